@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+🎛️ Benchmark DSP TTS - chaîne d'effets du preset Jarvis
+Compare l'implémentation historique (boucle Python par échantillon, un tableau par écho)
+à la chaîne compilée de services/tts-service/core/dsp.py: écart de sortie et débit
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+import scipy.signal
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services', 'tts-service'))
+
+from core.dsp import PresetEffectChain  # noqa: E402
+from presets.jarvis_voice import JarvisVoicePreset  # noqa: E402
+
+
+# Implémentation historique (AudioProcessor._apply_* avant vectorisation), conservée pour comparaison
+
+def _legacy_peaking(freq, q, gain_db, sr):
+    w0 = 2 * np.pi * freq / sr
+    alpha = np.sin(w0) / (2 * q)
+    A = 10**(gain_db / 40)
+    a0 = 1 + alpha / A
+    b = np.array([1 + alpha * A, -2 * np.cos(w0), 1 - alpha * A]) / a0
+    a = np.array([1, -2 * np.cos(w0), 1 - alpha / A]) / a0
+    return b, a
+
+
+def legacy_eq(audio, cfg, sr):
+    processed = audio.copy()
+    if cfg.get('low_gain', 0.0) != 0:
+        sos = scipy.signal.butter(4, cfg.get('low_freq', 80) * 2, 'lp', fs=sr, output='sos')
+        processed += scipy.signal.sosfilt(sos, audio) * (10**(cfg['low_gain'] / 20) - 1)
+    if cfg.get('mid_gain', 0.0) != 0:
+        mid = cfg.get('mid_freq', 1000)
+        sos = scipy.signal.butter(4, [mid / 2, mid * 2], 'bp', fs=sr, output='sos')
+        processed += scipy.signal.sosfilt(sos, audio) * (10**(cfg['mid_gain'] / 20) - 1)
+    if cfg.get('high_gain', 0.0) != 0:
+        sos = scipy.signal.butter(4, cfg.get('high_freq', 8000), 'hp', fs=sr, output='sos')
+        processed += scipy.signal.sosfilt(sos, audio) * (10**(cfg['high_gain'] / 20) - 1)
+    if cfg.get('presence_gain', 0.0) != 0:
+        b, a = _legacy_peaking(cfg.get('presence_freq', 4000), 2.0, cfg['presence_gain'], sr)
+        processed = scipy.signal.lfilter(b, a, processed)
+    return np.clip(processed, -1.0, 1.0)
+
+
+def legacy_compression(audio, cfg, sr):
+    attack_samples = int(cfg.get('attack', 5.0) * sr / 1000)
+    release_samples = int(cfg.get('release', 50.0) * sr / 1000)
+    threshold_linear = 10**(cfg.get('threshold', -18.0) / 20)
+    ratio = cfg.get('ratio', 3.0)
+
+    envelope = np.abs(audio)
+    for i in range(1, len(envelope)):
+        if envelope[i] > envelope[i-1]:
+            envelope[i] = envelope[i-1] + (envelope[i] - envelope[i-1]) / attack_samples
+        else:
+            envelope[i] = envelope[i-1] + (envelope[i] - envelope[i-1]) / release_samples
+
+    gain = np.ones_like(envelope)
+    over = envelope > threshold_linear
+    if np.any(over):
+        gain[over] = threshold_linear / envelope[over]
+        gain[over] = gain[over] ** (1 - 1/ratio)
+    return audio * gain
+
+
+def legacy_special_fx(audio, cfg, sr):
+    processed = audio.copy()
+    metallic = cfg.get('metallic_filter', {})
+    if metallic.get('enabled', False):
+        center = metallic.get('center_freq', 2000)
+        b, a = _legacy_peaking(center, center / metallic.get('bandwidth', 1.5), metallic.get('gain', 2.0), sr)
+        processed = scipy.signal.lfilter(b, a, processed)
+    harmonic = cfg.get('harmonic_enhancer', {})
+    if harmonic.get('enabled', False):
+        enhanced = processed.copy()
+        for h in harmonic.get('harmonics', [2, 3]):
+            enhanced += np.tanh(processed * h) * harmonic.get('intensity', 0.3) / h
+        processed = enhanced
+    chorus = cfg.get('subtle_chorus', {})
+    if chorus.get('enabled', False):
+        delay = int(chorus.get('delay', 10) * sr / 1000)
+        lfo = np.sin(2 * np.pi * chorus.get('rate', 0.5) * np.arange(len(audio)) / sr)
+        delayed = np.zeros_like(audio)
+        if delay < len(audio):
+            delayed[delay:] = audio[:-delay]
+        processed = (processed + delayed * (1 + chorus.get('depth', 0.1) * lfo)) * 0.5
+    return np.clip(processed, -1.0, 1.0)
+
+
+def legacy_reverb(audio, cfg, sr):
+    feedback = cfg.get('room_size', 0.7) * (1 - cfg.get('damping', 0.3))
+    reverb_signal = np.zeros_like(audio)
+    for delay in (int(0.03 * sr), int(0.05 * sr), int(0.07 * sr), int(0.09 * sr)):
+        if delay < len(audio):
+            delayed = np.zeros_like(audio)
+            delayed[delay:] = audio[:-delay]
+            reverb_signal += delayed * feedback
+    processed = cfg.get('dry_level', 0.75) * audio + cfg.get('wet_level', 0.25) * reverb_signal
+    return np.clip(processed, -1.0, 1.0)
+
+
+def legacy_chain(audio, effects, sr):
+    processed = audio.copy()
+    processed = legacy_eq(processed, effects['eq'], sr)
+    processed = legacy_compression(processed, effects['compression'], sr)
+    processed = legacy_special_fx(processed, effects['fx'], sr)
+    return legacy_reverb(processed, effects['reverb'], sr)
+
+
+def synthetic_speech(seconds: float, sr: int, seed: int = 0) -> np.ndarray:
+    """Signal de type voix: harmoniques d'une fondamentale modulée, enveloppe syllabique, bruit"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 10))
+    syllables = (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)) ** 2
+    return 0.3 * voiced * syllables + 0.01 * rng.standard_normal(len(t))
+
+
+def timed(fn: Callable[[], np.ndarray], repeats: int) -> Dict[str, Any]:
+    durations = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return {"result": result, "median": statistics.median(durations), "min": min(durations)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la chaîne d'effets TTS")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Durée de l'énoncé simulé")
+    parser.add_argument("--sample-rate", type=int, default=22050)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Sortie JSON")
+    args = parser.parse_args()
+
+    sr = args.sample_rate
+    effects = JarvisVoicePreset().get_audio_effects()
+    audio = synthetic_speech(args.seconds, sr)
+    chain = PresetEffectChain(effects, sr)
+
+    legacy = timed(lambda: legacy_chain(audio, effects, sr), args.repeats)
+    vectorized = timed(lambda: chain.process(audio), args.repeats)
+
+    reference, output = legacy["result"], vectorized["result"]
+    error = output - reference
+    report = {
+        "seconds": args.seconds,
+        "sample_rate": sr,
+        "legacy_median_s": round(legacy["median"], 4),
+        "vectorized_median_s": round(vectorized["median"], 4),
+        "speedup": round(legacy["median"] / vectorized["median"], 1),
+        "legacy_realtime_factor": round(args.seconds / legacy["median"], 1),
+        "vectorized_realtime_factor": round(args.seconds / vectorized["median"], 1),
+        "max_abs_error": float(np.max(np.abs(error))),
+        "snr_db": round(float(10 * np.log10(np.sum(reference**2) / max(np.sum(error**2), 1e-300))), 1)
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"🎛️ Chaîne Jarvis, {args.seconds:.0f}s @ {sr}Hz ({args.repeats} répétitions)")
+    print(f"   Historique : {report['legacy_median_s'] * 1000:8.1f} ms  (x{report['legacy_realtime_factor']} temps réel)")
+    print(f"   Vectorisée : {report['vectorized_median_s'] * 1000:8.1f} ms  (x{report['vectorized_realtime_factor']} temps réel)")
+    print(f"   Accélération: x{report['speedup']}")
+    print(f"   Écart max  : {report['max_abs_error']:.2e}  (SNR {report['snr_db']} dB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""
+Moteur d'embeddings partagé pour JARVIS
+Un seul modèle SentenceTransformer par processus (mémoire ChromaDB + recherche d'outils)
+Micro-batching asynchrone, cache par hash de contenu (LRU + table embedding_cache optionnelle)
+Même implémentation que services/brain-api/utils/embedding_engine.py
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from loguru import logger
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+class EmbeddingEngine:
+    """
+    Moteur d'embeddings avec:
+    - Modèle chargé une seule fois, hors boucle événementielle
+    - Micro-batching: les requêtes concurrentes sont regroupées pendant quelques ms
+    - Encodage dans un thread dédié (la boucle n'est jamais bloquée)
+    - Déduplication des requêtes identiques en vol
+    - Cache LRU en mémoire + table embedding_cache persistante (optionnelle)
+    - Vecteurs de secours (hash) jamais mis en cache: ils ne doivent pas se mêler à ceux du modèle
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        dimension: int = 384,
+        max_batch_size: int = 32,
+        batch_wait_ms: float = 5.0,
+        cache_size: int = 10000,
+        session_factory: Any = None,
+        hash_fallback: bool = True
+    ):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.max_batch_size = max_batch_size
+        self.batch_wait_ms = batch_wait_ms
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.cache_size = cache_size
+        self.session_factory = session_factory
+        self.hash_fallback = hash_fallback
+
+        self.model = None
+        self._model_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._pending: List[Tuple[str, str]] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        self.stats = {
+            "requests": 0,
+            "memory_hits": 0,
+            "db_hits": 0,
+            "encoded": 0,
+            "batches": 0,
+            "coalesced": 0,
+            "avg_batch_size": 0.0,
+            "total_encode_time": 0.0
+        }
+
+    async def initialize(self) -> bool:
+        """Charger le modèle dans le thread d'encodage"""
+        if self.model is not None:
+            return True
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            logger.warning("⚠️ sentence-transformers indisponible, embeddings de secours par hash")
+            return False
+
+        try:
+            loop = asyncio.get_running_loop()
+            self.model = await loop.run_in_executor(self._executor, SentenceTransformer, self.model_name)
+            logger.success(f"✅ Modèle d'embeddings chargé: {self.model_name} (dimension: {self.dimension})")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement modèle embeddings: {e}")
+            return False
+
+    async def shutdown(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            await self._flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    def cache_key(self, text: str) -> str:
+        """Hash de contenu (inclut le modèle pour isoler les espaces vectoriels)"""
+        return hashlib.sha256(f"{self.model_name}:{text}".encode("utf-8")).hexdigest()
+
+    async def embed(self, text: str) -> List[float]:
+        """Embedding d'un texte (regroupé avec les requêtes concurrentes)"""
+        self.stats["requests"] += 1
+        key = self.cache_key(text)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.stats["memory_hits"] += 1
+            return cached
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending.append((key, text))
+
+        if len(self._pending) >= self.max_batch_size:
+            if self._flush_handle:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._schedule_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait, self._schedule_flush)
+
+        return await asyncio.shield(future)
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings d'une liste de textes (un seul lot si possible)"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def encode_sync(self, texts: List[str]) -> List[List[float]]:
+        """Chemin synchrone pour les appelants non-async (utilise le même cache et modèle)"""
+        results: List[Optional[List[float]]] = []
+        missing: List[Tuple[int, str, str]] = []
+        for i, text in enumerate(texts):
+            key = self.cache_key(text)
+            cached = self._cache_get(key)
+            results.append(cached)
+            if cached is None:
+                missing.append((i, key, text))
+            else:
+                self.stats["memory_hits"] += 1
+
+        if missing:
+            vectors, from_model = self._encode([text for _, _, text in missing])
+            for (i, key, _), vector in zip(missing, vectors):
+                if from_model:
+                    self._cache_put(key, vector)
+                results[i] = vector
+
+        self.stats["requests"] += len(texts)
+        return results
+
+    def _schedule_flush(self):
+        """Lancer un flush en gardant une référence à la tâche (sinon collectable, erreurs perdues)"""
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Flush d'embeddings interrompu: {task.exception()}")
+
+    async def _flush(self):
+        """Traiter le lot en attente: cache DB, puis encodage des manquants en thread"""
+        self._flush_handle = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending:
+            self._schedule_flush()
+        if not batch:
+            return
+
+        try:
+            found = await self._db_lookup([key for key, _ in batch])
+            self.stats["db_hits"] += len(found)
+
+            to_encode = [(key, text) for key, text in batch if key not in found]
+            encoded: Dict[str, List[float]] = {}
+            from_model = True
+            if to_encode:
+                loop = asyncio.get_running_loop()
+                vectors, from_model = await loop.run_in_executor(
+                    self._executor, self._encode, [text for _, text in to_encode]
+                )
+                encoded = {key: vector for (key, _), vector in zip(to_encode, vectors)}
+                if from_model:
+                    await self._db_store(encoded)
+
+            for key, _ in batch:
+                vector = found.get(key) or encoded[key]
+                if key in found or from_model:
+                    self._cache_put(key, vector)
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_result(vector)
+
+        except Exception as e:
+            logger.error(f"❌ Erreur lot d'embeddings: {e}")
+            for key, _ in batch:
+                future = self._inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+
+    def _encode(self, texts: List[str]) -> Tuple[List[List[float]], bool]:
+        """Encodage effectif (exécuté hors boucle événementielle); indique si le modèle a servi"""
+        start_time = time.time()
+        from_model = self.model is not None
+        if from_model:
+            with self._model_lock:
+                vectors = self.model.encode(texts, batch_size=self.max_batch_size, convert_to_numpy=True)
+            vectors = vectors.tolist()
+        elif self.hash_fallback:
+            vectors = [self.hash_embedding(text) for text in texts]
+        else:
+            raise RuntimeError("Modèle d'embeddings non disponible. Installez sentence-transformers.")
+
+        self.stats["batches"] += 1
+        self.stats["encoded"] += len(texts)
+        self.stats["total_encode_time"] += time.time() - start_time
+        self.stats["avg_batch_size"] = self.stats["encoded"] / self.stats["batches"]
+        return vectors, from_model
+
+    def hash_embedding(self, text: str) -> List[float]:
+        """Embedding de secours basé sur TF-IDF simplifié (reproductible, jamais mis en cache)"""
+        words = text.lower().split()
+        word_freq: Dict[str, int] = {}
+        for word in words:
+            word_freq[word] = word_freq.get(word, 0) + 1
+
+        embedding = [0.0] * self.dimension
+        for i, word in enumerate(list(word_freq.keys())[:self.dimension]):
+            hash_val = hashlib.md5(word.encode()).hexdigest()
+            val = int(hash_val[:8], 16) / (16**8)
+            embedding[i] = val * math.log(1 + word_freq[word])
+
+        norm = math.sqrt(sum(x * x for x in embedding))
+        if norm > 0:
+            embedding = [x / norm for x in embedding]
+        return embedding
+
+    def _cache_get(self, key: str) -> Optional[List[float]]:
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+        return vector
+
+    def _cache_put(self, key: str, vector: List[float]):
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _db_lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Lire les embeddings persistés (et compter l'accès) en une requête"""
+        if self.session_factory is None or not keys:
+            return {}
+
+        from sqlalchemy import text as sql_text
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(sql_text("""
+                    UPDATE embedding_cache
+                    SET access_count = access_count + 1, last_accessed = NOW()
+                    WHERE model_name = :model_name AND hash_key = ANY(:keys)
+                    RETURNING hash_key, embedding::text
+                """), {"model_name": self.model_name, "keys": keys})
+                rows = result.fetchall()
+                await session.commit()
+            return {row[0]: json.loads(row[1]) for row in rows}
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur lecture embedding_cache: {e}")
+            return {}
+
+    async def _db_store(self, encoded: Dict[str, List[float]]):
+        """Persister les nouveaux embeddings en une seule insertion"""
+        if self.session_factory is None or not encoded:
+            return
+
+        from sqlalchemy import text as sql_text
+        try:
+            async with self.session_factory() as session:
+                await session.execute(sql_text("""
+                    INSERT INTO embedding_cache (uuid, hash_key, embedding, model_name, access_count, is_active)
+                    SELECT gen_random_uuid()::text, t.hash_key, CAST(t.embedding AS vector), :model_name, 1, TRUE
+                    FROM unnest(CAST(:keys AS text[]), CAST(:embeddings AS text[])) AS t(hash_key, embedding)
+                    ON CONFLICT (hash_key) DO NOTHING
+                """), {
+                    "model_name": self.model_name,
+                    "keys": list(encoded.keys()),
+                    "embeddings": [json.dumps(vector) for vector in encoded.values()]
+                })
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Erreur écriture embedding_cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = max(self.stats["requests"], 1)
+        return {
+            **self.stats,
+            "model_loaded": self.model is not None,
+            "cache_entries": len(self._cache),
+            "pending": len(self._pending),
+            "hit_rate": (self.stats["memory_hits"] + self.stats["db_hits"]) / requests
+        }
+
+
+# Instance globale (un seul modèle par processus)
+_global_embedding_engine: Optional[EmbeddingEngine] = None
+# Les appelants arrivés pendant le chargement du modèle attendent la fin de l'initialisation
+_global_embedding_engine_lock = asyncio.Lock()
+
+
+async def get_embedding_engine(**kwargs) -> EmbeddingEngine:
+    """Obtenir l'instance globale EmbeddingEngine (singleton)"""
+    global _global_embedding_engine
+
+    async with _global_embedding_engine_lock:
+        if _global_embedding_engine is None:
+            engine = EmbeddingEngine(**kwargs)
+            await engine.initialize()
+            _global_embedding_engine = engine
+            return engine
+
+    session_factory = kwargs.pop("session_factory", None)
+    if session_factory is not None and _global_embedding_engine.session_factory is None:
+        _global_embedding_engine.session_factory = session_factory
+
+    # Le modèle est partagé: une configuration différente ne peut pas s'appliquer après coup
+    ignored = {
+        name: value for name, value in kwargs.items()
+        if getattr(_global_embedding_engine, name, value) != value
+    }
+    if ignored:
+        logger.warning(f"⚠️ Moteur d'embeddings déjà initialisé, paramètres ignorés: {ignored}")
+
+    return _global_embedding_engine
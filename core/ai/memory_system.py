@@ -12,11 +12,12 @@ from pathlib import Path
 import uuid
 from loguru import logger
 
+from .embedding_engine import EmbeddingEngine, get_embedding_engine
+
 # Imports conditionnels
 try:
     import chromadb
     from chromadb.config import Settings
-    from sentence_transformers import SentenceTransformer
     MEMORY_AVAILABLE = True
 except ImportError as e:
     MEMORY_AVAILABLE = False
@@ -80,38 +81,36 @@ class UserPreference:
     last_updated: float = field(default_factory=time.time)
 
 class EmbeddingGenerator:
-    """Générateur d'embeddings pour la recherche sémantique"""
+    """Générateur d'embeddings pour la recherche sémantique (adossé au moteur partagé)"""
     
     def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
         self.model_name = model_name
-        self.model = None
+        self.engine: Optional[EmbeddingEngine] = None
         self.dimension = 384  # Dimension du modèle MiniLM
+    
+    @property
+    def model(self):
+        return self.engine.model if self.engine else None
         
     async def initialize(self):
-        """Initialise le modèle d'embeddings"""
+        """Initialise le modèle d'embeddings (partagé avec le gestionnaire d'outils)"""
         if not MEMORY_AVAILABLE:
             return False
         
-        try:
-            logger.info(f"🔄 Chargement du modèle d'embeddings {self.model_name}...")
-            self.model = SentenceTransformer(self.model_name)
-            logger.success(f"✅ Modèle d'embeddings prêt (dimension: {self.dimension})")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Erreur chargement modèle embeddings: {e}")
-            return False
+        self.engine = await get_embedding_engine(
+            model_name=self.model_name, dimension=self.dimension, hash_fallback=False
+        )
+        return self.engine.model is not None
     
-    def generate_embedding(self, text: str) -> List[float]:
-        """Génère un embedding pour un texte"""
+    async def embed(self, text: str) -> List[float]:
+        """Génère un embedding sans bloquer la boucle (regroupé avec les requêtes concurrentes)"""
         if not self.model:
             raise RuntimeError("Modèle d'embeddings non disponible. Installez sentence-transformers.")
-        
-        try:
-            embedding = self.model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
-        except Exception as e:
-            logger.error(f"❌ Erreur génération embedding: {e}")
-            raise RuntimeError(f"Impossible de générer l'embedding: {e}")
+        return await self.engine.embed(text)
+    
+    def generate_embedding(self, text: str) -> List[float]:
+        """Génère un embedding pour un texte"""
+        return self.generate_embeddings_batch([text])[0]
     
     def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
         """Génère des embeddings pour une liste de textes"""
@@ -119,8 +118,7 @@ class EmbeddingGenerator:
             raise RuntimeError("Modèle d'embeddings non disponible. Installez sentence-transformers.")
         
         try:
-            embeddings = self.model.encode(texts, convert_to_tensor=False)
-            return embeddings.tolist()
+            return self.engine.encode_sync(texts)
         except Exception as e:
             logger.error(f"❌ Erreur génération embeddings batch: {e}")
             raise RuntimeError(f"Impossible de générer les embeddings: {e}")
@@ -222,7 +220,8 @@ class ChromaMemoryStore:
     
     def search_memories(self, category: str, query: str, 
                        n_results: int = 5, 
-                       where: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+                       where: Dict[str, Any] = None,
+                       query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """Recherche des mémoires par similarité sémantique"""
         if category not in self.collections:
             return []
@@ -230,11 +229,18 @@ class ChromaMemoryStore:
         try:
             collection = self.collections[category]
             
-            results = collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                where=where
-            )
+            if query_embedding is not None:
+                results = collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    where=where
+                )
+            else:
+                results = collection.query(
+                    query_texts=[query],
+                    n_results=n_results,
+                    where=where
+                )
             
             # Formater les résultats
             memories = []
@@ -473,7 +479,7 @@ class MemorySystem:
             )
             
             # Générer l'embedding
-            memory_entry.embedding = self.embedding_generator.generate_embedding(summary)
+            memory_entry.embedding = await self.embedding_generator.embed(summary)
             
             # Stocker en mémoire
             self.memory_store.store_memory("conversations", memory_entry)
@@ -571,7 +577,7 @@ Résumé:"""
             importance=0.7 if result.get("success") else 0.3
         )
         
-        memory_entry.embedding = self.embedding_generator.generate_embedding(command)
+        memory_entry.embedding = await self.embedding_generator.embed(command)
         
         self.memory_store.store_memory("commands", memory_entry)
         self.stats["memories_stored"] += 1
@@ -686,13 +692,18 @@ Résumé:"""
         """Recherche des mémoires par similarité sémantique"""
         self.stats["memories_retrieved"] += 1
         
+        # Embedding de la requête calculé une seule fois pour toutes les collections
+        query_embedding = None
+        if self.embedding_generator.model:
+            query_embedding = await self.embedding_generator.embed(query)
+        
         if category:
-            return self.memory_store.search_memories(category, query, limit)
+            return self.memory_store.search_memories(category, query, limit, query_embedding=query_embedding)
         else:
             # Rechercher dans toutes les catégories
             all_results = []
             for cat in self.memory_store.collection_names.keys():
-                results = self.memory_store.search_memories(cat, query, limit)
+                results = self.memory_store.search_memories(cat, query, limit, query_embedding=query_embedding)
                 all_results.extend(results)
             
             # Trier par pertinence (distance)
@@ -5,6 +5,8 @@ Orchestrates backups across all services
 
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -15,6 +17,7 @@ from .postgresql_backup import PostgreSQLBackup
 from .redis_backup import RedisBackup
 from .chromadb_backup import ChromaDBBackup
 from .base_backup import BackupType, BackupStatus
+from .streaming import IOBudget
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +50,12 @@ class BackupManager:
         self.services = {}
         self.backup_configs = {}
         
+        # Full backups run services concurrently under a shared I/O budget and lowered CPU priority
+        full_backup_config = self.config.get('full_backup', {})
+        self.max_concurrent_backups = max(full_backup_config.get('max_concurrent', 2), 1)
+        self.io_budget = IOBudget.from_mb_s(full_backup_config.get('io_budget_mb_s'))
+        self.niceness = full_backup_config.get('niceness', 10)
+        
         # Initialize services
         self._initialize_services()
     
@@ -64,7 +73,11 @@ class BackupManager:
             database=pg_config.get('database', 'jarvis_memory'),
             username=pg_config.get('username', 'jarvis'),
             password=pg_config.get('password'),
-            compress=pg_config.get('compress', True)
+            compress=pg_config.get('compress', True),
+            compression=pg_config.get('compression', 'zstd'),
+            compression_level=pg_config.get('compression_level', 3),
+            compression_threads=pg_config.get('compression_threads', 0),
+            jobs=pg_config.get('jobs', 4)
         )
         
         # Redis backup
@@ -77,7 +90,10 @@ class BackupManager:
             port=redis_config.get('port', 6379),
             password=redis_config.get('password'),
             db=redis_config.get('db', 0),
-            compress=redis_config.get('compress', True)
+            compress=redis_config.get('compress', True),
+            compression=redis_config.get('compression', 'zstd'),
+            compression_level=redis_config.get('compression_level', 3),
+            compression_threads=redis_config.get('compression_threads', 0)
         )
         
         # ChromaDB backup
@@ -87,9 +103,16 @@ class BackupManager:
         self.services['chromadb'] = ChromaDBBackup(
             backup_dir=chroma_backup_dir,
             chroma_persist_dir=Path(chroma_config.get('persist_dir', './memory/chroma')),
-            compress=chroma_config.get('compress', True)
+            compress=chroma_config.get('compress', True),
+            compression=chroma_config.get('compression', 'zstd'),
+            compression_level=chroma_config.get('compression_level', 3),
+            compression_threads=chroma_config.get('compression_threads', 0)
         )
         
+        for service in self.services.values():
+            service.io_budget = self.io_budget
+            service.niceness = self.niceness
+        
         # Default backup configurations
         self.backup_configs = {
             'postgresql': BackupConfig(
@@ -151,38 +174,62 @@ class BackupManager:
             raise
     
     async def create_full_backup(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Create full backup of all services"""
+        """Create full backup of all services, running up to `max_concurrent_backups` at once"""
         
-        logger.info("Starting full system backup")
+        logger.info(f"Starting full system backup ({self.max_concurrent_backups} concurrent)")
         
-        results = {}
-        errors = []
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_concurrent_backups)
         
-        for service_name in self.services:
-            try:
-                result = await self.create_backup(service_name, BackupType.FULL, metadata)
-                results[service_name] = result
-                
-            except Exception as e:
-                error_msg = f"Backup failed for {service_name}: {e}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+        async def run_service_backup(service_name: str):
+            queued = time.perf_counter()
+            async with semaphore:
+                service_started = time.perf_counter()
+                try:
+                    result = await self.create_backup(service_name, BackupType.FULL, metadata)
+                    error = None
+                except Exception as e:
+                    error = f"Backup failed for {service_name}: {e}"
+                    logger.error(error)
+                    result = {
+                        "status": BackupStatus.FAILED.value,
+                        "error": str(e)
+                    }
                 
-                results[service_name] = {
-                    "status": BackupStatus.FAILED.value,
-                    "error": str(e)
-                }
+                timing = self._service_timing(result, service_started - queued,
+                                              time.perf_counter() - service_started)
+                return service_name, result, timing, error
+        
+        outcomes = await asyncio.gather(*(run_service_backup(name) for name in self.services))
+        
+        results = {}
+        services = {}
+        errors = []
+        for service_name, result, timing, error in outcomes:
+            results[service_name] = result
+            services[service_name] = timing
+            if error:
+                errors.append(error)
         
         # Summary
         successful = sum(1 for r in results.values() if r['status'] == BackupStatus.COMPLETED.value)
         total = len(results)
+        wall_time = time.perf_counter() - started
         
         summary = {
             "backup_type": "full_system",
-            "started_at": datetime.now(timezone.utc),
+            "started_at": started_at,
+            "completed_at": datetime.now(timezone.utc),
             "total_services": total,
             "successful": successful,
             "failed": total - successful,
+            "max_concurrent": self.max_concurrent_backups,
+            "wall_time_seconds": round(wall_time, 3),
+            # Time a sequential run would have taken (sum of per-service wall times)
+            "sequential_time_seconds": round(sum(t["wall_time_seconds"] for t in services.values()), 3),
+            "services": services,
+            "io_budget": self.io_budget.get_stats() if self.io_budget else None,
             "results": results,
             "errors": errors
         }
@@ -301,7 +348,9 @@ class BackupManager:
         service = self.services[service_name]
         
         try:
-            deleted_files = service.cleanup_old_backups(
+            # Unlinks and chunk garbage collection are blocking filesystem work
+            deleted_files = await asyncio.to_thread(
+                service.cleanup_old_backups,
                 retention_days=config.retention_days,
                 max_backups=config.max_backups
             )
@@ -312,6 +361,20 @@ class BackupManager:
         except Exception as e:
             logger.error(f"Failed to cleanup old backups for {service_name}: {e}")
     
+    def _service_timing(self, result: Dict[str, Any], queued: float, wall_time: float) -> Dict[str, Any]:
+        """Per-service wall time and throughput for the full backup summary"""
+        bytes_written = result.get('file_size', 0)
+        source_bytes = result.get('source_size', bytes_written)
+        
+        return {
+            "status": result['status'],
+            "queued_seconds": round(queued, 3),
+            "wall_time_seconds": round(wall_time, 3),
+            "bytes_written": bytes_written,
+            "bytes_per_second": round(bytes_written / wall_time) if wall_time > 0 else 0,
+            "source_bytes_per_second": round(source_bytes / wall_time) if wall_time > 0 else 0
+        }
+    
     def _format_bytes(self, bytes_size: int) -> str:
         """Format bytes in human readable format"""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -3,8 +3,8 @@ Base backup class for JARVIS AI database backup system
 """
 
 import os
+import asyncio
 import hashlib
-import gzip
 import shutil
 import logging
 from abc import ABC, abstractmethod
@@ -13,6 +13,12 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 from enum import Enum
 
+from .chunk_store import MANIFEST_SUFFIX, ChunkStore, DedupStats, is_manifest
+from .streaming import (
+    CHUNK_SIZE, CODEC_EXTENSIONS, IOBudget, StreamStats, detect_codec, directory_size, low_priority,
+    open_backup, pause_process_group, resolve_codec, stream_command, stream_directory, stream_file
+)
+
 logger = logging.getLogger(__name__)
 
 class BackupType(Enum):
@@ -30,12 +36,22 @@ class BackupStatus(Enum):
 class BaseBackup(ABC):
     """Base class for all backup implementations"""
     
-    def __init__(self, service_name: str, backup_dir: Path, compress: bool = True):
+    def __init__(self, service_name: str, backup_dir: Path, compress: bool = True,
+                 compression: str = "zstd", compression_level: int = 3,
+                 compression_threads: int = 0):
         self.service_name = service_name
         self.backup_dir = Path(backup_dir)
         self.compress = compress
+        self._compression_codec = resolve_codec(True, compression)
+        self.compression_level = compression_level
+        self.compression_threads = compression_threads  # zstd worker threads (0 = single-threaded)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
         
+        # Shared throttling, attached by BackupManager so concurrent backups spare live traffic
+        self.io_budget: Optional[IOBudget] = None
+        self.niceness = 0
+        self._chunk_store: Optional[ChunkStore] = None
+        
         # Setup logging
         self.logger = logging.getLogger(f"{__name__}.{service_name}")
     
@@ -61,38 +77,189 @@ class BaseBackup(ABC):
         """List all available backups"""
         pass
     
+    @property
+    def codec(self) -> str:
+        """Codec of new backups (follows `compress`, which may be toggled after construction)"""
+        return self._compression_codec if self.compress else "none"
+    
+    def backup_codec(self, source_compressed: bool = False) -> str:
+        """Codec for a backup; already-compressed sources are stored as-is"""
+        return "none" if source_compressed else self.codec
+    
     def generate_backup_filename(self, backup_type: BackupType, 
-                                timestamp: Optional[datetime] = None) -> str:
+                                timestamp: Optional[datetime] = None,
+                                codec: Optional[str] = None) -> str:
         """Generate standardized backup filename"""
         if timestamp is None:
             timestamp = datetime.now(timezone.utc)
         
         date_str = timestamp.strftime("%Y%m%d_%H%M%S")
-        extension = ".gz" if self.compress else ""
+        extension = CODEC_EXTENSIONS[codec or self.codec]
         
         return f"{self.service_name}_{backup_type.value}_{date_str}.backup{extension}"
     
+    async def stream_command_to_backup(self, cmd: List[str], target_path: Path,
+                                       env: Optional[Dict[str, str]] = None,
+                                       source_compressed: bool = False) -> StreamStats:
+        """Dump command stdout -> compression -> SHA-256 -> file, in one pass on a worker thread"""
+        return await asyncio.to_thread(
+            stream_command, cmd, target_path, self.backup_codec(source_compressed),
+            env, self.compression_level, self.compression_threads,
+            io_budget=self.io_budget, niceness=self.niceness
+        )
+    
+    async def stream_file_to_backup(self, source_path: Path, target_path: Path,
+                                    source_compressed: bool = False) -> StreamStats:
+        """File -> compression -> SHA-256 -> backup, in one pass on a worker thread"""
+        return await asyncio.to_thread(
+            stream_file, source_path, target_path, self.backup_codec(source_compressed),
+            self.compression_level, self.compression_threads, io_budget=self.io_budget
+        )
+    
+    async def stream_directory_to_backup(self, source_dir: Path, target_path: Path,
+                                         source_compressed: bool = False) -> StreamStats:
+        """Directory -> tar -> compression -> SHA-256 -> backup, in one pass on a worker thread"""
+        return await asyncio.to_thread(
+            stream_directory, source_dir, target_path, self.backup_codec(source_compressed),
+            self.compression_level, self.compression_threads, io_budget=self.io_budget
+        )
+    
+    @property
+    def chunk_store(self) -> ChunkStore:
+        """Deduplicating store backing this service's incremental backups (created on first use)"""
+        if self._chunk_store is None:
+            self._chunk_store = ChunkStore(self.backup_dir / "chunk_store", self.codec, self.compression_level)
+        self._chunk_store.io_budget = self.io_budget
+        return self._chunk_store
+    
+    def generate_manifest_filename(self, backup_type: BackupType,
+                                   timestamp: Optional[datetime] = None) -> str:
+        """Standardized filename for an incremental backup manifest"""
+        return self.generate_backup_filename(backup_type, timestamp, codec="none") + MANIFEST_SUFFIX
+    
+    async def chunk_directory_to_backup(self, source_dir: Path, manifest_path: Path,
+                                        metadata: Optional[Dict[str, Any]] = None) -> DedupStats:
+        """Directory -> content-defined chunks -> chunk store + manifest, on a worker thread"""
+        return await asyncio.to_thread(self.chunk_store.backup_directory, source_dir, manifest_path, metadata)
+    
+    async def restore_chunked_backup(self, manifest_path: Path, target_dir: Path,
+                                     paths: Optional[List[str]] = None) -> int:
+        """Reassemble an incremental backup from its chunks, on a worker thread"""
+        return await asyncio.to_thread(self.chunk_store.restore_directory, manifest_path, target_dir, paths)
+    
+    def chunk_result(self, stats: DedupStats, manifest_path: Path) -> Dict[str, Any]:
+        """Backup result fields from an incremental (deduplicated) backup"""
+        self.logger.info(
+            f"Chunked {stats.bytes_in} bytes: {stats.chunks_new}/{stats.chunks_total} new chunks, "
+            f"{stats.bytes_written} bytes written ({stats.reused_ratio:.1%} reused)"
+        )
+        return {
+            "file_size": stats.bytes_written,
+            "checksum": stats.checksum,
+            "backup_path": str(manifest_path),
+            "compression": stats.codec,
+            "source_size": stats.bytes_in,
+            "new_bytes": stats.bytes_new,
+            "chunks_total": stats.chunks_total,
+            "chunks_new": stats.chunks_new,
+            "reused_ratio": round(stats.reused_ratio, 4),
+            "duration_seconds": round(stats.duration, 3),
+            "throughput_mb_s": round(stats.throughput_mb_s, 2)
+        }
+    
+    async def run_command(self, cmd: List[str], env: Optional[Dict[str, str]] = None,
+                          output_dir: Optional[Path] = None) -> str:
+        """
+        Run a tool at the service's CPU priority; returns stderr, raises on non-zero exit.
+        With `output_dir` and an I/O budget, what the tool writes there is charged to the budget
+        and the tool is paused whenever it runs ahead of it.
+        """
+        throttled = output_dir is not None and self.io_budget is not None
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            env=env,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            preexec_fn=low_priority(self.niceness),
+            start_new_session=throttled  # own process group: workers are paused with the tool
+        )
+        pacer = asyncio.create_task(self._pace_output(process.pid, output_dir)) if throttled else None
+        try:
+            _, stderr = await process.communicate()
+        finally:
+            if pacer is not None:
+                pacer.cancel()
+                charged = await pacer
+        
+        if throttled:
+            # Bytes written since the last poll: the dump stage still pays for them
+            tail = max(await asyncio.to_thread(directory_size, output_dir) - charged, 0)
+            await asyncio.sleep(self.io_budget.consume(tail, block=False))
+        
+        error = stderr.decode("utf-8", errors="replace").strip() if stderr else ""
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"{Path(cmd[0]).name} failed ({process.returncode}): {error[-2000:] or 'Unknown error'}")
+        
+        return error
+    
+    async def _pace_output(self, pid: int, output_dir: Path, interval: float = 0.25) -> int:
+        """Charge a running tool's output growth to the I/O budget; returns the bytes charged once cancelled"""
+        charged = 0
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                size = await asyncio.to_thread(directory_size, output_dir)
+                wait = self.io_budget.consume(max(size - charged, 0), block=False)
+                charged = max(charged, size)
+                if wait > 0:
+                    pause_process_group(pid, True)
+                    try:
+                        await asyncio.sleep(wait)
+                    finally:
+                        pause_process_group(pid, False)
+        except asyncio.CancelledError:
+            return charged
+    
+    def stream_result(self, stats: StreamStats, backup_path: Path) -> Dict[str, Any]:
+        """Backup result fields from a streaming pass (no re-read of the file)"""
+        self.logger.info(
+            f"Streamed {stats.bytes_in} bytes -> {stats.bytes_out} bytes ({stats.codec}) "
+            f"at {stats.throughput_mb_s:.1f} MB/s"
+        )
+        return {
+            "file_size": stats.bytes_out,
+            "checksum": stats.checksum,
+            "backup_path": str(backup_path),
+            "compression": stats.codec,
+            "source_size": stats.bytes_in,
+            "duration_seconds": round(stats.duration, 3),
+            "throughput_mb_s": round(stats.throughput_mb_s, 2)
+        }
+    
     def calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA-256 checksum of a file"""
         sha256_hash = hashlib.sha256()
         
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
                 sha256_hash.update(chunk)
         
         return sha256_hash.hexdigest()
     
+    def is_compressed(self, backup_path: Path) -> bool:
+        """Whether a backup file is stored compressed (gzip or zstd)"""
+        return detect_codec(backup_path) != "none"
+    
     def compress_file(self, source_path: Path, target_path: Path) -> None:
-        """Compress a file using gzip"""
-        with open(source_path, 'rb') as f_in:
-            with gzip.open(target_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+        """Compress a file with the configured codec"""
+        stream_file(source_path, target_path, self.codec, self.compression_level, self.compression_threads)
     
     def decompress_file(self, source_path: Path, target_path: Path) -> None:
-        """Decompress a gzip file"""
-        with gzip.open(source_path, 'rb') as f_in:
+        """Decompress a gzip or zstd backup file"""
+        with open_backup(source_path) as f_in:
             with open(target_path, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
+                shutil.copyfileobj(f_in, f_out, CHUNK_SIZE)
     
     def get_file_size(self, file_path: Path) -> int:
         """Get file size in bytes"""
@@ -135,6 +302,11 @@ class BaseBackup(ABC):
                 except Exception as e:
                     self.logger.error(f"Failed to delete {file_path}: {e}")
         
+        # Chunks only referenced by deleted manifests are now garbage
+        if any(is_manifest(path) for path in deleted_files):
+            live_manifests = self.backup_dir.glob(f"{self.service_name}_*{MANIFEST_SUFFIX}")
+            self.chunk_store.collect_garbage(live_manifests)
+        
         return deleted_files
     
     def get_backup_metadata(self, backup_path: Path) -> Dict[str, Any]:
@@ -150,5 +322,5 @@ class BaseBackup(ABC):
             "created_at": datetime.fromtimestamp(stat.st_ctime, timezone.utc),
             "modified_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
             "checksum": self.calculate_checksum(backup_path),
-            "compressed": backup_path.suffix == ".gz"
+            "compressed": self.is_compressed(backup_path)
         }
\ No newline at end of file
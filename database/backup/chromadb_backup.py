@@ -12,13 +12,17 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from .base_backup import BaseBackup, BackupType, BackupStatus
+from .chunk_store import is_manifest
+from .streaming import StreamStats, extract_archive
 
 class ChromaDBBackup(BaseBackup):
     """ChromaDB backup implementation"""
     
     def __init__(self, backup_dir: Path, chroma_persist_dir: Path,
-                 compress: bool = True):
-        super().__init__("chromadb", backup_dir, compress)
+                 compress: bool = True, compression: str = "zstd",
+                 compression_level: int = 3, compression_threads: int = 0):
+        super().__init__("chromadb", backup_dir, compress, compression,
+                         compression_level, compression_threads)
         
         self.chroma_persist_dir = Path(chroma_persist_dir)
         if not self.chroma_persist_dir.exists():
@@ -26,9 +30,13 @@ class ChromaDBBackup(BaseBackup):
     
     async def create_backup(self, backup_type: BackupType = BackupType.FULL,
                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Create ChromaDB backup"""
+        """Create ChromaDB backup (incremental backups only store the chunks that changed)"""
         
-        backup_filename = self.generate_backup_filename(backup_type)
+        incremental = backup_type == BackupType.INCREMENTAL
+        if incremental:
+            backup_filename = self.generate_manifest_filename(backup_type)
+        else:
+            backup_filename = self.generate_backup_filename(backup_type)
         backup_path = self.backup_dir / backup_filename
         temp_backup_dir = self.backup_dir / f"temp_{backup_filename}"
         
@@ -50,26 +58,25 @@ class ChromaDBBackup(BaseBackup):
             # Backup ChromaDB data
             await self._backup_chroma_data(temp_backup_dir)
             
-            # Create archive
-            if self.compress:
-                await self._create_compressed_archive(temp_backup_dir, backup_path)
+            if incremental:
+                # Deduplicate against previous backups: only changed chunks are written.
+                # Chunking reads the staged copy, not the live persist directory: the copy
+                # (SQLite backup API) is what makes the snapshot consistent, so incremental
+                # backups still need scratch space for one full copy of the data.
+                stats = await self.chunk_directory_to_backup(temp_backup_dir, backup_path, metadata)
+                backup_result = self.chunk_result(stats, backup_path)
             else:
-                shutil.make_archive(str(backup_path.with_suffix('')), 'tar', temp_backup_dir)
-                backup_path = backup_path.with_suffix('.tar')
-            
-            # Calculate file stats
-            file_size = self.get_file_size(backup_path)
-            checksum = self.calculate_checksum(backup_path)
+                # Create archive (tar stream -> compression -> checksum in one pass)
+                stats = await self._create_compressed_archive(temp_backup_dir, backup_path)
+                backup_result = self.stream_result(stats, backup_path)
             
             result.update({
                 "status": BackupStatus.COMPLETED.value,
                 "completed_at": datetime.now(timezone.utc),
-                "file_size": file_size,
-                "checksum": checksum,
-                "backup_path": str(backup_path)
+                **backup_result
             })
             
-            self.logger.info(f"ChromaDB backup completed: {backup_path.name} ({file_size} bytes)")
+            self.logger.info(f"ChromaDB backup completed: {backup_path.name} ({backup_result['file_size']} bytes)")
             
         except Exception as e:
             self.logger.error(f"ChromaDB backup failed: {e}")
@@ -135,13 +142,9 @@ class ChromaDBBackup(BaseBackup):
             # Fallback to file copy
             shutil.copy2(source_path, target_path)
     
-    async def _create_compressed_archive(self, source_dir: Path, target_path: Path):
-        """Create compressed tar.gz archive"""
-        
-        import tarfile
-        
-        with tarfile.open(target_path, "w:gz") as tar:
-            tar.add(source_dir, arcname=".")
+    async def _create_compressed_archive(self, source_dir: Path, target_path: Path) -> StreamStats:
+        """Create tar archive compressed with the configured codec, on a worker thread"""
+        return await self.stream_directory_to_backup(source_dir, target_path)
     
     async def restore_backup(self, backup_path: Path, 
                            target_location: Optional[str] = None) -> bool:
@@ -160,10 +163,7 @@ class ChromaDBBackup(BaseBackup):
             temp_extract_dir.mkdir(exist_ok=True)
             
             # Extract backup archive
-            if backup_path.name.endswith('.tar.gz') or backup_path.name.endswith('.gz'):
-                await self._extract_compressed_archive(backup_path, temp_extract_dir)
-            else:
-                await self._extract_archive(backup_path, temp_extract_dir)
+            await self._extract_archive(backup_path, temp_extract_dir)
             
             # Restore ChromaDB data
             chroma_data_dir = temp_extract_dir / "chroma_data"
@@ -196,21 +196,12 @@ class ChromaDBBackup(BaseBackup):
             if temp_extract_dir.exists():
                 shutil.rmtree(temp_extract_dir)
     
-    async def _extract_compressed_archive(self, archive_path: Path, extract_dir: Path):
-        """Extract compressed tar.gz archive"""
-        
-        import tarfile
-        
-        with tarfile.open(archive_path, "r:gz") as tar:
-            tar.extractall(extract_dir)
-    
     async def _extract_archive(self, archive_path: Path, extract_dir: Path):
-        """Extract regular tar archive"""
-        
-        import tarfile
-        
-        with tarfile.open(archive_path, "r") as tar:
-            tar.extractall(extract_dir)
+        """Extract tar archive (plain, gzip or zstd) or reassemble a chunk manifest, on a worker thread"""
+        if is_manifest(archive_path):
+            await self.restore_chunked_backup(archive_path, extract_dir)
+        else:
+            await asyncio.to_thread(extract_archive, archive_path, extract_dir)
     
     async def verify_backup(self, backup_path: Path) -> bool:
         """Verify ChromaDB backup integrity"""
@@ -224,10 +215,7 @@ class ChromaDBBackup(BaseBackup):
             temp_verify_dir.mkdir(exist_ok=True)
             
             # Extract and verify backup
-            if backup_path.name.endswith('.tar.gz') or backup_path.name.endswith('.gz'):
-                await self._extract_compressed_archive(backup_path, temp_verify_dir)
-            else:
-                await self._extract_archive(backup_path, temp_verify_dir)
+            await self._extract_archive(backup_path, temp_verify_dir)
             
             # Verify metadata file exists
             metadata_file = temp_verify_dir / "metadata.json"
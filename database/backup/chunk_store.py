@@ -0,0 +1,436 @@
+"""
+Deduplicating chunk store for JARVIS AI incremental backups
+
+Backup streams are cut into content-defined chunks (windowed gear hash with FastCDC-style
+normalized chunking), each chunk is stored once under its SHA-256 and every backup is a manifest listing
+the chunks of each file. Unchanged data between two runs costs no new storage: a backup of a
+mostly-unchanged store only writes the chunks that changed. Every manifest is a complete
+snapshot, so restoring never needs a chain of previous backups.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .streaming import IOBudget, zstandard
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_SUFFIX = ".manifest"
+MANIFEST_VERSION = 1
+
+# Chunk size bounds: small enough that scattered SQLite page updates only touch a few chunks
+MIN_CHUNK_SIZE = 64 * 1024
+AVG_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+# Amount of data hashed per pass when scanning for boundaries
+SCAN_SIZE = 8 * 1024 * 1024
+
+# 32-bit gear hash: each byte is shifted out after 32 steps, so the hash covers a 32-byte window
+WINDOW = 32
+_MASK_32 = 0xFFFFFFFF
+
+# Deterministic gear table: boundaries must be identical across runs and versions for dedup to work
+GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], "big") for i in range(256)]
+
+
+def is_manifest(path: Path) -> bool:
+    """Whether a backup file is a chunk manifest (incremental backup)"""
+    return Path(path).name.endswith(MANIFEST_SUFFIX)
+
+
+def _high_bits_mask(bits: int) -> int:
+    # The gear hash shifts left: the high bits depend on the widest window of recent bytes
+    return ((1 << bits) - 1) << (32 - bits)
+
+
+class _Boundaries:
+    """
+    Boundary candidates of a buffer: the end offsets where the windowed gear hash matches a mask.
+    With numpy the hash of every position is computed in log2(WINDOW) vector passes
+    (h_2w(i) = h_w(i) + h_w(i - w) << w); otherwise positions are hashed lazily, one byte at a time.
+    Both give identical boundaries.
+    """
+
+    def __init__(self, data, mask_strict: int, mask_loose: int):
+        self.data = data
+        self.mask_strict = mask_strict
+        self.mask_loose = mask_loose
+        self.strict = self.loose = None
+
+        if NUMPY_AVAILABLE:
+            gear = np.array(GEAR, dtype=np.uint32)
+            h = gear[np.frombuffer(data, dtype=np.uint8)]
+            width = 1
+            while width < WINDOW:
+                h[width:] += h[:-width] << np.uint32(width)
+                width *= 2
+            self.strict = np.flatnonzero((h & np.uint32(mask_strict)) == 0) + 1
+            self.loose = np.flatnonzero((h & np.uint32(mask_loose)) == 0) + 1
+
+    def first(self, low: int, high: int, strict: bool) -> Optional[int]:
+        """First boundary end in [low, high], if any"""
+        if low > high:
+            return None
+
+        if self.strict is not None:
+            ends = self.strict if strict else self.loose
+            index = int(np.searchsorted(ends, low))
+            return int(ends[index]) if index < len(ends) and ends[index] <= high else None
+
+        data = self.data
+        gear = GEAR
+        mask = self.mask_strict if strict else self.mask_loose
+        h = 0
+        # Warm the window up on the bytes preceding the first candidate
+        for i in range(max(low - WINDOW, 0), high):
+            h = ((h << 1) + gear[data[i]]) & _MASK_32
+            if i + 1 >= low and not h & mask:
+                return i + 1
+        return None
+
+
+def chunk_stream(source: BinaryIO, min_size: int = MIN_CHUNK_SIZE,
+                 avg_size: int = AVG_CHUNK_SIZE, max_size: int = MAX_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Cut a stream into content-defined chunks (FastCDC-style normalized chunking):
+    boundaries are harder to hit before the average size and easier after it, so chunk sizes
+    cluster around the average, and bytes below the minimum size are never boundaries.
+    """
+    bits = max(avg_size.bit_length() - 1, 1)
+    mask_strict = _high_bits_mask(min(bits + 2, 32))
+    mask_loose = _high_bits_mask(max(bits - 2, 1))
+    scan_size = max(SCAN_SIZE, 2 * max_size)
+
+    buffer = bytearray()
+    eof = False
+    while True:
+        while not eof and len(buffer) < scan_size:
+            block = source.read(scan_size - len(buffer))
+            if not block:
+                eof = True
+            else:
+                buffer += block
+        if not buffer:
+            return
+
+        boundaries = _Boundaries(bytes(buffer), mask_strict, mask_loose)
+        length = len(buffer)
+        start = 0
+        while start < length:
+            normal = min(start + avg_size, length)
+            limit = min(start + max_size, length)
+            cut = (boundaries.first(start + min_size + 1, normal, strict=True)
+                   or boundaries.first(max(normal + 1, start + min_size + 1), limit, strict=False))
+            if cut is None:
+                if limit - start < max_size and not eof:
+                    break  # The boundary may lie in data not read yet
+                cut = limit
+            yield bytes(buffer[start:cut])
+            start = cut
+        del buffer[:start]
+
+
+@dataclass
+class DedupStats:
+    """Outcome of an incremental backup into the chunk store"""
+    codec: str
+    files: int
+    bytes_in: int
+    bytes_new: int
+    bytes_stored: int
+    chunks_total: int
+    chunks_new: int
+    manifest_size: int
+    checksum: str
+    duration: float
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes this backup actually added on disk (new chunks + manifest)"""
+        return self.bytes_stored + self.manifest_size
+
+    @property
+    def reused_ratio(self) -> float:
+        """Fraction of the source already present in the store"""
+        return 1 - self.bytes_new / self.bytes_in if self.bytes_in else 1.0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Source throughput in MB/s"""
+        return self.bytes_in / (1024 * 1024) / max(self.duration, 1e-9)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "bytes_written": self.bytes_written,
+            "reused_ratio": round(self.reused_ratio, 4),
+            "throughput_mb_s": round(self.throughput_mb_s, 2)
+        }
+
+
+class ChunkStore:
+    """
+    Content-addressed chunk storage shared by all incremental backups of a service.
+
+    Layout under `root`:
+    - chunks/<2 hex>/<sha256>: one chunk, compressed on its own with the store codec
+    - index.json: sha256 -> [raw size, stored size, codec]
+
+    Manifests live next to the regular backup files so listing and retention treat them alike;
+    `collect_garbage` drops the chunks no remaining manifest references.
+    Blocking API: run it in a worker thread.
+    """
+
+    def __init__(self, root: Path, codec: str = "zstd", level: int = 3,
+                 min_size: int = MIN_CHUNK_SIZE, avg_size: int = AVG_CHUNK_SIZE,
+                 max_size: int = MAX_CHUNK_SIZE, io_budget: Optional[IOBudget] = None):
+        if not min_size <= avg_size <= max_size:
+            raise ValueError("Chunk sizes must satisfy min_size <= avg_size <= max_size")
+
+        self.root = Path(root)
+        self.chunks_dir = self.root / "chunks"
+        self.index_path = self.root / "index.json"
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        self.io_budget = io_budget
+
+        # Serializes backups and garbage collection on this store
+        self._lock = threading.RLock()
+        self.chunks_dir.mkdir(parents=True, exist_ok=True)
+        self.index: Dict[str, List[Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, List[Any]]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)["chunks"]
+        except (ValueError, KeyError) as e:
+            # Chunks on disk are still found by path and re-indexed when referenced again
+            logger.warning(f"Chunk index unreadable, starting a new one: {e}")
+            return {}
+
+    def _save_index(self):
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "chunks": self.index}, f)
+        os.replace(temp_path, self.index_path)
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        if self.codec == "gzip":
+            return gzip.compress(data, compresslevel=min(max(self.level, 1), 9))
+        return data
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd chunks")
+            return zstandard.ZstdDecompressor().decompress(data)
+        if codec == "gzip":
+            return gzip.decompress(data)
+        return data
+
+    def _put_chunk(self, data: bytes, stats: Dict[str, int]) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        stats["chunks_total"] += 1
+
+        if digest in self.index:
+            return digest
+
+        path = self.chunk_path(digest)
+        if path.exists():
+            # Written by a run that died before saving the index: adopt it
+            self.index[digest] = [len(data), path.stat().st_size, self.codec]
+            return digest
+
+        stored = self._compress(data)
+        path.parent.mkdir(exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(stored)
+        os.replace(temp_path, path)
+
+        self.index[digest] = [len(data), len(stored), self.codec]
+        stats["chunks_new"] += 1
+        stats["bytes_new"] += len(data)
+        stats["bytes_stored"] += len(stored)
+        return digest
+
+    def put_stream(self, source: BinaryIO, stats: Optional[Dict[str, int]] = None) -> Tuple[List[str], int]:
+        """Chunk a stream into the store; returns its chunk digests and size"""
+        stats = stats if stats is not None else {"chunks_total": 0, "chunks_new": 0, "bytes_new": 0, "bytes_stored": 0}
+        digests = []
+        size = 0
+        for chunk in chunk_stream(source, self.min_size, self.avg_size, self.max_size):
+            if self.io_budget is not None:
+                self.io_budget.consume(len(chunk))
+            digests.append(self._put_chunk(chunk, stats))
+            size += len(chunk)
+        return digests, size
+
+    def backup_directory(self, source_dir: Path, manifest_path: Path,
+                         metadata: Optional[Dict[str, Any]] = None) -> DedupStats:
+        """Store every file of a directory and write the manifest describing it"""
+        started = time.perf_counter()
+        source_dir = Path(source_dir)
+        manifest_path = Path(manifest_path)
+        stats = {"chunks_total": 0, "chunks_new": 0, "bytes_new": 0, "bytes_stored": 0}
+        files = []
+
+        with self._lock:
+            for file_path in sorted(p for p in source_dir.rglob("*") if p.is_file()):
+                with open(file_path, "rb") as f:
+                    digests, size = self.put_stream(f, stats)
+                files.append({
+                    "path": file_path.relative_to(source_dir).as_posix(),
+                    "size": size,
+                    "mode": file_path.stat().st_mode & 0o777,
+                    "chunks": digests
+                })
+
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "chunk_sizes": [self.min_size, self.avg_size, self.max_size],
+                "metadata": metadata or {},
+                "files": files
+            }
+            payload = json.dumps(manifest, default=str).encode("utf-8")
+
+            # Chunks first, then the manifest, then the index: a crash never leaves dangling references
+            temp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(payload)
+            os.replace(temp_path, manifest_path)
+            self._save_index()
+
+        return DedupStats(
+            codec=self.codec,
+            files=len(files),
+            bytes_in=sum(f["size"] for f in files),
+            manifest_size=len(payload),
+            checksum=hashlib.sha256(payload).hexdigest(),
+            duration=time.perf_counter() - started,
+            **stats
+        )
+
+    @staticmethod
+    def load_manifest(manifest_path: Path) -> Dict[str, Any]:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+        return manifest
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Read a chunk back and check it against its hash"""
+        entry = self.index.get(digest)
+        codec = entry[2] if entry else self.codec
+        with open(self.chunk_path(digest), "rb") as f:
+            data = self._decompress(f.read(), codec)
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupted chunk: {digest}")
+        return data
+
+    def restore_directory(self, manifest_path: Path, target_dir: Path,
+                          paths: Optional[Iterable[str]] = None) -> int:
+        """Reassemble the files of a manifest (or only `paths`) under target_dir; returns bytes written"""
+        manifest = self.load_manifest(manifest_path)
+        target_dir = Path(target_dir)
+        wanted = set(paths) if paths is not None else None
+        written = 0
+
+        for entry in manifest["files"]:
+            if wanted is not None and entry["path"] not in wanted:
+                continue
+
+            target_path = (target_dir / entry["path"]).resolve()
+            if not target_path.is_relative_to(target_dir.resolve()):
+                raise ValueError(f"Unsafe path in manifest: {entry['path']}")
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(target_path, "wb") as f:
+                for digest in entry["chunks"]:
+                    data = self.read_chunk(digest)
+                    if self.io_budget is not None:
+                        self.io_budget.consume(len(data))
+                    f.write(data)
+                    written += len(data)
+            os.chmod(target_path, entry.get("mode", 0o644))
+
+            if target_path.stat().st_size != entry["size"]:
+                raise ValueError(f"Size mismatch after restore: {entry['path']}")
+
+        return written
+
+    def verify(self, manifest_path: Path, deep: bool = False) -> bool:
+        """Check every chunk of a manifest is present (and, with deep, intact)"""
+        manifest = self.load_manifest(manifest_path)
+        for entry in manifest["files"]:
+            for digest in entry["chunks"]:
+                if not self.chunk_path(digest).exists():
+                    logger.error(f"Missing chunk {digest} for {entry['path']}")
+                    return False
+                if deep:
+                    try:
+                        self.read_chunk(digest)
+                    except ValueError as e:
+                        logger.error(str(e))
+                        return False
+        return True
+
+    def collect_garbage(self, manifest_paths: Iterable[Path]) -> int:
+        """Delete chunks referenced by none of the given (live) manifests; returns the number removed"""
+        with self._lock:
+            live = set()
+            for manifest_path in manifest_paths:
+                for entry in self.load_manifest(manifest_path)["files"]:
+                    live.update(entry["chunks"])
+
+            removed = 0
+            for path in self.chunks_dir.glob("*/*"):
+                if path.name not in live:
+                    path.unlink(missing_ok=True)
+                    self.index.pop(path.name, None)
+                    removed += 1
+            for digest in [d for d in self.index if d not in live]:
+                del self.index[digest]
+
+            self._save_index()
+
+        if removed:
+            logger.info(f"Removed {removed} unreferenced chunks from {self.root}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "chunks": len(self.index),
+            "raw_bytes": sum(entry[0] for entry in self.index.values()),
+            "stored_bytes": sum(entry[1] for entry in self.index.values())
+        }
@@ -3,6 +3,7 @@ PostgreSQL backup implementation for JARVIS AI
 """
 
 import asyncio
+import shutil
 import subprocess
 import tempfile
 import os
@@ -11,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from .base_backup import BaseBackup, BackupType, BackupStatus
+from .chunk_store import is_manifest
+from .streaming import extract_archive, open_backup
 
 class PostgreSQLBackup(BaseBackup):
     """PostgreSQL backup implementation using pg_dump and pg_restore"""
@@ -18,14 +21,18 @@ class PostgreSQLBackup(BaseBackup):
     def __init__(self, backup_dir: Path, host: str = "localhost", 
                  port: int = 5432, database: str = "jarvis_memory",
                  username: str = "jarvis", password: str = None,
-                 compress: bool = True):
-        super().__init__("postgresql", backup_dir, compress)
+                 compress: bool = True, compression: str = "zstd",
+                 compression_level: int = 3, compression_threads: int = 0,
+                 jobs: int = 4):
+        super().__init__("postgresql", backup_dir, compress, compression,
+                         compression_level, compression_threads)
         
         self.host = host
         self.port = port
         self.database = database
         self.username = username
         self.password = password
+        self.jobs = max(jobs, 1)  # pg_dump / pg_restore worker connections
         
         # Environment for pg_dump/pg_restore
         self.env = os.environ.copy()
@@ -34,11 +41,28 @@ class PostgreSQLBackup(BaseBackup):
     
     async def create_backup(self, backup_type: BackupType = BackupType.FULL,
                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Create PostgreSQL backup using pg_dump"""
+        """
+        Create PostgreSQL backup with a parallel directory-format pg_dump.
+        Full backups are streamed into one archive; incremental backups go to the chunk store,
+        so tables that did not change cost no new storage.
         
-        backup_filename = self.generate_backup_filename(backup_type)
+        The directory format cannot be piped: the dump is staged next to the backups
+        (scratch space of about one dump, uncompressed for incremental backups) and removed
+        afterwards. Its writes are charged to the I/O budget like the archiving pass that follows.
+        """
+        
+        incremental = backup_type == BackupType.INCREMENTAL
+        if incremental:
+            backup_filename = self.generate_manifest_filename(backup_type)
+        else:
+            # Directory format dumps are compressed per table by pg_dump: no second compression pass
+            backup_filename = self.generate_backup_filename(
+                backup_type, codec=self.backup_codec(source_compressed=True)
+            )
         backup_path = self.backup_dir / backup_filename
-        temp_backup_path = backup_path.with_suffix('.tmp')
+        # Hidden while being written: never matched by the `<service>_*.backup*` listing and cleanup globs
+        temp_backup_path = self.backup_dir / f".{backup_path.name}.partial"
+        dump_dir = self.backup_dir / f".{backup_path.name}.dir"
         
         result = {
             "service": self.service_name,
@@ -50,7 +74,7 @@ class PostgreSQLBackup(BaseBackup):
         }
         
         try:
-            self.logger.info(f"Starting PostgreSQL backup: {backup_filename}")
+            self.logger.info(f"Starting PostgreSQL backup: {backup_filename} ({self.jobs} dump jobs)")
             
             # Build pg_dump command
             cmd = [
@@ -59,60 +83,44 @@ class PostgreSQLBackup(BaseBackup):
                 f"--port={self.port}",
                 f"--username={self.username}",
                 "--verbose",
-                "--format=custom",  # Use custom format for compression and parallel restore
+                "--format=directory",  # One file per table: dumped and restored in parallel
+                f"--jobs={self.jobs}",
+                f"--file={dump_dir}",
                 "--no-owner",
                 "--no-acl",
-                f"--file={temp_backup_path}",
             ]
             
             # Add backup type specific options
-            if backup_type == BackupType.FULL:
+            if backup_type in (BackupType.FULL, BackupType.INCREMENTAL):
                 cmd.append("--create")  # Include CREATE DATABASE statement
-            elif backup_type == BackupType.INCREMENTAL:
-                # For incremental, we'll use a different approach with WAL files
-                # For now, treat as full backup (proper incremental needs WAL archiving)
-                cmd.append("--create")
             
-            cmd.append(self.database)
+            if incremental:
+                # Uncompressed table data: pg_dump compression would turn any change into a whole new file
+                cmd.append("--compress=0")
             
-            # Execute pg_dump
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                env=self.env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            cmd.append(self.database)
             
-            stdout, stderr = await process.communicate()
+            await self.run_command(cmd, env=self.env, output_dir=dump_dir)
             
-            if process.returncode != 0:
-                error_msg = stderr.decode('utf-8') if stderr else "Unknown error"
-                raise Exception(f"pg_dump failed: {error_msg}")
-            
-            # Compress if requested
-            if self.compress:
-                self.logger.info("Compressing backup file...")
-                compressed_path = backup_path
-                self.compress_file(temp_backup_path, compressed_path)
-                temp_backup_path.unlink()  # Remove uncompressed file
-                final_backup_path = compressed_path
+            if incremental:
+                # Dump directory -> content-defined chunks: only changed chunks are written
+                stats = await self.chunk_directory_to_backup(dump_dir, backup_path, metadata)
+                backup_result = self.chunk_result(stats, backup_path)
             else:
-                final_backup_path = backup_path
-                temp_backup_path.rename(final_backup_path)
-            
-            # Calculate file stats
-            file_size = self.get_file_size(final_backup_path)
-            checksum = self.calculate_checksum(final_backup_path)
+                # Tar the dump directory -> SHA-256 -> file in a single pass
+                stats = await self.stream_directory_to_backup(dump_dir, temp_backup_path, source_compressed=True)
+                temp_backup_path.rename(backup_path)
+                backup_result = self.stream_result(stats, backup_path)
             
             result.update({
                 "status": BackupStatus.COMPLETED.value,
                 "completed_at": datetime.now(timezone.utc),
-                "file_size": file_size,
-                "checksum": checksum,
-                "backup_path": str(final_backup_path)
+                "dump_format": "directory",
+                "dump_jobs": self.jobs,
+                **backup_result
             })
             
-            self.logger.info(f"PostgreSQL backup completed: {final_backup_path.name} ({file_size} bytes)")
+            self.logger.info(f"PostgreSQL backup completed: {backup_path.name} ({backup_result['file_size']} bytes)")
             
         except Exception as e:
             self.logger.error(f"PostgreSQL backup failed: {e}")
@@ -129,11 +137,44 @@ class PostgreSQLBackup(BaseBackup):
             
             raise
         
+        finally:
+            shutil.rmtree(dump_dir, ignore_errors=True)
+        
         return result
     
+    def is_directory_dump(self, backup_path: Path) -> bool:
+        """Whether a backup is a tarred directory-format dump (older backups are custom-format files)"""
+        with open_backup(backup_path) as f:
+            header = f.read(262)
+        return header[257:262] == b"ustar"
+    
+    async def _prepare_dump(self, backup_path: Path, work_dir: Path, toc_only: bool = False) -> Path:
+        """Path pg_restore can read: extracted dump directory, decompressed custom dump or the file itself"""
+        if is_manifest(backup_path):
+            dump_dir = work_dir / "dump"
+            if toc_only:
+                # Listing only needs the table of contents; the other chunks are checked for presence
+                if not await asyncio.to_thread(self.chunk_store.verify, backup_path):
+                    raise ValueError(f"Incomplete chunked backup: {backup_path.name}")
+            await self.restore_chunked_backup(backup_path, dump_dir, ["toc.dat"] if toc_only else None)
+            return dump_dir
+        
+        if await asyncio.to_thread(self.is_directory_dump, backup_path):
+            dump_dir = work_dir / "dump"
+            # Listing only needs the table of contents, but the whole archive is still read back
+            await asyncio.to_thread(extract_archive, backup_path, dump_dir, ["toc.dat"] if toc_only else None)
+            return dump_dir
+        
+        if self.is_compressed(backup_path):
+            restore_file = work_dir / "dump.backup"
+            await asyncio.to_thread(self.decompress_file, backup_path, restore_file)
+            return restore_file
+        
+        return backup_path
+    
     async def restore_backup(self, backup_path: Path, 
                            target_location: Optional[str] = None) -> bool:
-        """Restore PostgreSQL backup using pg_restore"""
+        """Restore PostgreSQL backup using a parallel pg_restore"""
         
         if not backup_path.exists():
             raise FileNotFoundError(f"Backup file not found: {backup_path}")
@@ -143,42 +184,32 @@ class PostgreSQLBackup(BaseBackup):
         self.logger.info(f"Starting PostgreSQL restore from {backup_path.name} to {target_db}")
         
         try:
-            # Decompress if needed
-            restore_file = backup_path
-            temp_file = None
-            
-            if backup_path.suffix == '.gz':
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.backup')
-                self.decompress_file(backup_path, Path(temp_file.name))
-                restore_file = Path(temp_file.name)
-                temp_file.close()
-            
-            # Build pg_restore command
-            cmd = [
-                "pg_restore",
-                f"--host={self.host}",
-                f"--port={self.port}",
-                f"--username={self.username}",
-                "--verbose",
-                "--clean",  # Clean (drop) database objects before recreating
-                "--if-exists",  # Use IF EXISTS when dropping objects
-                f"--dbname={target_db}",
-                str(restore_file)
-            ]
-            
-            # Execute pg_restore
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                env=self.env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            # Cleanup temporary file
-            if temp_file:
-                Path(temp_file.name).unlink()
+            with tempfile.TemporaryDirectory(prefix=".restore_", dir=self.backup_dir) as work_dir:
+                restore_source = await self._prepare_dump(backup_path, Path(work_dir))
+                
+                # Build pg_restore command
+                cmd = [
+                    "pg_restore",
+                    f"--host={self.host}",
+                    f"--port={self.port}",
+                    f"--username={self.username}",
+                    "--verbose",
+                    "--clean",  # Clean (drop) database objects before recreating
+                    "--if-exists",  # Use IF EXISTS when dropping objects
+                    f"--jobs={self.jobs}",
+                    f"--dbname={target_db}",
+                    str(restore_source)
+                ]
+                
+                # Execute pg_restore
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    env=self.env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
                 error_msg = stderr.decode('utf-8') if stderr else "Unknown error"
@@ -199,33 +230,23 @@ class PostgreSQLBackup(BaseBackup):
             return False
         
         try:
-            # For custom format backups, use pg_restore --list to verify
-            restore_file = backup_path
-            temp_file = None
-            
-            if backup_path.suffix == '.gz':
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.backup')
-                self.decompress_file(backup_path, Path(temp_file.name))
-                restore_file = Path(temp_file.name)
-                temp_file.close()
-            
-            cmd = [
-                "pg_restore",
-                "--list",
-                str(restore_file)
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            # Cleanup temporary file
-            if temp_file:
-                Path(temp_file.name).unlink()
+            with tempfile.TemporaryDirectory(prefix=".verify_", dir=self.backup_dir) as work_dir:
+                # pg_restore --list reads the table of contents of either dump format
+                restore_source = await self._prepare_dump(backup_path, Path(work_dir), toc_only=True)
+                
+                cmd = [
+                    "pg_restore",
+                    "--list",
+                    str(restore_source)
+                ]
+                
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
             
             if process.returncode == 0 and stdout:
                 self.logger.info(f"Backup verification successful: {backup_path.name}")
@@ -12,14 +12,17 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from .base_backup import BaseBackup, BackupType, BackupStatus
+from .streaming import StreamStats
 
 class RedisBackup(BaseBackup):
     """Redis backup implementation using BGSAVE and AOF"""
     
     def __init__(self, backup_dir: Path, host: str = "localhost", 
                  port: int = 6379, password: Optional[str] = None,
-                 db: int = 0, compress: bool = True):
-        super().__init__("redis", backup_dir, compress)
+                 db: int = 0, compress: bool = True, compression: str = "zstd",
+                 compression_level: int = 3, compression_threads: int = 0):
+        super().__init__("redis", backup_dir, compress, compression,
+                         compression_level, compression_threads)
         
         self.host = host
         self.port = port
@@ -65,23 +68,18 @@ class RedisBackup(BaseBackup):
             
             if backup_type == BackupType.FULL:
                 # Use BGSAVE for full backup
-                await self._create_rdb_backup(redis, backup_path)
+                stats = await self._create_rdb_backup(redis, backup_path)
             else:
                 # Use AOF for incremental backup
-                await self._create_aof_backup(redis, backup_path)
-            
-            # Calculate file stats
-            file_size = self.get_file_size(backup_path)
-            checksum = self.calculate_checksum(backup_path)
+                stats = await self._create_aof_backup(redis, backup_path)
             
             result.update({
                 "status": BackupStatus.COMPLETED.value,
                 "completed_at": datetime.now(timezone.utc),
-                "file_size": file_size,
-                "checksum": checksum
+                **self.stream_result(stats, backup_path)
             })
             
-            self.logger.info(f"Redis backup completed: {backup_path.name} ({file_size} bytes)")
+            self.logger.info(f"Redis backup completed: {backup_path.name} ({stats.bytes_out} bytes)")
             
         except Exception as e:
             self.logger.error(f"Redis backup failed: {e}")
@@ -96,7 +94,7 @@ class RedisBackup(BaseBackup):
         
         return result
     
-    async def _create_rdb_backup(self, redis, backup_path: Path):
+    async def _create_rdb_backup(self, redis, backup_path: Path) -> StreamStats:
         """Create RDB backup using BGSAVE"""
         
         # Get Redis data directory
@@ -118,19 +116,13 @@ class RedisBackup(BaseBackup):
                 break
             await asyncio.sleep(0.5)
         
-        # Copy RDB file to backup location
+        # Stream RDB file to backup location (copy, compression and checksum in one pass)
         if rdb_path.exists():
-            if self.compress:
-                temp_path = backup_path.with_suffix('.tmp')
-                shutil.copy2(rdb_path, temp_path)
-                self.compress_file(temp_path, backup_path)
-                temp_path.unlink()
-            else:
-                shutil.copy2(rdb_path, backup_path)
+            return await self.stream_file_to_backup(rdb_path, backup_path)
         else:
             raise FileNotFoundError(f"RDB file not found: {rdb_path}")
     
-    async def _create_aof_backup(self, redis, backup_path: Path):
+    async def _create_aof_backup(self, redis, backup_path: Path) -> StreamStats:
         """Create AOF backup"""
         
         # Get Redis data directory
@@ -158,15 +150,9 @@ class RedisBackup(BaseBackup):
                 break
             await asyncio.sleep(0.5)
         
-        # Copy AOF file to backup location
+        # Stream AOF file to backup location (copy, compression and checksum in one pass)
         if aof_path.exists():
-            if self.compress:
-                temp_path = backup_path.with_suffix('.tmp')
-                shutil.copy2(aof_path, temp_path)
-                self.compress_file(temp_path, backup_path)
-                temp_path.unlink()
-            else:
-                shutil.copy2(aof_path, backup_path)
+            return await self.stream_file_to_backup(aof_path, backup_path)
         else:
             raise FileNotFoundError(f"AOF file not found: {aof_path}")
     
@@ -216,8 +202,8 @@ class RedisBackup(BaseBackup):
         await redis.flushall()
         
         # Decompress and copy backup file
-        if backup_path.suffix == '.gz':
-            self.decompress_file(backup_path, target_rdb_path)
+        if self.is_compressed(backup_path):
+            await asyncio.to_thread(self.decompress_file, backup_path, target_rdb_path)
         else:
             shutil.copy2(backup_path, target_rdb_path)
         
@@ -239,8 +225,8 @@ class RedisBackup(BaseBackup):
         await redis.flushall()
         
         # Decompress and copy backup file
-        if backup_path.suffix == '.gz':
-            self.decompress_file(backup_path, target_aof_path)
+        if self.is_compressed(backup_path):
+            await asyncio.to_thread(self.decompress_file, backup_path, target_aof_path)
         else:
             shutil.copy2(backup_path, target_aof_path)
         
@@ -260,9 +246,9 @@ class RedisBackup(BaseBackup):
             temp_file = None
             check_file = backup_path
             
-            if backup_path.suffix == '.gz':
+            if self.is_compressed(backup_path):
                 temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.rdb')
-                self.decompress_file(backup_path, Path(temp_file.name))
+                await asyncio.to_thread(self.decompress_file, backup_path, Path(temp_file.name))
                 check_file = Path(temp_file.name)
                 temp_file.close()
             
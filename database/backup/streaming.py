@@ -0,0 +1,335 @@
+"""
+Single-pass streaming pipeline for JARVIS AI backups
+
+Source (subprocess stdout, file or tar stream) -> compression -> SHA-256 -> backup file,
+in one pass and meant to run in a worker thread so the event loop is never blocked.
+Concurrent streams can share an IOBudget so backups never saturate the disk used by live traffic.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import signal
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+CODEC_EXTENSIONS = {
+    "zstd": ".zst",
+    "gzip": ".gz",
+    "none": ""
+}
+
+
+def resolve_codec(compress: bool, compression: str = "zstd") -> str:
+    """Pick the codec actually available for a compression setting"""
+    if not compress or compression == "none":
+        return "none"
+    if compression not in CODEC_EXTENSIONS:
+        raise ValueError(f"Unknown compression codec: {compression}")
+    if compression == "zstd" and not ZSTD_AVAILABLE:
+        logger.warning("zstandard not installed, falling back to gzip compression")
+        return "gzip"
+    return compression
+
+
+def detect_codec(path: Path) -> str:
+    """Codec of a backup file, from its extension"""
+    for codec, extension in CODEC_EXTENSIONS.items():
+        if extension and Path(path).name.endswith(extension):
+            return codec
+    return "none"
+
+
+@dataclass
+class StreamStats:
+    """Outcome of a streaming pass"""
+    codec: str
+    bytes_in: int
+    bytes_out: int
+    checksum: str
+    duration: float
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Source throughput in MB/s"""
+        return self.bytes_in / (1024 * 1024) / max(self.duration, 1e-9)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "throughput_mb_s": round(self.throughput_mb_s, 2),
+            "compression_ratio": round(self.bytes_in / self.bytes_out, 3) if self.bytes_out else None
+        }
+
+
+class IOBudget:
+    """
+    Token bucket shared by all concurrent backup streams (thread-safe).
+    Caps the aggregate source throughput: writers run in worker threads and sleep when over budget.
+    """
+
+    def __init__(self, bytes_per_second: float, burst_bytes: Optional[float] = None):
+        if bytes_per_second <= 0:
+            raise ValueError("I/O budget must be positive")
+        self.rate = float(bytes_per_second)
+        self.capacity = float(burst_bytes or bytes_per_second)  # one second of burst by default
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.bytes_consumed = 0
+        self.throttled_seconds = 0.0
+
+    @classmethod
+    def from_mb_s(cls, mb_per_second: Optional[float]) -> Optional["IOBudget"]:
+        """Budget from a MB/s setting (None or 0 = unlimited)"""
+        return cls(mb_per_second * 1024 * 1024) if mb_per_second else None
+
+    def consume(self, nbytes: int, block: bool = True) -> float:
+        """
+        Reserve `nbytes` and block until they fit in the budget; returns the wait.
+        With block=False the caller does the waiting (e.g. by pausing the process writing the bytes).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reservations may push the bucket into debt: later callers wait proportionally longer
+            self._tokens -= nbytes
+            self.bytes_consumed += nbytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.throttled_seconds += wait
+        if wait > 0 and block:
+            time.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mb_per_second": round(self.rate / (1024 * 1024), 2),
+            "bytes_consumed": self.bytes_consumed,
+            "throttled_seconds": round(self.throttled_seconds, 3)
+        }
+
+
+def directory_size(path: Path) -> int:
+    """Bytes currently held by the files under `path` (0 before it exists)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # removed or renamed by the writing tool meanwhile
+    return total
+
+
+def pause_process_group(pid: int, paused: bool) -> None:
+    """Stop or resume a tool started in its own session, worker processes included (POSIX only)"""
+    if os.name != "posix":
+        return
+    try:
+        os.killpg(pid, signal.SIGSTOP if paused else signal.SIGCONT)
+    except ProcessLookupError:
+        pass
+
+
+def low_priority(niceness: int):
+    """preexec_fn lowering the CPU priority of a dump subprocess (no-op outside POSIX)"""
+    if niceness <= 0 or os.name != "posix":
+        return None
+    return lambda: os.nice(niceness)
+
+
+class _HashingSink:
+    """Final stage: hash and write the bytes that land on disk"""
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.bytes_out = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.file.write(data)
+        self.bytes_out += len(data)
+        return len(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+class BackupWriter:
+    """
+    Writable stream producing a backup file: compresses, hashes the output and writes it in one pass.
+    Usable directly as `fileobj` (e.g. tarfile in "w|" mode).
+    """
+
+    def __init__(self, target_path: Path, codec: str = "zstd",
+                 level: int = 3, threads: int = 0,
+                 io_budget: Optional[IOBudget] = None):
+        self.target_path = Path(target_path)
+        self.codec = codec
+        self.io_budget = io_budget
+        self.bytes_in = 0
+        self.closed = False
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._file = open(self.target_path, "wb")
+        self._sink = _HashingSink(self._file)
+
+        if codec == "zstd":
+            compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+            self._stream = compressor.stream_writer(self._sink, closefd=False)
+        elif codec == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._sink, mode="wb", compresslevel=min(max(level, 1), 9))
+        else:
+            self._stream = None
+
+    def write(self, data) -> int:
+        if self.io_budget is not None:
+            self.io_budget.consume(len(data))
+        self.bytes_in += len(data)
+        if self._stream is None:
+            return self._sink.write(data)
+        self._stream.write(data)
+        return len(data)
+
+    def flush(self):
+        pass  # Compression frames are only flushed on close
+
+    def close(self) -> StreamStats:
+        if not self.closed:
+            self.closed = True
+            try:
+                if self._stream is not None:
+                    self._stream.close()
+                self._sink.flush()
+            finally:
+                self._file.close()
+                self._finished = time.perf_counter()
+        return self.stats()
+
+    def abort(self):
+        """Close and remove a partially written backup"""
+        try:
+            self.close()
+        except Exception:
+            pass
+        self.target_path.unlink(missing_ok=True)
+
+    def stats(self) -> StreamStats:
+        return StreamStats(
+            codec=self.codec,
+            bytes_in=self.bytes_in,
+            bytes_out=self._sink.bytes_out,
+            checksum=self._sink.sha256.hexdigest(),
+            duration=(self._finished or time.perf_counter()) - self._started
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def copy_stream(source: BinaryIO, writer: BackupWriter) -> None:
+    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+        writer.write(chunk)
+
+
+def stream_file(source_path: Path, target_path: Path, codec: str,
+                level: int = 3, threads: int = 0,
+                io_budget: Optional[IOBudget] = None) -> StreamStats:
+    """Copy a file into a backup in one pass (blocking: run in a worker thread)"""
+    with open(source_path, "rb") as source, \
+            BackupWriter(target_path, codec, level, threads, io_budget) as writer:
+        copy_stream(source, writer)
+    return writer.stats()
+
+
+def stream_directory(source_dir: Path, target_path: Path, codec: str,
+                     level: int = 3, threads: int = 0,
+                     io_budget: Optional[IOBudget] = None) -> StreamStats:
+    """Tar a directory into a backup in one pass (blocking: run in a worker thread)"""
+    with BackupWriter(target_path, codec, level, threads, io_budget) as writer:
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            tar.add(source_dir, arcname=".")
+    return writer.stats()
+
+
+def extract_archive(archive_path: Path, extract_dir: Path,
+                    members: Optional[List[str]] = None) -> None:
+    """
+    Stream-extract a tar backup (plain, gzip or zstd) in one pass (blocking: run in a worker thread).
+    With `members`, only those entries are written out but the whole archive is still read.
+    """
+    wanted = {f"./{name}" for name in members} if members is not None else None
+    with open_backup(archive_path) as stream, tarfile.open(fileobj=stream, mode="r|") as tar:
+        for member in tar:
+            if wanted is not None and member.name not in wanted:
+                continue
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, extract_dir, filter="data")
+            else:
+                tar.extract(member, extract_dir)
+
+
+def stream_command(cmd: List[str], target_path: Path, codec: str,
+                   env: Optional[Dict[str, str]] = None,
+                   level: int = 3, threads: int = 0,
+                   io_budget: Optional[IOBudget] = None,
+                   niceness: int = 0) -> StreamStats:
+    """
+    Pipe a dump command's stdout into a backup in one pass (blocking: run in a worker thread).
+    stderr is spooled to a temp file so a verbose command can never stall on a full pipe.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, env=env, stdout=subprocess.PIPE, stderr=stderr,
+                                   preexec_fn=low_priority(niceness))
+        try:
+            with BackupWriter(target_path, codec, level, threads, io_budget) as writer:
+                copy_stream(process.stdout, writer)
+                returncode = process.wait()
+                if returncode != 0:
+                    stderr.seek(0)
+                    error = stderr.read().decode("utf-8", errors="replace").strip() or "Unknown error"
+                    raise RuntimeError(f"{Path(cmd[0]).name} failed ({returncode}): {error[-2000:]}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+    return writer.stats()
+
+
+def open_backup(path: Path) -> BinaryIO:
+    """Open a backup file for reading, decompressing on the fly according to its extension"""
+    codec = detect_codec(path)
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read .zst backups")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
@@ -54,6 +54,11 @@ def load_config() -> Dict[str, Any]:
             },
             "chromadb": {
                 "persist_dir": settings.get('CHROMA_PERSIST_DIRECTORY', './memory/chroma')
+            },
+            "full_backup": {
+                "max_concurrent": 2,
+                "io_budget_mb_s": None,
+                "niceness": 10
             }
         }
     }
@@ -115,6 +120,12 @@ def create(ctx, service, backup_type, output):
                 click.echo(f"  - Total services: {result['total_services']}")
                 click.echo(f"  - Successful: {result['successful']}")
                 click.echo(f"  - Failed: {result['failed']}")
+                click.echo(f"  - Wall time: {result['wall_time_seconds']:.1f}s "
+                           f"(sequential: {result['sequential_time_seconds']:.1f}s)")
+                
+                for name, timing in result['services'].items():
+                    click.echo(f"  - {name}: {timing['status']} in {timing['wall_time_seconds']:.1f}s, "
+                               f"{timing['bytes_per_second'] / (1024 * 1024):.1f} MB/s")
                 
                 if result['errors']:
                     click.echo("Errors:")
@@ -474,6 +485,7 @@ def cleanup(ctx, category, dry_run):
                         click.echo(f"   Records processed: {result['total_processed']}")
                         click.echo(f"   Archived: {result['archived']}")
                         click.echo(f"   Deleted: {result['deleted']}")
+                        click.echo(f"   Batches: {result['batches']} ({result['rows_per_second']} rows/s)")
                     else:
                         click.echo(f"❌ Policy execution failed")
                         for error in result.get('errors', []):
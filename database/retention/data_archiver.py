@@ -1,71 +1,518 @@
 """
 Data archiver for JARVIS AI
 Handles archiving of old data to compressed storage
+
+Archives are written batch by batch to a JSON Lines journal: each batch is appended as its own
+gzip member and synced to disk, so rows are archived durably before the batch that deletes them commits.
+When the archive is closed the journal is rewritten as Parquet (pyarrow, zstd) whose footer carries
+an index (row count, time range, per-column min/max): listing and stats read only footers, and restores
+skip the row groups and archives that cannot match. Without pyarrow archives stay in JSON Lines.
+Legacy single-document `.json.gz` archives remain readable.
 """
 
+import asyncio
 import json
 import gzip
 import logging
-from datetime import datetime, timezone
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import uuid
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+ARCHIVE_EXTENSIONS = (".parquet", ".jsonl.gz", ".json.gz")
+ARCHIVE_FORMATS = ("parquet", "jsonl")
+
+# Header and trailer lines of JSON Lines archives (never valid column names)
+METADATA_KEY = "@metadata"
+SUMMARY_KEY = "@summary"
+
+# Parquet schema metadata holding the archive metadata and summary (with its index)
+FOOTER_KEY = b"jarvis.archive"
+
+TIME_COLUMN = "created_at"
+ROW_GROUP_SIZE = 50000
+
+def resolve_archive_format(archive_format: str = "parquet") -> str:
+    """Pick the archive format actually available"""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format: {archive_format}")
+    if archive_format == "parquet" and not PYARROW_AVAILABLE:
+        logger.warning("pyarrow not installed, falling back to JSON Lines archives")
+        return "jsonl"
+    return archive_format
+
+def _line_kind(line: Dict[str, Any]) -> str:
+    if len(line) == 1:
+        if METADATA_KEY in line:
+            return "metadata"
+        if SUMMARY_KEY in line:
+            return "summary"
+    return "record"
+
+def _read_jsonl(archive_path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+        try:
+            for raw_line in f:
+                line = json.loads(raw_line)
+                kind = _line_kind(line)
+                yield kind, line if kind == "record" else next(iter(line.values()))
+        except EOFError:
+            # Interrupted run: every completed batch is still readable
+            logger.warning(f"Archive {archive_path.name} is truncated after its last complete batch")
+
+def _as_utc(value: Any) -> Any:
+    """Timestamps (datetime, date or ISO string) as aware UTC datetimes; naive ones are taken as UTC"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value
+
+def _value_kind(value: Any) -> Optional[str]:
+    """Storage kind of a record value (None for NULL)"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, (str, uuid.UUID, Decimal)):
+        return "string"
+    if isinstance(value, datetime):
+        return "timestamp" if value.tzinfo else "timestamp_naive"
+    if isinstance(value, date):
+        return "date"
+    return "json"
+
+class _ColumnIndex:
+    """Kind, null count and min/max of one column, gathered while batches are written"""
+
+    def __init__(self):
+        self.kinds = set()
+        self.non_null = 0
+        self.ordered = True
+        self.min = None
+        self.max = None
+
+    def update(self, value: Any):
+        kind = _value_kind(value)
+        if kind is None:
+            return
+        self.non_null += 1
+        self.kinds.add(kind)
+        if kind == "json" or not self.ordered:
+            return
+        if kind == "string":
+            value = str(value)
+        elif kind == "timestamp":
+            value = value.astimezone(timezone.utc)
+        try:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        except TypeError:
+            self.ordered = False
+
+    @property
+    def kind(self) -> str:
+        if len(self.kinds) == 1:
+            return next(iter(self.kinds))
+        if self.kinds == {"int", "float"}:
+            return "float"
+        # Only NULLs, or values of several kinds: stored as JSON text
+        return "json"
+
+    def to_index(self, row_count: int) -> Dict[str, Any]:
+        kind = self.kind
+        ranged = self.ordered and kind != "json"
+        return {
+            "kind": kind,
+            "null_count": row_count - self.non_null,
+            "min": _index_value(self.min) if ranged else None,
+            "max": _index_value(self.max) if ranged else None
+        }
+
+def _index_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def _parse_index_value(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind in ("timestamp", "timestamp_naive", "date"):
+        return _as_utc(value)
+    return value
+
+if PYARROW_AVAILABLE:
+    ARROW_TYPES = {
+        "bool": pa.bool_(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "timestamp_naive": pa.timestamp("us"),
+        "date": pa.date32(),
+        "json": pa.string()
+    }
+
+def _from_journal(kind: str, value: Any) -> Any:
+    """Typed column value from its JSON Lines form (timestamps and dates were written as strings)"""
+    if value is None:
+        return None
+    if kind in ("timestamp", "timestamp_naive"):
+        return datetime.fromisoformat(value)
+    if kind == "date":
+        return date.fromisoformat(value)
+    if kind == "json":
+        return json.dumps(value, separators=(',', ':'))
+    return value
+
+@dataclass
+class RecordFilter:
+    """
+    Restore predicate: a time range on `time_column` (start inclusive, end exclusive)
+    and/or accepted values per column, e.g. {"user_id": 42} or {"user_id": [1, 2]}
+    """
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    where: Dict[str, Any] = field(default_factory=dict)
+    time_column: str = TIME_COLUMN
+
+    def __post_init__(self):
+        self.start_time = _as_utc(self.start_time)
+        self.end_time = _as_utc(self.end_time)
+        self.accepted = {
+            column: [self._normalize(v) for v in (values if isinstance(values, (list, tuple, set)) else [values])]
+            for column, values in self.where.items()
+        }
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        return str(value) if isinstance(value, (uuid.UUID, Decimal)) else value
+
+    @property
+    def active(self) -> bool:
+        return bool(self.start_time or self.end_time or self.accepted)
+
+    def may_match(self, bounds: Dict[str, Tuple[Any, Any]]) -> bool:
+        """Whether a block (archive or row group) whose columns span `bounds` (min, max) can hold a match"""
+        try:
+            if (self.start_time or self.end_time) and bounds.get(self.time_column):
+                low, high = (_as_utc(v) for v in bounds[self.time_column])
+                if self.start_time and high is not None and high < self.start_time:
+                    return False
+                if self.end_time and low is not None and low >= self.end_time:
+                    return False
+            for column, accepted in self.accepted.items():
+                low, high = bounds.get(column) or (None, None)
+                if low is not None and high is not None and not any(low <= v <= high for v in accepted):
+                    return False
+        except TypeError:
+            pass  # Bounds not comparable with the predicate: the block has to be read
+        return True
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if self.start_time or self.end_time:
+            value = _as_utc(record.get(self.time_column))
+            if not isinstance(value, datetime):
+                return False
+            if self.start_time and value < self.start_time:
+                return False
+            if self.end_time and value >= self.end_time:
+                return False
+        return all(self._normalize(record.get(column)) in accepted for column, accepted in self.accepted.items())
+
+def _index_bounds(index: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    return {
+        name: (_parse_index_value(column["kind"], column["min"]), _parse_index_value(column["kind"], column["max"]))
+        for name, column in index.get("columns", {}).items()
+        if column.get("min") is not None
+    }
+
+def _row_group_bounds(row_group, json_columns: List[str]) -> Dict[str, Tuple[Any, Any]]:
+    """Parquet min/max per column; JSON text columns are left out, their order is not the values' order"""
+    bounds = {}
+    for i in range(row_group.num_columns):
+        column = row_group.column(i)
+        statistics = column.statistics
+        if column.path_in_schema in json_columns:
+            continue
+        if statistics is not None and statistics.has_min_max:
+            bounds[column.path_in_schema] = (statistics.min, statistics.max)
+    return bounds
+
+class ArchiveWriter:
+    """
+    Streamed archive: batches go to a JSON Lines journal (an @metadata line, record lines per batch,
+    an @summary line on close). With the parquet format the complete journal is rewritten as Parquet on close.
+    """
+
+    def __init__(self, path: Path, metadata: Dict[str, Any], compresslevel: int = 6,
+                 archive_format: str = "jsonl", row_group_size: int = ROW_GROUP_SIZE):
+        self.path = Path(path)
+        self.metadata = metadata
+        self.compresslevel = compresslevel
+        self.archive_format = archive_format
+        self.row_group_size = row_group_size
+        self.record_count = 0
+        self.batches = 0
+        self.closed = False
+        self.columns: Dict[str, _ColumnIndex] = {}
+        self._file = open(self.path, 'ab')
+        self._append([{METADATA_KEY: metadata}])
+
+    def _append(self, lines: List[Dict[str, Any]]) -> int:
+        payload = "".join(json.dumps(line, default=str, separators=(',', ':')) + "\n" for line in lines)
+        member = gzip.compress(payload.encode('utf-8'), compresslevel=self.compresslevel)
+        self._file.write(member)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return len(member)
+
+    def write_batch_sync(self, records: List[Dict[str, Any]]) -> int:
+        """Append one batch as a gzip member and sync it; returns compressed bytes written"""
+        if not records:
+            return 0
+        written = self._append(records)
+        self.record_count += len(records)
+        self.batches += 1
+        for record in records:
+            for name, value in record.items():
+                column = self.columns.get(name)
+                if column is None:
+                    column = self.columns[name] = _ColumnIndex()
+                column.update(value)
+        return written
+
+    async def write_batch(self, records: List[Dict[str, Any]]) -> int:
+        """Append one batch on a worker thread (serialization and fsync stay off the event loop)"""
+        return await asyncio.to_thread(self.write_batch_sync, records)
+
+    def index(self) -> Dict[str, Any]:
+        """Footer index: row count, time range and per-column kind, null count and min/max"""
+        columns = {name: column.to_index(self.record_count) for name, column in self.columns.items()}
+        time_column = columns.get(self.metadata.get("time_column", TIME_COLUMN))
+        return {
+            "row_count": self.record_count,
+            "time_range": {"start": time_column["min"], "end": time_column["max"]}
+            if time_column and time_column["min"] is not None else None,
+            "columns": columns
+        }
+
+    def close_sync(self) -> Path:
+        if not self.closed:
+            self.closed = True
+            summary = {
+                "record_count": self.record_count,
+                "batches": self.batches,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+                "index": self.index()
+            }
+            try:
+                self._append([{SUMMARY_KEY: summary}])
+            finally:
+                self._file.close()
+
+            if self.archive_format == "parquet" and self.record_count:
+                try:
+                    self.path = self._write_parquet(summary)
+                except Exception as e:
+                    # The journal is complete and synced: it stays the archive
+                    logger.warning(f"Parquet conversion of {self.path.name} failed, kept as JSON Lines: {e}")
+        return self.path
+
+    async def close(self) -> Path:
+        return await asyncio.to_thread(self.close_sync)
+
+    def _write_parquet(self, summary: Dict[str, Any]) -> Path:
+        """Rewrite the complete journal as Parquet, one row group per `row_group_size` records, then drop it"""
+        target = self.path.with_name(self.path.name[:-len(".jsonl.gz")] + ".parquet")
+        partial = target.with_name(target.name + ".partial")
+        kinds = {name: column["kind"] for name, column in summary["index"]["columns"].items()}
+        footer = {"metadata": {**self.metadata, "format": "parquet"}, "summary": summary}
+        schema = pa.schema(
+            [(name, ARROW_TYPES[kind]) for name, kind in kinds.items()],
+            metadata={FOOTER_KEY: json.dumps(footer, default=str)}
+        )
+
+        def write_row_group(writer, records):
+            writer.write_table(pa.Table.from_pydict(
+                {name: [_from_journal(kind, record.get(name)) for record in records] for name, kind in kinds.items()},
+                schema=schema
+            ))
+
+        try:
+            with open(partial, 'wb') as f:
+                writer = pq.ParquetWriter(f, schema, compression="zstd")
+                try:
+                    records = []
+                    for kind, payload in _read_jsonl(self.path):
+                        if kind != "record":
+                            continue
+                        records.append(payload)
+                        if len(records) >= self.row_group_size:
+                            write_row_group(writer, records)
+                            records = []
+                    if records:
+                        write_row_group(writer, records)
+                finally:
+                    writer.close()
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, target)
+        except Exception:
+            partial.unlink(missing_ok=True)
+            raise
+
+        self.path.unlink()
+        return target
+
+    @property
+    def size_bytes(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
 class DataArchiver:
     """Handles data archiving operations"""
     
-    def __init__(self, archive_dir: Path):
+    def __init__(self, archive_dir: Path, archive_format: str = "parquet",
+                 row_group_size: int = ROW_GROUP_SIZE):
         self.archive_dir = Path(archive_dir)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_format = resolve_archive_format(archive_format)
+        self.row_group_size = row_group_size
     
-    async def archive_records(self, table_name: str, records: List[Dict[str, Any]],
-                            metadata: Optional[Dict[str, Any]] = None) -> Path:
-        """Archive records to compressed JSON file"""
-        
-        if not records:
-            raise ValueError("No records to archive")
+    def open_archive(self, table_name: str, metadata: Optional[Dict[str, Any]] = None) -> ArchiveWriter:
+        """Start a streamed archive for a table; batches are appended with ArchiveWriter.write_batch"""
         
         # Generate archive filename
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         archive_id = str(uuid.uuid4())[:8]
-        filename = f"{table_name}_{timestamp}_{archive_id}.json.gz"
+        filename = f"{table_name}_{timestamp}_{archive_id}.jsonl.gz"
         
         archive_path = self.archive_dir / table_name
         archive_path.mkdir(exist_ok=True)
         
-        full_path = archive_path / filename
-        
-        # Prepare archive data
-        archive_data = {
-            "metadata": {
-                "table_name": table_name,
-                "archived_at": datetime.now(timezone.utc).isoformat(),
-                "record_count": len(records),
-                "archive_id": archive_id,
-                **(metadata or {})
-            },
-            "records": records
-        }
+        return ArchiveWriter(archive_path / filename, {
+            "table_name": table_name,
+            "archived_at": datetime.now(timezone.utc).isoformat(),
+            "archive_id": archive_id,
+            "format": "jsonl",
+            "time_column": TIME_COLUMN,
+            **(metadata or {})
+        }, archive_format=self.archive_format, row_group_size=self.row_group_size)
+    
+    async def archive_records(self, table_name: str, records: List[Dict[str, Any]],
+                            metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """Archive records to a Parquet (or compressed JSON Lines) file"""
+        
+        if not records:
+            raise ValueError("No records to archive")
+        
+        writer = self.open_archive(table_name, metadata)
+        try:
+            await writer.write_batch(records)
+        finally:
+            await writer.close()
+        
+        logger.info(f"Archived {len(records)} records from {table_name} to {writer.path.name}")
+        
+        return writer.path
+    
+    def read_archive(self, archive_path: Path,
+                     record_filter: Optional[RecordFilter] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream an archive as (kind, payload) pairs: ("metadata", ...), ("record", ...) for each
+        record, then ("summary", ...). Legacy .json.gz archives are yielded in the same shape.
+        With a filter only matching records are yielded; Parquet row groups that cannot match are not read.
+        """
+        
+        if archive_path.name.endswith(".parquet"):
+            yield from self._read_parquet(archive_path, record_filter)
+            return
+        
+        if archive_path.name.endswith(".jsonl.gz"):
+            lines = _read_jsonl(archive_path)
+        else:
+            with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+                archive_data = json.load(f)
+            lines = [("metadata", archive_data["metadata"])]
+            lines += [("record", record) for record in archive_data["records"]]
+            lines.append(("summary", {"record_count": len(archive_data["records"])}))
         
-        # Write compressed JSON
-        with gzip.open(full_path, 'wt', encoding='utf-8') as f:
-            json.dump(archive_data, f, indent=2, default=str)
+        for kind, payload in lines:
+            if kind != "record" or record_filter is None or record_filter.matches(payload):
+                yield kind, payload
+    
+    def _read_parquet(self, archive_path: Path,
+                      record_filter: Optional[RecordFilter]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required to read .parquet archives")
         
-        logger.info(f"Archived {len(records)} records from {table_name} to {filename}")
+        parquet_file = pq.ParquetFile(archive_path)
+        footer = json.loads(parquet_file.schema_arrow.metadata[FOOTER_KEY])
+        json_columns = [
+            name for name, column in footer["summary"]["index"]["columns"].items() if column["kind"] == "json"
+        ]
         
-        return full_path
+        yield "metadata", footer["metadata"]
+        for i in range(parquet_file.num_row_groups):
+            if record_filter is not None and not record_filter.may_match(
+                    _row_group_bounds(parquet_file.metadata.row_group(i), json_columns)):
+                continue
+            for record in parquet_file.read_row_group(i).to_pylist():
+                for name in json_columns:
+                    if record[name] is not None:
+                        record[name] = json.loads(record[name])
+                if record_filter is None or record_filter.matches(record):
+                    yield "record", record
+        yield "summary", footer["summary"]
     
-    async def restore_from_archive(self, archive_path: Path) -> Dict[str, Any]:
-        """Restore records from archive file"""
+    def iter_archive_records(self, archive_path: Path,
+                             record_filter: Optional[RecordFilter] = None) -> Iterator[Dict[str, Any]]:
+        """Stream the records of an archive without loading it whole"""
+        for kind, payload in self.read_archive(archive_path, record_filter):
+            if kind == "record":
+                yield payload
+    
+    async def restore_from_archive(self, archive_path: Path,
+                                   start_time: Optional[datetime] = None,
+                                   end_time: Optional[datetime] = None,
+                                   where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Restore records from archive file, optionally only those in [start_time, end_time)
+        and matching `where` (column -> accepted value or values)
+        """
         
         if not archive_path.exists():
             raise FileNotFoundError(f"Archive file not found: {archive_path}")
         
+        record_filter = RecordFilter(start_time, end_time, where or {})
+        
         try:
-            with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
-                archive_data = json.load(f)
+            archive_data = await asyncio.to_thread(
+                self._load_archive, archive_path, record_filter if record_filter.active else None
+            )
             
             logger.info(f"Restored {archive_data['metadata']['record_count']} records from {archive_path.name}")
             
@@ -75,6 +522,75 @@ class DataArchiver:
             logger.error(f"Failed to restore from archive {archive_path}: {e}")
             raise
     
+    async def restore_range(self, table_name: str,
+                            start_time: Optional[datetime] = None,
+                            end_time: Optional[datetime] = None,
+                            where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Restore the records of a table in [start_time, end_time) and matching `where` across all its archives.
+        Archives whose footer index rules them out are never opened.
+        """
+        
+        record_filter = RecordFilter(start_time, end_time, where or {})
+        return await asyncio.to_thread(self._restore_range, table_name, record_filter)
+    
+    def _restore_range(self, table_name: str, record_filter: RecordFilter) -> Dict[str, Any]:
+        records = []
+        archives_read = []
+        archives_skipped = 0
+        
+        for archive in sorted(self.list_archives(table_name), key=lambda a: a["created_at"]):
+            if archive["index"] and not record_filter.may_match(_index_bounds(archive["index"])):
+                archives_skipped += 1
+                continue
+            records.extend(self.iter_archive_records(Path(archive["path"]), record_filter))
+            archives_read.append(archive["filename"])
+        
+        logger.info(f"Restored {len(records)} {table_name} records from {len(archives_read)} archives "
+                    f"({archives_skipped} skipped by their index)")
+        
+        return {
+            "table_name": table_name,
+            "records": records,
+            "archives_read": archives_read,
+            "archives_skipped": archives_skipped
+        }
+    
+    def _load_archive(self, archive_path: Path, record_filter: Optional[RecordFilter] = None) -> Dict[str, Any]:
+        metadata = {}
+        records = []
+        for kind, payload in self.read_archive(archive_path, record_filter):
+            if kind == "record":
+                records.append(payload)
+            else:
+                metadata.update(payload)
+        
+        metadata["record_count"] = len(records)
+        return {"metadata": metadata, "records": records}
+    
+    def _archive_metadata(self, archive_file: Path) -> Dict[str, Any]:
+        """Metadata of an archive: Parquet footer only, or read as a stream up to the JSON Lines summary"""
+        if archive_file.name.endswith(".parquet"):
+            if not PYARROW_AVAILABLE:
+                raise RuntimeError("pyarrow is required to read .parquet archives")
+            footer = json.loads(pq.read_schema(archive_file).metadata[FOOTER_KEY])
+            return {**footer["metadata"], **footer["summary"]}
+        
+        metadata = {}
+        record_count = 0
+        for kind, payload in self.read_archive(archive_file):
+            if kind == "record":
+                record_count += 1
+            elif kind == "summary":
+                metadata.update(payload)
+                return metadata
+            else:
+                metadata.update(payload)
+        
+        # No summary: archive of an interrupted run
+        metadata.update({"record_count": record_count, "incomplete": True})
+        return metadata
+    
     def list_archives(self, table_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """List available archive files"""
         
@@ -89,21 +605,19 @@ class DataArchiver:
             if not archive_dir.exists():
                 continue
             
-            for archive_file in archive_dir.glob("*.json.gz"):
+            archive_files = [f for f in archive_dir.iterdir() if f.name.endswith(ARCHIVE_EXTENSIONS)]
+            
+            for archive_file in archive_files:
+                # Journal left behind by a run interrupted right after its Parquet conversion
+                if archive_file.name.endswith(".jsonl.gz") and \
+                        archive_file.with_name(archive_file.name[:-len(".jsonl.gz")] + ".parquet").exists():
+                    continue
+                
                 stat = archive_file.stat()
                 
-                # Try to extract metadata without fully loading the file
                 try:
-                    with gzip.open(archive_file, 'rt', encoding='utf-8') as f:
-                        # Read just the beginning to get metadata
-                        content = f.read(1024)
-                        if '"metadata"' in content:
-                            f.seek(0)
-                            data = json.load(f)
-                            metadata = data.get('metadata', {})
-                        else:
-                            metadata = {}
-                except:
+                    metadata = self._archive_metadata(archive_file)
+                except Exception:
                     metadata = {}
                 
                 archives.append({
@@ -115,7 +629,11 @@ class DataArchiver:
                     "modified_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
                     "record_count": metadata.get('record_count', 0),
                     "archived_at": metadata.get('archived_at'),
-                    "archive_id": metadata.get('archive_id')
+                    "archive_id": metadata.get('archive_id'),
+                    "format": metadata.get('format', 'json'),
+                    "incomplete": metadata.get('incomplete', False),
+                    "time_range": metadata.get('index', {}).get('time_range'),
+                    "index": metadata.get('index')
                 })
         
         # Sort by creation time (newest first)
@@ -131,6 +649,7 @@ class DataArchiver:
             "total_size_bytes": 0,
             "total_records": 0,
             "tables": {},
+            "formats": {},
             "oldest_archive": None,
             "newest_archive": None
         }
@@ -154,7 +673,9 @@ class DataArchiver:
                     "total_size_bytes": 0,
                     "total_records": 0,
                     "oldest_archive": None,
-                    "newest_archive": None
+                    "newest_archive": None,
+                    "data_start": None,
+                    "data_end": None
                 }
             
             table_stats = stats["tables"][table_name]
@@ -168,6 +689,15 @@ class DataArchiver:
             if not table_stats["newest_archive"] or archive["created_at"] > datetime.fromisoformat(table_stats["newest_archive"].replace('Z', '+00:00')):
                 table_stats["newest_archive"] = archive["created_at"].isoformat()
             
+            # Time span of the archived rows, from the footer indexes
+            time_range = archive["time_range"]
+            if time_range:
+                if not table_stats["data_start"] or time_range["start"] < table_stats["data_start"]:
+                    table_stats["data_start"] = time_range["start"]
+                if not table_stats["data_end"] or time_range["end"] > table_stats["data_end"]:
+                    table_stats["data_end"] = time_range["end"]
+            
+            stats["formats"][archive["format"]] = stats["formats"].get(archive["format"], 0) + 1
             stats["total_size_bytes"] += archive["size_bytes"]
             stats["total_records"] += archive["record_count"]
         
@@ -196,27 +726,35 @@ class DataArchiver:
         return deleted_files
     
     def verify_archive(self, archive_path: Path) -> bool:
-        """Verify archive file integrity"""
+        """Verify archive file integrity (streamed, never loaded whole)"""
         
         try:
-            with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
-                data = json.load(f)
+            metadata = None
+            summary = None
+            record_count = 0
             
-            # Basic validation
-            if 'metadata' not in data or 'records' not in data:
-                return False
+            for kind, payload in self.read_archive(archive_path):
+                if metadata is None:
+                    if kind != "metadata":
+                        return False
+                    metadata = payload
+                elif kind == "summary":
+                    summary = payload
+                else:
+                    record_count += 1
             
-            metadata = data['metadata']
-            records = data['records']
+            # An interrupted archive has no summary: its records are readable but not complete
+            if metadata is None or summary is None:
+                return False
             
             # Check record count matches metadata
-            if metadata.get('record_count') != len(records):
+            if summary.get('record_count') != record_count:
                 return False
             
             # Check required metadata fields
-            required_fields = ['table_name', 'archived_at', 'record_count']
-            for field in required_fields:
-                if field not in metadata:
+            required_fields = ['table_name', 'archived_at']
+            for required_field in required_fields:
+                if required_field not in metadata:
                     return False
             
             return True
@@ -1,26 +1,35 @@
 """
 Data retention manager for JARVIS AI
 Executes retention policies and manages data lifecycle
+
+Rules run in keyset batches (`id > last_id ORDER BY id LIMIT n`), each batch in its own short
+transaction, so memory stays bounded by the batch size and locks are only held per batch.
 """
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Sequence
 from pathlib import Path
 import asyncpg
 import json
 
 from .retention_policies import RetentionPolicy, RetentionRule, RetentionAction, DataCategory, RetentionPolicyBuilder
-from .data_archiver import DataArchiver
+from .data_archiver import ArchiveWriter, DataArchiver
 
 logger = logging.getLogger(__name__)
 
+# Log progress every N batches
+PROGRESS_LOG_INTERVAL = 10
+
 class RetentionManager:
     """Manages data retention policies and execution"""
     
     def __init__(self, database_url: str, archive_dir: Path,
-                 policies: Optional[Dict[DataCategory, RetentionPolicy]] = None):
+                 policies: Optional[Dict[DataCategory, RetentionPolicy]] = None,
+                 batch_size: int = 5000, batch_pause_seconds: float = 0.0,
+                 archive_format: str = "parquet"):
         self.database_url = database_url
         self.archive_dir = Path(archive_dir)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
@@ -29,11 +38,16 @@ class RetentionManager:
         self.policies = policies or RetentionPolicyBuilder.get_default_policies()
         
         # Initialize archiver
-        self.archiver = DataArchiver(self.archive_dir)
+        self.archiver = DataArchiver(self.archive_dir, archive_format)
+        
+        # Batching: rows per transaction, and an optional pause between batches to let live traffic through
+        self.batch_size = max(batch_size, 1)
+        self.batch_pause_seconds = batch_pause_seconds
         
         # Statistics
         self.last_run = None
         self.execution_stats = {}
+        self.progress: Dict[str, Dict[str, Any]] = {}  # Live progress per policy
     
     async def execute_all_policies(self) -> Dict[str, Any]:
         """Execute all enabled retention policies"""
@@ -86,6 +100,7 @@ class RetentionManager:
             'total_policies': len(self.policies),
             'successful_policies': sum(1 for r in results.values() if r.get('success', False)),
             'total_records_processed': total_processed,
+            'total_batches': sum(r.get('batches', 0) for r in results.values()),
             'total_errors': total_errors,
             'policy_results': results
         }
@@ -114,9 +129,14 @@ class RetentionManager:
             'deleted': 0,
             'compressed': 0,
             'anonymized': 0,
+            'batches': 0,
+            'archived_bytes': 0,
+            'archive_files': [],
             'errors': []
         }
         
+        started = time.perf_counter()
+        
         # Sort rules by priority (higher priority first)
         sorted_rules = sorted(policy.rules, key=lambda r: r.priority, reverse=True)
         
@@ -131,6 +151,10 @@ class RetentionManager:
                 
                 result['rules_executed'] += 1
                 result['total_processed'] += rule_result['processed']
+                result['batches'] += rule_result['batches']
+                result['archived_bytes'] += rule_result['archived_bytes']
+                if rule_result.get('archive_file'):
+                    result['archive_files'].append(rule_result['archive_file'])
                 
                 # Update action counters
                 if rule.action == RetentionAction.ARCHIVE:
@@ -151,99 +175,188 @@ class RetentionManager:
                 result['errors'].append(error_msg)
                 result['success'] = False
         
+        result['duration_seconds'] = round(time.perf_counter() - started, 3)
+        result['rows_per_second'] = round(result['total_processed'] / max(result['duration_seconds'], 1e-3), 1)
+        
         return result
     
     async def _execute_rule(self, conn: asyncpg.Connection, 
                           policy: RetentionPolicy, rule: RetentionRule) -> Dict[str, Any]:
         """Execute a single retention rule"""
         
-        result = {'processed': 0, 'error': None}
+        result = {
+            'processed': 0,
+            'batches': 0,
+            'archived_bytes': 0,
+            'archive_file': None,
+            'error': None
+        }
+        started = time.perf_counter()
         
         try:
+            # Batched rules update `result` as batches commit: a failure keeps the committed count
             if rule.action == RetentionAction.DELETE:
-                result['processed'] = await self._execute_delete_rule(conn, policy, rule)
+                result['processed'] = await self._execute_delete_rule(conn, policy, rule, result)
             
             elif rule.action == RetentionAction.ARCHIVE:
-                result['processed'] = await self._execute_archive_rule(conn, policy, rule)
+                result['processed'] = await self._execute_archive_rule(conn, policy, rule, result)
             
             elif rule.action == RetentionAction.COMPRESS:
                 result['processed'] = await self._execute_compress_rule(conn, policy, rule)
             
             elif rule.action == RetentionAction.ANONYMIZE:
-                result['processed'] = await self._execute_anonymize_rule(conn, policy, rule)
+                result['processed'] = await self._execute_anonymize_rule(conn, policy, rule, result)
             
         except Exception as e:
             result['error'] = str(e)
             logger.error(f"Rule execution failed: {e}")
         
+        result['duration_seconds'] = round(time.perf_counter() - started, 3)
+        result['rows_per_second'] = round(result['processed'] / max(result['duration_seconds'], 1e-3), 1)
+        
         return result
     
-    async def _execute_delete_rule(self, conn: asyncpg.Connection,
-                                 policy: RetentionPolicy, rule: RetentionRule) -> int:
-        """Execute a delete rule"""
+    async def _run_batched(self, conn: asyncpg.Connection, policy: RetentionPolicy,
+                           rule: RetentionRule, stats: Dict[str, Any],
+                           handle_batch: Callable[[List[asyncpg.Record], List[int]], Awaitable[int]],
+                           condition: Optional[str] = None, args: Sequence[Any] = (),
+                           columns: str = "id") -> int:
+        """
+        Walk the rows matching a condition in keyset batches; `handle_batch(rows, ids)` runs in the
+        batch's transaction and returns the number of rows it affected.
+        """
         
-        # Handle max records limit
-        if rule.params and 'keep_latest' in rule.params:
-            keep_latest = rule.params['keep_latest']
+        condition = condition or rule.condition
+        progress = self.progress[policy.category.value] = {
+            'rule': rule.name,
+            'processed': 0,
+            'batches': 0,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'rows_per_second': 0.0
+        }
+        started = time.perf_counter()
+        last_id = None
+        
+        while True:
+            keyset_args = list(args)
+            query = f"SELECT {columns} FROM {policy.table_name} WHERE ({condition})"
+            if last_id is not None:
+                keyset_args.append(last_id)
+                query += f" AND id > ${len(keyset_args)}"
+            keyset_args.append(self.batch_size)
+            query += f" ORDER BY id LIMIT ${len(keyset_args)}"
             
-            # Get total count
-            count_query = f"SELECT COUNT(*) FROM {policy.table_name}"
-            total_count = await conn.fetchval(count_query)
+            async with conn.transaction():
+                rows = await conn.fetch(query, *keyset_args)
+                if not rows:
+                    break
+                ids = [row['id'] for row in rows]
+                affected = await handle_batch(rows, ids)
             
-            if total_count > keep_latest:
-                # Delete oldest records beyond the limit
-                delete_query = f"""
-                DELETE FROM {policy.table_name} 
-                WHERE id IN (
-                    SELECT id FROM {policy.table_name}
-                    ORDER BY created_at DESC
-                    OFFSET {keep_latest}
-                )
-                """
-                result = await conn.execute(delete_query)
-                return int(result.split()[-1]) if result else 0
+            last_id = ids[-1]
+            stats['processed'] += affected
+            stats['batches'] += 1
             
-            return 0
-        
-        # Regular condition-based delete
-        delete_query = f"DELETE FROM {policy.table_name} WHERE {rule.condition}"
-        result = await conn.execute(delete_query)
+            elapsed = time.perf_counter() - started
+            progress.update({
+                'processed': stats['processed'],
+                'batches': stats['batches'],
+                'last_id': last_id,
+                'rows_per_second': round(stats['processed'] / max(elapsed, 1e-3), 1)
+            })
+            if stats['batches'] % PROGRESS_LOG_INTERVAL == 0:
+                logger.info(f"{policy.table_name}/{rule.name}: {stats['processed']} rows "
+                           f"in {stats['batches']} batches ({progress['rows_per_second']} rows/s)")
+            
+            if len(rows) < self.batch_size:
+                break
+            if self.batch_pause_seconds:
+                await asyncio.sleep(self.batch_pause_seconds)
         
-        return int(result.split()[-1]) if result else 0
+        progress['completed_at'] = datetime.now(timezone.utc).isoformat()
+        return stats['processed']
     
-    async def _execute_archive_rule(self, conn: asyncpg.Connection,
-                                  policy: RetentionPolicy, rule: RetentionRule) -> int:
-        """Execute an archive rule"""
+    @staticmethod
+    def _affected(status: str) -> int:
+        return int(status.split()[-1]) if status else 0
+    
+    async def _execute_delete_rule(self, conn: asyncpg.Connection, policy: RetentionPolicy,
+                                 rule: RetentionRule, stats: Dict[str, Any]) -> int:
+        """Execute a delete rule, one short transaction per batch"""
         
-        # Select records to archive
-        select_query = f"SELECT * FROM {policy.table_name} WHERE {rule.condition}"
-        records = await conn.fetch(select_query)
+        async def delete_batch(rows, ids):
+            return self._affected(await conn.execute(
+                f"DELETE FROM {policy.table_name} WHERE id = ANY($1)", ids
+            ))
         
-        if not records:
-            return 0
+        # Handle max records limit
+        if rule.params and 'keep_latest' in rule.params:
+            keep_latest = rule.params['keep_latest']
+            
+            # Newest row beyond the limit: it and everything older goes
+            boundary = await conn.fetchrow(
+                f"SELECT created_at, id FROM {policy.table_name} "
+                f"ORDER BY created_at DESC, id DESC OFFSET $1 LIMIT 1",
+                keep_latest
+            )
+            if boundary is None:
+                return 0
+            
+            return await self._run_batched(
+                conn, policy, rule, stats, delete_batch,
+                condition="(created_at, id) <= ($1, $2)",
+                args=(boundary['created_at'], boundary['id'])
+            )
         
-        # Archive records
-        archive_file = await self.archiver.archive_records(
-            table_name=policy.table_name,
-            records=[dict(record) for record in records],
-            metadata={
-                'policy': policy.category.value,
-                'rule': rule.name,
-                'archived_at': datetime.now(timezone.utc).isoformat()
-            }
-        )
+        # Regular condition-based delete
+        return await self._run_batched(conn, policy, rule, stats, delete_batch)
+    
+    async def _execute_archive_rule(self, conn: asyncpg.Connection, policy: RetentionPolicy,
+                                  rule: RetentionRule, stats: Dict[str, Any]) -> int:
+        """
+        Execute an archive rule: each batch is appended (and synced) to the archive,
+        then deleted in the same transaction.
+        """
         
-        logger.info(f"Archived {len(records)} records to {archive_file}")
+        writer: Optional[ArchiveWriter] = None
         
-        # Delete archived records from main table
-        delete_query = f"DELETE FROM {policy.table_name} WHERE {rule.condition}"
-        await conn.execute(delete_query)
+        async def archive_batch(rows, ids):
+            nonlocal writer
+            if writer is None:
+                writer = self.archiver.open_archive(policy.table_name, {
+                    'policy': policy.category.value,
+                    'rule': rule.name
+                })
+                stats['archive_file'] = str(writer.path)
+            
+            stats['archived_bytes'] += await writer.write_batch([dict(row) for row in rows])
+            
+            # Delete archived records from main table
+            return self._affected(await conn.execute(
+                f"DELETE FROM {policy.table_name} WHERE id = ANY($1)", ids
+            ))
         
-        return len(records)
+        try:
+            processed = await self._run_batched(conn, policy, rule, stats, archive_batch, columns="*")
+        finally:
+            if writer is not None:
+                await writer.close()
+                # The journal is replaced by its Parquet rewrite on close
+                stats['archive_file'] = str(writer.path)
+                stats['archived_bytes'] = writer.size_bytes
+                logger.info(f"Archived {writer.record_count} records to {writer.path}")
+        
+        return processed
     
     async def _execute_compress_rule(self, conn: asyncpg.Connection,
                                    policy: RetentionPolicy, rule: RetentionRule) -> int:
-        """Execute a compress rule (placeholder for future implementation)"""
+        """
+        Execute a compress rule (placeholder for future implementation)
+        
+        Not batched: the rule only counts matching rows, a read-only query that
+        holds no row locks. A real implementation that rewrites rows should go
+        through `_run_batched` like the other actions.
+        """
         
         # For now, just log that compression would happen
         # In a real implementation, this could compress large text fields
@@ -256,9 +369,9 @@ class RetentionManager:
         
         return count or 0
     
-    async def _execute_anonymize_rule(self, conn: asyncpg.Connection,
-                                    policy: RetentionPolicy, rule: RetentionRule) -> int:
-        """Execute an anonymize rule"""
+    async def _execute_anonymize_rule(self, conn: asyncpg.Connection, policy: RetentionPolicy,
+                                    rule: RetentionRule, stats: Dict[str, Any]) -> int:
+        """Execute an anonymize rule, one short transaction per batch"""
         
         # Example anonymization for different data types
         anonymize_updates = []
@@ -281,11 +394,13 @@ class RetentionManager:
         update_query = f"""
         UPDATE {policy.table_name} 
         SET {', '.join(anonymize_updates)}, updated_at = NOW()
-        WHERE {rule.condition}
+        WHERE id = ANY($1)
         """
         
-        result = await conn.execute(update_query)
-        return int(result.split()[-1]) if result else 0
+        async def anonymize_batch(rows, ids):
+            return self._affected(await conn.execute(update_query, ids))
+        
+        return await self._run_batched(conn, policy, rule, stats, anonymize_batch)
     
     async def execute_policy_for_category(self, category: DataCategory) -> Dict[str, Any]:
         """Execute retention policy for a specific category"""
@@ -355,6 +470,8 @@ class RetentionManager:
             'total_policies': len(self.policies),
             'enabled_policies': sum(1 for p in self.policies.values() if p.enabled),
             'last_execution': self.last_run.isoformat() if self.last_run else None,
+            'batch_size': self.batch_size,
+            'progress': self.progress,
             'policies': {}
         }
         
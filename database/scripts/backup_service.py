@@ -76,6 +76,11 @@ class BackupService:
                     },
                     "chromadb": {
                         "persist_dir": settings.get('CHROMA_PERSIST_DIRECTORY', './memory/chroma')
+                    },
+                    "full_backup": {
+                        "max_concurrent": 2,
+                        "io_budget_mb_s": None,
+                        "niceness": 10
                     }
                 },
                 "schedule": {
@@ -97,7 +102,10 @@ class BackupService:
                 },
                 "retention": {
                     "enabled": True,
-                    "cleanup_cron": "0 5 * * *"  # Daily at 5 AM
+                    "cleanup_cron": "0 5 * * *",  # Daily at 5 AM
+                    "batch_size": 5000,  # Rows per retention transaction
+                    "batch_pause_seconds": 0.0,
+                    "archive_format": "parquet"  # Falls back to JSON Lines without pyarrow
                 },
                 "health_check": {
                     "enabled": True,
@@ -162,7 +170,10 @@ class BackupService:
         if self.config['retention']['enabled']:
             self.retention_manager = RetentionManager(
                 database_url=self.config['database_url'],
-                archive_dir=Path(self.config['archive_dir'])
+                archive_dir=Path(self.config['archive_dir']),
+                batch_size=self.config['retention'].get('batch_size', 5000),
+                batch_pause_seconds=self.config['retention'].get('batch_pause_seconds', 0.0),
+                archive_format=self.config['retention'].get('archive_format', 'parquet')
             )
         
         # Initialize health monitor
@@ -0,0 +1,151 @@
+"""
+Parallel full system backup tests for JARVIS AI
+"""
+
+import pytest
+import asyncio
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from database.backup.backup_manager import BackupConfig, BackupManager
+from database.backup.base_backup import BackupStatus, BaseBackup
+from database.backup.streaming import IOBudget
+
+class FakeService:
+    """Backup service that takes a fixed time and tracks overlap with its peers"""
+
+    def __init__(self, name, tracker, duration=0.1, fail=False):
+        self.name = name
+        self.tracker = tracker
+        self.duration = duration
+        self.fail = fail
+
+    async def create_backup(self, backup_type, metadata=None):
+        self.tracker["running"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        try:
+            await asyncio.sleep(self.duration)
+        finally:
+            self.tracker["running"] -= 1
+        if self.fail:
+            raise RuntimeError("connection refused")
+        return {
+            "status": BackupStatus.COMPLETED.value,
+            "backup_path": f"/backups/{self.name}.backup",
+            "file_size": 1000000,
+            "source_size": 4000000
+        }
+
+    async def verify_backup(self, backup_path):
+        return True
+
+    def cleanup_old_backups(self, retention_days=30, max_backups=None):
+        self.tracker.setdefault("cleanup_threads", []).append(threading.current_thread())
+        return []
+
+class DumpingBackup(BaseBackup):
+    """Backup service only used to run dump tools through BaseBackup.run_command"""
+
+    async def create_backup(self, backup_type, metadata=None):
+        pass
+
+    async def restore_backup(self, backup_path, target_location=None):
+        pass
+
+    async def verify_backup(self, backup_path):
+        pass
+
+    async def list_backups(self):
+        pass
+
+class TestParallelFullBackup:
+    """create_full_backup concurrency, limits and summary"""
+
+    @pytest.fixture
+    def temp_backup_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    def make_manager(self, temp_backup_dir, max_concurrent, failing=()):
+        manager = BackupManager(
+            backup_root_dir=temp_backup_dir,
+            config={"full_backup": {"max_concurrent": max_concurrent, "io_budget_mb_s": 50}}
+        )
+        tracker = {"running": 0, "peak": 0}
+        manager.services = {
+            name: FakeService(name, tracker, fail=name in failing)
+            for name in ["postgresql", "redis", "chromadb"]
+        }
+        return manager, tracker
+
+    def test_budget_and_priority_attached_to_services(self, temp_backup_dir):
+        manager = BackupManager(
+            backup_root_dir=temp_backup_dir,
+            config={"full_backup": {"io_budget_mb_s": 50, "niceness": 5}, "postgresql": {"jobs": 8}}
+        )
+
+        assert manager.services["postgresql"].jobs == 8
+        for service in manager.services.values():
+            assert service.io_budget is manager.io_budget
+            assert service.niceness == 5
+
+    @pytest.mark.asyncio
+    async def test_services_run_concurrently(self, temp_backup_dir):
+        manager, tracker = self.make_manager(temp_backup_dir, max_concurrent=3)
+
+        summary = await manager.create_full_backup()
+
+        assert tracker["peak"] == 3
+        assert summary["successful"] == 3
+        assert summary["wall_time_seconds"] < summary["sequential_time_seconds"]
+        assert summary["io_budget"]["mb_per_second"] == 50
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_per_service_report(self, temp_backup_dir):
+        manager, tracker = self.make_manager(temp_backup_dir, max_concurrent=2, failing=["redis"])
+
+        summary = await manager.create_full_backup()
+
+        assert tracker["peak"] == 2
+        assert summary["successful"] == 2 and summary["failed"] == 1
+        assert summary["errors"] == ["Backup failed for redis: connection refused"]
+        assert summary["results"]["redis"]["status"] == BackupStatus.FAILED.value
+
+        postgresql = summary["services"]["postgresql"]
+        assert postgresql["wall_time_seconds"] >= 0.1
+        assert 0 < postgresql["bytes_per_second"] <= 1000000 / 0.1
+        assert postgresql["source_bytes_per_second"] == pytest.approx(4 * postgresql["bytes_per_second"], rel=0.01)
+        # Third service waited for a free slot
+        assert max(t["queued_seconds"] for t in summary["services"].values()) >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cleanup_runs_off_the_event_loop(self, temp_backup_dir):
+        manager, tracker = self.make_manager(temp_backup_dir, max_concurrent=3)
+
+        await manager._cleanup_old_backups("chromadb", BackupConfig(service_name="chromadb"))
+
+        assert tracker["cleanup_threads"] and threading.main_thread() not in tracker["cleanup_threads"]
+
+    @pytest.mark.asyncio
+    async def test_dump_directory_writes_are_charged_to_the_budget(self, temp_backup_dir):
+        """Tools that write a dump directory (pg_dump --format=directory) are held to the I/O budget"""
+        backup = DumpingBackup("postgresql", temp_backup_dir)
+        backup.io_budget = IOBudget(bytes_per_second=2000000, burst_bytes=200000)
+        dump_dir = temp_backup_dir / ".dump.dir"
+        script = (
+            "import os, sys; os.makedirs(sys.argv[1]); "
+            "[open(os.path.join(sys.argv[1], f'{i}.dat'), 'wb').write(b'x' * 250000) for i in range(4)]"
+        )
+
+        started = time.monotonic()
+        await backup.run_command([sys.executable, "-c", script, str(dump_dir)], output_dir=dump_dir)
+        elapsed = time.monotonic() - started
+
+        # 1 MB written, 200 KB burst, 2 MB/s: the dump stage takes at least 0.4 s
+        assert backup.io_budget.bytes_consumed == 1000000
+        assert elapsed >= 0.38
@@ -287,6 +287,7 @@ class TestBackupRecovery:
         """Test backup filename generation"""
         
         from database.backup.base_backup import BaseBackup, BackupType
+        from database.backup.streaming import ZSTD_AVAILABLE
         
         class TestBackup(BaseBackup):
             async def create_backup(self, backup_type, metadata=None):
@@ -304,7 +305,8 @@ class TestBackupRecovery:
         filename = backup.generate_backup_filename(BackupType.FULL)
         
         assert filename.startswith("test_service_full_")
-        assert filename.endswith(".backup.gz")
+        # zstd by default, gzip when zstandard is not installed
+        assert filename.endswith(".backup.zst" if ZSTD_AVAILABLE else ".backup.gz")
         
         # Test without compression
         backup.compress = False
@@ -0,0 +1,159 @@
+"""
+Deduplicating chunk store tests for JARVIS AI incremental backups
+"""
+
+import pytest
+import hashlib
+import io
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import database.backup.chunk_store as chunk_store
+from database.backup.base_backup import BackupType
+from database.backup.chromadb_backup import ChromaDBBackup
+from database.backup.chunk_store import ChunkStore, chunk_stream
+
+SMALL_CHUNKS = {"min_size": 4 * 1024, "avg_size": 16 * 1024, "max_size": 64 * 1024}
+
+def digests(data, **sizes):
+    return [hashlib.sha256(c).hexdigest() for c in chunk_stream(io.BytesIO(data), **sizes)]
+
+class TestContentDefinedChunking:
+    """Chunk boundaries follow content, not offsets"""
+
+    def test_chunks_reassemble_within_bounds(self):
+        data = os.urandom(2 * 1024 * 1024)
+
+        chunks = list(chunk_stream(io.BytesIO(data), **SMALL_CHUNKS))
+
+        assert b"".join(chunks) == data
+        assert all(4 * 1024 <= len(c) <= 64 * 1024 for c in chunks[:-1])
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        data = os.urandom(2 * 1024 * 1024)
+        edited = data[:1000000] + b"new row" + data[1000000:]
+
+        before, after = set(digests(data, **SMALL_CHUNKS)), digests(edited, **SMALL_CHUNKS)
+
+        assert sum(d not in before for d in after) <= 2
+
+    def test_scalar_fallback_matches_vectorized_boundaries(self, monkeypatch):
+        random.seed(7)
+        data = os.urandom(300000) + bytes(200000) + b"".join(b"row %d\n" % random.randint(0, 99) for _ in range(50000))
+        expected = digests(data, **SMALL_CHUNKS)
+
+        monkeypatch.setattr(chunk_store, "NUMPY_AVAILABLE", False)
+
+        assert digests(data, **SMALL_CHUNKS) == expected
+
+class TestChunkStore:
+    """Manifests, deduplication, restore and garbage collection"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def source_dir(self, temp_dir):
+        source = temp_dir / "source"
+        (source / "segments").mkdir(parents=True)
+        (source / "chroma.sqlite3").write_bytes(os.urandom(1024 * 1024))
+        (source / "segments" / "data_level0.bin").write_bytes(os.urandom(300000))
+        return source
+
+    def test_unchanged_backup_writes_no_chunks(self, temp_dir, source_dir):
+        store = ChunkStore(temp_dir / "store", codec="gzip", **SMALL_CHUNKS)
+
+        first = store.backup_directory(source_dir, temp_dir / "first.manifest")
+        second = store.backup_directory(source_dir, temp_dir / "second.manifest")
+
+        assert first.bytes_new == first.bytes_in == 1024 * 1024 + 300000
+        assert second.chunks_new == 0 and second.bytes_stored == 0
+        assert second.reused_ratio == 1.0
+
+    def test_changed_pages_cost_only_changed_chunks(self, temp_dir, source_dir):
+        store = ChunkStore(temp_dir / "store", codec="gzip", **SMALL_CHUNKS)
+        store.backup_directory(source_dir, temp_dir / "first.manifest")
+
+        db = source_dir / "chroma.sqlite3"
+        content = bytearray(db.read_bytes())
+        content[500000:504096] = os.urandom(4096)  # one rewritten page
+        db.write_bytes(bytes(content))
+        stats = store.backup_directory(source_dir, temp_dir / "second.manifest")
+
+        assert 0 < stats.bytes_new <= 3 * 64 * 1024
+        restored = temp_dir / "restored"
+        store.restore_directory(temp_dir / "second.manifest", restored)
+        assert (restored / "chroma.sqlite3").read_bytes() == bytes(content)
+        assert (restored / "segments" / "data_level0.bin").read_bytes() == \
+            (source_dir / "segments" / "data_level0.bin").read_bytes()
+
+    def test_garbage_collection_keeps_live_chunks(self, temp_dir, source_dir):
+        store = ChunkStore(temp_dir / "store", codec="none", **SMALL_CHUNKS)
+        store.backup_directory(source_dir, temp_dir / "first.manifest")
+        (source_dir / "chroma.sqlite3").write_bytes(os.urandom(1024 * 1024))
+        store.backup_directory(source_dir, temp_dir / "second.manifest")
+
+        (temp_dir / "first.manifest").unlink()
+        removed = store.collect_garbage([temp_dir / "second.manifest"])
+
+        assert removed > 0
+        assert store.verify(temp_dir / "second.manifest", deep=True)
+        assert ChunkStore(temp_dir / "store").index == store.index
+
+    def test_corrupted_chunk_is_detected(self, temp_dir, source_dir):
+        store = ChunkStore(temp_dir / "store", codec="none", **SMALL_CHUNKS)
+        store.backup_directory(source_dir, temp_dir / "backup.manifest")
+        chunk_path = next(store.chunks_dir.glob("*/*"))
+        chunk_path.write_bytes(b"garbage")
+
+        assert store.verify(temp_dir / "backup.manifest")
+        assert not store.verify(temp_dir / "backup.manifest", deep=True)
+        with pytest.raises(ValueError, match="Corrupted chunk"):
+            store.restore_directory(temp_dir / "backup.manifest", temp_dir / "restored")
+
+        chunk_path.unlink()
+        assert not store.verify(temp_dir / "backup.manifest")
+
+class TestChromaDBIncrementalBackup:
+    """Incremental ChromaDB backups through the chunk store"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.asyncio
+    async def test_incremental_backup_round_trip(self, temp_dir):
+        persist_dir = temp_dir / "chroma"
+        persist_dir.mkdir()
+        conn = sqlite3.connect(str(persist_dir / "chroma.sqlite3"))
+        conn.execute("CREATE TABLE embeddings (id INTEGER PRIMARY KEY, vector BLOB)")
+        conn.executemany("INSERT INTO embeddings (vector) VALUES (?)", [(os.urandom(512),) for _ in range(4000)])
+        conn.commit()
+        conn.close()
+        chroma_backup = ChromaDBBackup(backup_dir=temp_dir / "backups", chroma_persist_dir=persist_dir)
+
+        first = await chroma_backup.create_backup(BackupType.INCREMENTAL)
+        second = await chroma_backup.create_backup(BackupType.INCREMENTAL)
+
+        assert first["backup_path"].endswith(".backup.manifest")
+        assert second["new_bytes"] < first["new_bytes"] / 4
+        assert await chroma_backup.verify_backup(Path(second["backup_path"]))
+
+        restore_dir = temp_dir / "restored"
+        assert await chroma_backup.restore_backup(Path(second["backup_path"]), str(restore_dir))
+        conn = sqlite3.connect(str(restore_dir / "chroma.sqlite3"))
+        assert conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 4000
+        conn.close()
+
+        # Retention removing every manifest leaves no chunk behind
+        chroma_backup.cleanup_old_backups(retention_days=-1)
+        assert not any(chroma_backup.chunk_store.chunks_dir.glob("*/*"))
@@ -0,0 +1,127 @@
+"""
+Columnar archive tests for JARVIS AI retention
+"""
+
+import pytest
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import database.retention.data_archiver as data_archiver
+from database.retention.data_archiver import PYARROW_AVAILABLE, DataArchiver, resolve_archive_format
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+requires_pyarrow = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+
+def make_records(first, count):
+    return [
+        {
+            "id": i,
+            "user_id": i % 7,
+            "created_at": START + timedelta(hours=i),
+            "content": f"message {i}",
+            "metadata": {"source": "chat", "tokens": i},
+            "deleted_at": None
+        }
+        for i in range(first, first + count)
+    ]
+
+def write_archive(archiver, first=0, batches=4, batch_size=500):
+    writer = archiver.open_archive("messages")
+    for batch in range(batches):
+        writer.write_batch_sync(make_records(first + batch * batch_size, batch_size))
+    return writer.close_sync()
+
+class TestColumnarArchives:
+    """Parquet archives with a footer index"""
+
+    @pytest.fixture
+    def archiver(self):
+        temp_dir = tempfile.mkdtemp()
+        yield DataArchiver(Path(temp_dir), row_group_size=500)
+        shutil.rmtree(temp_dir)
+
+    @requires_pyarrow
+    def test_parquet_round_trip_keeps_types(self, archiver):
+        path = write_archive(archiver)
+
+        assert path.name.endswith(".parquet")
+        assert not any(archiver.archive_dir.rglob("*.jsonl.gz"))  # journal replaced
+        assert archiver.verify_archive(path)
+        records = list(archiver.iter_archive_records(path))
+        assert len(records) == 2000
+        assert records[10]["created_at"] == START + timedelta(hours=10)
+        assert records[10]["metadata"] == {"source": "chat", "tokens": 10}
+        assert records[10]["deleted_at"] is None
+
+    @requires_pyarrow
+    def test_listing_reads_only_footers(self, archiver, monkeypatch):
+        write_archive(archiver)
+        monkeypatch.setattr(DataArchiver, "_read_parquet", lambda *args: pytest.fail("archive body read"))
+
+        archive = archiver.list_archives("messages")[0]
+        stats = archiver.get_archive_stats()
+
+        assert archive["record_count"] == 2000 and archive["format"] == "parquet"
+        assert archive["time_range"]["start"] == START.isoformat()
+        assert archive["index"]["columns"]["user_id"] == {"kind": "int", "null_count": 0, "min": 0, "max": 6}
+        assert stats["tables"]["messages"]["data_end"] == (START + timedelta(hours=1999)).isoformat()
+        assert stats["formats"] == {"parquet": 1}
+
+    @requires_pyarrow
+    @pytest.mark.asyncio
+    async def test_restore_reads_only_matching_row_groups(self, archiver, monkeypatch):
+        path = write_archive(archiver)
+        read_groups = []
+        read_row_group = data_archiver.pq.ParquetFile.read_row_group
+        monkeypatch.setattr(data_archiver.pq.ParquetFile, "read_row_group",
+                            lambda self, i, *args, **kwargs: read_groups.append(i) or read_row_group(self, i, *args, **kwargs))
+
+        restored = await archiver.restore_from_archive(
+            path, start_time=START + timedelta(hours=1200), end_time=START + timedelta(hours=1300), where={"user_id": 3}
+        )
+
+        assert read_groups == [2]
+        assert [r["id"] for r in restored["records"]] == [i for i in range(1200, 1300) if i % 7 == 3]
+        assert restored["metadata"]["record_count"] == len(restored["records"])
+
+    @requires_pyarrow
+    @pytest.mark.asyncio
+    async def test_restore_range_skips_archives_by_index(self, archiver):
+        write_archive(archiver, first=0)
+        write_archive(archiver, first=5000)
+
+        result = await archiver.restore_range("messages", start_time=START + timedelta(hours=5100),
+                                              end_time=START + timedelta(hours=5110))
+
+        assert result["archives_skipped"] == 1 and len(result["archives_read"]) == 1
+        assert [r["id"] for r in result["records"]] == list(range(5100, 5110))
+
+    @pytest.mark.asyncio
+    async def test_jsonl_fallback_filters_and_indexes(self, archiver, monkeypatch):
+        monkeypatch.setattr(data_archiver, "PYARROW_AVAILABLE", False)
+        assert resolve_archive_format("parquet") == "jsonl"
+        archiver = DataArchiver(archiver.archive_dir, archive_format="parquet")
+
+        path = write_archive(archiver, batches=2)
+        restored = await archiver.restore_from_archive(path, where={"user_id": [1, 2]}, end_time=START + timedelta(hours=100))
+
+        assert path.name.endswith(".jsonl.gz") and archiver.verify_archive(path)
+        assert [r["id"] for r in restored["records"]] == [i for i in range(100) if i % 7 in (1, 2)]
+        assert archiver.list_archives()[0]["time_range"]["end"] == (START + timedelta(hours=999)).isoformat()
+
+    @requires_pyarrow
+    @pytest.mark.asyncio
+    async def test_json_columns_are_never_pruned(self, archiver):
+        """Mixed-type columns are stored as JSON text, whose min/max says nothing about the values"""
+        records = [{"id": i, "tag": "abc" if i % 2 else 5} for i in range(10)]
+        parquet_path = await archiver.archive_records("tags", records)
+        jsonl_path = await DataArchiver(archiver.archive_dir, archive_format="jsonl").archive_records("tags", records)
+
+        parquet = await archiver.restore_from_archive(parquet_path, where={"tag": "abc"})
+        jsonl = await archiver.restore_from_archive(jsonl_path, where={"tag": "abc"})
+
+        assert parquet_path.name.endswith(".parquet")
+        assert [r["id"] for r in parquet["records"]] == [r["id"] for r in jsonl["records"]] == [1, 3, 5, 7, 9]
@@ -0,0 +1,196 @@
+"""
+Batched retention engine tests for JARVIS AI
+"""
+
+import pytest
+import gzip
+import json
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from database.retention.data_archiver import DataArchiver
+from database.retention.retention_manager import RetentionManager
+from database.retention.retention_policies import (
+    DataCategory, RetentionAction, RetentionPolicy, RetentionRule
+)
+
+OLD = "created_at < NOW() - INTERVAL '90 days'"
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+class FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.transactions += 1
+        self.snapshot = {k: dict(v) for k, v in self.conn.rows.items()}
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.conn.rows = self.snapshot
+
+class FakeConnection:
+    """In-memory table understanding the keyset / ANY($1) statements of the batched engine"""
+
+    def __init__(self, rows, fail_on_delete=None):
+        self.rows = {row["id"]: row for row in rows}
+        self.predicates = {
+            OLD: lambda row, args: row["created_at"] < NOW - timedelta(days=90),
+            "(created_at, id) <= ($1, $2)": lambda row, args: (row["created_at"], row["id"]) <= (args[0], args[1])
+        }
+        self.fail_on_delete = fail_on_delete
+        self.deletes = 0
+        self.transactions = 0
+        self.largest_fetch = 0
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    async def fetch(self, query, *args):
+        condition = re.search(r"WHERE \((.*)\)", query).group(1)
+        matching = sorted(
+            (row for row in self.rows.values() if self.predicates[condition](row, args)),
+            key=lambda row: row["id"]
+        )
+        keyset = re.search(r"id > \$(\d+)", query)
+        if keyset:
+            matching = [row for row in matching if row["id"] > args[int(keyset.group(1)) - 1]]
+        limit = args[int(re.search(r"LIMIT \$(\d+)", query).group(1)) - 1]
+        batch = [dict(row) for row in matching[:limit]]
+        self.largest_fetch = max(self.largest_fetch, len(batch))
+        return batch
+
+    async def fetchrow(self, query, keep_latest):
+        ordered = sorted(self.rows.values(), key=lambda row: (row["created_at"], row["id"]), reverse=True)
+        return ordered[keep_latest] if len(ordered) > keep_latest else None
+
+    async def execute(self, query, ids):
+        assert "= ANY($1)" in query
+        if query.startswith("DELETE"):
+            self.deletes += 1
+            if self.deletes == self.fail_on_delete:
+                raise RuntimeError("lock timeout")
+            removed = [i for i in ids if self.rows.pop(i, None) is not None]
+            return f"DELETE {len(removed)}"
+        for i in ids:
+            self.rows[i]["content"] = "[ANONYMIZED]"
+        return f"UPDATE {len(ids)}"
+
+def make_rows(count, old_every=1):
+    return [
+        {
+            "id": i,
+            "created_at": NOW - timedelta(days=200 if i % old_every == 0 else 1, seconds=i),
+            "content": f"message {i}",
+            "metadata": {"source": "chat"}
+        }
+        for i in range(1, count + 1)
+    ]
+
+def make_policy(action, condition=OLD, params=None):
+    return RetentionPolicy(
+        category=DataCategory.MESSAGES,
+        table_name="messages",
+        rules=[RetentionRule(name="rule", condition=condition, action=action, params=params)]
+    )
+
+class TestBatchedRetention:
+    """Keyset batches, short transactions and streamed archives"""
+
+    @pytest.fixture
+    def archive_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.asyncio
+    async def test_archive_rule_runs_in_batches(self, archive_dir):
+        conn = FakeConnection(make_rows(2500, old_every=2))
+        manager = RetentionManager("postgresql://unused", archive_dir, policies={}, batch_size=400)
+
+        result = await manager._execute_policy(conn, make_policy(RetentionAction.ARCHIVE))
+
+        assert result["archived"] == 1250 and not result["errors"]
+        assert result["batches"] == 4 and conn.transactions == 4
+        assert conn.largest_fetch == 400
+        assert all(row["id"] % 2 for row in conn.rows.values())
+
+        archive_path = Path(result["archive_files"][0])
+        assert manager.archiver.verify_archive(archive_path)
+        records = list(manager.archiver.iter_archive_records(archive_path))
+        assert [r["id"] for r in records] == list(range(2, 2501, 2))
+        assert records[0]["metadata"] == {"source": "chat"}
+        assert manager.progress["messages"]["processed"] == 1250
+        assert result["rows_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_keeps_committed_batches(self, archive_dir):
+        conn = FakeConnection(make_rows(1000), fail_on_delete=2)
+        manager = RetentionManager("postgresql://unused", archive_dir, policies={}, batch_size=300)
+
+        result = await manager._execute_policy(conn, make_policy(RetentionAction.DELETE))
+
+        assert result["deleted"] == 300
+        assert "lock timeout" in result["errors"][0]
+        assert len(conn.rows) == 700
+
+    @pytest.mark.asyncio
+    async def test_keep_latest_deletes_oldest_in_batches(self, archive_dir):
+        conn = FakeConnection(make_rows(1000))
+        manager = RetentionManager("postgresql://unused", archive_dir, policies={}, batch_size=250)
+
+        result = await manager._execute_policy(
+            conn, make_policy(RetentionAction.DELETE, condition="id IS NOT NULL", params={"keep_latest": 100})
+        )
+
+        assert result["deleted"] == 900
+        # Newest rows have the smallest ids (created_at goes back with the id)
+        assert sorted(conn.rows) == list(range(1, 101))
+
+    @pytest.mark.asyncio
+    async def test_anonymize_updates_by_id_batches(self, archive_dir):
+        conn = FakeConnection(make_rows(500, old_every=5))
+        manager = RetentionManager("postgresql://unused", archive_dir, policies={}, batch_size=30)
+
+        result = await manager._execute_policy(conn, make_policy(RetentionAction.ANONYMIZE))
+
+        assert result["anonymized"] == 100 and result["batches"] == 4
+        assert sum(row["content"] == "[ANONYMIZED]" for row in conn.rows.values()) == 100
+
+class TestStreamedArchives:
+    """JSON Lines archives written batch by batch"""
+
+    @pytest.fixture
+    def archiver(self):
+        temp_dir = tempfile.mkdtemp()
+        yield DataArchiver(Path(temp_dir))
+        shutil.rmtree(temp_dir)
+
+    def test_truncated_archive_keeps_complete_batches(self, archiver):
+        writer = archiver.open_archive("messages")
+        writer.write_batch_sync([{"id": 1}, {"id": 2}])
+        writer.write_batch_sync([{"id": 3}])
+        writer._file.close()  # interrupted run: no summary line
+        with open(writer.path, "ab") as f:
+            f.write(gzip.compress(b'{"id": 4}\n')[:12])
+
+        assert [r["id"] for r in archiver.iter_archive_records(writer.path)] == [1, 2, 3]
+        assert not archiver.verify_archive(writer.path)
+        assert archiver.list_archives("messages")[0]["record_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_legacy_json_archive_still_readable(self, archiver):
+        legacy = archiver.archive_dir / "messages" / "messages_20250101_000000_abcd1234.json.gz"
+        legacy.parent.mkdir()
+        with gzip.open(legacy, "wt", encoding="utf-8") as f:
+            json.dump({"metadata": {"table_name": "messages", "archived_at": "2025-01-01", "record_count": 1},
+                       "records": [{"id": 7}]}, f, indent=2)
+
+        restored = await archiver.restore_from_archive(legacy)
+
+        assert restored["records"] == [{"id": 7}]
+        assert archiver.verify_archive(legacy)
+        assert archiver.get_archive_stats()["total_records"] == 1
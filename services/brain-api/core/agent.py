@@ -6,15 +6,24 @@ Orchestration autonome d'outils avec framework ReAct
 import asyncio
 import json
 import time
-from typing import Dict, List, Optional, Any, Tuple
+import uuid
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from .execution_pool import AgentExecutionPool, ExecutionRejected
 from .llm_manager import LLMManager, ModelSelectionStrategy
+from utils.http_pool import get_http_pool
+from utils.monitoring import record_agent_iterations_saved
 
 logger = logging.getLogger(__name__)
 
+# Callback de streaming: reçoit les événements d'exécution au fil de l'eau
+AgentEventCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+FINAL_ANSWER_MARKERS = ["réponse finale:", "final answer:", "conclusion:", "résultat:"]
+
 class AgentState(Enum):
     IDLE = "idle"
     THINKING = "thinking"
@@ -32,6 +41,7 @@ class AgentStep:
     action_input: Optional[Dict] = None
     observation: Optional[str] = None
     timestamp: float = None
+    tool_calls: List[Dict] = field(default_factory=list)  # actions de l'étape (exécutées en parallèle)
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -46,6 +56,10 @@ class AgentExecution:
     start_time: float = None
     end_time: float = None
     total_duration: float = None
+    user_id: Optional[str] = None
+    queue_wait: float = 0.0  # attente d'un slot du pool avant démarrage
+    iterations_saved: int = 0  # itérations économisées par l'exécution parallèle des outils
+    execution_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     
     def __post_init__(self):
         if self.start_time is None:
@@ -55,24 +69,43 @@ class ReactAgent:
     """
     Agent ReAct (Reasoning and Action) pour orchestration autonome d'outils
     Implémente le pattern Think → Act → Observe
+    Plusieurs exécutions concurrentes (état propre à chaque tâche), admises par un pool borné et équitable
     """
     
-    def __init__(self, llm_url: str, memory_manager=None, metacognition=None, persona_manager=None, llm_gateway_url: str = None):
+    def __init__(self, llm_url: str, memory_manager=None, metacognition=None, persona_manager=None, llm_gateway_url: str = None,
+                 llm_cache=None, llm_cache_strategy=None,
+                 max_concurrent_executions: int = 4, max_executions_per_user: int = 2,
+                 max_queued_executions: int = 64, max_queued_per_user: int = 8):
         self.llm_url = llm_url
+        self.llm_client = get_http_pool().register("ollama", llm_url)
         self.llm_gateway_url = llm_gateway_url or "http://llm-gateway:5010"
         self.use_gateway = True  # Activer le gateway par défaut
         self.memory_manager = memory_manager
         self.metacognition = metacognition
         self.persona_manager = persona_manager
         
+        # Cache LLM partagé (LLMCacheManager): réponses servies depuis le cache, générations identiques coalescées
+        self.llm_cache = llm_cache
+        self.llm_cache_strategy = llm_cache_strategy
+        
         # Configuration
         self.max_iterations = 5
         self.timeout_seconds = 30
         self.debug = True
         
-        # État de l'agent
-        self.current_execution: Optional[AgentExecution] = None
-        self.is_active = False
+        # Outils: actions indépendantes d'une même étape exécutées en parallèle
+        self.max_parallel_tools = 4
+        self.tool_timeout_seconds = 10.0
+        self.tool_timeouts: Dict[str, float] = {"search_web": 15.0}
+        
+        # Exécutions en cours (execution_id -> état de la tâche)
+        self.active_executions: Dict[str, AgentExecution] = {}
+        self.execution_pool = AgentExecutionPool(
+            max_concurrent=max_concurrent_executions,
+            max_active_per_user=max_executions_per_user,
+            max_queue=max_queued_executions,
+            max_queued_per_user=max_queued_per_user
+        )
         
         # Outils disponibles
         self.tools = {}
@@ -87,12 +120,19 @@ class ReactAgent:
             "successful_executions": 0,
             "failed_executions": 0,
             "tools_used": {},
+            "tool_timeouts": 0,
+            "parallel_tool_steps": 0,
+            "iterations_saved": 0,
             "avg_duration": 0.0,
             "avg_steps": 0.0
         }
         
         logger.info("🤖 React Agent initialisé avec Persona Manager" if persona_manager else "🤖 React Agent initialisé")
     
+    @property
+    def is_active(self) -> bool:
+        return bool(self.active_executions)
+    
     async def initialize(self):
         """Initialisation asynchrone de l'agent"""
         logger.info("🚀 Initialisation React Agent...")
@@ -117,10 +157,10 @@ class ReactAgent:
         """Arrêt propre de l'agent"""
         logger.info("🛑 Arrêt React Agent...")
         
-        if self.current_execution and self.current_execution.status not in [AgentState.COMPLETED, AgentState.ERROR]:
-            logger.warning("Arrêt forcé pendant une exécution")
-            if self.current_execution:
-                self.current_execution.status = AgentState.ERROR
+        for execution in list(self.active_executions.values()):
+            if execution.status not in [AgentState.COMPLETED, AgentState.ERROR]:
+                logger.warning(f"Arrêt forcé pendant une exécution ({execution.execution_id})")
+                execution.status = AgentState.ERROR
         
         # Arrêt LLM Manager
         if self.llm_manager:
@@ -128,28 +168,39 @@ class ReactAgent:
         
         self._log_final_stats()
     
-    async def execute_task(self, task: str, context: Optional[Dict] = None) -> AgentExecution:
+    async def execute_task(self, task: str, context: Optional[Dict] = None,
+                           on_event: Optional[AgentEventCallback] = None,
+                           user_id: Optional[str] = None) -> AgentExecution:
         """
         Exécuter une tâche avec le framework ReAct
         
         Args:
             task: Description de la tâche à accomplir
             context: Contexte additionnel (utilisateur, historique, etc.)
+            on_event: Callback de streaming (tokens de réflexion, actions, observations,
+                      tokens de réponse); les réflexions passent alors par LLMManager.stream_completion
+            user_id: Utilisateur pour l'équité du pool (défaut: context["user_id"])
         
         Returns:
             AgentExecution: Résultat de l'exécution avec toutes les étapes
-        """
-        if self.is_active:
-            raise RuntimeError("Agent déjà en cours d'exécution")
         
-        self.is_active = True
-        self.stats["total_executions"] += 1
+        Raises:
+            ExecutionRejected: file d'attente du pool pleine
+        """
+        user_id = user_id or (context or {}).get("user_id") or "anonymous"
         
-        # Initialiser l'exécution
-        execution = AgentExecution(task=task, steps=[])
-        self.current_execution = execution
+        # État propre à cette exécution
+        execution = AgentExecution(task=task, steps=[], user_id=user_id)
+        slot = None
         
         try:
+            # Attendre un slot (rotation entre utilisateurs); le timeout ne court qu'une fois admis
+            slot = await self.execution_pool.acquire(user_id)
+            execution.queue_wait = slot.waited
+            execution.start_time = time.time()
+            self.stats["total_executions"] += 1
+            self.active_executions[execution.execution_id] = execution
+            
             logger.info(f"🎯 Démarrage tâche: {task}")
             execution.status = AgentState.THINKING
             
@@ -160,7 +211,7 @@ class ReactAgent:
                     raise TimeoutError(f"Timeout après {self.timeout_seconds}s")
                 
                 # Étape THINK (Réflexion)
-                thought = await self._think_step(task, execution.steps, context)
+                thought = await self._think_step(task, execution.steps, context, on_event, iteration + 1)
                 step = AgentStep(
                     step_number=iteration + 1,
                     state=AgentState.THINKING,
@@ -174,19 +225,33 @@ class ReactAgent:
                     execution.status = AgentState.COMPLETED
                     break
                 
-                # Étape ACT (Action)
-                action, action_input = await self._act_step(thought)
-                if action:
+                # Étape ACT (Action): une ou plusieurs actions indépendantes
+                actions = await self._act_step(thought)
+                if actions:
                     step.state = AgentState.ACTING
-                    step.action = action
-                    step.action_input = action_input
+                    for action, action_input in actions:
+                        await self._emit(on_event, {
+                            "type": "action",
+                            "step": iteration + 1,
+                            "action": action,
+                            "input": action_input
+                        })
                     
-                    # Étape OBSERVE (Observation)
-                    observation = await self._observe_step(action, action_input)
+                    # Étape OBSERVE (Observation): outils exécutés en parallèle
+                    step.tool_calls = await asyncio.gather(*(
+                        self._run_tool_call(action, action_input, iteration + 1, on_event)
+                        for action, action_input in actions
+                    ))
                     step.state = AgentState.OBSERVING
-                    step.observation = observation
+                    self._summarize_tool_calls(step)
+                    
+                    if len(actions) > 1:
+                        execution.iterations_saved += len(actions) - 1
+                        self.stats["parallel_tool_steps"] += 1
+                        self.stats["iterations_saved"] += len(actions) - 1
+                        record_agent_iterations_saved(len(actions) - 1)
                     
-                    logger.info(f"🔄 Étape {iteration + 1}: {action} → {observation[:100]}...")
+                    logger.info(f"🔄 Étape {iteration + 1}: {step.action} → {step.observation[:100]}...")
                 else:
                     # Pas d'action nécessaire, on continue la réflexion
                     continue
@@ -198,6 +263,8 @@ class ReactAgent:
                 # Appliquer le formatage de la persona si disponible
                 execution.final_answer = await self._format_with_persona_async(raw_answer, context)
                 execution.status = AgentState.COMPLETED
+                # Réponse non issue d'une réflexion streamée: la transmettre d'un bloc
+                await self._emit(on_event, {"type": "answer_token", "content": execution.final_answer})
             
             execution.end_time = time.time()
             execution.total_duration = execution.end_time - execution.start_time
@@ -207,6 +274,9 @@ class ReactAgent:
             
             logger.info(f"✅ Tâche complétée en {execution.total_duration:.2f}s avec {len(execution.steps)} étapes")
             
+        except ExecutionRejected:
+            raise
+        
         except Exception as e:
             execution.status = AgentState.ERROR
             execution.end_time = time.time()
@@ -220,12 +290,14 @@ class ReactAgent:
                 execution.steps[-1].observation = f"Erreur: {str(e)}"
         
         finally:
-            self.is_active = False
-            self.current_execution = None
+            self.active_executions.pop(execution.execution_id, None)
+            if slot is not None:
+                self.execution_pool.release(slot)
         
         return execution
     
-    async def _think_step(self, task: str, previous_steps: List[AgentStep], context: Optional[Dict]) -> str:
+    async def _think_step(self, task: str, previous_steps: List[AgentStep], context: Optional[Dict],
+                          on_event: Optional[AgentEventCallback] = None, step_number: int = 0) -> str:
         """Étape de réflexion - analyser la situation et planifier"""
         
         # Construire le prompt de réflexion
@@ -237,43 +309,85 @@ class ReactAgent:
             if not should_use_llm:
                 return f"Réflexion simplifiée: {reason}"
         
-        # Appeler le LLM pour la réflexion
+        # Appeler le LLM pour la réflexion (en streaming si un client écoute)
+        if on_event and self.llm_manager:
+            return await self._stream_llm(prompt, step_number, on_event)
+        
         thought = await self._call_llm(prompt)
         
         return thought
     
-    async def _act_step(self, thought: str) -> Tuple[Optional[str], Optional[Dict]]:
-        """Étape d'action - décider quelle action prendre"""
-        
-        # Analyser la pensée pour extraire l'action
-        action_match = self._parse_action_from_thought(thought)
-        
-        if not action_match:
-            return None, None
-        
-        action_name = action_match.get("action")
-        action_input = action_match.get("input", {})
+    async def _act_step(self, thought: str) -> List[Tuple[str, Dict]]:
+        """Étape d'action - décider quelles actions prendre (dédupliquées, outils connus uniquement)"""
         
-        # Vérifier que l'outil existe
-        if action_name not in self.tools:
-            logger.warning(f"⚠️ Outil inconnu: {action_name}")
-            return None, None
+        actions = []
+        seen = set()
+        for action_match in self._parse_actions_from_thought(thought):
+            action_name = action_match.get("action")
+            action_input = action_match.get("input", {})
+            
+            # Vérifier que l'outil existe
+            if action_name not in self.tools:
+                logger.warning(f"⚠️ Outil inconnu: {action_name}")
+                continue
+            
+            key = (action_name, json.dumps(action_input, sort_keys=True, default=str))
+            if key in seen:
+                continue
+            seen.add(key)
+            actions.append((action_name, action_input))
+        
+        if len(actions) > self.max_parallel_tools:
+            logger.warning(f"⚠️ {len(actions)} actions demandées, limitées à {self.max_parallel_tools}")
+        return actions[:self.max_parallel_tools]
+    
+    async def _run_tool_call(self, action: str, action_input: Dict, step_number: int,
+                             on_event: Optional[AgentEventCallback] = None) -> Dict:
+        """Exécuter un outil de l'étape et relayer son observation dès qu'elle est disponible"""
+        started = time.time()
+        observation = await self._observe_step(action, action_input)
+        await self._emit(on_event, {
+            "type": "observation",
+            "step": step_number,
+            "action": action,
+            "observation": observation
+        })
+        return {
+            "action": action,
+            "input": action_input,
+            "observation": observation,
+            "duration": time.time() - started
+        }
+    
+    def _summarize_tool_calls(self, step: AgentStep):
+        """Renseigner action/action_input/observation de l'étape à partir de ses appels d'outils"""
+        if len(step.tool_calls) == 1:
+            call = step.tool_calls[0]
+            step.action, step.action_input, step.observation = call["action"], call["input"], call["observation"]
+            return
         
-        return action_name, action_input
+        step.action = " + ".join(call["action"] for call in step.tool_calls)
+        step.action_input = {"parallel": [{call["action"]: call["input"]} for call in step.tool_calls]}
+        step.observation = "\n".join(f"[{call['action']}] {call['observation']}" for call in step.tool_calls)
     
     async def _observe_step(self, action: str, action_input: Dict) -> str:
-        """Étape d'observation - exécuter l'action et observer le résultat"""
+        """Étape d'observation - exécuter l'action (avec timeout par outil) et observer le résultat"""
         
+        timeout = self.tool_timeouts.get(action, self.tool_timeout_seconds)
         try:
             # Exécuter l'outil
             tool_function = self.tools[action]
-            result = await tool_function(action_input)
+            result = await asyncio.wait_for(tool_function(action_input), timeout=timeout)
             
             # Mettre à jour les statistiques d'utilisation des outils
             self.stats["tools_used"][action] = self.stats["tools_used"].get(action, 0) + 1
             
             return str(result)
             
+        except asyncio.TimeoutError:
+            self.stats["tool_timeouts"] += 1
+            logger.warning(f"⏱️ Outil {action} interrompu après {timeout}s")
+            return f"Erreur: {action} n'a pas répondu en {timeout}s"
         except Exception as e:
             error_msg = f"Erreur lors de l'exécution de {action}: {str(e)}"
             logger.error(error_msg)
@@ -292,6 +406,7 @@ OUTILS DISPONIBLES:
 INSTRUCTIONS:
 1. Réfléchis étape par étape à comment accomplir cette tâche
 2. Si tu as besoin d'utiliser un outil, indique: Action: [nom_outil] avec Input: [paramètres]
+   Pour plusieurs outils indépendants, indique une ligne Action par outil: ils seront exécutés en parallèle
 3. Si tu as assez d'informations pour répondre, indique: Réponse finale: [ta_réponse]
 
 """
@@ -301,8 +416,8 @@ INSTRUCTIONS:
             prompt += "ÉTAPES PRÉCÉDENTES:\n"
             for step in previous_steps:
                 prompt += f"Étape {step.step_number}: {step.thought}\n"
-                if step.action:
-                    prompt += f"Action: {step.action} → {step.observation}\n"
+                for call in step.tool_calls:
+                    prompt += f"Action: {call['action']} → {call['observation']}\n"
             prompt += "\n"
         
         # Ajouter le contexte si disponible
@@ -323,14 +438,20 @@ INSTRUCTIONS:
         return "\n".join(descriptions)
     
     def _parse_action_from_thought(self, thought: str) -> Optional[Dict]:
-        """Parser l'action depuis la pensée de l'agent"""
+        """Parser la première action depuis la pensée de l'agent"""
+        actions = self._parse_actions_from_thought(thought)
+        return actions[0] if actions else None
+    
+    def _parse_actions_from_thought(self, thought: str) -> List[Dict]:
+        """Parser toutes les actions depuis la pensée de l'agent (une par ligne "Action: ... Input: ...")"""
         import re
         
-        # Chercher pattern "Action: [nom] avec Input: [params]"
-        action_pattern = r"Action:\s*(\w+).*?Input:\s*(.+?)(?:\n|$)"
-        match = re.search(action_pattern, thought, re.IGNORECASE | re.DOTALL)
+        # Chercher pattern "Action: [nom] avec Input: [params]"; une action ne déborde jamais
+        # sur la suivante (ni entre le nom et "Input:", ni dans les paramètres)
+        action_pattern = r"Action:\s*(\w+)(?:(?!Action:).)*?Input:\s*(.+?)(?=\s*Action:|\n|$)"
+        actions = []
         
-        if match:
+        for match in re.finditer(action_pattern, thought, re.IGNORECASE | re.DOTALL):
             action_name = match.group(1).strip()
             input_str = match.group(2).strip()
             
@@ -341,24 +462,17 @@ INSTRUCTIONS:
                 # Si pas JSON, traiter comme string simple
                 action_input = {"query": input_str}
             
-            return {
+            actions.append({
                 "action": action_name,
                 "input": action_input
-            }
+            })
         
-        return None
+        return actions
     
     def _is_final_answer(self, thought: str) -> bool:
         """Vérifier si la pensée contient une réponse finale"""
-        final_indicators = [
-            "réponse finale:",
-            "final answer:",
-            "conclusion:",
-            "résultat:"
-        ]
-        
         thought_lower = thought.lower()
-        return any(indicator in thought_lower for indicator in final_indicators)
+        return any(indicator in thought_lower for indicator in FINAL_ANSWER_MARKERS)
     
     def _extract_final_answer(self, thought: str) -> str:
         """Extraire la réponse finale de la pensée"""
@@ -396,33 +510,94 @@ INSTRUCTIONS:
             return "Je n'ai pas pu rassembler suffisamment d'informations pour répondre complètement à votre demande."
     
     async def _call_llm(self, prompt: str) -> str:
-        """Appeler le LLM local (Ollama)"""
+        """Appeler le LLM local (Ollama), via le cache LLM s'il est configuré"""
         
-        # Appel LLM via Ollama
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "model": "llama3.2:3b",
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "max_tokens": 512
-                    }
-                }
-                
-                async with session.post(f"{self.llm_url}/api/generate", json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get("response", "Pas de réponse du LLM")
-                    else:
-                        logger.warning(f"LLM request failed: {response.status}")
-                        return self._fallback_response(prompt)
+            if self.llm_cache is not None:
+                cache_options = {"strategy": self.llm_cache_strategy} if self.llm_cache_strategy else {}
+                return await self.llm_cache.get_or_generate(
+                    prompt, lambda: self._generate(prompt),
+                    model="llama3.2:3b", temperature=0.7, max_tokens=512, **cache_options
+                )
+            return await self._generate(prompt)
         except Exception as e:
+            # Les réponses de secours ne passent jamais par le cache
             logger.warning(f"LLM connection failed: {e}")
             return self._fallback_response(prompt)
     
+    async def _generate(self, prompt: str) -> str:
+        """Appel LLM via Ollama (lève une exception en cas d'échec)"""
+        payload = {
+            "model": "llama3.2:3b",
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": 0.7,
+                "max_tokens": 512
+            }
+        }
+        
+        async with self.llm_client.post("/api/generate", json=payload) as response:
+            if response.status != 200:
+                raise RuntimeError(f"LLM request failed: {response.status}")
+            result = await response.json()
+            if not result.get("response"):
+                raise RuntimeError("Pas de réponse du LLM")
+            return result["response"]
+    
+    async def _stream_llm(self, prompt: str, step_number: int, on_event: AgentEventCallback) -> str:
+        """
+        Réflexion en streaming via le LLM Manager
+        Chaque token est relayé; dès qu'un marqueur de réponse finale apparaît, le texte qui le suit
+        est aussi relayé en tokens de réponse (provisoires: la réponse extraite à la fin fait foi)
+        """
+        thought = ""
+        answer_start = None
+        answer_sent = 0
+        
+        try:
+            async for chunk in self.llm_manager.stream_completion(
+                [{"role": "user", "content": prompt}], temperature=0.7, max_tokens=512
+            ):
+                if not chunk.content:
+                    continue
+                
+                thought += chunk.content
+                await self._emit(on_event, {"type": "thought_token", "step": step_number, "content": chunk.content})
+                
+                if answer_start is None:
+                    answer_start = self._find_answer_start(thought)
+                if answer_start is None:
+                    continue
+                
+                # La réponse finale s'arrête à la fin de ligne (cf. _extract_final_answer)
+                answer = thought[answer_start:].split("\n", 1)[0].lstrip()
+                if len(answer) > answer_sent:
+                    await self._emit(on_event, {"type": "answer_token", "content": answer[answer_sent:]})
+                    answer_sent = len(answer)
+        except Exception as e:
+            logger.warning(f"LLM streaming failed: {e}")
+        
+        return thought or self._fallback_response(prompt)
+    
+    def _find_answer_start(self, thought: str) -> Optional[int]:
+        """Position du texte de réponse finale dans une réflexion partielle (None si pas encore de marqueur)"""
+        thought_lower = thought.lower()
+        for marker in FINAL_ANSWER_MARKERS:
+            index = thought_lower.find(marker)
+            if index >= 0:
+                return index + len(marker)
+        return None
+    
+    async def _emit(self, on_event: Optional[AgentEventCallback], event: Dict[str, Any]):
+        """Transmettre un événement de streaming (une erreur côté client n'interrompt pas la tâche)"""
+        if not on_event:
+            return
+        try:
+            await on_event(event)
+        except Exception as e:
+            logger.debug(f"Événement de streaming non transmis: {e}")
+    
     def _fallback_response(self, prompt: str) -> str:
         """Réponse de secours si LLM indisponible"""
         
@@ -437,7 +612,7 @@ INSTRUCTIONS:
     async def _test_llm_connection(self):
         """Tester la connexion au LLM"""
         try:
-            test_response = await self._call_llm("Test de connexion")
+            test_response = await self._generate("Test de connexion")  # hors cache: teste vraiment le LLM
             if test_response:
                 logger.info("✅ Connexion LLM testée")
             else:
@@ -551,20 +726,13 @@ INSTRUCTIONS:
         return f"Système: {info['os']}, CPU: {info['cpu_percent']}%, RAM: {info['memory_percent']}%"
     
     def _update_stats(self, execution: AgentExecution):
-        """Mettre à jour les statistiques"""
-        if execution.total_duration:
-            # Moyenne mobile pour la durée
-            if self.stats["avg_duration"] == 0:
-                self.stats["avg_duration"] = execution.total_duration
-            else:
-                self.stats["avg_duration"] = (self.stats["avg_duration"] + execution.total_duration) / 2
-        
-        # Moyenne mobile pour les étapes
-        steps_count = len(execution.steps)
-        if self.stats["avg_steps"] == 0:
-            self.stats["avg_steps"] = steps_count
-        else:
-            self.stats["avg_steps"] = (self.stats["avg_steps"] + steps_count) / 2
+        """
+        Mettre à jour les statistiques (moyennes cumulées sur les exécutions réussies)
+        Sans await: la mise à jour est atomique vis-à-vis des autres exécutions de la boucle
+        """
+        completed = max(self.stats["successful_executions"], 1)
+        self.stats["avg_duration"] += ((execution.total_duration or 0.0) - self.stats["avg_duration"]) / completed
+        self.stats["avg_steps"] += (len(execution.steps) - self.stats["avg_steps"]) / completed
     
     def get_stats(self) -> Dict:
         """Obtenir les statistiques de l'agent"""
@@ -573,7 +741,10 @@ INSTRUCTIONS:
         return {
             **self.stats,
             "success_rate": round(success_rate, 2),
+            "avg_iterations_saved": round(self.stats["iterations_saved"] / max(self.stats["total_executions"], 1), 2),
             "is_active": self.is_active,
+            "active_executions": len(self.active_executions),
+            "execution_pool": self.execution_pool.get_stats(),
             "tools_count": len(self.tools)
         }
     
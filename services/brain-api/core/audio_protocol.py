@@ -0,0 +1,89 @@
+"""
+📦 Audio Protocol - JARVIS Brain API
+Trames audio binaires WebSocket: en-tête fixe + charge utile PCM/Opus brute
+(le canal JSON reste réservé au contrôle: auth, sessions, acks, transcriptions)
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Dict
+
+# En-tête (ordre réseau, 20 octets):
+#   magic "JA" | version u8 | format u8 | stream_id u32 | sequence u32 | timestamp_us u64
+FRAME_MAGIC = b"JA"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("!2sBBIIQ")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+
+FRAME_FORMATS: Dict[str, int] = {
+    "pcm_s16le": 0,
+    "opus": 1,
+    "wav": 2
+}
+FRAME_FORMAT_NAMES: Dict[int, str] = {code: name for name, code in FRAME_FORMATS.items()}
+
+SEQUENCE_MODULO = 2**32
+
+
+class AudioFrameError(ValueError):
+    """Trame audio binaire invalide"""
+
+
+@dataclass
+class AudioFrame:
+    """Trame audio binaire décodée"""
+    stream_id: int
+    sequence: int
+    timestamp: float  # secondes (epoch client)
+    format: str
+    payload: bytes
+
+
+def encode_frame(stream_id: int, sequence: int, timestamp: float, format: str, payload: bytes) -> bytes:
+    """Construire une trame binaire (en-tête + charge utile)"""
+    if format not in FRAME_FORMATS:
+        raise AudioFrameError(f"Format audio non supporté: {format}")
+
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        FRAME_FORMATS[format],
+        stream_id,
+        sequence % SEQUENCE_MODULO,
+        max(0, int(timestamp * 1_000_000))
+    )
+    return header + payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Décoder une trame binaire reçue; la charge utile est une vue sans copie"""
+    if len(data) < FRAME_HEADER_SIZE:
+        raise AudioFrameError(f"Trame trop courte ({len(data)} octets)")
+
+    magic, version, format_code, stream_id, sequence, timestamp_us = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise AudioFrameError("Signature de trame invalide")
+    if version != FRAME_VERSION:
+        raise AudioFrameError(f"Version de trame non supportée: {version}")
+    if format_code not in FRAME_FORMAT_NAMES:
+        raise AudioFrameError(f"Format audio inconnu: {format_code}")
+
+    return AudioFrame(
+        stream_id=stream_id,
+        sequence=sequence,
+        timestamp=timestamp_us / 1_000_000,
+        format=FRAME_FORMAT_NAMES[format_code],
+        payload=memoryview(data)[FRAME_HEADER_SIZE:]
+    )
+
+
+def describe_protocol() -> Dict:
+    """Description du protocole envoyée au client à l'ouverture d'une session binaire"""
+    return {
+        "header": "!2sBBIIQ",
+        "header_size": FRAME_HEADER_SIZE,
+        "magic": FRAME_MAGIC.decode(),
+        "version": FRAME_VERSION,
+        "formats": FRAME_FORMATS,
+        "fields": ["magic", "version", "format", "stream_id", "sequence", "timestamp_us"]
+    }
@@ -10,9 +10,13 @@ import logging
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass
 import base64
+import itertools
 import numpy as np
 from collections import deque
 
+from .audio_protocol import AudioFrame, AudioFrameError, FRAME_FORMATS, describe_protocol, encode_frame
+from .jitter_buffer import JitterBuffer
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -26,6 +30,8 @@ class AudioChunk:
     timestamp: float
     user_id: str
     sequence: int
+    direction: Optional[str] = None  # input, output (traitement après le jitter buffer)
+    concealed: bool = False  # trame de masquage d'une perte
 
 @dataclass
 class StreamSession:
@@ -42,6 +48,13 @@ class StreamSession:
     buffer_size: int
     latency_target: float  # ms
     stats: Dict[str, Any]
+    transport: str = "json"  # json (base64, historique) ou binary (trames audio_protocol)
+    stream_id: int = 0
+    ack_interval: int = 1  # accusés regroupés toutes les N trames
+    pending_acks: int = 0
+    pending_latency_ms: float = 0.0
+    last_ack_at: float = 0.0
+    jitter_buffer: Optional[JitterBuffer] = None
 
 class AudioStreamer:
     """
@@ -49,13 +62,17 @@ class AudioStreamer:
     Optimisé pour latence <500ms avec buffer adaptatif
     """
     
-    def __init__(self, websocket_manager=None):
+    def __init__(self, websocket_manager=None, config: Optional[Dict[str, Any]] = None):
         self.websocket_manager = websocket_manager
         
         # Sessions actives
         self.active_sessions: Dict[str, StreamSession] = {}
         self.audio_buffers: Dict[str, deque] = {}
         
+        # Flux binaires: stream_id (en-tête de trame) -> session_id
+        self.stream_ids: Dict[int, str] = {}
+        self._stream_counter = itertools.count(1)
+        
         # Configuration streaming
         self.config = {
             "target_latency_ms": 200,  # Latence cible
@@ -64,8 +81,14 @@ class AudioStreamer:
             "chunk_duration_ms": 20,   # Durée chunk audio
             "sample_rate": 16000,      # Fréquence échantillonnage
             "channels": 1,             # Mono
-            "format": "wav"            # Format audio
+            "format": "wav",           # Format audio
+            "transport": "json",       # json (base64) ou binary
+            "ack_interval_frames": 10, # Accusés regroupés (transport binaire)
+            "ack_max_delay_ms": 250,   # Délai max avant accusé partiel
+            "jitter_min_depth": 1,     # Profondeur jitter buffer (trames)
+            "jitter_max_depth": 25
         }
+        self.config.update(config or {})
         
         # Optimisations performance
         self.adaptive_buffering = True
@@ -125,6 +148,15 @@ class AudioStreamer:
         # Fusionner config par défaut avec config fournie
         session_config = {**self.config, **(config or {})}
         
+        transport = session_config["transport"]
+        if transport not in ("json", "binary"):
+            raise ValueError(f"Transport audio inconnu: {transport}")
+        if transport == "binary" and session_config["format"] not in FRAME_FORMATS:
+            raise ValueError(f"Format non supporté en binaire: {session_config['format']}")
+        
+        default_ack_interval = session_config["ack_interval_frames"] if transport == "binary" else 1
+        stream_id = next(self._stream_counter)
+        
         session = StreamSession(
             session_id=session_id,
             user_id=user_id,
@@ -142,11 +174,24 @@ class AudioStreamer:
                 "chunks_received": 0,
                 "bytes_transferred": 0,
                 "avg_chunk_latency": 0.0,
-                "quality_degradations": 0
-            }
+                "quality_degradations": 0,
+                "acks_sent": 0
+            },
+            transport=transport,
+            stream_id=stream_id,
+            ack_interval=max(1, int(session_config.get("ack_interval", default_ack_interval))),
+            last_ack_at=time.time(),
+            jitter_buffer=JitterBuffer(
+                frame_duration_ms=session_config["chunk_duration_ms"],
+                min_depth=session_config["jitter_min_depth"],
+                max_depth=session_config["jitter_max_depth"],
+                adaptive=self.adaptive_buffering,
+                conceal=self.jitter_compensation
+            )
         )
         
         self.active_sessions[session_id] = session
+        self.stream_ids[stream_id] = session_id
         self.audio_buffers[session_id] = deque(maxlen=100)  # Buffer 100 chunks
         self.stats["active_sessions"] += 1
         
@@ -154,12 +199,18 @@ class AudioStreamer:
         
         # Notifier client
         if self.websocket_manager:
-            await self.websocket_manager._send_message(connection_id, {
+            message = {
                 "type": "audio_session_started",
                 "session_id": session_id,
+                "stream_id": stream_id,
+                "transport": transport,
+                "ack_interval": session.ack_interval,
                 "config": session_config,
                 "timestamp": time.time()
-            })
+            }
+            if transport == "binary":
+                message["protocol"] = describe_protocol()
+            await self.websocket_manager._send_message(connection_id, message)
         
         return session_id
     
@@ -170,17 +221,22 @@ class AudioStreamer:
         
         session = self.active_sessions[session_id]
         
+        # Libérer le jitter buffer puis accuser les dernières trames
+        await self._playout(session, session.jitter_buffer.flush())
+        await self._flush_acks(session)
+        
         # Notifier client
         if self.websocket_manager:
             await self.websocket_manager._send_message(session.connection_id, {
                 "type": "audio_session_ended",
                 "session_id": session_id,
-                "stats": session.stats,
+                "stats": {**session.stats, "jitter": session.jitter_buffer.get_stats()},
                 "timestamp": time.time()
             })
         
         # Nettoyer ressources
         del self.active_sessions[session_id]
+        self.stream_ids.pop(session.stream_id, None)
         if session_id in self.audio_buffers:
             del self.audio_buffers[session_id]
         
@@ -190,7 +246,7 @@ class AudioStreamer:
     
     async def process_audio_chunk(self, session_id: str, chunk_data: Dict[str, Any]):
         """
-        Traiter un chunk audio reçu
+        Traiter un chunk audio reçu en JSON/base64 (clients historiques)
         
         Args:
             session_id: ID de session
@@ -201,13 +257,11 @@ class AudioStreamer:
             return
         
         session = self.active_sessions[session_id]
-        session.last_activity = time.time()
         
         try:
             # Décoder données audio
             audio_data = base64.b64decode(chunk_data.get("data", ""))
             chunk_id = chunk_data.get("chunk_id", f"chunk_{int(time.time() * 1000)}")
-            sequence = chunk_data.get("sequence", 0)
             
             # Créer chunk audio
             chunk = AudioChunk(
@@ -218,51 +272,117 @@ class AudioStreamer:
                 channels=chunk_data.get("channels", session.channels),
                 timestamp=time.time(),
                 user_id=session.user_id,
-                sequence=sequence
+                sequence=chunk_data.get("sequence", session.stats["chunks_received"]),
+                direction=chunk_data.get("type")
             )
             
-            # Ajouter au buffer
-            self.audio_buffers[session_id].append(chunk)
+            await self._ingest_chunk(session, chunk, chunk_data.get("timestamp", chunk.timestamp))
             
-            # Calculer latence
-            receive_time = time.time()
-            client_timestamp = chunk_data.get("timestamp", receive_time)
-            latency_ms = (receive_time - client_timestamp) * 1000
-            
-            # Mettre à jour stats session
-            session.stats["chunks_received"] += 1
-            session.stats["bytes_transferred"] += len(audio_data)
-            session.stats["avg_chunk_latency"] = (
-                (session.stats["avg_chunk_latency"] * (session.stats["chunks_received"] - 1) + latency_ms) 
-                / session.stats["chunks_received"]
-            )
+        except Exception as e:
+            logger.error(f"❌ Erreur traitement chunk audio: {e}")
+            session.stats["quality_degradations"] += 1
+    
+    async def process_audio_frame(self, connection_id: str, frame: AudioFrame):
+        """
+        Traiter une trame audio binaire (voir core/audio_protocol.py)
+        
+        Args:
+            connection_id: Connexion WebSocket ayant émis la trame
+            frame: Trame décodée
+        """
+        session_id = self.stream_ids.get(frame.stream_id)
+        session = self.active_sessions.get(session_id) if session_id else None
+        if not session or session.connection_id != connection_id:
+            raise AudioFrameError(f"Flux audio inconnu: {frame.stream_id}")
+        
+        chunk = AudioChunk(
+            id=f"{session_id}:{frame.sequence}",
+            data=bytes(frame.payload),
+            format=frame.format,
+            sample_rate=session.sample_rate,
+            channels=session.channels,
+            timestamp=time.time(),
+            user_id=session.user_id,
+            sequence=frame.sequence,
+            # Les trames montantes sont l'audio micro du client
+            direction="input" if session.direction in ("input", "bidirectional") else None
+        )
+        
+        try:
+            await self._ingest_chunk(session, chunk, frame.timestamp)
+        except Exception as e:
+            logger.error(f"❌ Erreur traitement trame audio: {e}")
+            session.stats["quality_degradations"] += 1
+    
+    async def _ingest_chunk(self, session: StreamSession, chunk: AudioChunk, client_timestamp: float):
+        """Chemin commun JSON/binaire: jitter buffer, latence, traitement, accusé"""
+        session.last_activity = chunk.timestamp
+        
+        # Réordonnancement et masquage des pertes
+        session.jitter_buffer.push(chunk, chunk.timestamp, client_timestamp)
+        await self._playout(session, session.jitter_buffer.pop_ready(chunk.timestamp))
+        
+        # Calculer latence
+        latency_ms = (chunk.timestamp - client_timestamp) * 1000
+        
+        # Mettre à jour stats session
+        session.stats["chunks_received"] += 1
+        session.stats["bytes_transferred"] += len(chunk.data)
+        session.stats["avg_chunk_latency"] = (
+            (session.stats["avg_chunk_latency"] * (session.stats["chunks_received"] - 1) + latency_ms) 
+            / session.stats["chunks_received"]
+        )
+        
+        # Accusé de réception (regroupé toutes les ack_interval trames)
+        session.pending_acks += 1
+        session.pending_latency_ms += latency_ms
+        overdue = (chunk.timestamp - session.last_ack_at) * 1000 >= self.config["ack_max_delay_ms"]
+        if session.pending_acks >= session.ack_interval or overdue:
+            await self._flush_acks(session, chunk)
+        
+        logger.debug(f"🎵 Chunk traité: {chunk.id} (latence: {latency_ms:.1f}ms)")
+    
+    async def _playout(self, session: StreamSession, chunks: List[AudioChunk]):
+        """Traiter, dans l'ordre des séquences, les trames libérées par le jitter buffer"""
+        buffer = self.audio_buffers.get(session.session_id)
+        for chunk in chunks:
+            if buffer is not None:
+                buffer.append(chunk)
             
             # Traitement audio selon le type
-            if chunk_data.get("type") == "input":
+            if chunk.direction == "input":
                 await self._process_input_audio(session, chunk)
-            elif chunk_data.get("type") == "output":
+            elif chunk.direction == "output":
                 await self._process_output_audio(session, chunk)
-            
-            # Optimisation adaptative
-            if self.adaptive_buffering:
-                await self._adapt_buffer_size(session, latency_ms)
-            
-            # Accusé de réception
-            if self.websocket_manager:
-                await self.websocket_manager._send_message(session.connection_id, {
-                    "type": "audio_chunk_ack",
-                    "chunk_id": chunk_id,
-                    "session_id": session_id,
-                    "latency_ms": latency_ms,
-                    "buffer_level": len(self.audio_buffers[session_id]),
-                    "timestamp": time.time()
-                })
-            
-            logger.debug(f"🎵 Chunk traité: {chunk_id} (latence: {latency_ms:.1f}ms)")
-            
-        except Exception as e:
-            logger.error(f"❌ Erreur traitement chunk audio: {e}")
-            session.stats["quality_degradations"] += 1
+    
+    async def _flush_acks(self, session: StreamSession, last_chunk: Optional[AudioChunk] = None):
+        """Envoyer un accusé unique pour les trames en attente"""
+        if not session.pending_acks:
+            return
+        
+        frames = session.pending_acks
+        latency_ms = session.pending_latency_ms / frames
+        session.pending_acks = 0
+        session.pending_latency_ms = 0.0
+        session.last_ack_at = time.time()
+        session.stats["acks_sent"] += 1
+        
+        if last_chunk is None:
+            buffer = self.audio_buffers.get(session.session_id)
+            last_chunk = buffer[-1] if buffer else None
+        
+        if self.websocket_manager:
+            await self.websocket_manager._send_message(session.connection_id, {
+                "type": "audio_chunk_ack",
+                "chunk_id": last_chunk.id if last_chunk else None,
+                "session_id": session.session_id,
+                "last_sequence": last_chunk.sequence if last_chunk else None,
+                "frames": frames,
+                "latency_ms": latency_ms,
+                "buffer_level": session.jitter_buffer.depth,
+                "target_depth": session.jitter_buffer.target_depth,
+                "timestamp": session.last_ack_at
+            })
     
     async def send_audio_chunk(self, session_id: str, audio_data: bytes, metadata: Optional[Dict] = None):
         """
@@ -277,10 +397,28 @@ class AudioStreamer:
             return
         
         session = self.active_sessions[session_id]
+        sequence = session.stats["chunks_sent"]
+        
+        if session.transport == "binary":
+            # Trame binaire: pas de base64 ni de JSON sur le chemin audio
+            if self.websocket_manager:
+                if metadata:
+                    await self.websocket_manager._send_message(session.connection_id, {
+                        "type": "audio_chunk_meta",
+                        "session_id": session_id,
+                        "sequence": sequence,
+                        **metadata
+                    })
+                frame = encode_frame(session.stream_id, sequence, time.time(), session.format, audio_data)
+                await self.websocket_manager._send_binary(session.connection_id, frame)
+            
+            session.stats["chunks_sent"] += 1
+            session.stats["bytes_transferred"] += len(audio_data)
+            return
         
         # Encoder données
         encoded_data = base64.b64encode(audio_data).decode('utf-8')
-        chunk_id = f"out_{int(time.time() * 1000)}_{session.stats['chunks_sent']}"
+        chunk_id = f"out_{int(time.time() * 1000)}_{sequence}"
         
         # Créer message
         message = {
@@ -291,7 +429,7 @@ class AudioStreamer:
             "format": session.format,
             "sample_rate": session.sample_rate,
             "channels": session.channels,
-            "sequence": session.stats["chunks_sent"],
+            "sequence": sequence,
             "timestamp": time.time()
         }
         
@@ -345,16 +483,6 @@ class AudioStreamer:
                 # Réduire qualité pour améliorer latence
                 pass
     
-    async def _adapt_buffer_size(self, session: StreamSession, current_latency: float):
-        """Adapter la taille du buffer selon la latence"""
-        
-        if current_latency > session.latency_target * 1.5:
-            # Latence trop élevée, réduire buffer
-            session.buffer_size = max(512, session.buffer_size - 128)
-        elif current_latency < session.latency_target * 0.5:
-            # Latence très faible, augmenter buffer pour stabilité
-            session.buffer_size = min(4096, session.buffer_size + 128)
-    
     async def _latency_monitor(self):
         """Monitorer la latence en continu"""
         while True:
@@ -380,9 +508,13 @@ class AudioStreamer:
         """Gérer les buffers audio"""
         while True:
             try:
+                current_time = time.time()
+                for session in list(self.active_sessions.values()):
+                    # Résoudre les trous en attente si le flux s'est interrompu
+                    await self._playout(session, session.jitter_buffer.pop_ready(current_time))
+                
                 for session_id, buffer in self.audio_buffers.items():
                     # Nettoyer les vieux chunks
-                    current_time = time.time()
                     while buffer and (current_time - buffer[0].timestamp) > 30:  # 30s max
                         buffer.popleft()
                 
@@ -400,9 +532,12 @@ class AudioStreamer:
                 total_bytes = sum(s.stats["bytes_transferred"] for s in self.active_sessions.values())
                 self.stats["throughput_kbps"] = (total_bytes * 8) / 1000  # Convert to kbps
                 
-                # Calculer packet loss (simulé pour l'instant)
+                # Calculer packet loss (pertes confirmées par les jitter buffers)
                 total_chunks = sum(s.stats["chunks_received"] for s in self.active_sessions.values())
                 self.stats["total_chunks_processed"] = total_chunks
+                lost = sum(s.jitter_buffer.stats["lost"] for s in self.active_sessions.values())
+                expected = lost + sum(s.jitter_buffer.stats["released"] for s in self.active_sessions.values())
+                self.stats["packet_loss_rate"] = lost / expected if expected else 0.0
                 
                 # Score qualité global
                 latency_score = max(0, 1 - (self.stats["avg_latency_ms"] / self.config["max_latency_ms"]))
@@ -434,9 +569,13 @@ class AudioStreamer:
         return {
             "session_id": session_id,
             "user_id": session.user_id,
+            "transport": session.transport,
+            "stream_id": session.stream_id,
+            "ack_interval": session.ack_interval,
             "duration": time.time() - session.created_at,
             "buffer_level": len(self.audio_buffers.get(session_id, [])),
-            **session.stats
+            **session.stats,
+            "jitter": session.jitter_buffer.get_stats()
         }
     
     def get_global_stats(self) -> Dict[str, Any]:
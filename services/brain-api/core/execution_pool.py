@@ -0,0 +1,190 @@
+"""
+🎟️ Execution Pool - JARVIS Brain API
+Pool borné d'exécutions ReactAgent concurrentes:
+file d'attente bornée, équité round-robin entre utilisateurs et plafond d'exécutions par utilisateur
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionRejected(Exception):
+    """Exécution refusée par le pool (file pleine globalement ou pour l'utilisateur)"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Agent saturé: {reason}")
+        self.reason = reason
+
+
+@dataclass
+class _Waiter:
+    user_id: str
+    enqueued_at: float
+    future: asyncio.Future
+
+
+@dataclass
+class ExecutionSlot:
+    """Slot d'exécution obtenu (à rendre via AgentExecutionPool.release)"""
+    user_id: str
+    admitted_at: float
+    waited: float
+    released: bool = False
+
+
+class AgentExecutionPool:
+    """
+    Admission des exécutions de l'agent:
+    - Au plus `max_concurrent` exécutions simultanées, et `max_active_per_user` par utilisateur
+    - Une file FIFO par utilisateur, servies à tour de rôle (un utilisateur bavard ne bloque pas les autres)
+    - File bornée globalement et par utilisateur: refus immédiat au-delà
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_active_per_user: int = 2,
+        max_queue: int = 64,
+        max_queued_per_user: int = 8
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_active_per_user = max_active_per_user
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+
+        self.active = 0
+        self.active_per_user: Dict[str, int] = {}
+        # Ordre de service: l'utilisateur servi passe en fin de rotation
+        self.queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected_queue_full": 0,
+            "rejected_user_queue_full": 0,
+            "cancelled_in_queue": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0
+        }
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    async def acquire(self, user_id: str) -> ExecutionSlot:
+        """Obtenir un slot d'exécution (attente en file si nécessaire)"""
+        if self.active < self.max_concurrent and not self.queues and self._has_room(user_id):
+            return self._admit(user_id, 0.0)
+
+        user_queue = self.queues.get(user_id)
+        if self.queued() >= self.max_queue:
+            self.stats["rejected_queue_full"] += 1
+            raise ExecutionRejected("queue_full")
+        if user_queue is not None and len(user_queue) >= self.max_queued_per_user:
+            self.stats["rejected_user_queue_full"] += 1
+            raise ExecutionRejected("user_queue_full")
+
+        waiter = _Waiter(user_id, time.monotonic(), asyncio.get_running_loop().create_future())
+        self.queues.setdefault(user_id, deque()).append(waiter)
+        self.stats["queued"] += 1
+        # Slot libre mais file non vide (utilisateurs au plafond): la rotation décide
+        self._dispatch()
+
+        try:
+            waited = await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot attribué pendant l'annulation de l'appelant: le rendre
+                self._release_user(user_id)
+            else:
+                self._discard(waiter)
+                self.stats["cancelled_in_queue"] += 1
+            self._dispatch()
+            raise
+
+        return ExecutionSlot(user_id=user_id, admitted_at=time.monotonic(), waited=waited)
+
+    def release(self, slot: ExecutionSlot):
+        """Rendre un slot et admettre les exécutions suivantes"""
+        if slot.released:
+            return
+        slot.released = True
+        self._release_user(slot.user_id)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, user_id: str):
+        """`async with pool.slot(user_id) as slot:` — slot rendu en sortie de bloc"""
+        slot = await self.acquire(user_id)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def _has_room(self, user_id: str) -> bool:
+        return self.active_per_user.get(user_id, 0) < self.max_active_per_user
+
+    def _admit(self, user_id: str, waited: float) -> ExecutionSlot:
+        self._take(user_id, waited)
+        return ExecutionSlot(user_id=user_id, admitted_at=time.monotonic(), waited=waited)
+
+    def _take(self, user_id: str, waited: float):
+        self.active += 1
+        self.active_per_user[user_id] = self.active_per_user.get(user_id, 0) + 1
+        self.stats["admitted"] += 1
+        self.stats["total_wait"] += waited
+        self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+
+    def _release_user(self, user_id: str):
+        self.active = max(self.active - 1, 0)
+        remaining = self.active_per_user.get(user_id, 0) - 1
+        if remaining > 0:
+            self.active_per_user[user_id] = remaining
+        else:
+            self.active_per_user.pop(user_id, None)
+
+    def _discard(self, waiter: _Waiter):
+        queue = self.queues.get(waiter.user_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        if not queue:
+            del self.queues[waiter.user_id]
+
+    def _dispatch(self):
+        """Attribuer les slots libres à tour de rôle entre les utilisateurs en attente"""
+        while self.active < self.max_concurrent:
+            user_id = next((u for u in self.queues if self._has_room(u)), None)
+            if user_id is None:
+                return
+
+            queue = self.queues.pop(user_id)
+            waiter = queue.popleft()
+            if queue:
+                self.queues[user_id] = queue  # fin de rotation
+
+            if waiter.future.done():
+                continue
+
+            waited = time.monotonic() - waiter.enqueued_at
+            self._take(user_id, waited)
+            waiter.future.set_result(waited)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "active": self.active,
+            "queued_now": self.queued(),
+            "waiting_users": len(self.queues),
+            "max_concurrent": self.max_concurrent,
+            "avg_wait": self.stats["total_wait"] / max(self.stats["admitted"], 1)
+        }
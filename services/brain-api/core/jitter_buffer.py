@@ -0,0 +1,211 @@
+"""
+⏱️ Jitter Buffer - JARVIS Brain API
+Réordonnancement par numéro de séquence, détection/masquage des pertes
+et profondeur cible adaptée à la gigue d'inter-arrivée mesurée (RFC 3550)
+"""
+
+import math
+from collections import deque
+from dataclasses import replace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Au-delà de cet écart de séquence, on considère une discontinuité (redémarrage client)
+MAX_SEQUENCE_GAP = 500
+
+
+class JitterBuffer:
+    """
+    Jitter buffer d'une session audio
+    - Les trames sont libérées strictement dans l'ordre des séquences
+    - Une séquence manquante est attendue tant qu'au plus target_depth trames
+      la suivent et que l'attente reste sous target_depth * frame_duration
+    - Au-delà, la trame est déclarée perdue et masquée (répétition atténuée de
+      la trame précédente pour le PCM, trame vide marquée pour l'Opus/PLC décodeur)
+    - target_depth suit la gigue d'inter-arrivée J (estimateur RFC 3550):
+      ceil(jitter_factor * J / frame_duration), bornée [min_depth, max_depth]
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: float = 20.0,
+        min_depth: int = 1,
+        max_depth: int = 25,
+        jitter_factor: float = 3.0,
+        adaptive: bool = True,
+        conceal: bool = True,
+        history_size: int = 1000
+    ):
+        self.frame_duration_ms = frame_duration_ms
+        self.min_depth = min_depth
+        self.max_depth = max(min_depth, max_depth)
+        self.jitter_factor = jitter_factor
+        self.adaptive = adaptive
+        self.conceal = conceal
+
+        self.target_depth = min_depth
+        self.jitter_ms = 0.0
+
+        self._frames: Dict[int, Any] = {}
+        self._next_sequence: Optional[int] = None
+        self._highest_sequence: Optional[int] = None
+        self._gap_since: Optional[float] = None
+        self._last_released = None
+        self._concealed_run = 0
+        self._last_transit: Optional[float] = None
+        self._latencies = deque(maxlen=history_size)
+
+        self.stats = {
+            "received": 0,
+            "released": 0,
+            "lost": 0,
+            "concealed": 0,
+            "late": 0,
+            "duplicates": 0,
+            "reordered": 0,
+            "resyncs": 0
+        }
+
+    @property
+    def depth(self) -> int:
+        """Nombre de trames en attente dans le buffer"""
+        return len(self._frames)
+
+    def push(self, chunk, arrival_time: float, sender_time: float) -> bool:
+        """
+        Insérer une trame reçue
+
+        Returns:
+            bool: False si la trame est rejetée (en retard ou dupliquée)
+        """
+        self.stats["received"] += 1
+        sequence = chunk.sequence
+
+        transit_ms = (arrival_time - sender_time) * 1000
+        self._latencies.append(transit_ms)
+        self._update_jitter(transit_ms)
+
+        if self._next_sequence is None:
+            self._next_sequence = sequence
+        elif sequence < self._next_sequence:
+            if self._next_sequence - sequence > MAX_SEQUENCE_GAP:
+                self._resync(sequence)
+            else:
+                self.stats["late"] += 1
+                return False
+        elif sequence - self._next_sequence > MAX_SEQUENCE_GAP:
+            self._resync(sequence)
+
+        if sequence in self._frames:
+            self.stats["duplicates"] += 1
+            return False
+
+        if self._highest_sequence is not None and sequence < self._highest_sequence:
+            self.stats["reordered"] += 1
+        self._highest_sequence = sequence if self._highest_sequence is None else max(self._highest_sequence, sequence)
+
+        self._frames[sequence] = chunk
+        return True
+
+    def pop_ready(self, now: float) -> List[Any]:
+        """Libérer les trames jouables, dans l'ordre, en masquant les pertes confirmées"""
+        ready = []
+        while self._frames:
+            chunk = self._frames.pop(self._next_sequence, None)
+            if chunk is not None:
+                ready.append(self._release(chunk))
+                continue
+
+            # Trou de séquence: attendre dans la limite de la profondeur cible
+            if self._gap_since is None:
+                self._gap_since = now
+            waited_ms = (now - self._gap_since) * 1000
+            if len(self._frames) <= self.target_depth and waited_ms < self.target_depth * self.frame_duration_ms:
+                break
+
+            self.stats["lost"] += 1
+            concealed = self._conceal(self._next_sequence)
+            if concealed is not None:
+                ready.append(concealed)
+            else:
+                self._advance()
+        return ready
+
+    def flush(self) -> List[Any]:
+        """Libérer tout le contenu (fin de session): les trous restants sont comptés perdus"""
+        ready = []
+        while self._frames:
+            chunk = self._frames.pop(self._next_sequence, None)
+            if chunk is None:
+                self.stats["lost"] += 1
+                self._advance()
+                continue
+            ready.append(self._release(chunk))
+        return ready
+
+    def _release(self, chunk):
+        self.stats["released"] += 1
+        self._last_released = chunk
+        self._concealed_run = 0
+        self._advance()
+        return chunk
+
+    def _advance(self):
+        self._next_sequence += 1
+        self._gap_since = None
+
+    def _conceal(self, sequence: int):
+        """Trame de masquage pour une séquence perdue (None si masquage désactivé)"""
+        if not self.conceal or self._last_released is None:
+            return None
+
+        template = self._last_released
+        self._concealed_run += 1
+        if template.format in ("pcm_s16le", "wav") and len(template.data) % 2 == 0:
+            # Répétition de la dernière trame, atténuée de 6 dB par trame perdue consécutive
+            samples = np.frombuffer(template.data, dtype=np.int16)
+            data = (samples >> self._concealed_run).astype(np.int16).tobytes() if self._concealed_run < 16 else bytes(len(template.data))
+        else:
+            data = b""  # Opus: masquage délégué au PLC du décodeur
+
+        self.stats["concealed"] += 1
+        self._advance()
+        return replace(template, id=f"{template.id}:plc{sequence}", data=data, sequence=sequence, concealed=True)
+
+    def _resync(self, sequence: int):
+        """Discontinuité de séquence: vider et repartir de la nouvelle séquence"""
+        self.stats["resyncs"] += 1
+        self._frames.clear()
+        self._next_sequence = sequence
+        self._highest_sequence = None
+        self._gap_since = None
+
+    def _update_jitter(self, transit_ms: float):
+        """Gigue d'inter-arrivée RFC 3550: J += (|D| - J) / 16, D = variation du temps de transit"""
+        if self._last_transit is not None:
+            delta = abs(transit_ms - self._last_transit)
+            self.jitter_ms += (delta - self.jitter_ms) / 16
+        self._last_transit = transit_ms
+
+        if self.adaptive:
+            depth = math.ceil(self.jitter_factor * self.jitter_ms / self.frame_duration_ms)
+            self.target_depth = min(self.max_depth, max(self.min_depth, depth))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Latences p50/p95/p99 (ms), taux de perte et état du buffer"""
+        expected = self.stats["released"] + self.stats["lost"]
+        if self._latencies:
+            p50, p95, p99 = np.percentile(np.fromiter(self._latencies, dtype=float), [50, 95, 99])
+        else:
+            p50 = p95 = p99 = 0.0
+        return {
+            **self.stats,
+            "depth": self.depth,
+            "target_depth": self.target_depth,
+            "jitter_ms": self.jitter_ms,
+            "loss_rate": self.stats["lost"] / expected if expected else 0.0,
+            "latency_p50_ms": float(p50),
+            "latency_p95_ms": float(p95),
+            "latency_p99_ms": float(p99)
+        }
@@ -12,6 +12,9 @@ from typing import Dict, Any, List, Optional, Tuple, AsyncGenerator
 from dataclasses import dataclass
 from enum import Enum
 
+from utils.http_pool import get_http_pool
+from utils.single_flight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 class ModelSelectionStrategy(Enum):
@@ -48,6 +51,11 @@ class LLMManager:
         self.fallback_url = fallback_url
         self.strategy = strategy
         
+        # Clients HTTP keep-alive partagés (connexions réutilisées entre requêtes)
+        http_pool = get_http_pool()
+        self.gateway_client = http_pool.register("llm_gateway", gateway_url)
+        self.fallback_client = http_pool.register("ollama_fallback", fallback_url)
+        
         # État du système
         self.gateway_available = True
         self.gateway_last_check = 0
@@ -57,6 +65,9 @@ class LLMManager:
         self.response_cache: Dict[str, LLMResponse] = {}
         self.cache_ttl = 300  # 5 minutes
         
+        # Coalescence des requêtes identiques concurrentes
+        self.single_flight = SingleFlight("llm_manager")
+        
         # Statistiques
         self.stats = {
             "total_requests": 0,
@@ -102,20 +113,19 @@ class LLMManager:
     async def _check_gateway_health(self):
         """Vérification santé LLM Gateway"""
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.get(f"{self.gateway_url}/api/health") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        self.gateway_available = data.get("status") == "healthy"
-                        self.gateway_last_check = time.time()
+            async with self.gateway_client.get("/api/health", timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self.gateway_available = data.get("status") == "healthy"
+                    self.gateway_last_check = time.time()
+                    
+                    if self.gateway_available:
+                        self._reset_circuit_breaker()
                         
-                        if self.gateway_available:
-                            self._reset_circuit_breaker()
-                            
-                        logger.debug(f"Gateway santé: {'✓' if self.gateway_available else '✗'}")
-                    else:
-                        self.gateway_available = False
-                        self._record_failure()
+                    logger.debug(f"Gateway santé: {'✓' if self.gateway_available else '✗'}")
+                else:
+                    self.gateway_available = False
+                    self._record_failure()
                         
         except Exception as e:
             self.gateway_available = False
@@ -193,20 +203,10 @@ class LLMManager:
                 return cached
         
         try:
-            # Décider service à utiliser
-            use_gateway = self._should_use_gateway()
-            
-            if use_gateway:
-                response = await self._request_gateway(messages, stream, **kwargs)
-                self.stats["gateway_requests"] += 1
-            else:
-                response = await self._request_fallback(messages, stream, **kwargs)
-                self.stats["fallback_requests"] += 1
-            
-            # Mettre en cache si pertinent
-            if not stream and len(response.content) > 10:
-                response.cached_at = time.time()
-                self.response_cache[cache_key] = response
+            # Une seule génération en vol par requête identique
+            response = await self.single_flight.do(
+                cache_key, lambda: self._generate(cache_key, messages, stream, **kwargs)
+            )
             
             # Mise à jour statistiques
             response_time = time.time() - start_time
@@ -228,6 +228,25 @@ class LLMManager:
             logger.error(f"❌ Erreur LLM completion: {e}")
             raise
     
+    async def _generate(self, cache_key: str, messages: List[Dict], stream: bool, **kwargs) -> LLMResponse:
+        """Génération effective (exécutée une fois par groupe de requêtes identiques)"""
+        # Décider service à utiliser
+        use_gateway = self._should_use_gateway()
+        
+        if use_gateway:
+            response = await self._request_gateway(messages, stream, **kwargs)
+            self.stats["gateway_requests"] += 1
+        else:
+            response = await self._request_fallback(messages, stream, **kwargs)
+            self.stats["fallback_requests"] += 1
+        
+        # Mettre en cache si pertinent
+        if not stream and len(response.content) > 10:
+            response.cached_at = time.time()
+            self.response_cache[cache_key] = response
+        
+        return response
+    
     async def _request_gateway(self, messages: List[Dict], stream: bool, **kwargs) -> LLMResponse:
         """Requête via LLM Gateway"""
         
@@ -238,44 +257,43 @@ class LLMManager:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.gateway_url}/api/chat",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Gateway error {response.status}: {error_text}")
+            async with self.gateway_client.post(
+                "/api/chat",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120)
+            ) as response:
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Gateway error {response.status}: {error_text}")
+                
+                if stream:
+                    # TODO: Implémenter streaming
+                    raise NotImplementedError("Streaming via gateway pas encore implémenté")
+                else:
+                    data = await response.json()
                     
-                    if stream:
-                        # TODO: Implémenter streaming
-                        raise NotImplementedError("Streaming via gateway pas encore implémenté")
+                    # Parser réponse gateway
+                    if "response" in data and "metadata" in data:
+                        return LLMResponse(
+                            content=data["response"].get("message", {}).get("content", ""),
+                            model_used=data["metadata"]["model_used"],
+                            complexity_score=data["metadata"]["complexity_score"],
+                            response_time=data["metadata"]["response_time"],
+                            gpu_status=data["metadata"]["gpu_status"],
+                            token_count=len(data["response"].get("message", {}).get("content", "").split())
+                        )
                     else:
-                        data = await response.json()
+                        # Format direct Ollama
+                        return LLMResponse(
+                            content=data.get("message", {}).get("content", ""),
+                            model_used="unknown",
+                            complexity_score=0.5,
+                            response_time=0.0,
+                            gpu_status="unknown",
+                            token_count=len(data.get("message", {}).get("content", "").split())
+                        )
                         
-                        # Parser réponse gateway
-                        if "response" in data and "metadata" in data:
-                            return LLMResponse(
-                                content=data["response"].get("message", {}).get("content", ""),
-                                model_used=data["metadata"]["model_used"],
-                                complexity_score=data["metadata"]["complexity_score"],
-                                response_time=data["metadata"]["response_time"],
-                                gpu_status=data["metadata"]["gpu_status"],
-                                token_count=len(data["response"].get("message", {}).get("content", "").split())
-                            )
-                        else:
-                            # Format direct Ollama
-                            return LLMResponse(
-                                content=data.get("message", {}).get("content", ""),
-                                model_used="unknown",
-                                complexity_score=0.5,
-                                response_time=0.0,
-                                gpu_status="unknown",
-                                token_count=len(data.get("message", {}).get("content", "").split())
-                            )
-                            
         except Exception as e:
             self._record_failure()
             logger.error(f"❌ Erreur requête gateway: {e}")
@@ -299,29 +317,28 @@ class LLMManager:
         try:
             start_time = time.time()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.fallback_url}/api/chat",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Fallback error {response.status}: {error_text}")
-                    
-                    data = await response.json()
-                    response_time = time.time() - start_time
-                    
-                    return LLMResponse(
-                        content=data.get("message", {}).get("content", ""),
-                        model_used=payload["model"],
-                        complexity_score=0.3,  # Score par défaut pour fallback
-                        response_time=response_time,
-                        gpu_status="fallback",
-                        token_count=len(data.get("message", {}).get("content", "").split())
-                    )
-                    
+            async with self.fallback_client.post(
+                "/api/chat",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=120)
+            ) as response:
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Fallback error {response.status}: {error_text}")
+                
+                data = await response.json()
+                response_time = time.time() - start_time
+                
+                return LLMResponse(
+                    content=data.get("message", {}).get("content", ""),
+                    model_used=payload["model"],
+                    complexity_score=0.3,  # Score par défaut pour fallback
+                    response_time=response_time,
+                    gpu_status="fallback",
+                    token_count=len(data.get("message", {}).get("content", "").split())
+                )
+                
         except Exception as e:
             logger.error(f"❌ Erreur fallback: {e}")
             raise
@@ -329,30 +346,88 @@ class LLMManager:
     async def stream_completion(self, messages: List[Dict], **kwargs) -> AsyncGenerator[LLMStreamChunk, None]:
         """
         Streaming completion avec sélection intelligente
+        Les flux identiques concurrents partagent une seule génération (chunks diffusés à tous)
         """
-        # TODO: Implémenter streaming complet
-        # Pour l'instant, simuler streaming depuis réponse normale
-        
-        response = await self.chat_completion(messages, stream=False, **kwargs)
+        cache_key = self._generate_cache_key(messages, stream=True, **kwargs)
+        async for chunk in self.single_flight.stream(cache_key, lambda: self._stream_chunks(messages, **kwargs)):
+            yield chunk
+    
+    async def _stream_chunks(self, messages: List[Dict], **kwargs) -> AsyncGenerator[LLMStreamChunk, None]:
+        """Production des chunks d'une génération en streaming (NDJSON Ollama, relayé tel quel par le gateway)"""
+        self.stats["total_requests"] += 1
         
-        # Diviser réponse en chunks pour simuler streaming
-        words = response.content.split()
-        chunk_size = max(1, len(words) // 10)  # ~10 chunks
+        if self._should_use_gateway():
+            emitted = False
+            try:
+                payload = {"messages": messages, "stream": True, **kwargs}
+                async for chunk in self._read_stream(self.gateway_client, payload, "gateway"):
+                    emitted = True
+                    yield chunk
+                self.stats["gateway_requests"] += 1
+                return
+            except Exception as e:
+                # Une fois des tokens transmis, impossible de reprendre sur le fallback
+                if emitted:
+                    self.stats["errors"] += 1
+                    raise
+                self._record_failure()
+                logger.warning(f"⚠️ Streaming gateway indisponible, fallback: {e}")
         
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunk_content = " ".join(chunk_words)
-            
-            is_final = i + chunk_size >= len(words)
-            
-            yield LLMStreamChunk(
-                content=chunk_content + (" " if not is_final else ""),
-                is_final=is_final,
-                metadata={"model": response.model_used} if is_final else None
-            )
+        payload = {
+            "model": kwargs.get("model", "llama3.2:3b"),
+            "messages": messages,
+            "stream": True,
+            "options": {
+                "temperature": kwargs.get("temperature", 0.7),
+                "top_p": kwargs.get("top_p", 0.9),
+                "max_tokens": kwargs.get("max_tokens", 2048)
+            }
+        }
+        try:
+            async for chunk in self._read_stream(self.fallback_client, payload, payload["model"]):
+                yield chunk
+            self.stats["fallback_requests"] += 1
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+    
+    async def _read_stream(self, client, payload: Dict, default_model: str) -> AsyncGenerator[LLMStreamChunk, None]:
+        """Lire une réponse /api/chat en streaming, une ligne JSON par token"""
+        async with client.post(
+            "/api/chat",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=120)
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise Exception(f"Stream error {response.status}: {error_text}")
             
-            # Petit délai pour simuler streaming réaliste
-            await asyncio.sleep(0.1)
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith(b"data:"):  # Erreur signalée par le gateway en cours de flux
+                    line = line[5:].strip()
+                
+                data = json.loads(line)
+                if "error" in data:
+                    raise Exception(f"Stream error: {data['error']}")
+                
+                done = data.get("done", False)
+                content = data.get("message", {}).get("content", "")
+                if not content and not done:
+                    continue
+                
+                yield LLMStreamChunk(
+                    content=content,
+                    is_final=done,
+                    metadata={
+                        "model": data.get("model", default_model),
+                        "eval_count": data.get("eval_count")
+                    } if done else None
+                )
+                if done:
+                    return
     
     def get_stats(self) -> Dict[str, Any]:
         """Récupérer statistiques détaillées"""
@@ -361,6 +436,11 @@ class LLMManager:
             "gateway_available": self.gateway_available,
             "circuit_breaker": self.circuit_breaker,
             "cache_size": len(self.response_cache),
+            "coalescing": self.single_flight.get_stats(),
+            "http": {
+                "gateway": self.gateway_client.get_stats(),
+                "fallback": self.fallback_client.get_stats()
+            },
             "strategy": self.strategy.value
         }
     
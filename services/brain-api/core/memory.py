@@ -24,11 +24,15 @@ from sqlalchemy import text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.types import String, DateTime, Integer, Float, JSON, Text
+from pgvector.sqlalchemy import Vector
 
 # Redis imports
 import redis.asyncio as redis
 from redis.asyncio.connection import ConnectionPool as RedisConnectionPool
 
+from .vector_index import VectorIndexManager
+from utils.embedding_engine import EmbeddingEngine, get_embedding_engine
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -70,6 +74,7 @@ class MemoryEntryModel(Base):
     type: Mapped[str] = mapped_column(String, nullable=False, index=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     embedding: Mapped[List[float]] = mapped_column(JSON, nullable=True)
+    embedding_vector: Mapped[Optional[List[float]]] = mapped_column(Vector(384), nullable=True)
     meta_data: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -82,6 +87,9 @@ class MemoryEntryModel(Base):
         Index('idx_memory_user_type', 'meta_data', 'type'),
         Index('idx_memory_created', 'created_at'),
         Index('idx_memory_relevance', 'relevance_score'),
+        Index('idx_memory_embedding_hnsw', 'embedding_vector', postgresql_using='hnsw',
+              postgresql_with={'m': 16, 'ef_construction': 64},
+              postgresql_ops={'embedding_vector': 'vector_cosine_ops'}),
     )
 
 class UserProfileModel(Base):
@@ -106,7 +114,8 @@ class HybridMemoryManager:
     - Cache multi-niveaux avec TTL
     """
     
-    def __init__(self, db_url: str, redis_url: str):
+    def __init__(self, db_url: str, redis_url: str, retrieval_mode: str = "memory",
+                 hnsw_ef_search: int = 64):
         self.db_url = db_url
         self.redis_url = redis_url
         
@@ -116,6 +125,9 @@ class HybridMemoryManager:
         self.redis_pool = None
         self.redis_client = None
         
+        # Moteur d'embeddings partagé (micro-batching + cache LRU/embedding_cache)
+        self.embedding_engine: Optional[EmbeddingEngine] = None
+        
         # Cache en mémoire local (L1 cache)
         self.static_memory: Dict[str, MemoryEntry] = {}
         self.dynamic_memory: Dict[str, MemoryEntry] = {}
@@ -127,6 +139,22 @@ class HybridMemoryManager:
         self.max_episodic_entries = 1000
         self.vector_dimension = 384
         
+        # Index vectoriel par utilisateur (L1 de recherche)
+        self.ivf_threshold = 20000  # vecteurs avant activation IVF
+        self.ivf_nprobe = 8
+        self.vector_index = VectorIndexManager(
+            self.vector_dimension,
+            ivf_threshold=self.ivf_threshold,
+            ivf_nprobe=self.ivf_nprobe
+        )
+        
+        # Recherche: memory (index L1), database (pgvector HNSW), hybrid (les deux + re-rank)
+        if retrieval_mode not in ("memory", "database", "hybrid"):
+            raise ValueError(f"Mode de récupération inconnu: {retrieval_mode}")
+        self.retrieval_mode = retrieval_mode
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ann_oversample = 4  # candidats DB = limit * oversample avant re-rank
+        
         # Cache TTL (seconds)
         self.static_cache_ttl = 86400 * 30  # 30 days
         self.dynamic_cache_ttl = 3600  # 1 hour
@@ -173,6 +201,12 @@ class HybridMemoryManager:
             # 3. Créer les tables si nécessaire
             await self._create_tables()
             
+            # 3.1 Moteur d'embeddings partagé adossé à embedding_cache
+            self.embedding_engine = await get_embedding_engine(
+                dimension=self.vector_dimension,
+                session_factory=self.db_session_factory
+            )
+            
             # 4. Charger les données depuis les DB avec cache
             await self._load_user_profiles()
             await self._load_static_memory()
@@ -289,6 +323,39 @@ class HybridMemoryManager:
                 # Créer toutes les tables
                 await conn.run_sync(Base.metadata.create_all)
                 
+                # Colonne pgvector + index HNSW pour les tables créées avant leur introduction
+                await conn.execute(text(
+                    f"ALTER TABLE memory_entries ADD COLUMN IF NOT EXISTS embedding_vector vector({self.vector_dimension})"
+                ))
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_memory_embedding_hnsw
+                    ON memory_entries USING hnsw (embedding_vector vector_cosine_ops)
+                    WITH (m = 16, ef_construction = 64)
+                """))
+                backfill = await conn.execute(text("""
+                    UPDATE memory_entries
+                    SET embedding_vector = (embedding::text)::vector
+                    WHERE embedding_vector IS NULL AND embedding IS NOT NULL
+                """))
+                if backfill.rowcount:
+                    logger.info(f"🧭 {backfill.rowcount} embeddings migrés vers pgvector")
+                
+                # Cache d'embeddings persistant (schéma de database/models/memory.py)
+                await conn.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS embedding_cache (
+                        id SERIAL PRIMARY KEY,
+                        uuid VARCHAR(36) UNIQUE NOT NULL,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                        is_active BOOLEAN NOT NULL DEFAULT TRUE,
+                        hash_key VARCHAR(64) UNIQUE NOT NULL,
+                        embedding vector({self.vector_dimension}) NOT NULL,
+                        model_name VARCHAR(100) NOT NULL DEFAULT 'all-MiniLM-L6-v2',
+                        access_count INTEGER NOT NULL DEFAULT 1,
+                        last_accessed TIMESTAMPTZ DEFAULT NOW()
+                    )
+                """))
+                
             logger.info("✅ Tables PostgreSQL créées/vérifiées")
             
         except Exception as e:
@@ -368,6 +435,7 @@ class HybridMemoryManager:
                     type="static",
                     content=content,
                     embedding=entry.embedding,
+                    embedding_vector=entry.embedding,
                     meta_data=entry.meta_data,
                     created_at=entry.created_at,
                     updated_at=entry.updated_at,
@@ -382,6 +450,7 @@ class HybridMemoryManager:
         
         # Stocker dans le cache local (L1)
         self.static_memory[memory_id] = entry
+        self.vector_index.add(entry)
         
         # Stocker dans Redis (L2)
         try:
@@ -431,6 +500,7 @@ class HybridMemoryManager:
         )
         
         self.dynamic_memory[memory_id] = entry
+        self.vector_index.add(entry)
         self.stats["dynamic_memories"] += 1
         self.stats["total_memories"] += 1
         self.stats["memory_updates"] += 1
@@ -474,7 +544,7 @@ class HybridMemoryManager:
             updated_at=datetime.now()
         )
         
-        self.episodic_memory.append(entry)
+        self._append_episode(entry)
         self.stats["episodic_memories"] += 1
         self.stats["total_memories"] += 1
         self.stats["memory_updates"] += 1
@@ -504,41 +574,31 @@ class HybridMemoryManager:
         # Générer embedding de la requête
         query_embedding = await self._generate_embedding(query)
         
-        # Collecter toutes les mémoires candidates
-        candidates = []
-        
-        if "static" in memory_types:
-            candidates.extend([entry for entry in self.static_memory.values() 
-                             if entry.meta_data.get("user_id") == user_id])
-        
-        if "dynamic" in memory_types:
-            candidates.extend([entry for entry in self.dynamic_memory.values() 
-                             if entry.meta_data.get("user_id") == user_id])
-        
-        if "episodic" in memory_types:
-            candidates.extend([entry for entry in self.episodic_memory 
-                             if entry.meta_data.get("user_id") == user_id])
-        
-        # Calculer la similarité et trier
+        # Top-k vectorisé sur l'index de l'utilisateur (similarité + bonus récence/fréquence)
         scored_memories = []
-        for memory in candidates:
-            if memory.embedding:
-                similarity = self._calculate_similarity(query_embedding, memory.embedding)
-                # Ajouter bonus pour accès récent et fréquence
-                recency_bonus = self._calculate_recency_bonus(memory)
-                frequency_bonus = self._calculate_frequency_bonus(memory)
-                
-                total_score = similarity + recency_bonus + frequency_bonus
-                scored_memories.append((total_score, memory))
+        if self.retrieval_mode in ("memory", "hybrid"):
+            scored_memories = self.vector_index.search(user_id, query_embedding, memory_types, limit)
+        
+        # Plus proches voisins côté PostgreSQL (HNSW) puis re-rank hybride
+        db_ids = set()
+        if self.retrieval_mode in ("database", "hybrid"):
+            db_candidates = await self._get_candidates_from_db(
+                user_id, memory_types, query_embedding, limit * self.ann_oversample
+            )
+            db_ids = {memory.id for memory in db_candidates}
+            scored_memories = self._rerank_candidates(scored_memories, db_candidates, query_embedding)
         
-        # Trier par score décroissant et limiter
-        scored_memories.sort(key=lambda x: x[0], reverse=True)
         results = [memory for score, memory in scored_memories[:limit]]
         
         # Mettre à jour les statistiques d'accès
         for memory in results:
             memory.access_count += 1
             memory.last_accessed = datetime.now()
+            self.vector_index.touch(memory)
+        
+        persisted_ids = [memory.id for memory in results if memory.id in db_ids]
+        if persisted_ids:
+            await self._update_access_stats_batch(persisted_ids)
         
         # Mettre à jour le temps de récupération moyen
         retrieval_time = time.time() - start_time
@@ -632,68 +692,22 @@ class HybridMemoryManager:
         return context
     
     async def _generate_embedding(self, text: str) -> List[float]:
-        """Générer un embedding vectoriel pour le texte"""
-        try:
-            # Tentative d'utiliser sentence-transformers si disponible
-            try:
-                from sentence_transformers import SentenceTransformer
-                if not hasattr(self, '_encoder'):
-                    self._encoder = SentenceTransformer('all-MiniLM-L6-v2')
-                
-                embedding = self._encoder.encode(text, convert_to_numpy=True)
-                return embedding.tolist()
-            except ImportError:
-                # Fallback vers un embedding simple si sentence-transformers n'est pas disponible
-                pass
-        except Exception as e:
-            logger.warning(f"Erreur lors de la génération d'embedding: {e}")
+        """Générer un embedding vectoriel pour le texte (lot partagé + cache par hash)"""
+        if self.embedding_engine is None:
+            self.embedding_engine = await get_embedding_engine(dimension=self.vector_dimension)
         
-        # Vérifier d'abord le cache des embeddings
-        try:
-            embedding_key = f"embedding:{hashlib.md5(text.encode()).hexdigest()}"
-            cached_embedding = await self.redis_client.get(embedding_key)
-            if cached_embedding:
-                return json.loads(cached_embedding)
-        except Exception as e:
-            logger.warning(f"⚠️ Erreur lecture cache embedding: {e}")
-        
-        # Fallback: embedding basé sur TF-IDF simplifié
-        import math
-        
-        # Tokenization simple
-        words = text.lower().split()
-        word_freq = {}
-        for word in words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # Créer un vecteur basé sur les mots les plus fréquents
-        embedding = [0.0] * min(self.vector_dimension, 384)
-        
-        for i, word in enumerate(list(word_freq.keys())[:len(embedding)]):
-            # Utiliser le hash pour générer une valeur reproductible
-            hash_val = hashlib.md5(word.encode()).hexdigest()
-            # Convertir en float normalisé
-            val = int(hash_val[:8], 16) / (16**8)
-            # Appliquer la fréquence du mot
-            embedding[i] = val * math.log(1 + word_freq[word])
-        
-        # Normaliser le vecteur
-        norm = math.sqrt(sum(x*x for x in embedding))
-        if norm > 0:
-            embedding = [x/norm for x in embedding]
-        
-        # Mise en cache de l'embedding
         try:
-            embedding_key = f"embedding:{hashlib.md5(text.encode()).hexdigest()}"
-            await self.redis_client.setex(
-                embedding_key,
-                3600,  # 1 heure
-                json.dumps(embedding)
-            )
+            return await self.embedding_engine.embed(text)
         except Exception as e:
-            logger.warning(f"⚠️ Erreur cache embedding: {e}")
-        
-        return embedding
+            logger.warning(f"Erreur lors de la génération d'embedding: {e}")
+            return self.embedding_engine.hash_embedding(text)
+    
+    def _append_episode(self, entry: MemoryEntry):
+        """Ajouter un épisode en gardant l'index synchronisé avec l'éviction du deque"""
+        if len(self.episodic_memory) == self.episodic_memory.maxlen:
+            self.vector_index.remove(self.episodic_memory[0].id)
+        self.episodic_memory.append(entry)
+        self.vector_index.add(entry)
     
     def _calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculer la similarité cosinus entre deux embeddings"""
@@ -812,6 +826,7 @@ class HybridMemoryManager:
             to_remove = user_dynamic_memories[max_entries:]
             for memory in to_remove:
                 del self.dynamic_memory[memory.id]
+                self.vector_index.remove(memory.id)
                 self.stats["dynamic_memories"] -= 1
                 self.stats["total_memories"] -= 1
     
@@ -884,6 +899,7 @@ class HybridMemoryManager:
                         entry_data['last_accessed'] = datetime.fromisoformat(entry_data['last_accessed'])
                     
                     self.static_memory[memory_id] = MemoryEntry(**entry_data)
+                    self.vector_index.add(self.static_memory[memory_id])
                 
                 logger.info(f"💾 {len(self.static_memory)} mémoires statiques chargées")
             else:
@@ -909,7 +925,7 @@ class HybridMemoryManager:
                     if episode_data.get('last_accessed'):
                         episode_data['last_accessed'] = datetime.fromisoformat(episode_data['last_accessed'])
                     
-                    self.episodic_memory.append(MemoryEntry(**episode_data))
+                    self._append_episode(MemoryEntry(**episode_data))
                 
                 logger.info(f"📝 {len(self.episodic_memory)} épisodes récents chargés")
             else:
@@ -972,31 +988,64 @@ class HybridMemoryManager:
         return {
             **self.stats,
             "users_count": len(self.user_profiles),
+            "vector_index": self.vector_index.get_stats(),
+            "retrieval_mode": self.retrieval_mode,
+            "embedding_engine": self.embedding_engine.get_stats() if self.embedding_engine else None,
             "interaction_count": self.interaction_count,
             "last_dynamic_update": self.last_dynamic_update
         }
     
-    async def _get_candidates_from_db(self, user_id: str, memory_types: List[str], query_embedding: List[float]) -> List[MemoryEntry]:
-        """Récupérer les candidats depuis PostgreSQL avec requête optimisée"""
+    def _rerank_candidates(self, scored_memories: List[Tuple[float, MemoryEntry]],
+                           db_candidates: List[MemoryEntry],
+                           query_embedding: List[float]) -> List[Tuple[float, MemoryEntry]]:
+        """Fusionner les candidats L1 et PostgreSQL et les re-classer avec le même score"""
+        merged = {memory.id: (score, memory) for score, memory in scored_memories}
+        
+        for memory in db_candidates:
+            if memory.id in merged:
+                continue
+            # La version L1 porte les compteurs d'accès les plus frais
+            local = self.static_memory.get(memory.id) or self.dynamic_memory.get(memory.id)
+            if local is not None:
+                memory = local
+            
+            similarity = self._calculate_similarity(query_embedding, memory.embedding)
+            total_score = similarity + self._calculate_recency_bonus(memory) + self._calculate_frequency_bonus(memory)
+            merged[memory.id] = (float(total_score), memory)
+        
+        return sorted(merged.values(), key=lambda x: x[0], reverse=True)
+    
+    async def _get_candidates_from_db(self, user_id: str, memory_types: List[str], query_embedding: List[float],
+                                      limit: int = 50) -> List[MemoryEntry]:
+        """Récupérer les plus proches voisins depuis PostgreSQL (pgvector HNSW, distance cosinus)"""
+        if not query_embedding:
+            return []
+        
         try:
             async with self.db_session_factory() as session:
-                # Requête optimisée avec similarité vectorielle si disponible
-                placeholders = ','.join([f"'{t}'" for t in memory_types])
-                query = text(f"""
+                # ef_search borne le nombre de voisins explorés: doit couvrir limit après filtrage
+                await session.execute(
+                    text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                    {"ef_search": str(max(self.hnsw_ef_search, limit))}
+                )
+                
+                query = text("""
                     SELECT id, type, content, embedding, meta_data, created_at, updated_at, 
                            access_count, last_accessed, relevance_score
                     FROM memory_entries 
                     WHERE meta_data->>'user_id' = :user_id 
-                    AND type IN ({placeholders})
-                    AND embedding IS NOT NULL
-                    ORDER BY 
-                        relevance_score DESC,
-                        last_accessed DESC NULLS LAST,
-                        created_at DESC
-                    LIMIT 50
+                    AND type = ANY(:memory_types)
+                    AND embedding_vector IS NOT NULL
+                    ORDER BY embedding_vector <=> CAST(:query_embedding AS vector)
+                    LIMIT :limit
                 """)
                 
-                result = await session.execute(query, {"user_id": user_id})
+                result = await session.execute(query, {
+                    "user_id": user_id,
+                    "memory_types": list(memory_types),
+                    "query_embedding": json.dumps(query_embedding),
+                    "limit": limit
+                })
                 rows = result.fetchall()
                 
                 candidates = []
@@ -0,0 +1,305 @@
+"""
+🧭 Index Vectoriel en Mémoire - JARVIS Brain API
+Matrice d'embeddings contiguë par utilisateur (float32, pré-normalisée)
+Recherche top-k vectorisée (matmul + argpartition) avec mode IVF optionnel
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Codes de type stockés dans la matrice (int8)
+MEMORY_TYPE_CODES = {"static": 0, "dynamic": 1, "episodic": 2}
+
+
+class UserVectorIndex:
+    """
+    Index vectoriel d'un utilisateur:
+    - Matrice float32 contiguë, lignes normalisées (cosinus = produit scalaire)
+    - Map id -> ligne, suppression O(1) par échange avec la dernière ligne
+    - Colonnes parallèles pour type, nombre d'accès et dernier accès
+    - Mode IVF (k-means grossier) activé au-delà d'un seuil de taille
+    """
+
+    def __init__(self, dimension: int, initial_capacity: int = 256,
+                 ivf_threshold: int = 20000, ivf_nprobe: int = 8):
+        self.dimension = dimension
+        self.size = 0
+
+        self._capacity = initial_capacity
+        self._vectors = np.zeros((initial_capacity, dimension), dtype=np.float32)
+        self._types = np.zeros(initial_capacity, dtype=np.int8)
+        self._access_counts = np.zeros(initial_capacity, dtype=np.float32)
+        self._last_accessed = np.zeros(initial_capacity, dtype=np.float64)
+
+        self._ids: List[str] = []
+        self._entries: List[Any] = []
+        self._rows: Dict[str, int] = {}
+
+        # IVF (inverted file) pour les très gros utilisateurs
+        self.ivf_threshold = ivf_threshold
+        self.ivf_nprobe = ivf_nprobe
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(initial_capacity, dtype=np.int32)
+        self._ivf_built_size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._rows
+
+    def _grow(self):
+        """Doubler la capacité des tableaux"""
+        new_capacity = self._capacity * 2
+        for name in ("_vectors", "_types", "_access_counts", "_last_accessed", "_assignments"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self._capacity = new_capacity
+
+    def add(self, entry: Any) -> bool:
+        """Ajouter ou remplacer une entrée mémoire (doit porter un embedding)"""
+        if not entry.embedding:
+            return False
+
+        vector = np.asarray(entry.embedding, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            logger.warning(f"⚠️ Dimension embedding invalide pour {entry.id}: {vector.shape}")
+            return False
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+
+        row = self._rows.get(entry.id)
+        if row is None:
+            if self.size == self._capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+            self._ids.append(entry.id)
+            self._entries.append(entry)
+            self._rows[entry.id] = row
+        else:
+            self._entries[row] = entry
+
+        self._vectors[row] = vector
+        self._types[row] = MEMORY_TYPE_CODES.get(entry.type, -1)
+        self._access_counts[row] = entry.access_count
+        self._last_accessed[row] = _to_timestamp(entry.last_accessed)
+
+        if self._centroids is not None:
+            self._assignments[row] = int(np.argmax(self._centroids @ vector))
+        self._maybe_build_ivf()
+        return True
+
+    def remove(self, memory_id: str) -> bool:
+        """Supprimer une entrée (échange avec la dernière ligne)"""
+        row = self._rows.pop(memory_id, None)
+        if row is None:
+            return False
+
+        last = self.size - 1
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            self._types[row] = self._types[last]
+            self._access_counts[row] = self._access_counts[last]
+            self._last_accessed[row] = self._last_accessed[last]
+            self._assignments[row] = self._assignments[last]
+            self._ids[row] = self._ids[last]
+            self._entries[row] = self._entries[last]
+            self._rows[self._ids[row]] = row
+
+        self._ids.pop()
+        self._entries.pop()
+        self.size -= 1
+        return True
+
+    def touch(self, memory_id: str, access_count: int, last_accessed: Optional[datetime]):
+        """Synchroniser les colonnes d'accès après une récupération"""
+        row = self._rows.get(memory_id)
+        if row is not None:
+            self._access_counts[row] = access_count
+            self._last_accessed[row] = _to_timestamp(last_accessed)
+
+    def search(self, query: np.ndarray, type_codes: Optional[List[int]], limit: int,
+               now: Optional[float] = None) -> List[Tuple[float, Any]]:
+        """
+        Recherche top-k vectorisée
+
+        Args:
+            query: Embedding de requête déjà normalisé (float32)
+            type_codes: Codes de types autorisés (None = tous)
+            limit: Nombre de résultats
+            now: Horodatage de référence pour le bonus de récence
+
+        Returns:
+            List[Tuple[float, entry]]: Résultats triés par score décroissant
+        """
+        if self.size == 0 or limit <= 0:
+            return []
+
+        n = self.size
+        candidates = None
+
+        if self._centroids is not None and n >= self.ivf_threshold:
+            probe = np.argsort(self._centroids @ query)[-self.ivf_nprobe:]
+            candidates = np.flatnonzero(np.isin(self._assignments[:n], probe))
+
+        if type_codes is not None and len(type_codes) < len(MEMORY_TYPE_CODES):
+            type_mask = np.isin(self._types[:n], type_codes)
+            if candidates is None:
+                candidates = np.flatnonzero(type_mask)
+            else:
+                candidates = candidates[type_mask[candidates]]
+
+        if candidates is None:
+            vectors = self._vectors[:n]
+            access_counts = self._access_counts[:n]
+            last_accessed = self._last_accessed[:n]
+        else:
+            if candidates.size == 0:
+                return []
+            vectors = self._vectors[candidates]
+            access_counts = self._access_counts[candidates]
+            last_accessed = self._last_accessed[candidates]
+
+        scores = vectors @ query
+        scores += self._recency_bonus(last_accessed, now or time.time())
+        scores += np.minimum(0.05 * np.log1p(access_counts), 0.2)
+
+        k = min(limit, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        rows = top if candidates is None else candidates[top]
+        return [(float(scores[i]), self._entries[row]) for i, row in zip(top, rows)]
+
+    @staticmethod
+    def _recency_bonus(last_accessed: np.ndarray, now: float) -> np.ndarray:
+        """Bonus de récence vectorisé (décroissance exponentielle sur 24h)"""
+        hours = (now - last_accessed) / 3600.0
+        bonus = (0.1 * np.exp(-hours / 24.0)).astype(np.float32)
+        bonus[last_accessed <= 0] = 0.0
+        return bonus
+
+    def _maybe_build_ivf(self):
+        """Construire/reconstruire l'IVF quand l'index a doublé depuis la dernière construction"""
+        if self.size < self.ivf_threshold:
+            return
+        if self._centroids is not None and self.size < 2 * self._ivf_built_size:
+            return
+        self.build_ivf()
+
+    def build_ivf(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 42):
+        """Entraîner un k-means sphérique grossier et assigner chaque ligne à un centroïde"""
+        n = self.size
+        if n == 0:
+            return
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+
+        data = self._vectors[:n]
+        sample = data[rng.choice(n, size=min(n, n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], size=min(n_lists, sample.shape[0]), replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            non_empty = norms[:, 0] > 0
+            centroids[non_empty] = sums[non_empty] / norms[non_empty]
+
+        self._centroids = centroids
+        self._assignments[:n] = np.argmax(data @ centroids.T, axis=1)
+        self._ivf_built_size = n
+        logger.info(f"🧭 IVF construit: {n} vecteurs, {centroids.shape[0]} listes")
+
+
+class VectorIndexManager:
+    """Regroupe les index vectoriels par utilisateur"""
+
+    def __init__(self, dimension: int, ivf_threshold: int = 20000, ivf_nprobe: int = 8):
+        self.dimension = dimension
+        self.ivf_threshold = ivf_threshold
+        self.ivf_nprobe = ivf_nprobe
+        self._indexes: Dict[str, UserVectorIndex] = {}
+        self._owners: Dict[str, str] = {}
+
+    def add(self, entry: Any) -> bool:
+        """Indexer une entrée mémoire sous l'utilisateur de ses métadonnées"""
+        user_id = entry.meta_data.get("user_id")
+        if user_id is None:
+            return False
+
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = UserVectorIndex(self.dimension, ivf_threshold=self.ivf_threshold,
+                                    ivf_nprobe=self.ivf_nprobe)
+            self._indexes[user_id] = index
+
+        if index.add(entry):
+            self._owners[entry.id] = user_id
+            return True
+        return False
+
+    def remove(self, memory_id: str) -> bool:
+        user_id = self._owners.pop(memory_id, None)
+        if user_id is None:
+            return False
+        return self._indexes[user_id].remove(memory_id)
+
+    def touch(self, entry: Any):
+        user_id = self._owners.get(entry.id)
+        if user_id is not None:
+            self._indexes[user_id].touch(entry.id, entry.access_count, entry.last_accessed)
+
+    def search(self, user_id: str, query_embedding: List[float], memory_types: Optional[List[str]],
+               limit: int) -> List[Tuple[float, Any]]:
+        """Top-k pour un utilisateur, requête normalisée une seule fois"""
+        index = self._indexes.get(user_id)
+        if index is None or not query_embedding:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            return []
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            query = np.zeros_like(query)
+        else:
+            query = query / norm
+
+        type_codes = None
+        if memory_types is not None:
+            type_codes = [MEMORY_TYPE_CODES[t] for t in memory_types if t in MEMORY_TYPE_CODES]
+
+        return index.search(query, type_codes, limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        sizes = [len(index) for index in self._indexes.values()]
+        return {
+            "indexed_users": len(sizes),
+            "indexed_vectors": sum(sizes),
+            "largest_user_index": max(sizes, default=0),
+            "ivf_users": sum(1 for index in self._indexes.values() if index._centroids is not None),
+        }
+
+
+def _to_timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
@@ -53,6 +53,7 @@ class WebSocketHandler:
                 "supported_features": [
                     "chat",
                     "audio_streaming", 
+                    "binary_audio_frames",
                     "real_time_processing",
                     "context_awareness"
                 ]
@@ -264,13 +265,21 @@ class WebSocketWrapper:
         self.fastapi_websocket = fastapi_websocket
         self.client_id = client_id
     
-    async def send(self, message: str):
-        """Envoyer message (compatible avec websockets library)"""
-        await self.fastapi_websocket.send_text(message)
+    async def send(self, message):
+        """Envoyer message texte ou trame binaire (compatible avec websockets library)"""
+        if isinstance(message, (bytes, bytearray)):
+            await self.fastapi_websocket.send_bytes(message)
+        else:
+            await self.fastapi_websocket.send_text(message)
     
     async def recv(self):
-        """Recevoir message (compatible avec websockets library)"""
-        return await self.fastapi_websocket.receive_text()
+        """Recevoir message texte ou trame binaire (compatible avec websockets library)"""
+        message = await self.fastapi_websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+        if message.get("bytes") is not None:
+            return message["bytes"]
+        return message.get("text", "")
     
     async def __aiter__(self):
         """Iterator pour messages (compatible avec websockets library)"""
@@ -6,11 +6,16 @@ Gestion des connexions WebSocket temps réel
 import asyncio
 import json
 import logging
-from typing import Dict, List, Set, Optional, Any
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Set, Optional, Any, Union
 import websockets
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import uuid
 
+from .audio_protocol import AudioFrameError, decode_frame
+from .execution_pool import ExecutionRejected
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -21,11 +26,23 @@ class WebSocketConnection:
     connected_at: float
     last_activity: float
     meta_data: Dict[str, Any]
+    chat_tasks: Dict[str, asyncio.Task] = field(default_factory=dict)  # message_id -> tâche agent
+
+# Types de message routés: seuls ceux-ci (plus "invalid"/"unknown") ont des latences enregistrées
+ROUTED_MESSAGE_TYPES = frozenset({
+    "auth", "chat", "chat_cancel", "audio_chunk", "audio_session_start", "audio_session_end", "ping"
+})
 
 class WebSocketManager:
-    """Gestionnaire des connexions WebSocket pour streaming audio et communication temps réel"""
+    """
+    Gestionnaire des connexions WebSocket pour streaming audio et communication temps réel
+    - Contrôle (auth, ping, sessions) et audio traités directement dans la boucle de réception
+    - Chats exécutés en tâches suivies par connexion (annulables par message_id),
+      avec concurrence bornée globalement et par connexion
+    """
     
-    def __init__(self, agent=None, memory=None, audio_streamer=None):
+    def __init__(self, agent=None, memory=None, audio_streamer=None,
+                 max_concurrent_chats: int = 8, max_chats_per_connection: int = 4):
         self.agent = agent
         self.memory = memory
         self.audio_streamer = audio_streamer
@@ -34,12 +51,24 @@ class WebSocketManager:
         self.connections: Dict[str, WebSocketConnection] = {}
         self.user_connections: Dict[str, List[str]] = {}
         
+        # Dispatcher des chats
+        self.max_chats_per_connection = max_chats_per_connection
+        self._chat_slots = asyncio.Semaphore(max_concurrent_chats)
+        
+        # Latences de traitement par type de message (fenêtre glissante, secondes)
+        self._handling_latency: Dict[str, deque] = defaultdict(lambda: deque(maxlen=512))
+        self._handling_counts: Dict[str, int] = defaultdict(int)
+        
         # Statistiques
         self.stats = {
             "total_connections": 0,
             "active_connections": 0,
             "messages_sent": 0,
-            "messages_received": 0
+            "messages_received": 0,
+            "audio_frames_received": 0,
+            "audio_frames_sent": 0,
+            "chats_rejected": 0,
+            "chats_cancelled": 0
         }
         
         logger.info("🔌 WebSocket Manager initialisé")
@@ -54,7 +83,7 @@ class WebSocketManager:
         """Arrêt propre du gestionnaire"""
         logger.info("🛑 Arrêt WebSocket Manager...")
         
-        # Fermer toutes les connexions
+        # Fermer toutes les connexions (les chats en cours sont annulés)
         for connection in list(self.connections.values()):
             await self._disconnect_client(connection.id)
         
@@ -98,8 +127,8 @@ class WebSocketManager:
         finally:
             await self._disconnect_client(connection_id)
     
-    async def _handle_message(self, connection_id: str, message: str):
-        """Traiter un message reçu via WebSocket"""
+    async def _handle_message(self, connection_id: str, message: Union[str, bytes]):
+        """Traiter un message reçu via WebSocket (texte JSON de contrôle ou trame audio binaire)"""
         connection = self.connections.get(connection_id)
         if not connection:
             return
@@ -107,17 +136,27 @@ class WebSocketManager:
         connection.last_activity = asyncio.get_event_loop().time()
         self.stats["messages_received"] += 1
         
+        started = time.perf_counter()
+        
+        if isinstance(message, (bytes, bytearray)):
+            await self._handle_audio_frame(connection_id, message)
+            self._record_latency("audio_frame", time.perf_counter() - started)
+            return
+        
+        message_type = "invalid"
         try:
             data = json.loads(message)
             message_type = data.get("type", "unknown")
             
-            logger.info(f"📨 Message reçu ({connection_id}): {message_type}")
+            logger.debug(f"📨 Message reçu ({connection_id}): {message_type}")
             
-            # Router les messages selon le type
+            # Router les messages selon le type (les chats partent en tâche de fond)
             if message_type == "auth":
                 await self._handle_auth(connection_id, data)
             elif message_type == "chat":
-                await self._handle_chat_message(connection_id, data)
+                await self._dispatch_chat(connection_id, data)
+            elif message_type == "chat_cancel":
+                await self._handle_chat_cancel(connection_id, data)
             elif message_type == "audio_chunk":
                 await self._handle_audio_chunk(connection_id, data)
             elif message_type == "audio_session_start":
@@ -134,6 +173,69 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"❌ Erreur traitement message: {e}")
             await self._send_error(connection_id, f"Erreur interne: {str(e)}")
+        finally:
+            # Pour un chat: temps de prise en charge; la durée complète est mesurée sous "chat_execution".
+            # Types libres du client regroupés sous "unknown" (clés bornées, types non hashables inclus)
+            if message_type != "invalid" and not (
+                    isinstance(message_type, str) and message_type in ROUTED_MESSAGE_TYPES):
+                message_type = "unknown"
+            self._record_latency(message_type, time.perf_counter() - started)
+    
+    async def _dispatch_chat(self, connection_id: str, data: Dict):
+        """Lancer un chat en tâche suivie, sans bloquer la boucle de réception"""
+        connection = self.connections[connection_id]
+        
+        message_id = data.get("message_id") or str(uuid.uuid4())
+        data["message_id"] = message_id
+        
+        if message_id in connection.chat_tasks:
+            await self._send_error(connection_id, f"Chat déjà en cours: {message_id}")
+            return
+        
+        if len(connection.chat_tasks) >= self.max_chats_per_connection:
+            self.stats["chats_rejected"] += 1
+            await self._send_message(connection_id, {
+                "type": "chat_rejected",
+                "message_id": message_id,
+                "reason": f"Trop de chats en cours ({self.max_chats_per_connection} max)",
+                "timestamp": asyncio.get_event_loop().time()
+            })
+            return
+        
+        task = asyncio.create_task(self._run_chat(connection_id, data))
+        connection.chat_tasks[message_id] = task
+        task.add_done_callback(lambda _: connection.chat_tasks.pop(message_id, None))
+    
+    async def _run_chat(self, connection_id: str, data: Dict):
+        """Exécuter un chat sous la limite de concurrence globale"""
+        started = time.perf_counter()
+        try:
+            async with self._chat_slots:
+                await self._handle_chat_message(connection_id, data)
+        except asyncio.CancelledError:
+            self.stats["chats_cancelled"] += 1
+            logger.info(f"🛑 Chat annulé: {data['message_id']} ({connection_id})")
+            await self._send_message(connection_id, {
+                "type": "chat_cancelled",
+                "message_id": data["message_id"],
+                "timestamp": asyncio.get_event_loop().time()
+            })
+        finally:
+            self._record_latency("chat_execution", time.perf_counter() - started)
+    
+    async def _handle_chat_cancel(self, connection_id: str, data: Dict):
+        """Annuler un chat en cours par message_id"""
+        message_id = data.get("message_id")
+        task = self.connections[connection_id].chat_tasks.get(message_id)
+        if not task:
+            await self._send_error(connection_id, f"Aucun chat en cours: {message_id}")
+            return
+        
+        task.cancel()
+    
+    def _record_latency(self, message_type: str, duration: float):
+        self._handling_counts[message_type] += 1
+        self._handling_latency[message_type].append(duration)
     
     async def _handle_auth(self, connection_id: str, data: Dict):
         """Gérer l'authentification utilisateur"""
@@ -187,16 +289,20 @@ class WebSocketManager:
                 if self.memory:
                     context = await self.memory.get_context_for_user(user_id, message_content)
                 
-                # Exécuter la tâche avec l'agent
-                execution = await self.agent.execute_task(message_content, context)
+                # Exécuter la tâche avec l'agent (événements relayés au fil de l'eau si "stream")
+                on_event = None
+                if data.get("stream"):
+                    on_event = lambda event: self._send_chat_event(connection_id, data.get("message_id"), event)
+                execution = await self.agent.execute_task(message_content, context, on_event=on_event, user_id=user_id)
                 
-                # Envoyer la réponse
+                # Envoyer la réponse (fait foi, y compris en streaming)
                 await self._send_message(connection_id, {
                     "type": "chat_response",
                     "message_id": data.get("message_id"),
                     "response": execution.final_answer or "Désolé, je n'ai pas pu traiter votre demande.",
                     "execution_time": execution.total_duration,
                     "steps_count": len(execution.steps),
+                    "streamed": on_event is not None,
                     "timestamp": asyncio.get_event_loop().time()
                 })
                 
@@ -217,10 +323,27 @@ class WebSocketManager:
                     "timestamp": asyncio.get_event_loop().time()
                 })
         
+        except ExecutionRejected as e:
+            self.stats["chats_rejected"] += 1
+            await self._send_message(connection_id, {
+                "type": "chat_rejected",
+                "message_id": data.get("message_id"),
+                "reason": str(e),
+                "timestamp": asyncio.get_event_loop().time()
+            })
         except Exception as e:
             logger.error(f"❌ Erreur traitement chat: {e}")
             await self._send_error(connection_id, f"Erreur traitement: {str(e)}")
     
+    async def _send_chat_event(self, connection_id: str, message_id: Optional[str], event: Dict):
+        """Relayer un événement d'exécution de l'agent (thought_token, action, observation, answer_token)"""
+        await self._send_message(connection_id, {
+            "type": "chat_stream",
+            "message_id": message_id,
+            "event": event,
+            "timestamp": asyncio.get_event_loop().time()
+        })
+    
     async def _handle_audio_chunk(self, connection_id: str, data: Dict):
         """Gérer un chunk audio pour streaming"""
         connection = self.connections[connection_id]
@@ -255,6 +378,28 @@ class WebSocketManager:
             logger.error(f"❌ Erreur traitement audio: {e}")
             await self._send_error(connection_id, f"Erreur audio: {str(e)}")
     
+    async def _handle_audio_frame(self, connection_id: str, data: bytes):
+        """Gérer une trame audio binaire (chemin rapide, sans JSON ni base64)"""
+        connection = self.connections[connection_id]
+        if not connection.user_id:
+            await self._send_error(connection_id, "Authentification requise")
+            return
+        
+        if not self.audio_streamer:
+            await self._send_error(connection_id, "Audio streaming non disponible")
+            return
+        
+        self.stats["audio_frames_received"] += 1
+        
+        try:
+            frame = decode_frame(data)
+            await self.audio_streamer.process_audio_frame(connection_id, frame)
+        except AudioFrameError as e:
+            await self._send_error(connection_id, f"Trame audio invalide: {str(e)}")
+        except Exception as e:
+            logger.error(f"❌ Erreur trame audio: {e}")
+            await self._send_error(connection_id, f"Erreur audio: {str(e)}")
+    
     async def _handle_audio_session_start(self, connection_id: str, data: Dict):
         """Démarrer une session de streaming audio"""
         connection = self.connections[connection_id]
@@ -267,15 +412,8 @@ class WebSocketManager:
         try:
             if self.audio_streamer:
                 config = data.get("config", {})
-                session_id = await self.audio_streamer.start_session(connection_id, user_id, config)
-                
-                await self._send_message(connection_id, {
-                    "type": "audio_session_started", 
-                    "session_id": session_id,
-                    "timestamp": asyncio.get_event_loop().time()
-                })
-                
-                logger.info(f"🎵 Session audio démarrée: {session_id}")
+                # L'AudioStreamer notifie le client (audio_session_started)
+                await self.audio_streamer.start_session(connection_id, user_id, config)
             else:
                 await self._send_error(connection_id, "Audio streaming non disponible")
                 
@@ -289,15 +427,8 @@ class WebSocketManager:
             if self.audio_streamer:
                 session_id = data.get("session_id")
                 if session_id:
+                    # L'AudioStreamer notifie le client (audio_session_ended)
                     await self.audio_streamer.end_session(session_id)
-                    
-                    await self._send_message(connection_id, {
-                        "type": "audio_session_ended",
-                        "session_id": session_id,
-                        "timestamp": asyncio.get_event_loop().time()
-                    })
-                    
-                    logger.info(f"🎵 Session audio terminée: {session_id}")
                 else:
                     await self._send_error(connection_id, "session_id requis")
             else:
@@ -328,6 +459,20 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"❌ Erreur envoi message: {e}")
     
+    async def _send_binary(self, connection_id: str, data: bytes):
+        """Envoyer une trame audio binaire via WebSocket"""
+        connection = self.connections.get(connection_id)
+        if not connection:
+            return
+        
+        try:
+            await connection.websocket.send(data)
+            self.stats["audio_frames_sent"] += 1
+        except websockets.exceptions.ConnectionClosed:
+            await self._disconnect_client(connection_id)
+        except Exception as e:
+            logger.error(f"❌ Erreur envoi trame audio: {e}")
+    
     async def _send_error(self, connection_id: str, error_message: str):
         """Envoyer un message d'erreur"""
         await self._send_message(connection_id, {
@@ -342,6 +487,10 @@ class WebSocketManager:
         if not connection:
             return
         
+        # Annuler les chats en cours de la connexion
+        for task in list(connection.chat_tasks.values()):
+            task.cancel()
+        
         # Retirer de la liste des connexions utilisateur
         if connection.user_id and connection.user_id in self.user_connections:
             if connection_id in self.user_connections[connection.user_id]:
@@ -371,8 +520,20 @@ class WebSocketManager:
     
     def get_stats(self) -> Dict[str, Any]:
         """Obtenir les statistiques du gestionnaire WebSocket"""
+        handling_latency = {}
+        for message_type, durations in self._handling_latency.items():
+            ordered = sorted(durations)
+            handling_latency[message_type] = {
+                "count": self._handling_counts[message_type],
+                "avg_ms": sum(ordered) / len(ordered) * 1000,
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                "max_ms": ordered[-1] * 1000
+            }
+        
         return {
             **self.stats,
             "unique_users": len(self.user_connections),
-            "avg_connections_per_user": len(self.connections) / max(len(self.user_connections), 1)
+            "avg_connections_per_user": len(self.connections) / max(len(self.user_connections), 1),
+            "chats_in_flight": sum(len(c.chat_tasks) for c in self.connections.values()),
+            "handling_latency": handling_latency
         }
\ No newline at end of file
@@ -36,6 +36,8 @@ from utils.config import settings
 from utils.monitoring import setup_metrics
 from utils.graceful_shutdown import create_jarvis_shutdown_manager, ShutdownMiddleware
 from utils.redis_manager import get_redis_manager
+from utils.llm_cache import CacheStrategy, create_llm_cache_manager
+from utils.http_pool import get_http_pool, close_http_pool
 from utils.circuit_breaker import circuit_manager
 
 # Configuration logging structuré
@@ -66,11 +68,35 @@ app_state: Dict[str, Any] = {
     "audio_streamer": None,
     "persona_manager": None,
     "redis_manager": None,
+    "llm_cache": None,
+    "llm_cache_warmup": None,
     "shutdown_manager": None,
     "startup_time": None,
     "healthy": False
 }
 
+async def warm_tts_phrase_cache(persona_manager: PersonaManager):
+    """Envoyer les phrases prédéfinies des personas au cache de phrases du TTS Service"""
+    tts = get_http_pool().register("tts", settings.TTS_SERVICE_URL)
+    
+    for name, voice in persona_manager.get_canned_phrases().items():
+        try:
+            async with tts.post("/api/cache/warm", json=voice) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    logger.info("🔥 Préchauffage TTS planifié", persona=name, phrases=result.get("phrases"))
+                else:
+                    logger.warning("⚠️ Préchauffage TTS refusé", persona=name, status=response.status)
+        except Exception as e:
+            logger.warning("⚠️ TTS Service injoignable pour le préchauffage", persona=name, error=str(e))
+            return
+
+async def cancel_llm_cache_warmup():
+    """Interrompre la reconstruction de l'index sémantique si elle tourne encore"""
+    task = app_state["llm_cache_warmup"]
+    if task and not task.done():
+        task.cancel()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestionnaire de cycle de vie de l'application"""
@@ -94,6 +120,14 @@ async def lifespan(app: FastAPI):
         )
         logger.info("✅ Redis Manager prêt")
         
+        # 0.2 Pool HTTP partagé (gateway LLM, Ollama)
+        get_http_pool(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_POOL_KEEPALIVE_SECONDS
+        )
+        logger.info("✅ Pool HTTP prêt")
+        
         # 1. Métacognition Engine
         logger.info("🤔 Initialisation Métacognition Engine...")
         app_state["metacognition"] = MetacognitionEngine(
@@ -107,11 +141,21 @@ async def lifespan(app: FastAPI):
         logger.info("🧮 Initialisation Memory Manager...")
         app_state["memory"] = HybridMemoryManager(
             db_url=settings.MEMORY_DB_URL,
-            redis_url=settings.REDIS_URL
+            redis_url=settings.REDIS_URL,
+            retrieval_mode=settings.MEMORY_RETRIEVAL_MODE,
+            hnsw_ef_search=settings.MEMORY_HNSW_EF_SEARCH
         )
         await app_state["memory"].initialize()
         logger.info("✅ Memory Manager prêt")
         
+        # 2.1 Cache LLM (après la mémoire: réutilise le moteur d'embeddings partagé qu'elle a configuré)
+        if settings.LLM_CACHE_ENABLED:
+            logger.info("🗄️ Initialisation Cache LLM...")
+            app_state["llm_cache"] = create_llm_cache_manager(app_state["redis_manager"])
+            # Reconstruction de l'index sémantique depuis Redis en tâche de fond: le démarrage n'attend pas
+            app_state["llm_cache_warmup"] = asyncio.create_task(app_state["llm_cache"].initialize())
+            logger.info("✅ Cache LLM prêt (index sémantique en reconstruction)")
+        
         # 3. Persona Manager
         logger.info("🎭 Initialisation Persona Manager...")
         app_state["persona_manager"] = PersonaManager(
@@ -121,20 +165,32 @@ async def lifespan(app: FastAPI):
         await app_state["persona_manager"].initialize()
         logger.info("✅ Persona Manager prêt")
         
+        if settings.TTS_PHRASE_WARMUP:
+            asyncio.create_task(warm_tts_phrase_cache(app_state["persona_manager"]))
+        
         # 4. React Agent avec Persona Manager
         logger.info("🤖 Initialisation React Agent...")
         app_state["agent"] = ReactAgent(
             llm_url=settings.OLLAMA_URL,
             memory_manager=app_state["memory"],
             metacognition=app_state["metacognition"],
-            persona_manager=app_state["persona_manager"]
+            persona_manager=app_state["persona_manager"],
+            llm_cache=app_state["llm_cache"],
+            llm_cache_strategy=CacheStrategy(settings.LLM_CACHE_STRATEGY),
+            max_concurrent_executions=settings.AGENT_MAX_CONCURRENT_EXECUTIONS,
+            max_executions_per_user=settings.AGENT_MAX_EXECUTIONS_PER_USER,
+            max_queued_executions=settings.AGENT_MAX_QUEUED_EXECUTIONS,
+            max_queued_per_user=settings.AGENT_MAX_QUEUED_PER_USER
         )
         await app_state["agent"].initialize()
         logger.info("✅ React Agent prêt")
         
         # 5. Audio Streamer
         logger.info("🎵 Initialisation Audio Streamer...")
-        app_state["audio_streamer"] = AudioStreamer()
+        app_state["audio_streamer"] = AudioStreamer(config={
+            "ack_interval_frames": settings.AUDIO_ACK_INTERVAL_FRAMES,
+            "ack_max_delay_ms": settings.AUDIO_ACK_MAX_DELAY_MS
+        })
         await app_state["audio_streamer"].initialize()
         logger.info("✅ Audio Streamer prêt")
         
@@ -143,8 +199,11 @@ async def lifespan(app: FastAPI):
         app_state["websocket_manager"] = WebSocketManager(
             agent=app_state["agent"],
             memory=app_state["memory"],
-            audio_streamer=app_state["audio_streamer"]
+            audio_streamer=app_state["audio_streamer"],
+            max_concurrent_chats=settings.WEBSOCKET_MAX_CONCURRENT_CHATS,
+            max_chats_per_connection=settings.WEBSOCKET_MAX_CHATS_PER_CONNECTION
         )
+        app_state["audio_streamer"].websocket_manager = app_state["websocket_manager"]
         await app_state["websocket_manager"].initialize()
         logger.info("✅ WebSocket Manager prêt")
         
@@ -162,6 +221,11 @@ async def lifespan(app: FastAPI):
             lambda: app_state["audio_streamer"].shutdown() if app_state["audio_streamer"] else None,
             priority=20
         )
+        shutdown_manager.add_shutdown_hook(
+            "llm_cache_warmup",
+            cancel_llm_cache_warmup,
+            priority=25
+        )
         shutdown_manager.add_shutdown_hook(
             "agent",
             lambda: app_state["agent"].shutdown() if app_state["agent"] else None,
@@ -182,6 +246,11 @@ async def lifespan(app: FastAPI):
             lambda: app_state["redis_manager"].shutdown() if app_state["redis_manager"] else None,
             priority=60
         )
+        shutdown_manager.add_shutdown_hook(
+            "http_pool",
+            close_http_pool,
+            priority=65
+        )
         shutdown_manager.add_shutdown_hook(
             "metacognition",
             lambda: app_state["metacognition"].shutdown() if app_state["metacognition"] else None,
@@ -236,6 +305,8 @@ async def lifespan(app: FastAPI):
             
             if app_state["redis_manager"]:
                 await app_state["redis_manager"].shutdown()
+            
+            await close_http_pool()
                 
             if app_state["metacognition"]:
                 await app_state["metacognition"].shutdown()
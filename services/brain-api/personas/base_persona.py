@@ -53,6 +53,15 @@ class VoicePreferences:
     volume: float = 0.8         # Volume (0.0 à 1.0)
     emotion: str = "neutral"    # Émotion de base
     accent: str = "american"    # Accent vocal
+    language: str = "en"        # Langue des phrases de la persona
+    
+    def to_tts_params(self) -> Dict[str, Any]:
+        """Paramètres du TTS Service (vitesse/hauteur 0.5-1.5, 1.0 = neutre)"""
+        return {
+            "language": self.language,
+            "speed": round(1.0 + 0.5 * self.speed, 3),
+            "pitch": round(1.0 + 0.5 * self.pitch, 3)
+        }
 
 
 class BasePersona(ABC):
@@ -238,6 +247,14 @@ class BasePersona(ABC):
         
         return adjustments
     
+    def get_canned_phrases(self) -> List[str]:
+        """Phrases prédéfinies de la persona (salutations, confirmations, ...)"""
+        phrases = (
+            self.greetings + self.confirmations + self.thinking_phrases
+            + self.error_responses + self.farewells
+        )
+        return list(dict.fromkeys(phrases))
+    
     def get_persona_info(self) -> Dict[str, Any]:
         """Obtenir les informations complètes de la persona"""
         return {
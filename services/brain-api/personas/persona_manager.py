@@ -207,6 +207,16 @@ class PersonaManager:
         
         return result
     
+    def get_canned_phrases(self) -> Dict[str, Dict[str, Any]]:
+        """Phrases prédéfinies et paramètres vocaux de chaque persona (préchauffage du cache TTS)"""
+        return {
+            name: {
+                "phrases": persona.get_canned_phrases(),
+                **persona.voice.to_tts_params()
+            }
+            for name, persona in self._personas.items()
+        }
+    
     def format_response(self, content: str, context: Optional[Dict] = None) -> str:
         """
         Formater une réponse avec la persona active
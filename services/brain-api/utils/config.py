@@ -44,7 +44,13 @@ class Settings(BaseSettings):
     HOST_NETWORK_TIMEOUT: int = 30
     LLM_FAILOVER_TIMEOUT: int = 10
     
+    # Pool HTTP partagé (keep-alive vers gateway / Ollama)
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 16
+    HTTP_POOL_KEEPALIVE_SECONDS: float = 30.0
+    
     TTS_SERVICE_URL: str = "http://tts-service:5002"
+    TTS_PHRASE_WARMUP: bool = True  # préchauffer le cache TTS avec les phrases des personas
     STT_SERVICE_URL: str = "http://stt-service:5003"
     
     # 🧠 Métacognition
@@ -56,6 +62,14 @@ class Settings(BaseSettings):
     # 🤖 Agent React
     AGENT_MAX_ITERATIONS: int = 5
     AGENT_TIMEOUT_SECONDS: int = 30
+    AGENT_MAX_CONCURRENT_EXECUTIONS: int = 4
+    AGENT_MAX_EXECUTIONS_PER_USER: int = 2
+    AGENT_MAX_QUEUED_EXECUTIONS: int = 64
+    AGENT_MAX_QUEUED_PER_USER: int = 8
+    
+    # 🗄️ Cache LLM (Redis + L1 local, index sémantique reconstruit au démarrage)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_STRATEGY: str = "exact_match"  # exact_match, semantic_match, bypass
     TOOLS_ENABLED: List[str] = [
         "web_search", "file_system", "calculator", 
         "datetime", "weather", "system_info"
@@ -66,11 +80,17 @@ class Settings(BaseSettings):
     DYNAMIC_MEMORY_UPDATE_INTERVAL: int = 5  # 5 interactions
     EPISODIC_MEMORY_MAX_ENTRIES: int = 1000
     VECTOR_DIMENSION: int = 384
+    MEMORY_RETRIEVAL_MODE: str = "memory"  # memory, database (pgvector), hybrid
+    MEMORY_HNSW_EF_SEARCH: int = 64
     
     # 🔊 Audio
     AUDIO_CHUNK_SIZE: int = 1024
     AUDIO_SAMPLE_RATE: int = 16000
     WEBSOCKET_AUDIO_BUFFER_SIZE: int = 4096
+    AUDIO_ACK_INTERVAL_FRAMES: int = 10  # Trames binaires par accusé
+    AUDIO_ACK_MAX_DELAY_MS: int = 250
+    WEBSOCKET_MAX_CONCURRENT_CHATS: int = 8
+    WEBSOCKET_MAX_CHATS_PER_CONNECTION: int = 4
     
     # 📊 Performance
     MAX_CONCURRENT_REQUESTS: int = 100
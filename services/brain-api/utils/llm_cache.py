@@ -8,13 +8,20 @@ import hashlib
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, asdict, field, replace
 from datetime import datetime, timedelta
 from enum import Enum
 
+import numpy as np
+
 from .redis_manager import RedisManager
 from .circuit_breaker import call_redis_with_circuit_breaker
+from .embedding_engine import EmbeddingEngine, get_embedding_engine
+from .monitoring import record_llm_cache_lookup
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -62,12 +69,22 @@ class CacheConfig:
     # Seuils de similarité
     semantic_threshold: float = 0.85
     context_threshold: float = 0.75
+    semantic_thresholds: Dict[str, float] = field(default_factory=dict)  # par modèle
+    semantic_candidates: int = 5  # candidats récupérés en un seul MGET
+    semantic_min_words: int = 3
     
     # Limites de cache
     max_prompt_length: int = 4000
     max_response_length: int = 16000
     max_cache_size: int = 10000
     
+    # Cache local (L1): bornes en entrées et en octets, admission par fréquence
+    local_cache_max_entries: int = 1000
+    local_cache_max_bytes: int = 64 * 1024 * 1024  # 64 MB
+    local_admission_threshold: int = 2  # occurrences du pattern avant admission en L1
+    max_tracked_patterns: int = 10000   # patterns comptés (LRU), le reste est oublié
+    compression_min_bytes: int = 2048  # compresser les réponses plus longues
+    
     # Optimisations
     enable_compression: bool = True
     enable_deduplication: bool = True
@@ -76,6 +93,187 @@ class CacheConfig:
     # Coûts (pour calcul d'économies)
     cost_per_1k_tokens: float = 0.002  # $0.002 per 1K tokens
 
+@dataclass
+class LocalCacheItem:
+    """Entrée du cache local avec expiration et taille mémoire"""
+    entry: CacheEntry
+    expires_at: float
+    size: int
+    compressed_response: Optional[bytes] = None
+
+class LocalLRUCache:
+    """
+    Cache local LRU O(1) (OrderedDict) borné en entrées et en octets
+    - Expiration par entrée (TTL de la stratégie)
+    - Compression zlib optionnelle des grosses réponses
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int,
+                 enable_compression: bool = True, compression_min_bytes: int = 2048):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enable_compression = enable_compression
+        self.compression_min_bytes = compression_min_bytes
+        
+        self._items: "OrderedDict[str, LocalCacheItem]" = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.compressed_entries = 0
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+    
+    def get(self, key: str, now: Optional[float] = None) -> Optional[CacheEntry]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        
+        if (now or time.time()) >= item.expires_at:
+            self.pop(key)
+            self.expirations += 1
+            return None
+        
+        self._items.move_to_end(key)
+        # Statistiques d'accès tenues sur l'entrée stockée (les réponses compressées sont rendues en copie)
+        item.entry.last_accessed = datetime.now()
+        item.entry.access_count += 1
+        if item.compressed_response is not None:
+            return replace(item.entry, response=zlib.decompress(item.compressed_response).decode("utf-8"))
+        return item.entry
+    
+    def put(self, key: str, entry: CacheEntry, expires_at: float):
+        self.pop(key)
+        
+        response_bytes = entry.response.encode("utf-8")
+        compressed = None
+        if self.enable_compression and len(response_bytes) >= self.compression_min_bytes:
+            candidate = zlib.compress(response_bytes, 6)
+            if len(candidate) < len(response_bytes):
+                compressed = candidate
+                entry = replace(entry, response="")
+                self.compressed_entries += 1
+        
+        size = len(entry.prompt.encode("utf-8")) + (len(compressed) if compressed else len(response_bytes))
+        if size > self.max_bytes:
+            return
+        
+        self._items[key] = LocalCacheItem(entry, expires_at, size, compressed)
+        self.total_bytes += size
+        
+        while len(self._items) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.total_bytes -= evicted.size
+            if evicted.compressed_response is not None:
+                self.compressed_entries -= 1
+            self.evictions += 1
+    
+    def pop(self, key: str) -> Optional[LocalCacheItem]:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.total_bytes -= item.size
+            if item.compressed_response is not None:
+                self.compressed_entries -= 1
+        return item
+    
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        now = now or time.time()
+        expired = [key for key, item in self._items.items() if now >= item.expires_at]
+        for key in expired:
+            self.pop(key)
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def clear(self):
+        self._items.clear()
+        self.total_bytes = 0
+        self.compressed_entries = 0
+
+class SemanticCacheIndex:
+    """
+    Index vectoriel en mémoire des prompts cachés (un espace par modèle)
+    Matrice float32 normalisée, recherche par produit scalaire + argpartition
+    """
+    
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._rows: Dict[str, Dict[str, int]] = {}
+        self._models: Dict[str, str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._models)
+    
+    def __contains__(self, cache_key: str) -> bool:
+        return cache_key in self._models
+    
+    def add(self, model: str, cache_key: str, embedding: List[float]):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return
+        vector = vector / norm
+        
+        if cache_key in self._models:
+            self.remove(cache_key)
+        
+        matrix = self._vectors.get(model)
+        keys = self._keys.setdefault(model, [])
+        rows = self._rows.setdefault(model, {})
+        if matrix is None:
+            matrix = np.zeros((16, self.dimension), dtype=np.float32)
+        elif len(keys) == matrix.shape[0]:
+            matrix = np.concatenate([matrix, np.zeros_like(matrix)])
+        
+        matrix[len(keys)] = vector
+        rows[cache_key] = len(keys)
+        keys.append(cache_key)
+        self._vectors[model] = matrix
+        self._models[cache_key] = model
+    
+    def remove(self, cache_key: str) -> bool:
+        """Suppression O(1) par échange avec la dernière ligne"""
+        model = self._models.pop(cache_key, None)
+        if model is None:
+            return False
+        
+        rows, keys, matrix = self._rows[model], self._keys[model], self._vectors[model]
+        row = rows.pop(cache_key)
+        last = len(keys) - 1
+        if row != last:
+            matrix[row] = matrix[last]
+            keys[row] = keys[last]
+            rows[keys[row]] = row
+        keys.pop()
+        return True
+    
+    def search(self, model: str, embedding: List[float], threshold: float, limit: int) -> List[Tuple[float, str]]:
+        """Candidats au-dessus du seuil, triés par similarité cosinus décroissante"""
+        keys = self._keys.get(model)
+        if not keys:
+            return []
+        
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        
+        scores = self._vectors[model][:len(keys)] @ (query / norm)
+        k = min(limit, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k] if k < scores.shape[0] else np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), keys[i]) for i in top if scores[i] >= threshold]
+    
+    def clear(self):
+        self._vectors.clear()
+        self._keys.clear()
+        self._rows.clear()
+        self._models.clear()
+
 class LLMCacheManager:
     """
     Gestionnaire de cache LLM avec:
@@ -89,17 +287,23 @@ class LLMCacheManager:
     def __init__(
         self,
         redis_manager: RedisManager,
-        config: CacheConfig = None
+        config: CacheConfig = None,
+        embedding_engine: Optional[EmbeddingEngine] = None
     ):
         self.redis = redis_manager
         self.config = config or CacheConfig()
+        self.embedding_engine = embedding_engine
         
         # Cache local (L1)
-        self.local_cache: Dict[str, CacheEntry] = {}
-        self.local_cache_max_size = 100
+        self.local_cache = LocalLRUCache(
+            max_entries=self.config.local_cache_max_entries,
+            max_bytes=self.config.local_cache_max_bytes,
+            enable_compression=self.config.enable_compression,
+            compression_min_bytes=self.config.compression_min_bytes
+        )
         
-        # Index de similarité pour recherche sémantique
-        self.similarity_index: Dict[str, List[str]] = {}
+        # Index de similarité pour recherche sémantique (reconstruit depuis Redis au démarrage)
+        self.similarity_index = SemanticCacheIndex()
         
         # Statistiques détaillées
         self.stats = {
@@ -116,14 +320,65 @@ class LLMCacheManager:
             "evictions": 0
         }
         
-        # Patterns de requêtes fréquentes
-        self.frequent_patterns: Dict[str, int] = {}
+        # Coalescence des générations identiques sur cache miss
+        self.single_flight = SingleFlight("llm_cache")
+        
+        # Patterns de requêtes fréquentes (LRU borné à max_tracked_patterns)
+        self.frequent_patterns: "OrderedDict[str, int]" = OrderedDict()
         self.pattern_threshold = 3
         
         self._lock = asyncio.Lock()
         
         logger.info("🧠 LLM Cache Manager initialisé")
     
+    async def initialize(self, scan_batch_size: int = 500):
+        """Reconstruire l'index sémantique depuis les entrées Redis existantes (SCAN + MGET)"""
+        if self.embedding_engine is None:
+            self.embedding_engine = await get_embedding_engine()
+        
+        rebuilt = 0
+        try:
+            pattern = self._generate_cache_key("*", CacheStrategy.SEMANTIC_MATCH)
+            batch: List[str] = []
+            async for key in self.redis.client.scan_iter(match=pattern, count=scan_batch_size):
+                batch.append(key.decode() if isinstance(key, bytes) else key)
+                if len(batch) >= scan_batch_size:
+                    rebuilt += await self._index_semantic_keys(batch)
+                    batch = []
+            if batch:
+                rebuilt += await self._index_semantic_keys(batch)
+            
+            logger.info(f"🎯 Index sémantique reconstruit - {rebuilt} prompts")
+        except Exception as e:
+            logger.error(f"❌ Erreur reconstruction index sémantique: {e}")
+        
+        return rebuilt
+    
+    async def _index_semantic_keys(self, keys: List[str]) -> int:
+        """Indexer un lot de clés sémantiques (un MGET, un lot d'embeddings)"""
+        values = await self.redis.mget(*keys, use_local_cache=False)
+        entries = []
+        for key, value in zip(keys, values):
+            if not value:
+                continue
+            try:
+                entry_data = json.loads(value)
+                entries.append((key, entry_data["model"], entry_data["prompt"]))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+        
+        if not entries:
+            return 0
+        
+        embeddings = await self.embedding_engine.embed_many([prompt for _, _, prompt in entries])
+        for (key, model, _), embedding in zip(entries, embeddings):
+            self.similarity_index.add(model, key, embedding)
+        return len(entries)
+    
+    def _get_semantic_threshold(self, model: str) -> float:
+        """Seuil sémantique propre au modèle, sinon seuil global"""
+        return self.config.semantic_thresholds.get(model, self.config.semantic_threshold)
+    
     def _generate_prompt_hash(self, prompt: str, model: str = "", temperature: float = 0.7) -> str:
         """Générer hash du prompt pour cache exact"""
         content = f"{prompt}|{model}|{temperature}"
@@ -183,33 +438,46 @@ class LLMCacheManager:
         return (total_tokens / 1000) * self.config.cost_per_1k_tokens
     
     async def _get_from_local_cache(self, cache_key: str) -> Optional[CacheEntry]:
-        """Récupérer depuis cache local"""
-        if cache_key in self.local_cache:
-            entry = self.local_cache[cache_key]
-            # Vérifier TTL (simple pour cache local)
-            age = (datetime.now() - entry.created_at).total_seconds()
-            if age < self.config.default_ttl:
-                entry.last_accessed = datetime.now()
-                entry.access_count += 1
-                return entry
-            else:
-                # Supprimer entrée expirée
-                del self.local_cache[cache_key]
-        
-        return None
+        """Récupérer depuis cache local (statistiques d'accès mises à jour par le cache)"""
+        return self.local_cache.get(cache_key)
     
-    def _update_local_cache(self, cache_key: str, entry: CacheEntry):
-        """Mettre à jour cache local avec éviction LRU"""
-        if len(self.local_cache) >= self.local_cache_max_size:
-            # Éviction LRU
-            oldest_key = min(
-                self.local_cache.keys(),
-                key=lambda k: self.local_cache[k].last_accessed
-            )
-            del self.local_cache[oldest_key]
-            self.stats["evictions"] += 1
+    def _record_pattern(self, prompt: str) -> int:
+        """Compter les occurrences d'un pattern de requête"""
+        pattern = prompt[:50].lower()
+        count = self.frequent_patterns.pop(pattern, 0) + 1
+        self.frequent_patterns[pattern] = count
+        while len(self.frequent_patterns) > self.config.max_tracked_patterns:
+            self.frequent_patterns.popitem(last=False)
+        return count
+    
+    def _should_admit_locally(self, prompt: str) -> bool:
+        """Admission en L1 réservée aux patterns vus assez souvent"""
+        return self.frequent_patterns.get(prompt[:50].lower(), 0) >= self.config.local_admission_threshold
+    
+    def _update_local_cache(self, cache_key: str, entry: CacheEntry, strategy: Optional[CacheStrategy] = None):
+        """Mettre à jour cache local (LRU O(1), expiration selon la stratégie)"""
+        if not self._should_admit_locally(entry.prompt):
+            return
         
-        self.local_cache[cache_key] = entry
+        if strategy is None:
+            strategy = self._strategy_from_key(cache_key)
+        expires_at = _to_timestamp(entry.created_at) + self._get_ttl_for_strategy(strategy)
+        if expires_at <= time.time():
+            return
+        
+        evictions_before = self.local_cache.evictions
+        self.local_cache.put(cache_key, entry, expires_at)
+        self.stats["evictions"] += self.local_cache.evictions - evictions_before
+    
+    def _strategy_from_key(self, cache_key: str) -> Optional[CacheStrategy]:
+        """Retrouver la stratégie encodée dans la clé llm_cache:{strategy}:..."""
+        parts = cache_key.split(":")
+        if len(parts) > 1:
+            try:
+                return CacheStrategy(parts[1])
+            except ValueError:
+                pass
+        return None
     
     async def _find_semantic_match(
         self, 
@@ -217,53 +485,38 @@ class LLMCacheManager:
         model: str,
         threshold: float = None
     ) -> Optional[CacheEntry]:
-        """Chercher correspondance sémantique"""
+        """Chercher correspondance sémantique via l'index vectoriel puis un seul MGET"""
         if threshold is None:
-            threshold = self.config.semantic_threshold
+            threshold = self._get_semantic_threshold(model)
         
-        # Pour une implémentation simple, on utilise la correspondance de mots-clés
-        # Dans un système complet, on utiliserait des embeddings
-        
-        prompt_words = set(prompt.lower().split())
-        if len(prompt_words) < 3:  # Trop court pour match sémantique
+        if len(prompt.split()) < self.config.semantic_min_words:  # Trop court pour match sémantique
             return None
         
-        # Chercher dans l'index de similarité
         try:
-            pattern = f"semantic:{model}:*"
-            keys = await self.redis.client.keys(pattern)
+            if self.embedding_engine is None:
+                self.embedding_engine = await get_embedding_engine()
+            
+            embedding = await self.embedding_engine.embed(prompt)
+            candidates = self.similarity_index.search(
+                model, embedding, threshold, self.config.semantic_candidates
+            )
+            if not candidates:
+                return None
             
-            best_match = None
-            best_score = 0.0
+            values = await self.redis.mget(*[key for _, key in candidates])
             
-            for key in keys[:50]:  # Limiter la recherche
-                cached_data = await self.redis.get(key)
+            for (score, key), cached_data in zip(candidates, values):
                 if not cached_data:
+                    # Expirée côté Redis: retirer de l'index
+                    self.similarity_index.remove(key)
                     continue
-                
                 try:
-                    entry_data = json.loads(cached_data)
-                    cached_prompt = entry_data.get("prompt", "")
-                    cached_words = set(cached_prompt.lower().split())
-                    
-                    # Calcul similarité Jaccard simple
-                    intersection = len(prompt_words & cached_words)
-                    union = len(prompt_words | cached_words)
-                    
-                    if union > 0:
-                        similarity = intersection / union
-                        
-                        if similarity >= threshold and similarity > best_score:
-                            best_score = similarity
-                            # Reconstruire CacheEntry
-                            best_match = CacheEntry(**entry_data)
-                
+                    entry = CacheEntry(**json.loads(cached_data))
                 except (json.JSONDecodeError, TypeError):
                     continue
-            
-            if best_match and best_score >= threshold:
-                logger.info(f"🎯 Match sémantique trouvé (score: {best_score:.2f})")
-                return best_match
+                
+                logger.info(f"🎯 Match sémantique trouvé (score: {score:.2f})")
+                return entry
         
         except Exception as e:
             logger.error(f"❌ Erreur recherche sémantique: {e}")
@@ -290,6 +543,8 @@ class LLMCacheManager:
         
         self.stats["total_requests"] += 1
         start_time = time.time()
+        hits_before = self.stats["cache_hits"]
+        self._record_pattern(prompt)
         
         # Générer identifiants
         prompt_hash = self._generate_prompt_hash(prompt, model, temperature)
@@ -305,7 +560,8 @@ class LLMCacheManager:
                 if entry:
                     self.stats["cache_hits"] += 1
                     self.stats["exact_matches"] += 1
-                    logger.info("⚡ Cache hit (local exact)")\n                    return entry.response
+                    logger.info("⚡ Cache hit (local exact)")
+                    return entry.response
                 
                 # Cache Redis
                 cached_data = await self.redis.get(cache_key)
@@ -326,7 +582,7 @@ class LLMCacheManager:
                         )
                         
                         # Mettre en cache local
-                        self._update_local_cache(cache_key, entry)
+                        self._update_local_cache(cache_key, entry, strategy)
                         
                         self.stats["cache_hits"] += 1
                         self.stats["exact_matches"] += 1
@@ -389,6 +645,8 @@ class LLMCacheManager:
         finally:
             # Mettre à jour temps de réponse
             response_time = time.time() - start_time
+            result = "hit" if self.stats["cache_hits"] > hits_before else "miss"
+            record_llm_cache_lookup(strategy.value, result, response_time)
             if self.stats["avg_response_time"] == 0:
                 self.stats["avg_response_time"] = response_time
             else:
@@ -451,11 +709,14 @@ class LLMCacheManager:
             
             if success:
                 # Mettre en cache local
-                self._update_local_cache(cache_key, entry)
+                self._update_local_cache(cache_key, entry, strategy)
                 
-                # Mettre à jour patterns fréquents
-                pattern = prompt[:50].lower()
-                self.frequent_patterns[pattern] = self.frequent_patterns.get(pattern, 0) + 1
+                # Indexer le prompt pour la recherche sémantique
+                if strategy == CacheStrategy.SEMANTIC_MATCH:
+                    if self.embedding_engine is None:
+                        self.embedding_engine = await get_embedding_engine()
+                    embedding = await self.embedding_engine.embed(prompt)
+                    self.similarity_index.add(model, cache_key, embedding)
                 
                 # Mettre à jour stats
                 self.stats["cache_size"] += 1
@@ -468,6 +729,41 @@ class LLMCacheManager:
         
         return False
     
+    async def get_or_generate(
+        self,
+        prompt: str,
+        generate: Callable[[], Awaitable[str]],
+        model: str = "default",
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        context: Optional[Dict[str, Any]] = None,
+        strategy: CacheStrategy = CacheStrategy.EXACT_MATCH
+    ) -> str:
+        """
+        Réponse depuis le cache, sinon une seule génération pour tous les appelants concurrents
+        
+        Args:
+            generate: Coroutine factory produisant la réponse LLM sur cache miss
+        """
+        cached = await self.get_cached_response(prompt, model, temperature, max_tokens, context, strategy)
+        if cached is not None:
+            return cached
+        
+        prompt_hash = self._generate_prompt_hash(prompt, model, temperature)
+        context_hash = self._generate_context_hash(context) if context else None
+        flight_key = self._generate_cache_key(prompt_hash, strategy, context_hash)
+        
+        async def generate_and_cache() -> str:
+            start_time = time.time()
+            response = await generate()
+            await self.cache_response(
+                prompt, response, model, temperature, max_tokens,
+                response_time=time.time() - start_time, context=context, strategy=strategy
+            )
+            return response
+        
+        return await self.single_flight.do(flight_key, generate_and_cache)
+    
     def _get_ttl_for_strategy(self, strategy: CacheStrategy) -> int:
         """Obtenir TTL selon la stratégie"""
         ttl_map = {
@@ -481,13 +777,18 @@ class LLMCacheManager:
     async def invalidate_cache(self, pattern: str = None) -> int:
         """Invalider cache par pattern"""
         try:
-            if pattern:
-                keys = await self.redis.client.keys(f"llm_cache:*{pattern}*")
-            else:
-                keys = await self.redis.client.keys("llm_cache:*")
+            match = f"llm_cache:*{pattern}*" if pattern else "llm_cache:*"
+            keys = []
+            async for key in self.redis.client.scan_iter(match=match, count=500):
+                keys.append(key.decode() if isinstance(key, bytes) else key)
             
             if keys:
                 deleted = await self.redis.delete(*keys)
+                
+                # Garder l'index sémantique et le cache local synchronisés
+                for key in keys:
+                    self.similarity_index.remove(key)
+                    self.local_cache.pop(key)
                 self.stats["cache_size"] = max(0, self.stats["cache_size"] - deleted)
                 logger.info(f"🗑️ Cache invalidé - {deleted} entrées supprimées")
                 return deleted
@@ -502,19 +803,10 @@ class LLMCacheManager:
         try:
             # Redis s'occupe automatiquement des TTL
             # Nettoyer seulement le cache local
-            now = datetime.now()
-            expired_keys = []
-            
-            for key, entry in self.local_cache.items():
-                age = (now - entry.created_at).total_seconds()
-                if age > self.config.default_ttl:
-                    expired_keys.append(key)
+            expired = self.local_cache.purge_expired()
             
-            for key in expired_keys:
-                del self.local_cache[key]
-            
-            if expired_keys:
-                logger.info(f"🧹 Cache local nettoyé - {len(expired_keys)} entrées expirées")
+            if expired:
+                logger.info(f"🧹 Cache local nettoyé - {expired} entrées expirées")
             
         except Exception as e:
             logger.error(f"❌ Erreur nettoyage cache: {e}")
@@ -563,6 +855,11 @@ class LLMCacheManager:
             **self.stats,
             "hit_rate_percent": hit_rate,
             "local_cache_size": len(self.local_cache),
+            "local_cache_bytes": self.local_cache.total_bytes,
+            "local_cache_compressed": self.local_cache.compressed_entries,
+            "local_cache_expirations": self.local_cache.expirations,
+            "semantic_index_size": len(self.similarity_index),
+            "coalescing": self.single_flight.get_stats(),
             "frequent_patterns_count": len(self.frequent_patterns),
             "config": asdict(self.config)
         }
@@ -594,13 +891,27 @@ class LLMCacheManager:
                 "cache_stats": self.get_stats()
             }
 
+def _to_timestamp(value: Union[datetime, str, float, None]) -> float:
+    """Horodatage d'une date d'entrée (les entrées relues depuis Redis portent des chaînes)"""
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return time.time()
+    return float(value)
+
 # Factory function
 def create_llm_cache_manager(
     redis_manager: RedisManager,
-    config: CacheConfig = None
+    config: CacheConfig = None,
+    embedding_engine: Optional[EmbeddingEngine] = None
 ) -> LLMCacheManager:
     """Créer gestionnaire de cache LLM"""
-    return LLMCacheManager(redis_manager, config)
+    return LLMCacheManager(redis_manager, config, embedding_engine)
 
 # Décorateur pour cache automatique
 def cache_llm_response(
@@ -624,33 +935,14 @@ def cache_llm_response(
             model = kwargs.get('model', 'default')
             temperature = kwargs.get('temperature', 0.7)
             
-            # Chercher en cache
-            cached_response = await cache_manager.get_cached_response(
+            # Cache, sinon appel original partagé entre requêtes identiques concurrentes
+            return await cache_manager.get_or_generate(
                 prompt=prompt,
+                generate=lambda: func(*args, **kwargs),
                 model=model,
                 temperature=temperature,
                 strategy=strategy
             )
-            
-            if cached_response:
-                return cached_response
-            
-            # Appeler fonction originale
-            start_time = time.time()
-            response = await func(*args, **kwargs)
-            response_time = time.time() - start_time
-            
-            # Mettre en cache
-            await cache_manager.cache_response(
-                prompt=prompt,
-                response=response,
-                model=model,
-                temperature=temperature,
-                response_time=response_time,
-                strategy=strategy
-            )
-            
-            return response
         
         return wrapper
     return decorator
\ No newline at end of file
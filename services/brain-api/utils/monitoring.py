@@ -66,6 +66,11 @@ AGENT_EXECUTIONS = Counter(
     ['status']
 )
 
+AGENT_ITERATIONS_SAVED = Counter(
+    'jarvis_brain_agent_iterations_saved_total',
+    'Itérations ReAct économisées par l\'exécution parallèle des outils'
+)
+
 AUDIO_SESSIONS = Gauge(
     'jarvis_brain_audio_sessions_active',
     'Sessions audio actives'
@@ -82,6 +87,38 @@ LLAMA_REQUESTS = Counter(
     ['model', 'status']
 )
 
+LLM_CACHE_LOOKUP_DURATION = Histogram(
+    'jarvis_brain_llm_cache_lookup_seconds',
+    'Durée des recherches dans le cache LLM',
+    ['strategy', 'result'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+LLM_COALESCED_REQUESTS = Counter(
+    'jarvis_brain_llm_coalesced_requests_total',
+    'Requêtes LLM identiques servies par une génération déjà en vol',
+    ['group', 'kind']
+)
+
+LLM_COALESCED_SAVED_SECONDS = Counter(
+    'jarvis_brain_llm_coalesced_saved_gpu_seconds_total',
+    'Secondes GPU économisées par la coalescence des requêtes',
+    ['group', 'kind']
+)
+
+HTTP_POOL_CONNECTIONS = Counter(
+    'jarvis_brain_http_pool_connections_total',
+    'Événements de connexion du pool HTTP (created/reused/error)',
+    ['upstream', 'event']
+)
+
+HTTP_POOL_WAIT = Histogram(
+    'jarvis_brain_http_pool_wait_seconds',
+    'Attente de connexion du pool HTTP (queue: connexion libre, connect: établissement TCP)',
+    ['upstream', 'phase'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
 METACOGNITION_DECISIONS = Counter(
     'jarvis_brain_metacognition_decisions_total',
     'Décisions métacognition',
@@ -140,6 +177,13 @@ def record_agent_execution(status: str):
     except Exception as e:
         logger.error(f"❌ Erreur enregistrement agent: {e}")
 
+def record_agent_iterations_saved(count: int):
+    """Enregistrer les itérations économisées par une étape à outils parallèles"""
+    try:
+        AGENT_ITERATIONS_SAVED.inc(count)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement itérations agent: {e}")
+
 def record_audio_session(active_count: int):
     """Enregistrer le nombre de sessions audio actives"""
     try:
@@ -161,6 +205,35 @@ def record_llm_request(model: str, status: str):
     except Exception as e:
         logger.error(f"❌ Erreur enregistrement LLM: {e}")
 
+def record_llm_cache_lookup(strategy: str, result: str, duration: float):
+    """Enregistrer la latence d'une recherche cache LLM (result: hit/miss)"""
+    try:
+        LLM_CACHE_LOOKUP_DURATION.labels(strategy=strategy, result=result).observe(duration)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement cache LLM: {e}")
+
+def record_llm_coalesced(group: str, kind: str, saved_seconds: float):
+    """Enregistrer une requête LLM coalescée et le temps de génération économisé"""
+    try:
+        LLM_COALESCED_REQUESTS.labels(group=group, kind=kind).inc()
+        LLM_COALESCED_SAVED_SECONDS.labels(group=group, kind=kind).inc(saved_seconds)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement coalescence LLM: {e}")
+
+def record_http_pool_connection(upstream: str, event: str):
+    """Enregistrer un événement de connexion du pool HTTP"""
+    try:
+        HTTP_POOL_CONNECTIONS.labels(upstream=upstream, event=event).inc()
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement pool HTTP: {e}")
+
+def record_http_pool_wait(upstream: str, phase: str, seconds: float):
+    """Enregistrer une attente de connexion du pool HTTP"""
+    try:
+        HTTP_POOL_WAIT.labels(upstream=upstream, phase=phase).observe(seconds)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement attente pool HTTP: {e}")
+
 def record_metacognition_decision(decision: str):
     """Enregistrer une décision métacognition"""
     try:
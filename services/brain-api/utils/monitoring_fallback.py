@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 class MockMetric:
     """Mock metric class that logs instead of using Prometheus"""
     
-    def __init__(self, name: str, description: str, labels: list = None):
+    def __init__(self, name: str, description: str, labels: list = None, **kwargs):
         self.name = name
         self.description = description
         self.label_names = labels or []
@@ -0,0 +1,152 @@
+"""
+🛫 Single-Flight - JARVIS Brain API
+Coalescence des requêtes identiques concurrentes:
+une seule génération en vol par clé, résultat (ou flux de chunks) partagé par tous les appelants
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .monitoring import record_llm_coalesced
+
+logger = logging.getLogger(__name__)
+
+
+class _StreamFlight:
+    """Génération en streaming partagée: chunks rejoués puis diffusés à chaque abonné"""
+
+    def __init__(self):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.condition = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Groupe single-flight:
+    - do(): les appelants concurrents d'une même clé attendent le même futur
+    - stream(): les appelants concurrents reçoivent tous les chunks d'un même générateur
+    - Métriques: requêtes coalescées et secondes GPU économisées
+    """
+
+    def __init__(self, name: str = "llm"):
+        self.name = name
+        self._calls: Dict[str, Tuple[asyncio.Task, float]] = {}
+        self._streams: Dict[str, _StreamFlight] = {}
+
+        self.stats = {
+            "leaders": 0,
+            "coalesced": 0,
+            "stream_leaders": 0,
+            "stream_coalesced": 0,
+            "saved_seconds": 0.0
+        }
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécuter func une seule fois pour les appels concurrents portant la même clé"""
+        call = self._calls.get(key)
+        if call is not None:
+            self.stats["coalesced"] += 1
+            task, started_at = call
+            result = await asyncio.shield(task)
+            self._record_saved("completion", time.time() - started_at)
+            return result
+
+        # Tâche indépendante: l'annulation d'un appelant n'interrompt pas les autres
+        task = asyncio.get_running_loop().create_task(func())
+        self._calls[key] = (task, time.time())
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        self.stats["leaders"] += 1
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[Any]]) -> AsyncGenerator[Any, None]:
+        """
+        Diffuser un flux partagé: le premier appelant lance le générateur dans une tâche,
+        les suivants rejouent les chunks déjà produits puis suivent le flux en direct
+        """
+        flight = self._streams.get(key)
+        if flight is None:
+            flight = _StreamFlight()
+            self._streams[key] = flight
+            flight.task = asyncio.get_running_loop().create_task(self._pump(key, flight, factory))
+            self.stats["stream_leaders"] += 1
+        else:
+            self.stats["stream_coalesced"] += 1
+            flight.subscribers += 1
+            try:
+                async for chunk in self._follow(flight):
+                    yield chunk
+            finally:
+                flight.subscribers -= 1
+                if flight.finished_at is not None:
+                    self._record_saved("stream", flight.finished_at - flight.started_at)
+            return
+
+        flight.subscribers += 1
+        try:
+            async for chunk in self._follow(flight):
+                yield chunk
+        finally:
+            flight.subscribers -= 1
+            # Plus personne à l'écoute: inutile de continuer à générer
+            if flight.subscribers == 0 and not flight.done and flight.task:
+                flight.task.cancel()
+
+    async def _pump(self, key: str, flight: _StreamFlight, factory: Callable[[], AsyncIterator[Any]]):
+        """Consommer le générateur source et notifier les abonnés"""
+        try:
+            async for chunk in factory():
+                async with flight.condition:
+                    flight.chunks.append(chunk)
+                    flight.condition.notify_all()
+        except asyncio.CancelledError:
+            flight.error = asyncio.CancelledError()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.finished_at = time.time()
+            if self._streams.get(key) is flight:
+                del self._streams[key]
+            async with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    async def _follow(self, flight: _StreamFlight) -> AsyncGenerator[Any, None]:
+        index = 0
+        while True:
+            async with flight.condition:
+                while index >= len(flight.chunks) and not flight.done:
+                    await flight.condition.wait()
+                pending = flight.chunks[index:]
+                finished = flight.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(flight.chunks):
+                break
+
+        if flight.error is not None:
+            if isinstance(flight.error, asyncio.CancelledError):
+                raise RuntimeError("Génération partagée annulée")
+            raise flight.error
+
+    def _record_saved(self, kind: str, seconds: float):
+        seconds = max(seconds, 0.0)
+        self.stats["saved_seconds"] += seconds
+        record_llm_coalesced(self.name, kind, seconds)
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._streams)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "in_flight": self.in_flight()
+        }
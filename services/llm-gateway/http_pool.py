@@ -0,0 +1,181 @@
+"""
+🔌 Pool HTTP partagé - JARVIS LLM Gateway
+Une session aiohttp keep-alive par upstream Ollama (light / heavy / fallback)
+Limites de connexions globales et par hôte, métriques au niveau connexion
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import aiohttp
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class UpstreamClient:
+    """
+    Client HTTP d'un upstream:
+    - Session et connecteur uniques (connexions TCP réutilisées, keep-alive)
+    - Plafond de connexions concurrentes par hôte (les requêtes au-delà attendent une connexion libre)
+    - Statistiques: connexions créées/réutilisées, attente de connexion, temps d'établissement
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        limit: int = 100,
+        limit_per_host: int = 16,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 300.0,
+        connect_timeout: float = 10.0
+    ):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "queued": 0,
+            "total_queue_wait": 0.0,
+            "total_connect_time": 0.0
+        }
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Session partagée (créée à la première utilisation, dans la boucle courante)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                trace_configs=[self._trace_config()]
+            )
+        return self._session
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, **kwargs):
+        """
+        Requête sur l'upstream (utilisable avec `async with` ou `await`)
+        Avec `await`, l'appelant doit appeler response.release() pour rendre la connexion au pool
+        """
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Hooks aiohttp pour les statistiques de connexion"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats["requests"] += 1
+
+        async def on_request_exception(session, ctx, params):
+            self.stats["errors"] += 1
+
+        async def on_connection_queued_start(session, ctx, params):
+            ctx.queued_at = time.perf_counter()
+            self.stats["queued"] += 1
+
+        async def on_connection_queued_end(session, ctx, params):
+            wait = time.perf_counter() - ctx.queued_at
+            self.stats["total_queue_wait"] += wait
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_at = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            connect_time = time.perf_counter() - ctx.connect_at
+            self.stats["connections_created"] += 1
+            self.stats["total_connect_time"] += connect_time
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats["connections_reused"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_queued_start.append(on_connection_queued_start)
+        trace.on_connection_queued_end.append(on_connection_queued_end)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = self.stats["connections_created"] + self.stats["connections_reused"]
+        return {
+            **self.stats,
+            "base_url": self.base_url,
+            "limit_per_host": self.limit_per_host,
+            "reuse_rate": self.stats["connections_reused"] / max(connections, 1),
+            "open": self._session is not None and not self._session.closed
+        }
+
+
+class HTTPClientPool:
+    """Registre des clients upstream (un seul client par URL de base)"""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 16,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 300.0,
+        connect_timeout: float = 10.0
+    ):
+        self.defaults = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "timeout": timeout,
+            "connect_timeout": connect_timeout
+        }
+        self.upstreams: Dict[str, UpstreamClient] = {}
+
+    def register(self, name: str, base_url: str, **overrides) -> UpstreamClient:
+        """Obtenir le client d'un upstream (les composants visant la même URL partagent les connexions)"""
+        key = base_url.rstrip("/")
+        client = self.upstreams.get(key)
+        if client is None:
+            client = UpstreamClient(name, key, **{**self.defaults, **overrides})
+            self.upstreams[key] = client
+            logger.info("🔌 Upstream HTTP enregistré", upstream=name, url=key, limit_per_host=client.limit_per_host)
+        return client
+
+    async def close(self):
+        """Fermer toutes les sessions"""
+        for client in self.upstreams.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.error("❌ Erreur fermeture upstream", upstream=client.name, error=str(e))
+        logger.info("🔴 Pool HTTP fermé")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {client.name: client.get_stats() for client in self.upstreams.values()}
+
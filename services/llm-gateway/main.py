@@ -5,6 +5,7 @@ Optimized for AMD RX 7800 XT (16GB VRAM) with GPT-OSS 20B integration
 """
 
 import asyncio
+import os
 import time
 import json
 import aiohttp
@@ -19,6 +20,12 @@ from pydantic import BaseModel
 import structlog
 import GPUtil
 
+from prometheus_client import make_asgi_app
+
+from http_pool import HTTPClientPool
+from routing import RoutingEngine
+from scheduler import AdmissionScheduler, AdmissionRejected, Priority
+
 # Configuration logging
 structlog.configure(
     processors=[
@@ -73,6 +80,18 @@ class RequestComplexity:
     context_length: int
     multimodal: bool
     complexity_score: float  # 0.0 to 1.0
+    conversation_key: str = ""  # hash de la conversation (préfixe analysé)
+
+# Indicateurs de complexité (recherche par sous-chaîne, insensible à la casse)
+REASONING_INDICATORS = [
+    "explain", "analyze", "compare", "reasoning", "logic", "problem",
+    "step by step", "think through", "complex", "detailed", "comprehensive"
+]
+
+CODE_INDICATORS = [
+    "code", "function", "class", "algorithm", "programming", "debug",
+    "implement", "optimize", "refactor"
+]
 
 class LLMGateway:
     """Gateway intelligent pour routing multi-modèles optimisé AMD RX 7800 XT"""
@@ -106,6 +125,28 @@ class LLMGateway:
             )
         }
         
+        # Clients HTTP keep-alive par upstream (light et heavy partagent les connexions du même Ollama)
+        self.http_pool = HTTPClientPool(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "16")),
+            keepalive_timeout=float(os.getenv("HTTP_POOL_KEEPALIVE_SECONDS", "30"))
+        )
+        self.clients = {
+            model_type: self.http_pool.register(f"ollama_{model_type.value}", config.url)
+            for model_type, config in self.models.items()
+        }
+        
+        # Analyse incrémentale des conversations et cache de routage
+        self.routing = RoutingEngine(REASONING_INDICATORS, CODE_INDICATORS)
+        
+        # Contrôle d'admission: slots de génération par modèle, files à priorité
+        self.scheduler = AdmissionScheduler(
+            max_queue_per_model=int(os.getenv("GATEWAY_MAX_QUEUE_PER_MODEL", "64")),
+            max_slots=int(os.getenv("GATEWAY_MAX_SLOTS_PER_MODEL", "8"))
+        )
+        for model_type in self.models:
+            self.scheduler.register_model(model_type.value)
+        
         # État du système
         self.current_model: Optional[ModelType] = None
         self.gpu_metrics: Optional[GPUMetrics] = None
@@ -133,6 +174,9 @@ class LLMGateway:
         """Initialisation du gateway avec détection GPU"""
         logger.info("🚀 Initialisation LLM Gateway...")
         
+        # Tokenizer BPE de l'analyse de complexité (téléchargé par tiktoken s'il n'est pas en cache)
+        await self.routing.load_tokenizer(float(os.getenv("GATEWAY_TOKENIZER_LOAD_TIMEOUT", "10")))
+        
         # Détecter GPU AMD
         await self._detect_gpu()
         
@@ -160,6 +204,7 @@ class LLMGateway:
                     status=self._calculate_gpu_status(gpu.memoryUtil * 100, gpu.temperature),
                     last_updated=time.time()
                 )
+                self._update_model_slots()
                 logger.info("🎮 GPU détecté", 
                            name=gpu.name,
                            vram_total=f"{gpu.memoryTotal}MB",
@@ -204,56 +249,52 @@ class LLMGateway:
                     status=self._calculate_gpu_status(gpu.memoryUtil * 100, gpu.temperature),
                     last_updated=time.time()
                 )
+                self._update_model_slots()
         except Exception as e:
             logger.error("❌ Erreur mise à jour GPU", error=str(e))
 
+    def _update_model_slots(self):
+        """Ajuster les slots de génération concurrents aux métriques GPU courantes"""
+        # Le fallback tourne dans un autre conteneur: la VRAM locale ne le concerne pas
+        fallback = self.models[ModelType.FALLBACK]
+        self.scheduler.update_capacity(ModelType.FALLBACK.value, fallback.max_vram_mb, None)
+        self.scheduler.update_gpu_capacities(
+            {
+                model_type.value: config.max_vram_mb
+                for model_type, config in self.models.items()
+                if model_type != ModelType.FALLBACK
+            },
+            self.gpu_metrics
+        )
+
     async def _test_model_connections(self):
         """Test connectivité modèles Ollama"""
         for model_type, config in self.models.items():
             try:
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                    async with session.get(f"{config.url}/api/tags") as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            models = [m['name'] for m in data.get('models', [])]
-                            if config.name in models:
-                                logger.info(f"✅ Modèle {config.name} disponible sur {config.url}")
-                            else:
-                                logger.warning(f"⚠️ Modèle {config.name} non trouvé sur {config.url}")
+                client = self.clients[model_type]
+                async with client.get("/api/tags", timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        models = [m['name'] for m in data.get('models', [])]
+                        if config.name in models:
+                            logger.info(f"✅ Modèle {config.name} disponible sur {config.url}")
                         else:
-                            logger.error(f"❌ Connexion {config.url} échouée: {response.status}")
+                            logger.warning(f"⚠️ Modèle {config.name} non trouvé sur {config.url}")
+                    else:
+                        logger.error(f"❌ Connexion {config.url} échouée: {response.status}")
             except Exception as e:
                 logger.error(f"❌ Test connexion {model_type}: {str(e)}")
 
     def analyze_request_complexity(self, messages: List[Dict], context: Dict = None) -> RequestComplexity:
-        """Analyse de complexité de requête pour sélection modèle"""
-        
-        # Calculer nombre de tokens approximatif
-        total_text = ""
-        for msg in messages:
-            total_text += msg.get('content', '') + " "
-        
-        # Estimation tokens (approximation)
-        token_count = len(total_text.split()) * 1.3  # Facteur d'approximation
-        
-        # Analyse contenu pour déterminer complexité
-        reasoning_indicators = [
-            "explain", "analyze", "compare", "reasoning", "logic", "problem",
-            "step by step", "think through", "complex", "detailed", "comprehensive"
-        ]
+        """Analyse de complexité de requête pour sélection modèle (incrémentale par conversation)"""
         
-        code_indicators = [
-            "code", "function", "class", "algorithm", "programming", "debug",
-            "implement", "optimize", "refactor"
-        ]
-        
-        text_lower = total_text.lower()
-        reasoning_score = sum(1 for indicator in reasoning_indicators if indicator in text_lower)
-        code_score = sum(1 for indicator in code_indicators if indicator in text_lower)
+        conversation_key, state = self.routing.analyze(messages)
+        reasoning_score = self.routing.reasoning_score(state)
+        code_score = self.routing.code_score(state)
         
         # Calcul score complexité (0.0 à 1.0)
         complexity_factors = {
-            "token_length": min(token_count / 1000, 1.0) * 0.3,
+            "token_length": min(state.token_count / 1000, 1.0) * 0.3,
             "reasoning": min(reasoning_score / 5, 1.0) * 0.4,
             "code": min(code_score / 3, 1.0) * 0.3
         }
@@ -261,39 +302,63 @@ class LLMGateway:
         complexity_score = sum(complexity_factors.values())
         
         return RequestComplexity(
-            token_count=int(token_count),
+            token_count=state.token_count,
             reasoning_required=reasoning_score > 1,
             context_length=len(messages),
             multimodal=False,  # TODO: Détecter contenu multimodal
-            complexity_score=min(complexity_score, 1.0)
+            complexity_score=min(complexity_score, 1.0),
+            conversation_key=conversation_key
         )
 
+    def _routing_features(self, complexity: RequestComplexity) -> Tuple[Optional[str], bool, bool]:
+        """Entrées de la décision de routage (clé du cache de décisions): état GPU, VRAM du modèle lourd, complexité"""
+        complex_request = complexity.complexity_score >= self.complexity_threshold
+        if not self.gpu_metrics:
+            return None, True, complex_request
+        available_vram = self.gpu_metrics.memory_total_mb - self.gpu_metrics.memory_used_mb
+        heavy_fits = available_vram >= self.models[ModelType.HEAVY].max_vram_mb
+        return self.gpu_metrics.status.value, heavy_fits, complex_request
+
     def select_optimal_model(self, complexity: RequestComplexity) -> Tuple[ModelType, str]:
-        """Sélection modèle optimal basée sur complexité et état GPU"""
+        """Sélection modèle optimal (décision mémorisée par caractéristiques, raison formatée à chaque requête)"""
+        features = self._routing_features(complexity)
+        decision = self.routing.cached_decision(features)
+        if decision is None:
+            decision = self._select_model(features)
+            self.routing.store_decision(features, decision)
+        
+        model_type, reason = decision
+        available_vram = (self.gpu_metrics.memory_total_mb - self.gpu_metrics.memory_used_mb) if self.gpu_metrics else None
+        return model_type, reason.format(
+            score=complexity.complexity_score,
+            available=available_vram,
+            required=self.models[ModelType.HEAVY].max_vram_mb
+        )
+
+    def _select_model(self, features: Tuple[Optional[str], bool, bool]) -> Tuple[ModelType, str]:
+        """Sélection modèle optimal basée sur complexité et état GPU (raison en gabarit)"""
+        status, heavy_fits, complex_request = features
         
         # Vérifier état GPU critique
-        if self.gpu_metrics and self.gpu_metrics.status == GPUStatus.CRITICAL:
+        if status == GPUStatus.CRITICAL.value:
             return ModelType.FALLBACK, "GPU en état critique, utilisation fallback"
         
         # Sélection basée sur complexité
-        if complexity.complexity_score >= self.complexity_threshold:
+        if complex_request:
             # Requête complexe - vérifier si GPU peut gérer GPT-OSS 20B
-            if self.gpu_metrics:
-                required_vram = self.models[ModelType.HEAVY].max_vram_mb
-                available_vram = self.gpu_metrics.memory_total_mb - self.gpu_metrics.memory_used_mb
-                
-                if available_vram >= required_vram:
-                    return ModelType.HEAVY, f"Complexité élevée ({complexity.complexity_score:.2f}), GPU optimal"
-                else:
-                    return ModelType.LIGHT, f"Complexité élevée mais VRAM insuffisante ({available_vram}MB < {required_vram}MB)"
-            else:
-                return ModelType.HEAVY, f"Complexité élevée ({complexity.complexity_score:.2f}), pas de monitoring GPU"
-        else:
-            # Requête simple - utiliser modèle léger
-            return ModelType.LIGHT, f"Complexité faible ({complexity.complexity_score:.2f}), modèle léger optimal"
+            if status is None:
+                return ModelType.HEAVY, "Complexité élevée ({score:.2f}), pas de monitoring GPU"
+            if heavy_fits:
+                return ModelType.HEAVY, "Complexité élevée ({score:.2f}), GPU optimal"
+            return ModelType.LIGHT, "Complexité élevée mais VRAM insuffisante ({available}MB < {required}MB)"
+        
+        # Requête simple - utiliser modèle léger
+        return ModelType.LIGHT, "Complexité faible ({score:.2f}), modèle léger optimal"
 
-    async def process_request(self, messages: List[Dict], stream: bool = True, **kwargs) -> Dict:
-        """Traitement intelligent de requête avec sélection modèle"""
+    async def process_request(self, messages: List[Dict], stream: bool = True,
+                              priority: Priority = Priority.CHAT, deadline_ms: Optional[int] = None,
+                              **kwargs) -> Dict:
+        """Traitement intelligent de requête avec sélection modèle et contrôle d'admission"""
         
         start_time = time.time()
         request_id = f"req_{int(time.time() * 1000)}"
@@ -324,53 +389,75 @@ class LLMGateway:
                 }
             }
             
-            # Envoi requête
-            async with aiohttp.ClientSession() as session:
-                url = f"{model_config.url}/api/chat"
+            # Attente d'un slot de génération (file à priorité, délestage selon échéance)
+            try:
+                ticket = await self.scheduler.acquire(
+                    model_type.value, priority,
+                    deadline_s=deadline_ms / 1000 if deadline_ms is not None else None
+                )
+            except AdmissionRejected as e:
+                headers = {"Retry-After": str(max(int(e.retry_after), 1))} if e.retry_after else None
+                raise HTTPException(status_code=e.status_code, detail=f"Gateway saturé: {e.reason}", headers=headers)
+            
+            # Envoi requête (connexion et slot rendus par le générateur en streaming)
+            handed_off = False
+            try:
+                response = await self.clients[model_type].post("/api/chat", json=payload)
+            except Exception:
+                self.scheduler.release(ticket)
+                raise
+            try:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise HTTPException(status_code=response.status, detail=error_text)
                 
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise HTTPException(status_code=response.status, detail=error_text)
-                    
-                    # Mise à jour statistiques
-                    self.stats["total_requests"] += 1
-                    if model_type == ModelType.LIGHT:
-                        self.stats["light_model_requests"] += 1
-                    elif model_type == ModelType.HEAVY:
-                        self.stats["heavy_model_requests"] += 1
-                    else:
-                        self.stats["fallback_requests"] += 1
-                    
-                    response_time = time.time() - start_time
-                    self.stats["avg_response_time"] = (
-                        (self.stats["avg_response_time"] * (self.stats["total_requests"] - 1) + response_time) 
-                        / self.stats["total_requests"]
+                # Mise à jour statistiques
+                self.stats["total_requests"] += 1
+                if model_type == ModelType.LIGHT:
+                    self.stats["light_model_requests"] += 1
+                elif model_type == ModelType.HEAVY:
+                    self.stats["heavy_model_requests"] += 1
+                else:
+                    self.stats["fallback_requests"] += 1
+                
+                response_time = time.time() - start_time
+                self.stats["avg_response_time"] = (
+                    (self.stats["avg_response_time"] * (self.stats["total_requests"] - 1) + response_time) 
+                    / self.stats["total_requests"]
+                )
+                
+                if stream:
+                    handed_off = True
+                    return StreamingResponse(
+                        self._stream_response(response, ticket, request_id, model_config.name),
+                        media_type="text/plain"
                     )
-                    
-                    if stream:
-                        return StreamingResponse(
-                            self._stream_response(response, request_id, model_config.name),
-                            media_type="text/plain"
-                        )
-                    else:
-                        result = await response.json()
-                        return {
-                            "response": result,
-                            "metadata": {
-                                "model_used": model_config.name,
-                                "complexity_score": complexity.complexity_score,
-                                "response_time": response_time,
-                                "gpu_status": self.gpu_metrics.status.value if self.gpu_metrics else "unknown"
-                            }
+                else:
+                    result = await response.json()
+                    return {
+                        "response": result,
+                        "metadata": {
+                            "model_used": model_config.name,
+                            "complexity_score": complexity.complexity_score,
+                            "response_time": response_time,
+                            "queue_wait": ticket.waited,
+                            "gpu_status": self.gpu_metrics.status.value if self.gpu_metrics else "unknown"
                         }
-                        
+                    }
+            finally:
+                if not handed_off:
+                    response.release()
+                    self.scheduler.release(ticket)
+        
+        except HTTPException:
+            self.stats["failures"] += 1
+            raise
         except Exception as e:
             self.stats["failures"] += 1
             logger.error("❌ Erreur traitement requête", request_id=request_id, error=str(e))
             raise HTTPException(status_code=500, detail=f"Erreur Gateway LLM: {str(e)}")
 
-    async def _stream_response(self, response, request_id: str, model_name: str):
+    async def _stream_response(self, response, ticket, request_id: str, model_name: str):
         """Streaming de réponse avec monitoring"""
         try:
             async for chunk in response.content:
@@ -379,6 +466,14 @@ class LLMGateway:
         except Exception as e:
             logger.error("❌ Erreur streaming", request_id=request_id, model=model_name, error=str(e))
             yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            # Rendre la connexion et le slot une fois le flux consommé (ou abandonné)
+            response.release()
+            self.scheduler.release(ticket)
+    
+    async def shutdown(self):
+        """Fermeture des connexions upstream"""
+        await self.http_pool.close()
 
 # 🚀 FastAPI Application
 app = FastAPI(
@@ -389,15 +484,24 @@ app = FastAPI(
 
 gateway = LLMGateway()
 
+# Métriques Prometheus (files d'attente, slots, délestage)
+app.mount("/metrics", make_asgi_app())
+
 @app.on_event("startup")
 async def startup():
     await gateway.initialize()
 
+@app.on_event("shutdown")
+async def shutdown():
+    await gateway.shutdown()
+
 class ChatRequest(BaseModel):
     messages: List[Dict[str, Any]]
     stream: bool = True
     temperature: float = 0.7
     max_tokens: int = 2048
+    priority: str = "chat"  # voice, chat, background
+    deadline_ms: Optional[int] = None  # attente maximale en file
 
 @app.post("/api/chat")
 async def chat_completion(request: ChatRequest):
@@ -405,6 +509,8 @@ async def chat_completion(request: ChatRequest):
     return await gateway.process_request(
         messages=request.messages,
         stream=request.stream,
+        priority=Priority.parse(request.priority),
+        deadline_ms=request.deadline_ms,
         temperature=request.temperature,
         max_tokens=request.max_tokens
     )
@@ -445,6 +551,9 @@ async def metrics():
             "disk_usage": psutil.disk_usage('/').percent
         },
         "gateway_stats": gateway.stats,
+        "scheduler": gateway.scheduler.get_stats(),
+        "routing": gateway.routing.get_stats(),
+        "http_pool": gateway.http_pool.get_stats(),
         "current_model": gateway.current_model.value if gateway.current_model else None
     }
 
@@ -0,0 +1,244 @@
+"""
+🧭 Routing Engine - JARVIS LLM Gateway
+Analyse de complexité incrémentale: tokenizer local, indicateurs compilés en un seul motif,
+état mémorisé par préfixe de conversation et décisions de routage mises en cache
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+try:
+    from tokenizers import Tokenizer as HFTokenizer
+    HF_TOKENIZERS_AVAILABLE = True
+except ImportError:
+    HF_TOKENIZERS_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# Surcoût du template de chat Ollama par message (rôle, délimiteurs)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class LocalTokenizer:
+    """
+    Tokenizer local, par ordre de préférence:
+    - tokenizer.json HuggingFace (GATEWAY_TOKENIZER_PATH, ex: tokenizer Llama 3)
+    - BPE tiktoken cl100k_base (proche des vocabulaires Llama 3 / GPT-OSS), chargé au démarrage
+      par load_bpe: tiktoken télécharge l'encodage à la première utilisation
+    - Découpage regex façon BPE (mots, ponctuation, sous-mots de 4 caractères)
+    """
+
+    _FALLBACK_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+    def __init__(self, path: Optional[str] = None):
+        self.backend = "regex"
+        self._encoder = None
+
+        path = path or os.getenv("GATEWAY_TOKENIZER_PATH")
+        if path and HF_TOKENIZERS_AVAILABLE and os.path.exists(path):
+            try:
+                self._encoder = HFTokenizer.from_file(path)
+                self.backend = "huggingface"
+            except Exception as e:
+                logger.warning("⚠️ Tokenizer HuggingFace non chargé", path=path, error=str(e))
+
+        logger.info("🔤 Tokenizer de routage", backend=self.backend)
+
+    @staticmethod
+    def load_bpe() -> Any:
+        """Encodage tiktoken cl100k_base (bloquant: lecture du cache disque ou téléchargement)"""
+        return tiktoken.get_encoding("cl100k_base")
+
+    def use_bpe(self, encoder: Any):
+        self._encoder = encoder
+        self.backend = "tiktoken"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.backend == "huggingface":
+            return len(self._encoder.encode(text, add_special_tokens=False).ids)
+        if self.backend == "tiktoken":
+            return len(self._encoder.encode_ordinary(text))
+        return sum(1 + (len(token) - 1) // 4 for token in self._FALLBACK_PATTERN.findall(text))
+
+
+class IndicatorMatcher:
+    """
+    Indicateurs compilés en un seul motif (recherche en une passe, correspondances chevauchantes)
+    Retourne un masque de bits des indicateurs présents
+    """
+
+    def __init__(self, indicators: Iterable[str]):
+        self.indicators = list(dict.fromkeys(i.lower() for i in indicators))
+        self._bits = {indicator: 1 << i for i, indicator in enumerate(self.indicators)}
+        alternation = "|".join(re.escape(i) for i in sorted(self.indicators, key=len, reverse=True))
+        self._pattern = re.compile(f"(?=({alternation}))")
+
+    def scan(self, text_lower: str) -> int:
+        mask = 0
+        for match in self._pattern.finditer(text_lower):
+            mask |= self._bits[match.group(1)]
+        return mask
+
+    @staticmethod
+    def count(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+@dataclass(frozen=True)
+class ConversationState:
+    """État cumulé de l'analyse d'un préfixe de conversation"""
+    token_count: int = 0
+    reasoning_mask: int = 0
+    code_mask: int = 0
+    messages: int = 0
+
+
+class _LRU(OrderedDict):
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def lookup(self, key: Hashable) -> Any:
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key: Hashable, value: Any):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class RoutingEngine:
+    """
+    Moteur d'analyse des conversations:
+    - Chaque préfixe de conversation est identifié par un hash chaîné message par message
+    - Seuls les messages au-delà du plus long préfixe déjà analysé sont tokenisés et scannés
+    - Les décisions de routage sont mémorisées par caractéristiques de décision (état GPU, complexité)
+    """
+
+    def __init__(
+        self,
+        reasoning_indicators: Iterable[str],
+        code_indicators: Iterable[str],
+        tokenizer: Optional[LocalTokenizer] = None,
+        prefix_cache_size: int = 8192,
+        decision_cache_size: int = 4096
+    ):
+        self.tokenizer = tokenizer or LocalTokenizer()
+        self.reasoning = IndicatorMatcher(reasoning_indicators)
+        self.code = IndicatorMatcher(code_indicators)
+
+        self._prefixes = _LRU(prefix_cache_size)
+        self._decisions = _LRU(decision_cache_size)
+
+        self.stats = {
+            "analyses": 0,
+            "messages_analyzed": 0,
+            "messages_reused": 0,
+            "decision_hits": 0,
+            "decision_misses": 0
+        }
+
+    @staticmethod
+    def _prefix_keys(messages: List[Dict]) -> List[str]:
+        hasher = hashlib.blake2b(digest_size=16)
+        keys = []
+        for message in messages:
+            content = message.get("content", "")
+            hasher.update(str(message.get("role", "")).encode("utf-8"))
+            hasher.update(b"\x00")
+            hasher.update((content if isinstance(content, str) else str(content)).encode("utf-8"))
+            hasher.update(b"\x01")
+            keys.append(hasher.hexdigest())
+        return keys
+
+    def analyze(self, messages: List[Dict]) -> Tuple[str, ConversationState]:
+        """Analyser une conversation (incrémentalement depuis le plus long préfixe connu)"""
+        self.stats["analyses"] += 1
+        keys = self._prefix_keys(messages)
+
+        state = ConversationState()
+        start = 0
+        for i in range(len(keys) - 1, -1, -1):
+            cached = self._prefixes.lookup(keys[i])
+            if cached is not None:
+                state, start = cached, i + 1
+                break
+        self.stats["messages_reused"] += start
+
+        for i in range(start, len(messages)):
+            content = messages[i].get("content", "")
+            if not isinstance(content, str):
+                content = str(content)
+            text_lower = content.lower()
+            state = ConversationState(
+                token_count=state.token_count + self.tokenizer.count(content) + MESSAGE_OVERHEAD_TOKENS,
+                reasoning_mask=state.reasoning_mask | self.reasoning.scan(text_lower),
+                code_mask=state.code_mask | self.code.scan(text_lower),
+                messages=state.messages + 1
+            )
+            self._prefixes.store(keys[i], state)
+            self.stats["messages_analyzed"] += 1
+
+        return (keys[-1] if keys else ""), state
+
+    def reasoning_score(self, state: ConversationState) -> int:
+        return IndicatorMatcher.count(state.reasoning_mask)
+
+    def code_score(self, state: ConversationState) -> int:
+        return IndicatorMatcher.count(state.code_mask)
+
+    async def load_tokenizer(self, timeout: float = 10.0) -> bool:
+        """
+        Charger le BPE tiktoken (au démarrage, hors boucle d'événements et borné dans le temps);
+        en cas d'échec ou de dépassement, l'estimation regex reste en place
+        """
+        if self.tokenizer.backend != "regex" or not TIKTOKEN_AVAILABLE:
+            return False
+        try:
+            encoder = await asyncio.wait_for(asyncio.to_thread(LocalTokenizer.load_bpe), timeout)
+        except Exception as e:
+            logger.warning("⚠️ Encodage tiktoken indisponible, estimation regex conservée", error=repr(e))
+            return False
+
+        self.tokenizer.use_bpe(encoder)
+        self._prefixes.clear()  # états comptés avec l'ancien tokenizer
+        logger.info("🔤 Tokenizer de routage", backend=self.tokenizer.backend)
+        return True
+
+    def cached_decision(self, features: Hashable) -> Any:
+        decision = self._decisions.lookup(features)
+        self.stats["decision_hits" if decision is not None else "decision_misses"] += 1
+        return decision
+
+    def store_decision(self, features: Hashable, decision: Any):
+        self._decisions.store(features, decision)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["messages_analyzed"] + self.stats["messages_reused"]
+        return {
+            **self.stats,
+            "tokenizer": self.tokenizer.backend,
+            "prefix_cache_entries": len(self._prefixes),
+            "decision_cache_entries": len(self._decisions),
+            "message_reuse_rate": self.stats["messages_reused"] / max(total, 1)
+        }
@@ -0,0 +1,326 @@
+"""
+🚦 Admission Scheduler - JARVIS LLM Gateway
+Contrôle d'admission par modèle: slots de génération concurrents dérivés de la VRAM,
+files bornées par priorité (voix > chat > tâches de fond) et délestage selon les échéances
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = structlog.get_logger(__name__)
+
+
+class Priority(IntEnum):
+    VOICE = 0        # interaction vocale temps réel
+    CHAT = 1         # chat interactif
+    BACKGROUND = 2   # résumés, tâches de fond
+
+    @classmethod
+    def parse(cls, value: Any) -> "Priority":
+        """Priorité depuis un nom ("voice", "chat", "background", ...) ou un entier"""
+        if isinstance(value, Priority):
+            return value
+        if isinstance(value, int):
+            return cls(min(max(value, cls.VOICE), cls.BACKGROUND))
+        aliases = {
+            "voice": cls.VOICE, "interactive": cls.VOICE, "realtime": cls.VOICE,
+            "chat": cls.CHAT,
+            "background": cls.BACKGROUND, "summarization": cls.BACKGROUND, "batch": cls.BACKGROUND
+        }
+        return aliases.get(str(value).lower(), cls.CHAT)
+
+
+# Attente maximale en file par défaut (secondes)
+DEFAULT_QUEUE_DEADLINES = {
+    Priority.VOICE: 5.0,
+    Priority.CHAT: 30.0,
+    Priority.BACKGROUND: 300.0
+}
+
+
+QUEUE_DEPTH = Gauge(
+    'jarvis_gateway_queue_depth',
+    'Requêtes en attente d\'un slot de génération',
+    ['model', 'priority']
+)
+
+QUEUE_WAIT = Histogram(
+    'jarvis_gateway_queue_wait_seconds',
+    'Attente en file avant admission',
+    ['model', 'priority'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+
+ACTIVE_GENERATIONS = Gauge(
+    'jarvis_gateway_active_generations',
+    'Générations en cours par modèle',
+    ['model']
+)
+
+MODEL_SLOTS = Gauge(
+    'jarvis_gateway_model_slots',
+    'Slots de génération concurrents autorisés par modèle',
+    ['model']
+)
+
+SHED_REQUESTS = Counter(
+    'jarvis_gateway_shed_requests_total',
+    'Requêtes rejetées par le contrôle d\'admission',
+    ['model', 'priority', 'reason']
+)
+
+
+class AdmissionRejected(Exception):
+    """Requête refusée par le scheduler (file pleine, échéance intenable ou dépassée)"""
+
+    def __init__(self, reason: str, status_code: int = 503, retry_after: Optional[float] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    deadline: float = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+@dataclass
+class Ticket:
+    """Slot de génération obtenu (à rendre via AdmissionScheduler.release)"""
+    model: str
+    priority: Priority
+    admitted_at: float
+    waited: float
+    released: bool = False
+
+
+class _ModelQueue:
+    """Slots et file d'attente d'un modèle"""
+
+    def __init__(self, name: str, capacity: int, initial_service_time: float):
+        self.name = name
+        self.capacity = capacity
+        self.active = 0
+        self.heap: List[_Waiter] = []
+        self.service_time = initial_service_time  # moyenne mobile exponentielle
+
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "shed_queue_full": 0,
+            "shed_preempted": 0,
+            "shed_deadline": 0,
+            "total_wait": 0.0
+        }
+
+    def waiting(self) -> List[_Waiter]:
+        return [w for w in self.heap if not w.future.done()]
+
+    def expected_wait(self, ahead: int) -> float:
+        """Attente estimée derrière `ahead` requêtes (slots pleins)"""
+        return (ahead // max(self.capacity, 1) + 1) * self.service_time
+
+
+class AdmissionScheduler:
+    """
+    Scheduler d'admission du gateway:
+    - Slots par modèle: 1 + part de la VRAM libre / coût VRAM d'une séquence supplémentaire (KV cache),
+      la VRAM libre étant partagée entre les modèles d'un même GPU
+    - File à priorité par modèle (voix > chat > fond, FIFO à priorité égale), bornée
+    - File pleine: la requête la moins prioritaire et la plus récente est évincée au profit d'une plus prioritaire
+    - Échéances: refus immédiat si l'attente estimée dépasse l'échéance, expiration en file sinon
+    """
+
+    def __init__(
+        self,
+        max_queue_per_model: int = 64,
+        max_slots: int = 8,
+        default_slots: int = 2,
+        slot_vram_fraction: float = 0.125,
+        min_slot_vram_mb: int = 256,
+        initial_service_time: float = 2.0,
+        ewma_alpha: float = 0.2
+    ):
+        self.max_queue_per_model = max_queue_per_model
+        self.max_slots = max_slots
+        self.default_slots = default_slots
+        self.slot_vram_fraction = slot_vram_fraction
+        self.min_slot_vram_mb = min_slot_vram_mb
+        self.initial_service_time = initial_service_time
+        self.ewma_alpha = ewma_alpha
+
+        self.queues: Dict[str, _ModelQueue] = {}
+        self._seq = itertools.count()
+
+    def register_model(self, model: str, capacity: Optional[int] = None):
+        if model not in self.queues:
+            self.queues[model] = _ModelQueue(model, capacity or self.default_slots, self.initial_service_time)
+            MODEL_SLOTS.labels(model=model).set(self.queues[model].capacity)
+
+    def compute_slots(self, max_vram_mb: int, gpu_metrics: Any = None, vram_share: float = 1.0) -> int:
+        """
+        Slots concurrents d'un modèle d'après la VRAM:
+        chaque séquence parallèle coûte ~slot_vram_fraction du modèle en KV cache,
+        payée sur la part `vram_share` de la VRAM libre revenant au modèle
+        """
+        if gpu_metrics is None:
+            return self.default_slots
+
+        status = getattr(gpu_metrics.status, "value", gpu_metrics.status)
+        if status == "critical":
+            return 1
+
+        per_slot_mb = max(max_vram_mb * self.slot_vram_fraction, self.min_slot_vram_mb)
+        free_mb = max(gpu_metrics.memory_total_mb - gpu_metrics.memory_used_mb, 0) * vram_share
+        slots = 1 + int(free_mb // per_slot_mb)
+        if status == "loaded":
+            slots = max(1, slots // 2)
+        return min(slots, self.max_slots)
+
+    def update_capacity(self, model: str, max_vram_mb: int, gpu_metrics: Any = None, vram_share: float = 1.0):
+        """Recalculer les slots d'un modèle (appelé à chaque mise à jour des métriques GPU)"""
+        self.register_model(model)
+        queue = self.queues[model]
+        capacity = self.compute_slots(max_vram_mb, gpu_metrics, vram_share)
+        if capacity != queue.capacity:
+            logger.info("🚦 Slots modèle ajustés", model=model, previous=queue.capacity, slots=capacity)
+            queue.capacity = capacity
+            MODEL_SLOTS.labels(model=model).set(capacity)
+            self._dispatch(queue)
+
+    def update_gpu_capacities(self, models: Dict[str, int], gpu_metrics: Any = None):
+        """
+        Recalculer les slots des modèles d'un même GPU ({modèle: max_vram_mb}):
+        la VRAM libre est répartie à parts égales, sans être comptée pour chacun
+        """
+        vram_share = 1.0 / max(len(models), 1)
+        for model, max_vram_mb in models.items():
+            self.update_capacity(model, max_vram_mb, gpu_metrics, vram_share)
+
+    async def acquire(self, model: str, priority: Priority = Priority.CHAT, deadline_s: Optional[float] = None) -> Ticket:
+        """Obtenir un slot de génération (attente en file si nécessaire)"""
+        self.register_model(model)
+        queue = self.queues[model]
+        now = time.monotonic()
+        deadline = now + (deadline_s if deadline_s is not None else DEFAULT_QUEUE_DEADLINES[priority])
+
+        waiting = queue.waiting()
+        if queue.active < queue.capacity and not waiting:
+            return self._admit(queue, priority, 0.0)
+
+        # Échéance intenable: inutile d'occuper la file
+        ahead = sum(1 for w in waiting if w.priority <= priority)
+        expected = queue.expected_wait(ahead)
+        if now + expected > deadline:
+            self._shed(queue, priority, "deadline")
+            raise AdmissionRejected("deadline_unreachable", 503, retry_after=expected)
+
+        if len(waiting) >= self.max_queue_per_model:
+            victim = max(waiting)
+            if victim.priority <= priority:
+                self._shed(queue, priority, "queue_full")
+                raise AdmissionRejected("queue_full", 503, retry_after=expected)
+            self._shed(queue, Priority(victim.priority), "preempted")
+            victim.future.set_exception(AdmissionRejected("preempted", 503, retry_after=expected))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue.heap, _Waiter(int(priority), next(self._seq), deadline, now, future))
+        queue.stats["queued"] += 1
+        self._update_depth(queue)
+
+        try:
+            waited = await asyncio.wait_for(future, timeout=max(deadline - now, 0))
+        except asyncio.TimeoutError:
+            self._shed(queue, priority, "deadline")
+            raise AdmissionRejected("deadline_exceeded", 504)
+        except asyncio.CancelledError:
+            # Slot attribué pendant l'annulation de l'appelant: le rendre
+            if future.done() and not future.cancelled() and future.exception() is None:
+                queue.active -= 1
+                ACTIVE_GENERATIONS.labels(model=model).set(queue.active)
+                self._dispatch(queue)
+            raise
+        finally:
+            self._update_depth(queue)
+
+        return Ticket(model=model, priority=priority, admitted_at=time.monotonic(), waited=waited)
+
+    def release(self, ticket: Ticket):
+        """Rendre un slot et admettre les requêtes suivantes"""
+        if ticket.released:
+            return
+        ticket.released = True
+
+        queue = self.queues[ticket.model]
+        queue.active = max(queue.active - 1, 0)
+        service_time = time.monotonic() - ticket.admitted_at
+        queue.service_time += self.ewma_alpha * (service_time - queue.service_time)
+        ACTIVE_GENERATIONS.labels(model=ticket.model).set(queue.active)
+        self._dispatch(queue)
+
+    def _admit(self, queue: _ModelQueue, priority: Priority, waited: float) -> Ticket:
+        queue.active += 1
+        queue.stats["admitted"] += 1
+        ACTIVE_GENERATIONS.labels(model=queue.name).set(queue.active)
+        QUEUE_WAIT.labels(model=queue.name, priority=priority.name.lower()).observe(waited)
+        return Ticket(model=queue.name, priority=priority, admitted_at=time.monotonic(), waited=waited)
+
+    def _dispatch(self, queue: _ModelQueue):
+        """Attribuer les slots libres aux requêtes en attente (priorité puis ancienneté)"""
+        now = time.monotonic()
+        while queue.active < queue.capacity and queue.heap:
+            waiter = heapq.heappop(queue.heap)
+            if waiter.future.done():
+                continue  # annulée, expirée ou évincée
+            if waiter.deadline <= now:
+                self._shed(queue, Priority(waiter.priority), "deadline")
+                waiter.future.set_exception(AdmissionRejected("deadline_exceeded", 504))
+                continue
+
+            waited = now - waiter.enqueued_at
+            queue.active += 1
+            queue.stats["admitted"] += 1
+            queue.stats["total_wait"] += waited
+            ACTIVE_GENERATIONS.labels(model=queue.name).set(queue.active)
+            QUEUE_WAIT.labels(model=queue.name, priority=Priority(waiter.priority).name.lower()).observe(waited)
+            waiter.future.set_result(waited)
+        self._update_depth(queue)
+
+    def _shed(self, queue: _ModelQueue, priority: Priority, reason: str):
+        key = {"queue_full": "shed_queue_full", "preempted": "shed_preempted"}.get(reason, "shed_deadline")
+        queue.stats[key] += 1
+        SHED_REQUESTS.labels(model=queue.name, priority=priority.name.lower(), reason=reason).inc()
+        logger.warning("🚦 Requête délestée", model=queue.name, priority=priority.name.lower(), reason=reason)
+
+    def _update_depth(self, queue: _ModelQueue):
+        depths = {p: 0 for p in Priority}
+        for waiter in queue.waiting():
+            depths[Priority(waiter.priority)] += 1
+        for priority, depth in depths.items():
+            QUEUE_DEPTH.labels(model=queue.name, priority=priority.name.lower()).set(depth)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                **queue.stats,
+                "slots": queue.capacity,
+                "active": queue.active,
+                "queue_depth": len(queue.waiting()),
+                "avg_service_time": queue.service_time,
+                "avg_queue_wait": queue.stats["total_wait"] / max(queue.stats["admitted"], 1)
+            }
+            for name, queue in self.queues.items()
+        }
@@ -25,8 +25,11 @@ from loguru import logger
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
 import structlog
 
+from streaming import InferenceWorkerPool, StreamingSession, StreamConfig
+
 # Configuration
 MODEL_NAME = os.getenv("STT_MODEL", "base")
+STT_WORKERS = int(os.getenv("STT_WORKERS", "1"))  # inférences Whisper concurrentes
 def get_optimal_device():
     """Détection GPU optimale AMD/NVIDIA"""
     if torch.cuda.is_available():
@@ -98,6 +101,32 @@ stt_memory_usage = Gauge(
     registry=registry
 )
 
+# Métriques streaming
+stt_stream_latency = Histogram(
+    'stt_stream_latency_seconds',
+    'Delay between segment detection and transcription delivery',
+    ['kind'],
+    registry=registry
+)
+
+stt_stream_partials_dropped = Counter(
+    'stt_stream_partials_dropped_total',
+    'Partial hypotheses dropped (superseded or worker pool saturated)',
+    registry=registry
+)
+
+stt_stream_backpressure = Counter(
+    'stt_stream_backpressure_total',
+    'Final segments that waited for room in a connection queue',
+    registry=registry
+)
+
+stt_inference_in_flight = Gauge(
+    'stt_inference_in_flight',
+    'Whisper inferences running or waiting for a worker',
+    registry=registry
+)
+
 # Métriques d'erreur
 stt_errors = Counter(
     'stt_errors_total',
@@ -131,7 +160,7 @@ class STTService:
             stt_errors.labels(error_type='model_loading').inc()
             raise
     
-    def transcribe_audio(self, audio_data: np.ndarray, language: Optional[str] = None) -> Dict[str, Any]:
+    def transcribe_audio(self, audio_data: np.ndarray, language: Optional[str] = None, **decode_options) -> Dict[str, Any]:
         """Transcrire l'audio avec Whisper"""
         start_time = time.time()
         audio_duration = len(audio_data) / SAMPLE_RATE
@@ -142,7 +171,8 @@ class STTService:
                 "language": language,
                 "task": "transcribe",
                 "fp16": DEVICE == "cuda" and 'AMD' not in torch.cuda.get_device_name(0) if DEVICE == "cuda" else False,
-                "verbose": False
+                "verbose": False,
+                **decode_options
             }
             
             # Transcription
@@ -166,6 +196,22 @@ class STTService:
             stt_errors.labels(error_type='transcription').inc()
             raise
 
+    def transcribe_segment(self, audio_data: np.ndarray, language: Optional[str], prompt: Optional[str]) -> Dict[str, Any]:
+        """Transcrire un segment de flux (contexte = dernière transcription finale)"""
+        return self.transcribe_audio(
+            audio_data,
+            language,
+            initial_prompt=prompt,
+            condition_on_previous_text=False
+        )
+    
+    def detect_language(self, audio_data: np.ndarray) -> Dict[str, float]:
+        """Probabilités de langue sur les 30 premières secondes"""
+        sample = whisper.pad_or_trim(audio_data[:SAMPLE_RATE * 30])
+        mel = whisper.log_mel_spectrogram(sample).to(self.model.device)
+        _, probs = self.model.detect_language(mel)
+        return probs
+
     def process_audio_file(self, audio_bytes: bytes, format: str = "wav") -> np.ndarray:
         """Convertir les bytes audio en array numpy"""
         try:
@@ -190,6 +236,10 @@ class STTService:
 # Initialiser le service
 stt_service = STTService()
 
+# Pool d'inférence partagé (Whisper ne tourne jamais sur la boucle événementielle)
+inference_pool = InferenceWorkerPool(max_workers=STT_WORKERS)
+stream_config = StreamConfig(sample_rate=SAMPLE_RATE)
+
 @app.on_event("startup")
 async def startup_event():
     """Initialisation au démarrage"""
@@ -262,13 +312,12 @@ async def transcribe_audio(
         # Détecter la langue si demandé
         if detect_language and not language:
             # Détecter sur les 30 premières secondes
-            sample = audio_data[:SAMPLE_RATE * 30]
-            detected = stt_service.model.detect_language(sample)
+            detected = await inference_pool.run(stt_service.detect_language, audio_data)
             language = max(detected, key=detected.get)
             logger.info(f"Langue détectée: {language}")
         
-        # Transcrire
-        result = stt_service.transcribe_audio(audio_data, language)
+        # Transcrire (pool d'inférence)
+        result = await inference_pool.run(stt_service.transcribe_audio, audio_data, language)
         
         stt_requests.labels(method='transcribe', status='success').inc()
         
@@ -288,54 +337,64 @@ async def transcribe_audio(
         raise HTTPException(500, f"Erreur de transcription: {str(e)}")
 
 @app.websocket("/ws/stream")
-async def websocket_stream(websocket: WebSocket):
-    """WebSocket pour transcription en temps réel"""
+async def websocket_stream(websocket: WebSocket, language: Optional[str] = None):
+    """
+    WebSocket pour transcription en temps réel
+    Entrée: PCM int16 mono 16 kHz (binaire), texte "end" pour clôturer le flux
+    Sortie: hypothèses partielles puis finales par segment de parole
+    """
     await websocket.accept()
     stt_active_connections.inc()
     logger.info("Nouvelle connexion WebSocket STT")
     
+    async def send(message: Dict[str, Any]):
+        if message.get("type") == "transcription":
+            stt_stream_latency.labels(kind="final" if message["is_final"] else "partial").observe(message["latency"])
+        await websocket.send_json(message)
+    
+    session = StreamingSession(
+        pool=inference_pool,
+        transcribe=stt_service.transcribe_segment,
+        send=send,
+        config=stream_config,
+        language=language
+    )
+    session.start()
+    
     try:
-        audio_buffer = []
-        
         while True:
-            # Recevoir les données audio
-            data = await websocket.receive_bytes()
-            
-            # Ajouter au buffer
-            audio_buffer.extend(data)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
             
-            # Si on a assez de données (chunk de 1 seconde)
-            if len(audio_buffer) >= SAMPLE_RATE * 2:  # 2 bytes per sample
-                # Convertir en numpy array
-                audio_chunk = np.frombuffer(bytes(audio_buffer[:SAMPLE_RATE * 2]), dtype=np.int16)
-                audio_chunk = audio_chunk.astype(np.float32) / 32768.0
-                
-                # Transcrire le chunk
+            if message.get("bytes"):
+                # Segmentation sur la boucle, inférence dans le pool (attend si la file est pleine)
+                await session.feed(message["bytes"])
+                stt_inference_in_flight.set(inference_pool.in_flight + inference_pool.waiting)
+            elif message.get("text"):
                 try:
-                    result = stt_service.transcribe_audio(audio_chunk)
-                    
-                    # Envoyer le résultat
-                    await websocket.send_json({
-                        "type": "transcription",
-                        "text": result["text"],
-                        "timestamp": time.time(),
-                        "is_final": False
-                    })
-                except Exception as e:
-                    logger.error(f"Erreur de transcription chunk: {e}")
-                    stt_errors.labels(error_type='websocket_transcription').inc()
-                
-                # Vider le buffer traité
-                audio_buffer = audio_buffer[SAMPLE_RATE * 2:]
-                
+                    control = json.loads(message["text"]).get("type")
+                except (ValueError, AttributeError):
+                    control = message["text"].strip().lower()
+                if control == "end":
+                    await session.finish()
+                    await websocket.send_json({"type": "status", "status": "flushed", "timestamp": time.time()})
+        
+        logger.info("Déconnexion WebSocket STT")
     except WebSocketDisconnect:
-        stt_active_connections.dec()
         logger.info("Déconnexion WebSocket STT")
     except Exception as e:
-        stt_active_connections.dec()
         stt_errors.labels(error_type='websocket_error').inc()
         logger.error(f"Erreur WebSocket: {e}")
-        await websocket.close()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+    finally:
+        await session.close()
+        stt_active_connections.dec()
+        stt_stream_partials_dropped.inc(session.stats["partials_dropped"])
+        stt_stream_backpressure.inc(session.stats["backpressure_events"])
 
 @app.post("/detect-language")
 async def detect_language(audio: UploadFile = File(...)):
@@ -346,8 +405,7 @@ async def detect_language(audio: UploadFile = File(...)):
         audio_data = stt_service.process_audio_file(audio_bytes)
         
         # Détecter la langue sur les 30 premières secondes
-        sample = audio_data[:SAMPLE_RATE * 30]
-        detected = stt_service.model.detect_language(sample)
+        detected = await inference_pool.run(stt_service.detect_language, audio_data)
         
         # Trier par probabilité
         sorted_langs = sorted(detected.items(), key=lambda x: x[1], reverse=True)
@@ -0,0 +1,433 @@
+"""
+🎙️ Streaming STT - JARVIS v2.0
+Pipeline temps réel: ring buffer préalloué, segmentation VAD par énergie avec recouvrement,
+inférence dans un pool de workers (hors boucle événementielle), hypothèses partielles et finales
+"""
+
+import asyncio
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+@dataclass
+class StreamConfig:
+    sample_rate: int = 16000
+    buffer_seconds: float = 30.0          # capacité du ring buffer
+    frame_ms: int = 30                    # trame d'analyse VAD
+    speech_ratio: float = 3.0             # énergie / bruit de fond pour déclarer de la parole
+    min_rms: float = 0.008                # plancher absolu (audio normalisé [-1, 1])
+    noise_alpha: float = 0.05             # adaptation du bruit de fond
+    min_speech_ms: int = 90               # parole continue minimale pour ouvrir un segment
+    min_silence_ms: int = 500             # silence qui clôt un segment
+    preroll_ms: int = 200                 # audio conservé avant le début de parole
+    tail_ms: int = 150                    # audio conservé après la fin de parole
+    max_segment_s: float = 15.0           # découpage forcé des longs énoncés
+    split_search_ms: int = 600            # fenêtre de recherche du point de coupe le plus calme
+    overlap_ms: int = 300                 # recouvrement entre segments découpés
+    partial_interval_s: float = 1.0       # fréquence des hypothèses partielles
+    max_queued_finals: int = 4            # au-delà: backpressure sur la réception
+
+    def samples(self, ms: float) -> int:
+        return int(self.sample_rate * ms / 1000)
+
+
+class AudioRingBuffer:
+    """Ring buffer float32 préalloué, adressé par index absolu d'échantillon"""
+
+    def __init__(self, capacity_samples: int):
+        self.capacity = capacity_samples
+        self._data = np.zeros(capacity_samples, dtype=np.float32)
+        self.total_written = 0
+        self.dropped_samples = 0
+        self._carry = b""
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.total_written - self.capacity)
+
+    def write_pcm16(self, data: bytes) -> int:
+        """Écrire du PCM int16 little-endian (un octet orphelin est conservé pour l'appel suivant)"""
+        if self._carry:
+            data = self._carry + data
+            self._carry = b""
+        if len(data) % 2:
+            self._carry = data[-1:]
+            data = data[:-1]
+
+        samples = np.frombuffer(data, dtype=np.int16)
+        n = len(samples)
+        if n == 0:
+            return 0
+        if n > self.capacity:
+            skipped = n - self.capacity
+            samples = samples[skipped:]
+            self.total_written += skipped
+            self.dropped_samples += skipped
+            n = self.capacity
+
+        pos = self.total_written % self.capacity
+        first = min(n, self.capacity - pos)
+        np.multiply(samples[:first], 1.0 / 32768.0, out=self._data[pos:pos + first])
+        if first < n:
+            np.multiply(samples[first:], 1.0 / 32768.0, out=self._data[:n - first])
+        self.total_written += n
+        return n
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Copie contiguë des échantillons [start, end) encore disponibles"""
+        start = max(start, self.oldest)
+        end = min(end, self.total_written)
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+
+        s = start % self.capacity
+        e = s + (end - start)
+        if e <= self.capacity:
+            return self._data[s:e].copy()
+        return np.concatenate((self._data[s:], self._data[:e - self.capacity]))
+
+
+class EnergyVAD:
+    """Détection d'activité vocale par énergie RMS avec bruit de fond adaptatif (vectorisée par bloc)"""
+
+    def __init__(self, config: StreamConfig):
+        self.speech_ratio = config.speech_ratio
+        self.min_rms = config.min_rms
+        self.noise_alpha = config.noise_alpha
+        self.noise_floor = config.min_rms / config.speech_ratio
+
+    def process(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """frames: (n_frames, frame_len) -> (drapeaux parole, énergie RMS)"""
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1) + 1e-12)
+        threshold = max(self.noise_floor * self.speech_ratio, self.min_rms)
+        speech = rms > threshold
+
+        silence = rms[~speech]
+        if len(silence):
+            self.noise_floor += self.noise_alpha * (float(np.median(silence)) - self.noise_floor)
+            self.noise_floor = max(self.noise_floor, 1e-5)
+        return speech, rms
+
+
+@dataclass
+class SegmentEvent:
+    kind: str                 # "partial" ou "final"
+    segment_id: int
+    start: int                # index absolu d'échantillon
+    end: int
+    forced: bool = False      # découpage forcé (le segment suivant recouvre celui-ci)
+
+
+class StreamSegmenter:
+    """
+    Machine à états de segmentation:
+    - ouverture après min_speech_ms de parole (avec pre-roll)
+    - hypothèse partielle toutes les partial_interval_s
+    - clôture après min_silence_ms de silence
+    - découpage forcé au point le plus calme des derniers split_search_ms, avec recouvrement
+    """
+
+    def __init__(self, config: StreamConfig):
+        self.config = config
+        self.frame = config.samples(config.frame_ms)
+        self.min_speech_frames = max(1, config.min_speech_ms // config.frame_ms)
+        self.min_silence_frames = max(1, config.min_silence_ms // config.frame_ms)
+        self.preroll = config.samples(config.preroll_ms)
+        self.tail = config.samples(config.tail_ms)
+        self.overlap = config.samples(config.overlap_ms)
+        self.max_segment = int(config.max_segment_s * config.sample_rate)
+        self.partial_interval = int(config.partial_interval_s * config.sample_rate)
+
+        self.in_speech = False
+        self.segment_id = 0
+        self.segment_start = 0
+        self.speech_run = 0
+        self.silence_run = 0
+        self.last_partial = 0
+        self.min_start = 0
+        self._recent: Deque[Tuple[int, float]] = deque(maxlen=max(1, config.split_search_ms // config.frame_ms))
+
+    def update(self, speech: np.ndarray, rms: np.ndarray, base: int) -> List[SegmentEvent]:
+        events: List[SegmentEvent] = []
+        for i in range(len(speech)):
+            frame_end = base + (i + 1) * self.frame
+            is_speech = bool(speech[i])
+
+            if not self.in_speech:
+                self.speech_run = self.speech_run + 1 if is_speech else 0
+                if self.speech_run >= self.min_speech_frames:
+                    onset = frame_end - self.speech_run * self.frame
+                    self.in_speech = True
+                    self.segment_start = max(onset - self.preroll, self.min_start)
+                    self.silence_run = 0
+                    self.last_partial = frame_end
+                    self._recent.clear()
+                continue
+
+            self.silence_run = 0 if is_speech else self.silence_run + 1
+            self._recent.append((frame_end, float(rms[i])))
+
+            if self.silence_run >= self.min_silence_frames:
+                end = frame_end - self.silence_run * self.frame + self.tail
+                events.append(SegmentEvent("final", self.segment_id, self.segment_start, end))
+                self._close(end)
+            elif frame_end - self.segment_start >= self.max_segment:
+                cut = min(self._recent, key=lambda item: item[1])[0]
+                events.append(SegmentEvent("final", self.segment_id, self.segment_start, cut, forced=True))
+                self.segment_id += 1
+                self.segment_start = max(cut - self.overlap, self.min_start)
+                self.last_partial = frame_end
+                self._recent.clear()
+            elif frame_end - self.last_partial >= self.partial_interval:
+                events.append(SegmentEvent("partial", self.segment_id, self.segment_start, frame_end))
+                self.last_partial = frame_end
+        return events
+
+    def flush(self, position: int) -> List[SegmentEvent]:
+        """Clôturer le segment en cours (fin de flux)"""
+        if not self.in_speech:
+            return []
+        event = SegmentEvent("final", self.segment_id, self.segment_start, position)
+        self._close(position)
+        return [event]
+
+    def _close(self, end: int):
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+        self.min_start = end
+        self.segment_id += 1
+        self._recent.clear()
+
+
+def merge_overlap(previous: str, current: str, max_words: int = 6) -> str:
+    """Retirer du début de `current` les mots déjà présents à la fin de `previous` (recouvrement audio)"""
+    prev_words = previous.split()
+    words = current.split()
+    normalize = lambda w: w.strip(".,;:!?…\"'").lower()
+    for n in range(min(max_words, len(prev_words), len(words)), 0, -1):
+        if [normalize(w) for w in prev_words[-n:]] == [normalize(w) for w in words[:n]]:
+            return " ".join(words[n:])
+    return current
+
+
+class InferenceWorkerPool:
+    """Pool d'inférence partagé entre connexions (threads dédiés, concurrence bornée)"""
+
+    def __init__(self, max_workers: int = 1):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stt-inference")
+        self._slots = asyncio.Semaphore(max_workers)
+        self.in_flight = 0
+        self.waiting = 0
+
+    @property
+    def busy(self) -> bool:
+        """Plus de worker libre: les nouvelles tâches attendraient"""
+        return self.in_flight + self.waiting >= self.max_workers
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+@dataclass
+class _Job:
+    event: SegmentEvent
+    audio: np.ndarray
+    enqueued_at: float = field(default_factory=time.time)
+
+
+TranscribeFn = Callable[[np.ndarray, Optional[str], Optional[str]], Dict[str, Any]]
+
+
+class StreamingSession:
+    """
+    Session de transcription d'une connexion:
+    - feed(): écriture dans le ring buffer, VAD, segmentation (aucune inférence sur la boucle)
+    - file des segments finaux bornée (backpressure: feed() attend, la réception du socket ralentit)
+    - seule la dernière hypothèse partielle est conservée; abandonnée si le pool est saturé
+    """
+
+    def __init__(
+        self,
+        pool: InferenceWorkerPool,
+        transcribe: TranscribeFn,
+        send: Callable[[Dict[str, Any]], Awaitable[None]],
+        config: Optional[StreamConfig] = None,
+        language: Optional[str] = None
+    ):
+        self.pool = pool
+        self.transcribe = transcribe
+        self.send = send
+        self.config = config or StreamConfig()
+        self.language = language
+
+        self.ring = AudioRingBuffer(int(self.config.buffer_seconds * self.config.sample_rate))
+        self.vad = EnergyVAD(self.config)
+        self.segmenter = StreamSegmenter(self.config)
+        self._analyzed = 0
+
+        self._finals: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_queued_finals)
+        self._partial: Optional[_Job] = None
+        self._wakeup = asyncio.Event()
+        self._finalized_up_to = -1
+        self._last_final_text = ""
+        self._last_final_forced = False
+        self._consumer: Optional[asyncio.Task] = None
+        self._backpressure = False
+
+        self.stats = {
+            "audio_seconds": 0.0,
+            "partials_sent": 0,
+            "partials_dropped": 0,
+            "finals_sent": 0,
+            "backpressure_events": 0
+        }
+
+    def start(self):
+        self._consumer = asyncio.get_running_loop().create_task(self._consume())
+
+    async def feed(self, data: bytes):
+        written = self.ring.write_pcm16(data)
+        self.stats["audio_seconds"] += written / self.config.sample_rate
+
+        frame = self.segmenter.frame
+        n_frames = (self.ring.total_written - self._analyzed) // frame
+        if n_frames <= 0:
+            return
+
+        frames = self.ring.read(self._analyzed, self._analyzed + n_frames * frame)
+        if len(frames) < n_frames * frame:
+            # Audio écrasé avant analyse (flux trop rapide): reprendre au plus ancien disponible
+            self._analyzed = self.ring.oldest
+            return
+        speech, rms = self.vad.process(frames.reshape(n_frames, frame))
+        events = self.segmenter.update(speech, rms, self._analyzed)
+        self._analyzed += n_frames * frame
+
+        for event in events:
+            await self._submit(event)
+
+    async def finish(self):
+        """Fin de flux: clôturer le segment en cours et attendre les transcriptions finales"""
+        for event in self.segmenter.flush(self.ring.total_written):
+            await self._submit(event)
+        await self._finals.join()
+
+    async def close(self):
+        if self._consumer:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _submit(self, event: SegmentEvent):
+        job = _Job(event, self.ring.read(event.start, event.end))
+        if event.kind == "partial":
+            if self._partial is not None:
+                self.stats["partials_dropped"] += 1
+            self._partial = job
+            self._wakeup.set()
+            return
+
+        self._finalized_up_to = max(self._finalized_up_to, event.segment_id)
+        if self._finals.full():
+            self.stats["backpressure_events"] += 1
+            if not self._backpressure:
+                self._backpressure = True
+                await self._safe_send({"type": "status", "status": "backpressure", "queued": self._finals.qsize()})
+        await self._finals.put(job)
+        self._wakeup.set()
+
+    async def _next_job(self) -> Tuple[_Job, bool]:
+        while True:
+            if not self._finals.empty():
+                return self._finals.get_nowait(), True
+            if self._partial is not None:
+                job, self._partial = self._partial, None
+                if job.event.segment_id <= self._finalized_up_to or self.pool.busy:
+                    # Remplacée par une finale, ou workers saturés: les partielles sont optionnelles
+                    self.stats["partials_dropped"] += 1
+                    continue
+                return job, False
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def _consume(self):
+        while True:
+            job, is_final = await self._next_job()
+            try:
+                await self._process(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur transcription segment {job.event.segment_id}: {e}")
+            finally:
+                if is_final:
+                    self._finals.task_done()
+                    if self._backpressure and self._finals.qsize() < self.config.max_queued_finals // 2 + 1:
+                        self._backpressure = False
+
+    async def _process(self, job: _Job):
+        event = job.event
+        if len(job.audio) == 0:
+            return
+
+        prompt = self._last_final_text[-200:] or None
+        result = await self.pool.run(self.transcribe, job.audio, self.language, prompt)
+        text = result.get("text", "").strip()
+        if self.language is None and event.kind == "final":
+            self.language = result.get("language")
+
+        # Le segment qui suit un découpage forcé recouvre la fin du précédent
+        if self._last_final_forced:
+            text = merge_overlap(self._last_final_text, text)
+
+        if event.kind == "final":
+            self._last_final_forced = event.forced
+            if text:
+                self._last_final_text = text
+            self.stats["finals_sent"] += 1
+        else:
+            self.stats["partials_sent"] += 1
+
+        sample_rate = self.config.sample_rate
+        await self._safe_send({
+            "type": "transcription",
+            "text": text,
+            "segment_id": event.segment_id,
+            "start": event.start / sample_rate,
+            "end": event.end / sample_rate,
+            "is_final": event.kind == "final",
+            "language": result.get("language", self.language),
+            "latency": time.time() - job.enqueued_at,
+            "timestamp": time.time()
+        })
+
+    async def _safe_send(self, message: Dict[str, Any]):
+        try:
+            await self.send(message)
+        except Exception as e:
+            logger.debug(f"Envoi WebSocket STT impossible: {e}")
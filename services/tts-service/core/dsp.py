@@ -0,0 +1,307 @@
+"""
+🎛️ DSP - TTS Service
+Chaîne d'effets des presets (EQ, compression, effets spéciaux, réverbération) compilée une fois
+par configuration et appliquée sur tout le signal avec des filtres récursifs vectorisés
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.signal
+
+logger = logging.getLogger(__name__)
+
+
+def peaking_biquad(freq: float, q: float, gain_db: float, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients (b, a) d'un filtre en cloche (formules RBJ)
+
+    Normalisation historique des presets conservée: b et a étaient tous deux divisés par a0,
+    puis lfilter renormalise par a[0], ce qui revient à b non normalisé et a = [1, a1, a2].
+    Le timbre des presets (Jarvis) a été réglé avec cette réponse.
+    """
+    w0 = 2 * np.pi * freq / sample_rate
+    alpha = np.sin(w0) / (2 * q)
+    A = 10 ** (gain_db / 40)
+
+    b = np.array([1 + alpha * A, -2 * np.cos(w0), 1 - alpha * A])
+    a = np.array([1, -2 * np.cos(w0), 1 - alpha / A])
+    return b, a
+
+
+def envelope_follower(
+    magnitude: np.ndarray,
+    attack_coeff: float,
+    release_coeff: float,
+    block_size: int = 1024,
+    max_iterations: int = 64
+) -> np.ndarray:
+    """
+    Suiveur d'enveloppe attaque/relâchement:
+        e[i] = e[i-1] + c[i] * (|x[i]| - e[i-1]),  c[i] = attaque si |x[i]| > e[i-1] sinon relâchement
+
+    Le choix du coefficient dépend de l'état: on itère jusqu'au point fixe du masque
+    attaque/relâchement. À masque fixé, le filtre à coefficient variable se résout par blocs
+    en forme close (produits cumulés), seuls les états de fin de bloc étant propagés séquentiellement.
+    Chaque itération corrige au moins le premier échantillon erroné: le point fixe est la solution exacte.
+    Si max_iterations ne suffit pas (attaque quasi instantanée, où le masque ne se corrige que
+    quelques échantillons à la fois), le préfixe déjà cohérent est conservé et la suite est
+    calculée par la boucle exacte.
+    """
+    n = len(magnitude)
+    if n == 0:
+        return magnitude.copy()
+
+    exact_coeffs = (attack_coeff, release_coeff)
+    attack_coeff = min(attack_coeff, 1 - 1e-9)
+    release_coeff = min(release_coeff, 1 - 1e-9)
+
+    # Borne la décroissance par bloc (exp(-L) doit rester représentable)
+    decay = -np.log1p(-max(attack_coeff, release_coeff))
+    block_size = int(min(block_size, max(16, 30 / decay)))
+
+    blocks = -(-n // block_size)
+    padded = np.zeros(blocks * block_size)
+    padded[:n] = magnitude
+    x = padded.reshape(blocks, block_size)
+
+    mask = np.zeros((blocks, block_size), dtype=bool)
+    coeffs = np.full((blocks, block_size), release_coeff)
+    coeffs.flat[0] = 0.0      # e[0] = |x[0]|
+    coeffs.flat[n:] = 0.0     # remplissage neutre
+    decay_prod = np.empty_like(x)
+    forced = np.empty_like(x)
+    dirty = np.arange(blocks)
+
+    for _ in range(max_iterations):
+        # Seuls les blocs dont le masque a changé sont recalculés
+        c = coeffs[dirty]
+        decay = np.exp(np.cumsum(np.log1p(-c), axis=1))
+        decay_prod[dirty] = decay
+        forced[dirty] = decay * np.cumsum(c * x[dirty] / decay, axis=1)
+
+        # Propagation des états de fin de bloc
+        carries = np.empty(blocks)
+        carry = float(magnitude[0])
+        for i, (p, f) in enumerate(zip(decay_prod[:, -1].tolist(), forced[:, -1].tolist())):
+            carries[i] = carry
+            carry = p * carry + f
+
+        envelope = (decay_prod * carries[:, None] + forced).ravel()
+
+        new_mask = np.zeros_like(mask)
+        np.greater(padded[1:n], envelope[:n - 1], out=new_mask.reshape(-1)[1:n])
+        changed = new_mask != mask
+        dirty = np.flatnonzero(changed.any(axis=1))
+        if len(dirty) == 0:
+            return envelope[:n]
+        first_wrong = int(np.argmax(changed.reshape(-1)))
+        mask = new_mask
+        coeffs[dirty] = np.where(mask[dirty], attack_coeff, release_coeff)
+        coeffs.flat[0] = 0.0
+        coeffs.flat[n:] = 0.0
+
+    logger.debug(f"Suiveur d'enveloppe: point fixe non atteint, boucle exacte depuis {first_wrong}/{n}")
+    return _envelope_tail(magnitude, envelope[:n].copy(), first_wrong, *exact_coeffs)
+
+
+def _envelope_tail(magnitude: np.ndarray, envelope: np.ndarray, start: int,
+                   attack_coeff: float, release_coeff: float) -> np.ndarray:
+    """Boucle exacte du suiveur d'enveloppe à partir de `start` (envelope[:start] déjà exacte)"""
+    values = magnitude.tolist()
+    out = envelope.tolist()
+    e = out[start - 1] if start > 0 else values[0]
+    for i in range(max(start, 1), len(values)):
+        v = values[i]
+        e += (attack_coeff if v > e else release_coeff) * (v - e)
+        out[i] = e
+    if start == 0:
+        out[0] = values[0]
+    return np.asarray(out, dtype=envelope.dtype)
+
+
+class PresetEffectChain:
+    """
+    Chaîne d'effets d'un preset, compilée une fois (coefficients de filtres, gains, retards)
+    - EQ: bandes parallèles (sosfilt) sommées en place + cloche de présence (lfilter)
+    - Compression: suiveur d'enveloppe vectorisé, gain calculé en place
+    - Effets spéciaux: filtre résonant, enhancer harmonique, chorus (LFO précalculé)
+    - Réverbération: réponse impulsionnelle creuse (dry + échos) appliquée par accumulation décalée
+    """
+
+    def __init__(self, effects_config: Dict[str, Any], sample_rate: int = 22050):
+        self.sample_rate = sample_rate
+        self.eq = self._compile_eq(effects_config.get('eq')) if 'eq' in effects_config else None
+        self.compression = self._compile_compression(effects_config['compression']) if 'compression' in effects_config else None
+        self.fx = self._compile_fx(effects_config['fx']) if 'fx' in effects_config else None
+        self.reverb = self._compile_reverb(effects_config['reverb']) if 'reverb' in effects_config else None
+        self._chorus_lfo: Optional[np.ndarray] = None
+
+    # Compilation
+
+    def _compile_eq(self, eq_config: Dict[str, Any]) -> Dict[str, Any]:
+        sr = self.sample_rate
+        bands: List[Tuple[np.ndarray, float]] = []
+
+        low_gain = eq_config.get('low_gain', 0.0)
+        if low_gain != 0:
+            sos = scipy.signal.butter(4, eq_config.get('low_freq', 80) * 2, 'lp', fs=sr, output='sos')
+            bands.append((sos, 10 ** (low_gain / 20) - 1))
+
+        mid_gain = eq_config.get('mid_gain', 0.0)
+        if mid_gain != 0:
+            mid_freq = eq_config.get('mid_freq', 1000)
+            sos = scipy.signal.butter(4, [mid_freq / 2, mid_freq * 2], 'bp', fs=sr, output='sos')
+            bands.append((sos, 10 ** (mid_gain / 20) - 1))
+
+        high_gain = eq_config.get('high_gain', 0.0)
+        if high_gain != 0:
+            sos = scipy.signal.butter(4, eq_config.get('high_freq', 8000), 'hp', fs=sr, output='sos')
+            bands.append((sos, 10 ** (high_gain / 20) - 1))
+
+        presence = None
+        presence_gain = eq_config.get('presence_gain', 0.0)
+        if presence_gain != 0:
+            presence = peaking_biquad(eq_config.get('presence_freq', 4000), 2.0, presence_gain, sr)
+
+        return {"bands": bands, "presence": presence}
+
+    def _compile_compression(self, comp_config: Dict[str, Any]) -> Dict[str, float]:
+        attack_samples = max(int(comp_config.get('attack', 5.0) * self.sample_rate / 1000), 1)
+        release_samples = max(int(comp_config.get('release', 50.0) * self.sample_rate / 1000), 1)
+        return {
+            "threshold": 10 ** (comp_config.get('threshold', -18.0) / 20),
+            "exponent": 1 - 1 / comp_config.get('ratio', 3.0),
+            "attack": 1 / attack_samples,
+            "release": 1 / release_samples
+        }
+
+    def _compile_fx(self, fx_config: Dict[str, Any]) -> Dict[str, Any]:
+        compiled: Dict[str, Any] = {"metallic": None, "harmonics": None, "chorus": None}
+
+        metallic = fx_config.get('metallic_filter', {})
+        if metallic.get('enabled', False):
+            center_freq = metallic.get('center_freq', 2000)
+            q = center_freq / metallic.get('bandwidth', 1.5)
+            compiled["metallic"] = peaking_biquad(center_freq, q, metallic.get('gain', 2.0), self.sample_rate)
+
+        harmonic = fx_config.get('harmonic_enhancer', {})
+        if harmonic.get('enabled', False):
+            intensity = harmonic.get('intensity', 0.3)
+            compiled["harmonics"] = [(h, intensity / h) for h in harmonic.get('harmonics', [2, 3])]
+
+        chorus = fx_config.get('subtle_chorus', {})
+        if chorus.get('enabled', False):
+            compiled["chorus"] = {
+                "rate": chorus.get('rate', 0.5),
+                "depth": chorus.get('depth', 0.1),
+                "delay": int(chorus.get('delay', 10) * self.sample_rate / 1000)
+            }
+
+        return compiled
+
+    def _compile_reverb(self, reverb_config: Dict[str, Any]) -> Dict[str, Any]:
+        room_size = reverb_config.get('room_size', 0.7)
+        damping = reverb_config.get('damping', 0.3)
+        wet_level = reverb_config.get('wet_level', 0.25)
+        tap_gain = wet_level * room_size * (1 - damping)
+        delays = [int(t * self.sample_rate) for t in (0.03, 0.05, 0.07, 0.09)]
+        return {
+            "dry": reverb_config.get('dry_level', 0.75),
+            "taps": [(delay, tap_gain) for delay in delays]
+        }
+
+    # Traitement
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Appliquer la chaîne complète (retourne un nouveau tableau, l'entrée n'est pas modifiée)"""
+        try:
+            processed = np.asarray(audio, dtype=np.float64)
+            if self.eq:
+                processed = self._apply_eq(processed)
+            if self.compression:
+                processed = self._apply_compression(processed)
+            if self.fx:
+                processed = self._apply_fx(processed)
+            if self.reverb:
+                processed = self._apply_reverb(processed)
+            return processed if processed is not audio else processed.copy()
+        except Exception as e:
+            logger.error(f"❌ Erreur application effets preset: {e}")
+            return audio
+
+    def _apply_eq(self, audio: np.ndarray) -> np.ndarray:
+        processed = audio.copy()
+        for sos, gain in self.eq["bands"]:
+            band = scipy.signal.sosfilt(sos, audio)
+            band *= gain
+            processed += band
+
+        if self.eq["presence"] is not None:
+            b, a = self.eq["presence"]
+            processed = scipy.signal.lfilter(b, a, processed)
+
+        return np.clip(processed, -1.0, 1.0, out=processed)
+
+    def _apply_compression(self, audio: np.ndarray) -> np.ndarray:
+        params = self.compression
+        envelope = envelope_follower(np.abs(audio), params["attack"], params["release"])
+
+        # Gain de réduction au-dessus du seuil: (seuil / enveloppe) ** (1 - 1/ratio)
+        over = envelope > params["threshold"]
+        gain = envelope  # réutilisé en place
+        np.divide(params["threshold"], envelope, out=gain, where=over)
+        np.power(gain, params["exponent"], out=gain, where=over)
+        gain[~over] = 1.0
+
+        return np.multiply(audio, gain, out=gain)
+
+    def _apply_fx(self, audio: np.ndarray) -> np.ndarray:
+        fx = self.fx
+
+        if fx["metallic"] is not None:
+            b, a = fx["metallic"]
+            processed = scipy.signal.lfilter(b, a, audio)
+        else:
+            processed = audio.copy()
+
+        if fx["harmonics"]:
+            base = processed.copy()
+            scratch = np.empty_like(processed)
+            for h, weight in fx["harmonics"]:
+                np.multiply(base, h, out=scratch)
+                np.tanh(scratch, out=scratch)
+                scratch *= weight
+                processed += scratch
+
+        chorus = fx["chorus"]
+        if chorus:
+            delay = chorus["delay"]
+            if 0 < delay < len(audio):
+                # Voix retardée modulée par le LFO: (1 + depth * lfo) * audio[n - delay]
+                modulation = self._chorus_modulation(len(audio), chorus)
+                echo = np.multiply(audio[:-delay], modulation[delay:])
+                tail = processed[delay:]
+                tail += echo
+            processed *= 0.5
+
+        return np.clip(processed, -1.0, 1.0, out=processed)
+
+    def _chorus_modulation(self, length: int, chorus: Dict[str, Any]) -> np.ndarray:
+        # Le LFO d'un signal court est le début de celui d'un signal plus long: un seul tampon, agrandi au besoin
+        if self._chorus_lfo is None or len(self._chorus_lfo) < length:
+            lfo = np.sin(2 * np.pi * chorus["rate"] * np.arange(length) / self.sample_rate)
+            self._chorus_lfo = 1 + chorus["depth"] * lfo
+        return self._chorus_lfo[:length]
+
+    def _apply_reverb(self, audio: np.ndarray) -> np.ndarray:
+        # Réponse impulsionnelle creuse: accumulation des échos décalés dans un seul tampon
+        processed = audio * self.reverb["dry"]
+        scratch = np.empty_like(audio)
+        for delay, gain in self.reverb["taps"]:
+            if 0 < delay < len(audio):
+                echo = np.multiply(audio[:-delay], gain, out=scratch[:-delay])
+                tail = processed[delay:]
+                tail += echo
+        return np.clip(processed, -1.0, 1.0, out=processed)
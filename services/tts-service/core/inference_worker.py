@@ -0,0 +1,238 @@
+"""
+⚙️ Inference Worker - TTS Service
+Worker d'inférence propriétaire du modèle Coqui: file de jobs de synthèse,
+regroupement des jobs compatibles (même voix/langue) et concurrence bornée
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.monitoring import (
+    record_inference_queue_depth,
+    record_inference_batch,
+    record_inference_job
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceQueueFull(Exception):
+    """File de synthèse saturée"""
+
+
+@dataclass
+class SynthesisJob:
+    text: str
+    voice_id: str
+    language: str
+    speed: float
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    def __post_init__(self):
+        # L'état du futur n'est lu que sur la boucle; les threads du worker consultent l'événement
+        self.future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: asyncio.Future):
+        if future.cancelled():
+            self.cancelled.set()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Jobs compatibles: même voix et même langue (latents du locuteur réutilisés)"""
+        return (self.voice_id, self.language)
+
+
+class InferenceWorker:
+    """
+    Worker d'inférence TTS
+    - Threads dédiés (le modèle est chargé et utilisé uniquement sur ces threads)
+    - File FIFO bornée; le job le plus ancien détermine la voix/langue du prochain lot
+    - Lots de jobs compatibles exécutés d'affilée sur un même thread
+    - Au plus max_concurrency lots en cours
+    """
+
+    def __init__(
+        self,
+        synthesize_fn: Callable[[str, str, str, float], Any],
+        max_batch_size: int = 8,
+        max_concurrency: int = 1,
+        batch_window_ms: int = 10,
+        max_queue: int = 256
+    ):
+        self.synthesize_fn = synthesize_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_window = batch_window_ms / 1000
+        self.max_queue = max_queue
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="tts-inference"
+        )
+        self._pending: List[SynthesisJob] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batches: set = set()
+
+        self.stats = {
+            "jobs": 0,
+            "batches": 0,
+            "rejected": 0,
+            "failed": 0,
+            "total_queue_wait": 0.0,
+            "total_latency": 0.0
+        }
+
+        logger.info(
+            f"⚙️ Inference Worker: {self.max_concurrency} thread(s), "
+            f"lots de {self.max_batch_size} max, file de {self.max_queue}"
+        )
+
+    async def start(self):
+        """Démarrer le dispatcher de lots"""
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Exécuter une opération sur les threads du worker (chargement du modèle, ...)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def submit(self, text: str, voice_id: str, language: str, speed: float) -> Any:
+        """Mettre un job de synthèse en file et attendre son résultat"""
+        if self._dispatcher is None:
+            raise RuntimeError("Inference Worker non démarré")
+
+        if len(self._pending) >= self.max_queue:
+            self.stats["rejected"] += 1
+            raise InferenceQueueFull(f"File de synthèse pleine ({self.max_queue} jobs)")
+
+        job = SynthesisJob(text, voice_id, language, speed, asyncio.get_running_loop().create_future())
+        self._pending.append(job)
+        record_inference_queue_depth(len(self._pending))
+        self._wakeup.set()
+
+        return await job.future
+
+    async def _dispatch_loop(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._pending:
+                await self._slots.acquire()
+
+                # Courte fenêtre pour laisser arriver des jobs compatibles
+                if self.batch_window and len(self._pending) < self.max_batch_size:
+                    await asyncio.sleep(self.batch_window)
+
+                batch = self._take_batch()
+                if not batch:
+                    self._slots.release()
+                    continue
+
+                task = asyncio.create_task(self._execute(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    def _take_batch(self) -> List[SynthesisJob]:
+        """Extraire le prochain lot: jobs de même clé que le plus ancien, ordre d'arrivée conservé"""
+        pending = [job for job in self._pending if not job.future.done()]  # annulés par l'appelant
+        if not pending:
+            self._pending = []
+            record_inference_queue_depth(0)
+            return []
+
+        key = pending[0].key
+        batch, rest = [], []
+        for job in pending:
+            if job.key == key and len(batch) < self.max_batch_size:
+                batch.append(job)
+            else:
+                rest.append(job)
+
+        self._pending = rest
+        record_inference_queue_depth(len(rest))
+        return batch
+
+    async def _execute(self, batch: List[SynthesisJob]):
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            results = await loop.run_in_executor(self.executor, self._run_batch, batch)
+        except Exception as e:
+            results = [(False, e)] * len(batch)
+        finally:
+            self._slots.release()
+
+        finished = time.monotonic()
+        self.stats["batches"] += 1
+        record_inference_batch(len(batch), finished - started)
+
+        for job, (ok, value) in zip(batch, results):
+            queue_wait = started - job.enqueued_at
+            latency = finished - job.enqueued_at
+            self.stats["jobs"] += 1
+            self.stats["total_queue_wait"] += queue_wait
+            self.stats["total_latency"] += latency
+            record_inference_job(queue_wait, latency)
+
+            if job.future.done():
+                continue
+            if ok:
+                job.future.set_result(value)
+            else:
+                self.stats["failed"] += 1
+                job.future.set_exception(value)
+
+    def _run_batch(self, batch: List[SynthesisJob]) -> List[Tuple[bool, Any]]:
+        """Thread du worker: synthèse des jobs du lot d'affilée"""
+        results = []
+        for job in batch:
+            if job.cancelled.is_set():
+                results.append((False, asyncio.CancelledError()))
+                continue
+            try:
+                results.append((True, self.synthesize_fn(job.text, job.voice_id, job.language, job.speed)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        jobs = max(self.stats["jobs"], 1)
+        return {
+            **self.stats,
+            "queue_depth": len(self._pending),
+            "batches_in_flight": len(self._batches),
+            "avg_batch_size": self.stats["jobs"] / max(self.stats["batches"], 1),
+            "avg_queue_wait": self.stats["total_queue_wait"] / jobs,
+            "avg_latency": self.stats["total_latency"] / jobs
+        }
+
+    async def shutdown(self):
+        """Arrêter le dispatcher et libérer les threads"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        for job in self._pending:
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("Inference Worker arrêté"))
+        self._pending = []
+        record_inference_queue_depth(0)
+
+        self.executor.shutdown(wait=False)
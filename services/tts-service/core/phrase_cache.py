@@ -0,0 +1,257 @@
+"""
+🗃️ Phrase Cache - TTS Service
+Cache adressé par contenu de l'audio synthétisé (phrases récurrentes, salutations des personas)
+Deux niveaux: LRU mémoire + fichiers PCM 16 bits bruts sur disque
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.monitoring import record_phrase_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class PhraseCache:
+    """
+    Cache de phrases synthétisées
+    - Clé: texte normalisé + voix + langue + vitesse + hauteur + preset/effets + variante de traitement
+    - Niveau 1: LRU mémoire borné en octets
+    - Niveau 2: fichiers .pcm sur disque (écriture atomique, éviction des plus anciens)
+    - Synthèses concurrentes d'une même phrase fusionnées
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "/app/cache/phrases",
+        max_memory_mb: int = 64,
+        max_disk_mb: int = 1024,
+        sample_rate: int = 22050
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.sample_rate = sample_rate
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "writes": 0,
+            "disk_evictions": 0,
+            "warmed": 0
+        }
+
+        logger.info(
+            f"🗃️ Phrase Cache initialisé: {self.cache_dir} "
+            f"(mémoire {max_memory_mb}MB, disque {max_disk_mb}MB)"
+        )
+
+    async def initialize(self):
+        """Créer le répertoire et mesurer l'occupation disque existante"""
+        await asyncio.get_event_loop().run_in_executor(None, self._scan_disk)
+        logger.info(f"✅ Phrase Cache prêt: {self._disk_bytes / 1024 / 1024:.1f}MB sur disque")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalisation Unicode et des espaces (casse et ponctuation conservées: elles changent la prosodie)"""
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    def make_key(
+        self,
+        text: str,
+        voice_id: str = "default",
+        language: str = "fr",
+        speed: float = 1.0,
+        pitch: float = 1.0,
+        preset_name: Optional[str] = None,
+        preset_effects: Optional[Dict[str, Any]] = None,
+        context: Optional[str] = None,
+        variant: str = "full"
+    ) -> str:
+        """Clé de cache (blake2b) des paramètres déterminant l'audio produit"""
+        payload = json.dumps(
+            {
+                "text": self.normalize_text(text),
+                "voice_id": voice_id,
+                "language": language,
+                "speed": round(float(speed), 3),
+                "pitch": round(float(pitch), 3),
+                "preset": preset_name,
+                "effects": preset_effects,
+                "context": context,
+                "variant": variant,
+                "sample_rate": self.sample_rate
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """PCM en cache (mémoire puis disque) ou None"""
+        pcm = self._memory.get(key)
+        if pcm is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            record_phrase_cache_lookup("memory")
+            return pcm
+
+        pcm = await asyncio.get_event_loop().run_in_executor(None, self._read_disk, key)
+        if pcm is not None:
+            self._remember(key, pcm)
+            self.stats["disk_hits"] += 1
+            record_phrase_cache_lookup("disk")
+            return pcm
+
+        self.stats["misses"] += 1
+        record_phrase_cache_lookup("miss")
+        return None
+
+    async def put(self, key: str, pcm: bytes):
+        """Stocker du PCM dans les deux niveaux"""
+        if not pcm:
+            return
+        self._remember(key, pcm)
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self._write_disk, key, pcm)
+            self.stats["writes"] += 1
+        except OSError as e:
+            logger.warning(f"⚠️ Écriture cache phrase impossible: {e}")
+
+    async def get_or_synthesize(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Retourner le PCM en cache ou le synthétiser une seule fois pour tous les demandeurs"""
+        pcm = await self.get(key)
+        if pcm is not None:
+            return pcm
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        # Tâche indépendante: l'annulation d'un appelant n'interrompt pas les autres
+        task = asyncio.get_running_loop().create_task(self._synthesize_and_store(key, synthesize))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _synthesize_and_store(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        pcm = await synthesize()
+        await self.put(key, pcm)
+        return pcm
+
+    def _remember(self, key: str, pcm: bytes):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if len(pcm) > self.max_memory_bytes:
+            return
+        self._memory[key] = pcm
+        self._memory_bytes += len(pcm)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pcm"
+
+    def _scan_disk(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*/*.pcm"))
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            pcm = path.read_bytes()
+            os.utime(path)  # récence pour l'éviction
+            return pcm
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"⚠️ Lecture cache phrase impossible: {e}")
+            return None
+
+    def _write_disk(self, key: str, pcm: bytes):
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(pcm)
+        os.replace(tmp, path)
+        self._disk_bytes += len(pcm)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprimer les fichiers les moins récemment utilisés jusqu'à 90% du quota"""
+        files = sorted(
+            ((p.stat().st_mtime, p.stat().st_size, p) for p in self.cache_dir.glob("*/*.pcm")),
+            key=lambda item: item[0]
+        )
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if self._disk_bytes <= target:
+                break
+            try:
+                path.unlink()
+                self._disk_bytes -= size
+                self.stats["disk_evictions"] += 1
+            except OSError:
+                continue
+
+    async def warm(self, entries, synthesize: Callable[..., Awaitable[bytes]]) -> int:
+        """
+        Pré-remplir le cache
+
+        Args:
+            entries: Itérable de dicts de paramètres make_key (text, voice_id, ...)
+            synthesize: Coroutine de synthèse recevant ces mêmes paramètres
+
+        Returns:
+            int: Nombre de phrases synthétisées (hors phrases déjà en cache)
+        """
+        started = time.time()
+        synthesized = 0
+        for params in entries:
+            key = self.make_key(**params)
+            if key in self._memory or self._path(key).exists():
+                continue
+            try:
+                await self.get_or_synthesize(key, lambda: synthesize(**params))
+                synthesized += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Préchauffage phrase échoué ({params.get('text', '')[:40]}): {e}")
+
+        self.stats["warmed"] += synthesized
+        logger.info(f"🔥 Cache phrases préchauffé: {synthesized} phrases en {time.time() - started:.1f}s")
+        return synthesized
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "hit_rate": (self.stats["memory_hits"] + self.stats["disk_hits"]) / max(lookups, 1)
+        }
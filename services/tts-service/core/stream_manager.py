@@ -1,24 +1,26 @@
 """
 📡 Stream Manager - TTS Service
 Gestion du streaming audio temps réel
+Pipeline producteur/consommateur: synthèse des phrases suivantes pendant la diffusion
 """
 
 import asyncio
 import logging
+import struct
 from typing import AsyncGenerator, Dict, Any, Optional, List
 import numpy as np
 import time
 from collections import deque
-import io
 
 logger = logging.getLogger(__name__)
 
 class StreamManager:
     """
     Gestionnaire de streaming audio pour synthèse temps réel
-    - Chunking intelligent
-    - Buffer adaptatif
-    - Gestion latence
+    - Chunking intelligent (frames PCM brutes de taille fixe)
+    - Synthèse anticipée de `lookahead` phrases pendant la diffusion
+    - Cadencement sur horloge de lecture avec avance bornée
+    - TTFB et facteur temps réel (RTF) par stream
     """
     
     def __init__(
@@ -26,12 +28,18 @@ class StreamManager:
         tts_engine,
         audio_processor,
         chunk_duration_ms: int = 20,
-        buffer_size: int = 5
+        buffer_size: int = 5,
+        lookahead: int = 2,
+        max_lead_ms: int = 200,
+        phrase_cache=None
     ):
         self.tts_engine = tts_engine
         self.audio_processor = audio_processor
         self.chunk_duration_ms = chunk_duration_ms
         self.buffer_size = buffer_size
+        self.lookahead = max(1, lookahead)
+        self.max_lead = max_lead_ms / 1000
+        self.phrase_cache = phrase_cache
         
         # État des streams
         self.active_streams: Dict[str, Dict[str, Any]] = {}
@@ -53,7 +61,8 @@ class StreamManager:
         logger.info(
             f"📡 Stream Manager initialisé: "
             f"{chunk_duration_ms}ms chunks, "
-            f"{self.bytes_per_chunk} bytes/chunk"
+            f"{self.bytes_per_chunk} bytes/chunk, "
+            f"lookahead {self.lookahead} phrases"
         )
     
     async def initialize(self):
@@ -71,7 +80,8 @@ class StreamManager:
         voice_id: str = "default",
         language: str = "fr",
         speed: float = 1.0,
-        pitch: float = 1.0
+        pitch: float = 1.0,
+        wav_header: bool = False
     ) -> AsyncGenerator[bytes, None]:
         """
         Générer un stream audio à partir du texte
@@ -82,49 +92,55 @@ class StreamManager:
             language: Langue
             speed: Vitesse
             pitch: Hauteur
+            wav_header: Émettre un unique en-tête WAV de streaming avant les frames
             
         Yields:
-            bytes: Chunks audio WAV
+            bytes: Frames PCM 16 bits mono brutes (sample_rate Hz)
         """
         stream_id = f"stream_{self.stream_counter}"
         self.stream_counter += 1
         
         try:
             # Enregistrer le stream
-            self.active_streams[stream_id] = {
+            stream = {
                 "start_time": time.time(),
                 "text_length": len(text),
                 "chunks_sent": 0,
+                "sentences": 0,
+                "audio_seconds": 0.0,
+                "synthesis_time": 0.0,
+                "ttfb": None,
+                "rtf": None,
+                "underruns": 0,
                 "status": "active"
             }
+            self.active_streams[stream_id] = stream
             
             logger.info(f"📡 Démarrage stream {stream_id}: {len(text)} caractères")
             
-            # Stratégie de chunking selon la longueur
-            if len(text) < 100:
-                # Texte court: synthèse complète
-                async for chunk in self._stream_full_synthesis(
-                    text, voice_id, language, speed, pitch
-                ):
-                    self.active_streams[stream_id]["chunks_sent"] += 1
-                    yield chunk
-            else:
-                # Texte long: synthèse par phrases
-                async for chunk in self._stream_sentence_synthesis(
-                    text, voice_id, language, speed, pitch
-                ):
-                    self.active_streams[stream_id]["chunks_sent"] += 1
-                    yield chunk
+            if wav_header:
+                yield self._streaming_wav_header()
+            
+            # Texte court: une seule synthèse; texte long: pipeline par phrases
+            sentences = [text] if len(text) < 100 else self._split_sentences(text)
+            
+            async for chunk in self._stream_pipeline(
+                stream, sentences, voice_id, language, speed, pitch
+            ):
+                if stream["ttfb"] is None:
+                    stream["ttfb"] = time.time() - stream["start_time"]
+                stream["chunks_sent"] += 1
+                yield chunk
             
             # Marquer comme terminé
-            self.active_streams[stream_id]["status"] = "completed"
-            self.active_streams[stream_id]["end_time"] = time.time()
+            stream["status"] = "completed"
+            stream["end_time"] = time.time()
             
-            duration = time.time() - self.active_streams[stream_id]["start_time"]
+            duration = stream["end_time"] - stream["start_time"]
             logger.info(
                 f"✅ Stream {stream_id} terminé: "
-                f"{self.active_streams[stream_id]['chunks_sent']} chunks, "
-                f"{duration:.2f}s"
+                f"{stream['chunks_sent']} chunks, "
+                f"{duration:.2f}s, TTFB {stream['ttfb'] or 0:.3f}s, RTF {stream['rtf'] or 0:.2f}"
             )
             
         except Exception as e:
@@ -134,67 +150,126 @@ class StreamManager:
             raise
         
         finally:
+            if self.active_streams.get(stream_id, {}).get("status") == "active":
+                self.active_streams[stream_id]["status"] = "cancelled"
             # Nettoyer après délai
             asyncio.create_task(self._cleanup_stream(stream_id, delay=60))
     
-    async def _stream_full_synthesis(
+    async def _stream_pipeline(
         self,
-        text: str,
+        stream: Dict[str, Any],
+        sentences: List[str],
         voice_id: str,
         language: str,
         speed: float,
         pitch: float
     ) -> AsyncGenerator[bytes, None]:
-        """Stream avec synthèse complète puis chunking"""
+        """
+        Producteur: synthèse des phrases dans l'executor, jusqu'à `lookahead` phrases d'avance
+        Consommateur: découpage en frames et diffusion pendant la synthèse des suivantes
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.lookahead)
         
-        # Synthétiser tout l'audio
-        audio_data = await self.tts_engine.synthesize(
-            text, voice_id, language, speed, pitch
-        )
+        async def produce():
+            try:
+                for sentence in sentences:
+                    if not sentence.strip():
+                        continue
+                    started = time.time()
+                    pcm = await self._synthesize_pcm(sentence, voice_id, language, speed, pitch)
+                    stream["synthesis_time"] += time.time() - started
+                    stream["sentences"] += 1
+                    await queue.put(pcm)
+                await queue.put(None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put(e)
         
-        # Traiter l'audio
-        processed_audio = await self.audio_processor.process(
-            audio_data,
-            normalize=True,
-            remove_silence=False  # Garder timing pour streaming
-        )
+        producer = asyncio.create_task(produce())
+        remainder = b""
+        clock_start = None
         
-        # Chunker l'audio
-        async for chunk in self._chunk_audio(processed_audio):
-            yield chunk
+        try:
+            while True:
+                if queue.empty() and clock_start is not None:
+                    # Le consommateur attend la synthèse: risque de coupure côté client
+                    stream["underruns"] += 1
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                
+                data = remainder + item
+                usable = len(data) - len(data) % self.bytes_per_chunk
+                remainder = data[usable:]
+                
+                for offset in range(0, usable, self.bytes_per_chunk):
+                    if clock_start is None:
+                        clock_start = time.monotonic()
+                    await self._pace(clock_start, stream["audio_seconds"])
+                    stream["audio_seconds"] += self.chunk_duration_ms / 1000
+                    self._update_rtf(stream)
+                    yield data[offset:offset + self.bytes_per_chunk]
+            
+            # Dernière frame complétée par du silence
+            if remainder:
+                stream["audio_seconds"] += len(remainder) / (self.sample_rate * self.bytes_per_sample)
+                self._update_rtf(stream)
+                yield remainder + b'\x00' * (self.bytes_per_chunk - len(remainder))
+        
+        finally:
+            producer.cancel()
     
-    async def _stream_sentence_synthesis(
+    async def _synthesize_pcm(
         self,
-        text: str,
+        sentence: str,
         voice_id: str,
         language: str,
         speed: float,
         pitch: float
-    ) -> AsyncGenerator[bytes, None]:
-        """Stream avec synthèse par phrases"""
-        
-        # Découper en phrases
-        sentences = self._split_sentences(text)
-        
-        for sentence in sentences:
-            if not sentence.strip():
-                continue
-            
-            # Synthétiser la phrase
+    ) -> bytes:
+        """Synthétiser une phrase et retourner son PCM 16 bits traité (cache de phrases si disponible)"""
+        async def synthesize() -> bytes:
             audio_data = await self.tts_engine.synthesize(
                 sentence, voice_id, language, speed, pitch
             )
             
-            # Traiter l'audio
-            processed_audio = await self.audio_processor.process(
+            return await self.audio_processor.process_to_pcm(
                 audio_data,
                 normalize=True,
-                remove_silence=False
+                remove_silence=False  # Garder timing pour streaming
             )
-            
-            # Chunker et yielder
-            async for chunk in self._chunk_audio(processed_audio):
-                yield chunk
+        
+        if self.phrase_cache is None:
+            return await synthesize()
+        
+        key = self.phrase_cache.make_key(
+            sentence, voice_id, language, speed, pitch, variant="stream"
+        )
+        return await self.phrase_cache.get_or_synthesize(key, synthesize)
+    
+    async def _pace(self, clock_start: float, audio_sent: float):
+        """Ne pas dépasser l'horloge de lecture de plus de max_lead (aucune attente si en retard)"""
+        lead = audio_sent - (time.monotonic() - clock_start)
+        if lead > self.max_lead:
+            await asyncio.sleep(lead - self.max_lead)
+    
+    def _update_rtf(self, stream: Dict[str, Any]):
+        if stream["audio_seconds"] > 0:
+            stream["rtf"] = stream["synthesis_time"] / stream["audio_seconds"]
+    
+    def _streaming_wav_header(self) -> bytes:
+        """En-tête WAV de longueur inconnue (lecture progressive par les clients HTTP)"""
+        byte_rate = self.sample_rate * self.channels * self.bytes_per_sample
+        block_align = self.channels * self.bytes_per_sample
+        return (
+            b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, self.channels, self.sample_rate,
+                                    byte_rate, block_align, self.bytes_per_sample * 8)
+            + b"data" + struct.pack("<I", 0xFFFFFFFF)
+        )
     
     def _split_sentences(self, text: str) -> List[str]:
         """Découper le texte en phrases"""
@@ -220,28 +295,6 @@ class StreamManager:
         
         return sentences
     
-    async def _chunk_audio(self, audio_data: bytes) -> AsyncGenerator[bytes, None]:
-        """Découper l'audio en chunks de taille fixe"""
-        
-        # Créer buffer
-        buffer = io.BytesIO(audio_data)
-        
-        # Lire et envoyer par chunks
-        while True:
-            chunk = buffer.read(self.bytes_per_chunk)
-            
-            if not chunk:
-                break
-            
-            # Padder si nécessaire
-            if len(chunk) < self.bytes_per_chunk:
-                chunk += b'\x00' * (self.bytes_per_chunk - len(chunk))
-            
-            # Petit délai pour simuler streaming temps réel
-            await asyncio.sleep(self.chunk_duration_ms / 1000)
-            
-            yield chunk
-    
     async def _monitor_streams(self):
         """Monitorer les streams actifs"""
         while True:
@@ -297,7 +350,25 @@ class StreamManager:
             "average_duration": np.mean([
                 s.get("end_time", time.time()) - s["start_time"]
                 for s in completed_streams
-            ]) if completed_streams else 0
+            ]) if completed_streams else 0,
+            "average_ttfb": np.mean([
+                s["ttfb"] for s in self.active_streams.values() if s.get("ttfb") is not None
+            ]) if any(s.get("ttfb") is not None for s in self.active_streams.values()) else 0,
+            "average_rtf": np.mean([
+                s["rtf"] for s in completed_streams if s.get("rtf") is not None
+            ]) if any(s.get("rtf") is not None for s in completed_streams) else 0,
+            "streams": {
+                stream_id: {
+                    "status": s["status"],
+                    "ttfb": s.get("ttfb"),
+                    "rtf": s.get("rtf"),
+                    "audio_seconds": s.get("audio_seconds", 0.0),
+                    "synthesis_time": s.get("synthesis_time", 0.0),
+                    "sentences": s.get("sentences", 0),
+                    "underruns": s.get("underruns", 0)
+                }
+                for stream_id, s in self.active_streams.items()
+            }
         }
     
     async def shutdown(self):
@@ -3,7 +3,6 @@
 Moteur de synthèse vocale avec modèles avancés
 """
 
-import asyncio
 import logging
 from typing import Dict, Any, Optional, List, Union
 import os
@@ -16,6 +15,7 @@ import time
 import sys
 sys.path.append('/app')
 from presets.preset_manager import preset_manager
+from core.inference_worker import InferenceWorker
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +29,25 @@ class TTSEngine:
         self,
         model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
         device: str = "cpu",
-        enable_anti_hallucination: bool = True
+        enable_anti_hallucination: bool = True,
+        max_batch_size: int = 8,
+        max_concurrency: int = 1,
+        batch_window_ms: int = 10,
+        max_queue: int = 256
     ):
         self.model_name = model_name
         self.device = device
         self.enable_anti_hallucination = enable_anti_hallucination
         
+        # Worker d'inférence propriétaire du modèle (file, lots par voix/langue, concurrence bornée)
+        self.inference_worker = InferenceWorker(
+            self._synthesize_sync,
+            max_batch_size=max_batch_size,
+            max_concurrency=max_concurrency,
+            batch_window_ms=batch_window_ms,
+            max_queue=max_queue
+        )
+        
         self.tts = None
         self.voices: Dict[str, Dict[str, Any]] = {}
         self.model_loaded = False
@@ -54,11 +67,9 @@ class TTSEngine:
     async def initialize(self):
         """Initialisation asynchrone du moteur TTS"""
         try:
-            # Charger le modèle TTS
-            await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._load_model
-            )
+            # Charger le modèle TTS sur les threads du worker d'inférence
+            await self.inference_worker.start()
+            await self.inference_worker.run(self._load_model)
             
             # Charger les voix par défaut
             self._load_default_voices()
@@ -159,10 +170,8 @@ class TTSEngine:
             if self.enable_anti_hallucination:
                 text = self._remove_hallucinations(text)
             
-            # Synthèse dans un thread séparé
-            audio_array = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self._synthesize_sync,
+            # Synthèse par le worker d'inférence (regroupée avec les jobs de même voix/langue)
+            audio_array = await self.inference_worker.submit(
                 text,
                 voice_id,
                 language,
@@ -325,10 +334,16 @@ class TTSEngine:
         """Vérifier si le modèle est chargé"""
         return self.model_loaded
     
+    def get_inference_stats(self) -> Dict[str, Any]:
+        """Statistiques du worker d'inférence"""
+        return self.inference_worker.get_stats()
+    
     async def shutdown(self):
         """Arrêt propre du moteur"""
         logger.info("🛑 Arrêt TTS Engine...")
         
+        await self.inference_worker.shutdown()
+        
         # Libérer la mémoire GPU si utilisée
         if self.tts and self.device != "cpu":
             torch.cuda.empty_cache()
@@ -25,6 +25,8 @@ from prometheus_client import make_asgi_app
 from core.tts_engine import TTSEngine
 from core.audio_processor import AudioProcessor
 from core.stream_manager import StreamManager
+from core.phrase_cache import PhraseCache
+from core.inference_worker import InferenceQueueFull
 from utils.config import settings
 from utils.monitoring import setup_metrics, record_tts_request
 from presets.preset_manager import preset_manager
@@ -53,6 +55,7 @@ app_state: Dict[str, Any] = {
     "tts_engine": None,
     "audio_processor": None,
     "stream_manager": None,
+    "phrase_cache": None,
     "startup_time": None,
     "healthy": False
 }
@@ -71,7 +74,11 @@ async def lifespan(app: FastAPI):
         app_state["tts_engine"] = TTSEngine(
             model_name=settings.TTS_MODEL,
             device=settings.TTS_DEVICE,
-            enable_anti_hallucination=settings.ANTI_HALLUCINATION
+            enable_anti_hallucination=settings.ANTI_HALLUCINATION,
+            max_batch_size=settings.TTS_MAX_BATCH_SIZE,
+            max_concurrency=settings.TTS_INFERENCE_CONCURRENCY,
+            batch_window_ms=settings.TTS_BATCH_WINDOW_MS,
+            max_queue=settings.TTS_MAX_QUEUE
         )
         await app_state["tts_engine"].initialize()
         logger.info("✅ TTS Engine prêt")
@@ -86,15 +93,36 @@ async def lifespan(app: FastAPI):
         await app_state["audio_processor"].initialize()
         logger.info("✅ Audio Processor prêt")
         
+        # 2bis. Cache de phrases synthétisées
+        if settings.PHRASE_CACHE_ENABLED:
+            app_state["phrase_cache"] = PhraseCache(
+                cache_dir=os.path.join(settings.CACHE_DIR, "phrases"),
+                max_memory_mb=settings.PHRASE_CACHE_MEMORY_MB,
+                max_disk_mb=settings.PHRASE_CACHE_DISK_MB,
+                sample_rate=settings.SAMPLE_RATE
+            )
+            await app_state["phrase_cache"].initialize()
+        
         # 3. Stream Manager
         logger.info("📡 Initialisation Stream Manager...")
         app_state["stream_manager"] = StreamManager(
             tts_engine=app_state["tts_engine"],
-            audio_processor=app_state["audio_processor"]
+            audio_processor=app_state["audio_processor"],
+            chunk_duration_ms=settings.CHUNK_DURATION_MS,
+            buffer_size=settings.BUFFER_SIZE,
+            lookahead=settings.STREAM_LOOKAHEAD_SENTENCES,
+            max_lead_ms=settings.STREAM_MAX_LEAD_MS,
+            phrase_cache=app_state["phrase_cache"]
         )
         await app_state["stream_manager"].initialize()
         logger.info("✅ Stream Manager prêt")
         
+        # Préchauffage du cache en arrière-plan (phrases des presets)
+        if app_state["phrase_cache"] and settings.PHRASE_CACHE_WARMUP:
+            asyncio.create_task(
+                app_state["phrase_cache"].warm(preset_warmup_entries(), render_speech_pcm)
+            )
+        
         # ✅ Application prête
         startup_time = asyncio.get_event_loop().time() - startup_start
         app_state["startup_time"] = startup_time
@@ -171,6 +199,136 @@ class VoiceCloneRequest(BaseModel):
     name: str
     description: Optional[str] = ""
     
+class CacheWarmRequest(BaseModel):
+    phrases: List[str]
+    voice_id: Optional[str] = "default"
+    language: Optional[str] = "fr"
+    speed: Optional[float] = 1.0
+    pitch: Optional[float] = 1.0
+    preset_name: Optional[str] = None
+
+# 🗃️ Synthèse avec cache de phrases
+
+# Pause entre l'introduction Jarvis et le texte (silence PCM 16 bits, 200 ms)
+JARVIS_INTRO_PAUSE = bytes(2 * settings.CHANNELS * int(settings.SAMPLE_RATE * 0.2))
+
+def get_preset_effects(preset_name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Effets audio d'un preset (identiques à ceux renvoyés par TTSEngine.synthesize)"""
+    if not preset_name:
+        return None
+    preset = preset_manager.get_preset(preset_name)
+    if preset and hasattr(preset, 'get_audio_effects'):
+        return preset.get_audio_effects()
+    return None
+
+def speech_params(
+    text: str,
+    voice_id: str = "default",
+    language: str = "fr",
+    speed: float = 1.0,
+    pitch: float = 1.0,
+    preset_name: Optional[str] = None,
+    context: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Paramètres effectifs d'un énoncé (clé du cache de phrases)
+    
+    Le preset est résolu ici comme dans TTSEngine.synthesize: texte enrichi (le contexte n'y
+    ajoute qu'une introduction connue) et vitesse/hauteur/langue du preset. La clé ne dépend
+    ainsi que de ce qui change l'audio, quels que soient les paramètres bruts envoyés.
+    """
+    if preset_name:
+        text = preset_manager.enhance_text_with_preset(text, preset_name, context)
+        voice_config = preset_manager.apply_preset_to_voice_config(
+            preset_name,
+            {"voice_id": voice_id, "language": language, "speed": speed, "pitch": pitch}
+        )
+        speed = voice_config.get("speed", speed)
+        pitch = voice_config.get("pitch", pitch)
+        language = voice_config.get("language", language)
+    
+    return {
+        "text": text,
+        "voice_id": voice_id,
+        "language": language,
+        "speed": speed,
+        "pitch": pitch,
+        "preset_name": preset_name,
+        "preset_effects": get_preset_effects(preset_name),
+        "variant": "full"
+    }
+
+def jarvis_speech_params(text: str, context: Optional[str] = None) -> Dict[str, Any]:
+    """Paramètres de l'endpoint Jarvis (partagés avec le préchauffage du cache)"""
+    return speech_params(
+        text,
+        voice_id="french_male",  # Voix masculine pour Jarvis
+        language="fr",
+        speed=0.95,  # Légèrement plus lent
+        pitch=-2.0,  # Plus grave
+        preset_name="jarvis",
+        context=context
+    )
+
+async def render_speech_pcm(
+    text: str,
+    voice_id: str,
+    language: str,
+    speed: float,
+    pitch: float,
+    preset_name: Optional[str],
+    preset_effects: Optional[Dict[str, Any]],
+    variant: str = "full"
+) -> bytes:
+    """Synthèse + traitement complet d'un énoncé en PCM 16 bits (paramètres de speech_params)"""
+    # Texte et voix déjà résolus par speech_params: le moteur ne réapplique pas le preset
+    synthesis_result = await app_state["tts_engine"].synthesize(
+        text=text,
+        voice_id=voice_id,
+        language=language,
+        speed=speed,
+        pitch=pitch
+    )
+    audio_data = synthesis_result[0] if isinstance(synthesis_result, tuple) else synthesis_result
+    
+    return await app_state["audio_processor"].process_to_pcm(
+        audio_data,
+        normalize=True,
+        remove_silence=True,
+        apply_filters=True,
+        preset_effects=preset_effects
+    )
+
+async def cached_speech_pcm(params: Dict[str, Any]) -> bytes:
+    """PCM d'un énoncé (paramètres de speech_params), servi depuis le cache de phrases si disponible"""
+    phrase_cache = app_state["phrase_cache"]
+    if phrase_cache is None:
+        return await render_speech_pcm(**params)
+    
+    key = phrase_cache.make_key(**params)
+    return await phrase_cache.get_or_synthesize(key, lambda: render_speech_pcm(**params))
+
+async def render_speech(**kwargs) -> tuple:
+    """
+    Énoncé complet en WAV, servi depuis le cache de phrases si disponible
+    
+    Returns:
+        tuple: (audio WAV, effets preset appliqués)
+    """
+    params = speech_params(**kwargs)
+    pcm = await cached_speech_pcm(params)
+    return app_state["audio_processor"].pcm16_to_wav(pcm), params["preset_effects"]
+
+def preset_warmup_entries() -> List[Dict[str, Any]]:
+    """Phrases canoniques des presets, avec les paramètres de l'endpoint Jarvis"""
+    entries = []
+    for phrases in preset_manager.get_jarvis_phrases().values():
+        for phrase in phrases:
+            if "{" in phrase or phrase.endswith("..."):
+                continue  # gabarits et amorces incomplètes
+            entries.append(jarvis_speech_params(phrase))
+    return entries
+
 # 🛣️ Routes API
 
 @app.get("/")
@@ -195,6 +353,7 @@ async def root():
             "jarvis": "/api/tts/jarvis",
             "presets": "/api/presets",
             "jarvis_phrases": "/api/jarvis/phrases",
+            "phrase_cache": "/api/cache/stats",
             "websocket": "/ws",
             "metrics": "/metrics",
             "docs": "/docs"
@@ -227,8 +386,8 @@ async def synthesize_speech(request: TTSRequest):
     try:
         start_time = time.time()
         
-        # Synthétiser l'audio
-        synthesis_result = await app_state["tts_engine"].synthesize(
+        # Synthétiser et traiter l'audio (cache de phrases)
+        processed_audio, preset_effects = await render_speech(
             text=request.text,
             voice_id=request.voice_id,
             language=request.language,
@@ -238,21 +397,6 @@ async def synthesize_speech(request: TTSRequest):
             context=request.context
         )
         
-        # Gérer le résultat (peut être tuple avec effets ou juste bytes)
-        if isinstance(synthesis_result, tuple):
-            audio_data, preset_effects = synthesis_result
-        else:
-            audio_data = synthesis_result
-            preset_effects = None
-        
-        # Traiter l'audio
-        processed_audio = await app_state["audio_processor"].process(
-            audio_data,
-            normalize=True,
-            remove_silence=True,
-            preset_effects=preset_effects
-        )
-        
         # Encoder en base64
         audio_base64 = base64.b64encode(processed_audio).decode('utf-8')
         
@@ -276,6 +420,8 @@ async def synthesize_speech(request: TTSRequest):
             "text_length": len(request.text)
         }
         
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"❌ Erreur synthèse: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur synthèse: {str(e)}")
@@ -284,7 +430,7 @@ async def synthesize_speech(request: TTSRequest):
 async def stream_speech(request: TTSRequest):
     """
     Streaming audio en temps réel
-    Retourne un stream audio chunk par chunk
+    Retourne un en-tête WAV unique suivi des frames PCM 16 bits brutes
     """
     if not app_state["stream_manager"]:
         raise HTTPException(status_code=503, detail="Stream Manager non disponible")
@@ -297,7 +443,8 @@ async def stream_speech(request: TTSRequest):
                 voice_id=request.voice_id,
                 language=request.language,
                 speed=request.speed,
-                pitch=request.pitch
+                pitch=request.pitch,
+                wav_header=True
             ):
                 yield chunk
         
@@ -309,7 +456,8 @@ async def stream_speech(request: TTSRequest):
                 "Cache-Control": "no-cache",
                 "X-Content-Type-Options": "nosniff",
                 "X-Voice-ID": request.voice_id,
-                "X-Language": request.language
+                "X-Language": request.language,
+                "X-Sample-Rate": str(app_state["stream_manager"].sample_rate)
             }
         )
         
@@ -391,40 +539,22 @@ async def jarvis_tts(request: JarvisRequest):
         
         # Améliorer le texte avec des phrases Jarvis si catégorie fournie
         enhanced_text = request.text
+        utterances = [jarvis_speech_params(request.text, request.context)]
         if request.phrase_category:
             phrases = preset_manager.get_jarvis_phrases(request.phrase_category)
-            if phrases and request.phrase_category in phrases:
+            if phrases and phrases.get(request.phrase_category):
                 # Utiliser une phrase aléatoire de la catégorie comme introduction
                 import random
                 intro_phrase = random.choice(phrases[request.phrase_category])
                 enhanced_text = f"{intro_phrase} {request.text}"
+                # Introduction synthétisée à part: c'est une phrase canonique préchauffée,
+                # et le tirage aléatoire ne se retrouve pas dans la clé du texte demandé
+                utterances.insert(0, jarvis_speech_params(intro_phrase))
         
-        # Synthétiser avec preset Jarvis
-        synthesis_result = await app_state["tts_engine"].synthesize(
-            text=enhanced_text,
-            voice_id="french_male",  # Voix masculine pour Jarvis
-            language="fr",
-            speed=0.95,  # Légèrement plus lent
-            pitch=-2.0,  # Plus grave
-            preset_name="jarvis",
-            context=request.context
-        )
-        
-        # Gérer le résultat
-        if isinstance(synthesis_result, tuple):
-            audio_data, preset_effects = synthesis_result
-        else:
-            audio_data = synthesis_result
-            preset_effects = None
-        
-        # Traitement audio optimisé Jarvis
-        processed_audio = await app_state["audio_processor"].process(
-            audio_data,
-            normalize=True,
-            remove_silence=True,
-            apply_filters=True,
-            preset_effects=preset_effects
-        )
+        # Synthétiser avec preset Jarvis et traitement audio optimisé (cache de phrases)
+        segments = [await cached_speech_pcm(params) for params in utterances]
+        processed_audio = app_state["audio_processor"].pcm16_to_wav(JARVIS_INTRO_PAUSE.join(segments))
+        preset_effects = utterances[-1]["preset_effects"]
         
         # Encoder en base64
         audio_base64 = base64.b64encode(processed_audio).decode('utf-8')
@@ -453,6 +583,8 @@ async def jarvis_tts(request: JarvisRequest):
             "voice_effects": "applied" if preset_effects else "none"
         }
         
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"❌ Erreur synthèse Jarvis: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur synthèse Jarvis: {str(e)}")
@@ -547,6 +679,45 @@ async def get_jarvis_phrases_by_category(category: str):
         logger.error(f"❌ Erreur phrases Jarvis {category}: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
+@app.post("/api/cache/warm")
+async def warm_phrase_cache(request: CacheWarmRequest):
+    """
+    Préchauffer le cache de phrases (ex: phrases canoniques des personas du Brain API)
+    La synthèse s'exécute en arrière-plan
+    """
+    if not app_state["phrase_cache"] or not app_state["tts_engine"]:
+        raise HTTPException(status_code=503, detail="Cache de phrases non disponible")
+    
+    entries = [
+        speech_params(
+            phrase,
+            voice_id=request.voice_id,
+            language=request.language,
+            speed=request.speed,
+            pitch=request.pitch,
+            preset_name=request.preset_name
+        )
+        for phrase in dict.fromkeys(request.phrases)
+        if phrase.strip()
+    ]
+    asyncio.create_task(app_state["phrase_cache"].warm(entries, render_speech_pcm))
+    
+    return {"status": "scheduled", "phrases": len(entries)}
+
+@app.get("/api/cache/stats")
+async def phrase_cache_stats():
+    """Statistiques du cache de phrases"""
+    if not app_state["phrase_cache"]:
+        return {"enabled": False}
+    return {"enabled": True, **app_state["phrase_cache"].get_stats()}
+
+@app.get("/api/inference/stats")
+async def inference_stats():
+    """Statistiques du worker d'inférence (file, taille des lots, latences)"""
+    if not app_state["tts_engine"]:
+        raise HTTPException(status_code=503, detail="TTS Engine non disponible")
+    return app_state["tts_engine"].get_inference_stats()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -586,6 +757,16 @@ async def websocket_endpoint(websocket: WebSocket):
                     })
                     continue
                 
+                # Format des frames: PCM brut, sans en-tête WAV par chunk
+                await websocket.send_json({
+                    "type": "stream_start",
+                    "format": "pcm_s16le",
+                    "sample_rate": app_state["stream_manager"].sample_rate,
+                    "channels": app_state["stream_manager"].channels,
+                    "chunk_duration_ms": app_state["stream_manager"].chunk_duration_ms,
+                    "timestamp": time.time()
+                })
+                
                 # Streaming chunks audio
                 chunk_index = 0
                 async for audio_chunk in app_state["stream_manager"].stream_synthesis(
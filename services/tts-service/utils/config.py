@@ -22,6 +22,12 @@ class Settings(BaseSettings):
     TTS_DEVICE: str = "cpu"  # ou "cuda" si GPU disponible
     ANTI_HALLUCINATION: bool = True
     
+    # Worker d'inférence
+    TTS_MAX_BATCH_SIZE: int = 8  # jobs de même voix/langue exécutés d'affilée
+    TTS_INFERENCE_CONCURRENCY: int = 1  # lots simultanés (le modèle Coqui n'est pas thread-safe)
+    TTS_BATCH_WINDOW_MS: int = 10
+    TTS_MAX_QUEUE: int = 256
+    
     # Audio
     SAMPLE_RATE: int = 22050
     CHANNELS: int = 1
@@ -32,10 +38,16 @@ class Settings(BaseSettings):
     STREAMING_ENABLED: bool = True
     BUFFER_SIZE: int = 5
     MAX_LATENCY_MS: int = 500
+    STREAM_LOOKAHEAD_SENTENCES: int = 2  # phrases synthétisées en avance pendant la diffusion
+    STREAM_MAX_LEAD_MS: int = 200  # avance maximale de l'envoi sur l'horloge de lecture
     
     # Cache
     CACHE_DIR: str = "/app/cache"
     MODEL_DIR: str = "/app/models"
+    PHRASE_CACHE_ENABLED: bool = True
+    PHRASE_CACHE_MEMORY_MB: int = 64
+    PHRASE_CACHE_DISK_MB: int = 1024
+    PHRASE_CACHE_WARMUP: bool = True  # préchauffage au démarrage avec les phrases des presets
     
     # Redis (optionnel pour cache distribué)
     REDIS_URL: Optional[str] = None
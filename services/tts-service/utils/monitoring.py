@@ -50,6 +50,35 @@ TTS_ERRORS = Counter(
     ['error_type']
 )
 
+PHRASE_CACHE_LOOKUPS = Counter(
+    'jarvis_tts_phrase_cache_lookups_total',
+    'Consultations du cache de phrases synthétisées',
+    ['result']  # memory, disk, miss
+)
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    'jarvis_tts_inference_queue_depth',
+    'Jobs de synthèse en attente du worker d\'inférence'
+)
+
+INFERENCE_BATCH_SIZE = Histogram(
+    'jarvis_tts_inference_batch_size',
+    'Nombre de jobs par lot d\'inférence',
+    buckets=[1, 2, 3, 4, 6, 8, 12, 16, 32]
+)
+
+INFERENCE_BATCH_DURATION = Histogram(
+    'jarvis_tts_inference_batch_duration_seconds',
+    'Durée d\'exécution d\'un lot d\'inférence'
+)
+
+INFERENCE_JOB_LATENCY = Histogram(
+    'jarvis_tts_inference_job_latency_seconds',
+    'Latence par job de synthèse (attente en file, total)',
+    ['stage'],
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+)
+
 # Fonctions d'enregistrement
 def setup_metrics():
     """Initialiser les métriques"""
@@ -107,4 +136,34 @@ def record_tts_error(error_type: str):
     try:
         TTS_ERRORS.labels(error_type=error_type).inc()
     except Exception as e:
-        logger.error(f"❌ Erreur enregistrement erreur: {e}")
\ No newline at end of file
+        logger.error(f"❌ Erreur enregistrement erreur: {e}")
+
+def record_phrase_cache_lookup(result: str):
+    """Enregistrer une consultation du cache de phrases"""
+    try:
+        PHRASE_CACHE_LOOKUPS.labels(result=result).inc()
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement cache phrases: {e}")
+
+def record_inference_queue_depth(depth: int):
+    """Enregistrer la profondeur de la file d'inférence"""
+    try:
+        INFERENCE_QUEUE_DEPTH.set(depth)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement file d'inférence: {e}")
+
+def record_inference_batch(batch_size: int, duration: float):
+    """Enregistrer l'exécution d'un lot d'inférence"""
+    try:
+        INFERENCE_BATCH_SIZE.observe(batch_size)
+        INFERENCE_BATCH_DURATION.observe(duration)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement lot d'inférence: {e}")
+
+def record_inference_job(queue_wait: float, latency: float):
+    """Enregistrer la latence d'un job de synthèse"""
+    try:
+        INFERENCE_JOB_LATENCY.labels(stage="queue").observe(queue_wait)
+        INFERENCE_JOB_LATENCY.labels(stage="total").observe(latency)
+    except Exception as e:
+        logger.error(f"❌ Erreur enregistrement job d'inférence: {e}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+🔧 Tests unitaires pour l'exécution parallèle des outils ReactAgent
+Plusieurs actions par étape, timeouts par outil et itérations économisées
+"""
+
+import pytest
+import asyncio
+import time
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.agent import ReactAgent
+
+
+@pytest.fixture
+def agent():
+    agent = ReactAgent(llm_url="http://localhost:11434")
+
+    async def slow_tool(params):
+        await asyncio.sleep(0.1)
+        return f"lent: {params.get('query')}"
+
+    async def get_time(params):
+        await asyncio.sleep(0.1)
+        return "12:00"
+
+    async def stuck(params):
+        await asyncio.sleep(10)
+
+    agent.tools = {"slow_tool": slow_tool, "get_time": get_time, "stuck": stuck}
+    agent.tool_descriptions = {name: name for name in agent.tools}
+    return agent
+
+
+class TestParallelTools:
+    """Tests des étapes à plusieurs actions"""
+
+    def test_parse_multiple_actions(self, agent):
+        thought = "Je vais utiliser deux outils.\nAction: get_time avec Input: {}\nAction: slow_tool avec Input: météo\n"
+
+        actions = agent._parse_actions_from_thought(thought)
+
+        assert [a["action"] for a in actions] == ["get_time", "slow_tool"]
+        assert actions[1]["input"] == {"query": "météo"}
+        assert agent._parse_action_from_thought(thought)["action"] == "get_time"
+
+    def test_adjacent_actions_are_not_merged(self, agent):
+        thought = "Action: get_time Input: {} Action: slow_tool Input: météo\nAction: stuck\nAction: slow_tool Input: pluie"
+
+        actions = agent._parse_actions_from_thought(thought)
+
+        # "stuck" sans Input est ignorée au lieu d'absorber l'action suivante
+        assert actions == [
+            {"action": "get_time", "input": {}},
+            {"action": "slow_tool", "input": {"query": "météo"}},
+            {"action": "slow_tool", "input": {"query": "pluie"}}
+        ]
+
+    async def test_act_step_filters_unknown_and_duplicates(self, agent):
+        thought = "Action: get_time Input: {}\nAction: get_time Input: {}\nAction: inconnu Input: {}\n"
+
+        actions = await agent._act_step(thought)
+
+        assert actions == [("get_time", {})]
+
+    async def test_independent_actions_run_concurrently(self, agent):
+        thoughts = iter([
+            "Action: get_time avec Input: {}\nAction: slow_tool avec Input: x\n",
+            "Réponse finale: fait"
+        ])
+
+        async def call_llm(prompt):
+            return next(thoughts)
+
+        agent._call_llm = call_llm
+        started = time.time()
+        execution = await agent.execute_task("heure et recherche")
+        elapsed = time.time() - started
+
+        step = execution.steps[0]
+        assert [call["action"] for call in step.tool_calls] == ["get_time", "slow_tool"]
+        assert "[get_time] 12:00" in step.observation and "[slow_tool] lent: x" in step.observation
+        assert elapsed < 0.19
+        assert execution.iterations_saved == 1
+        assert agent.get_stats()["iterations_saved"] == 1
+        assert execution.final_answer == "fait"
+
+    async def test_tool_timeout_returns_error_observation(self, agent):
+        agent.tool_timeouts["stuck"] = 0.05
+
+        observation = await agent._observe_step("stuck", {})
+
+        assert observation.startswith("Erreur")
+        assert agent.stats["tool_timeouts"] == 1
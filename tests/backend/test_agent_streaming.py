@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+📡 Tests unitaires pour le streaming des exécutions ReactAgent
+Tokens de réflexion, actions/observations et tokens de réponse finale
+"""
+
+import pytest
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.agent import ReactAgent
+from core.llm_manager import LLMStreamChunk
+
+
+class ScriptedLLM:
+    """LLM Manager simulé: une liste de tokens par réflexion"""
+
+    def __init__(self, *thoughts):
+        self.thoughts = list(thoughts)
+
+    async def stream_completion(self, messages, **kwargs):
+        tokens = self.thoughts.pop(0)
+        for i, token in enumerate(tokens):
+            yield LLMStreamChunk(content=token, is_final=i == len(tokens) - 1)
+
+
+@pytest.fixture
+def agent():
+    agent = ReactAgent(llm_url="http://localhost:11434")
+
+    async def get_time(params):
+        return "12:00"
+
+    agent.tools = {"get_time": get_time}
+    agent.tool_descriptions = {"get_time": "Heure actuelle"}
+    return agent
+
+
+class TestAgentStreaming:
+    """Tests du mode streaming de execute_task"""
+
+    async def test_answer_tokens_streamed_from_thought(self, agent):
+        agent.llm_manager = ScriptedLLM(["Je sais. ", "Réponse fin", "ale: Bon", "jour à", " toi\n", "fin"])
+        events = []
+
+        async def on_event(event):
+            events.append(event)
+
+        execution = await agent.execute_task("Dis bonjour", on_event=on_event)
+
+        thought_tokens = [e["content"] for e in events if e["type"] == "thought_token"]
+        answer = "".join(e["content"] for e in events if e["type"] == "answer_token")
+        assert "".join(thought_tokens) == "Je sais. Réponse finale: Bonjour à toi\nfin"
+        assert answer == "Bonjour à toi"
+        assert execution.final_answer == "Bonjour à toi"
+
+    async def test_actions_and_observations_streamed(self, agent):
+        agent.llm_manager = ScriptedLLM(
+            ["Action: get_time ", "avec Input: {}\n"],
+            ["Réponse finale: ", "il est midi"]
+        )
+        events = []
+
+        async def on_event(event):
+            events.append(event)
+
+        execution = await agent.execute_task("Quelle heure ?", on_event=on_event)
+
+        types = [e["type"] for e in events if e["type"] != "thought_token"]
+        assert types[:2] == ["action", "observation"]
+        observation = next(e for e in events if e["type"] == "observation")
+        assert observation["observation"] == "12:00"
+        assert execution.final_answer == "il est midi"
+
+    async def test_without_callback_uses_blocking_llm(self, agent):
+        agent.llm_manager = ScriptedLLM()
+        calls = []
+
+        async def call_llm(prompt):
+            calls.append(prompt)
+            return "Réponse finale: ok"
+
+        agent._call_llm = call_llm
+        execution = await agent.execute_task("test")
+
+        assert execution.final_answer == "ok"
+        assert len(calls) == 1
+
+
+class RecordingCache:
+    """Cache LLM simulé: mémorise les générations réussies"""
+
+    def __init__(self):
+        self.responses = {}
+
+    async def get_or_generate(self, prompt, generate, **kwargs):
+        if prompt not in self.responses:
+            self.responses[prompt] = await generate()
+        return self.responses[prompt]
+
+
+class TestAgentLLMCache:
+    """Tests du passage de _call_llm par le cache LLM"""
+
+    async def test_generations_served_from_cache(self, agent):
+        agent.llm_cache = RecordingCache()
+        calls = []
+
+        async def generate(prompt):
+            calls.append(prompt)
+            return "Réponse finale: ok"
+
+        agent._generate = generate
+        assert await agent._call_llm("test") == await agent._call_llm("test") == "Réponse finale: ok"
+        assert calls == ["test"]
+
+    async def test_fallback_responses_are_not_cached(self, agent):
+        agent.llm_cache = RecordingCache()
+
+        async def generate(prompt):
+            raise RuntimeError("LLM request failed: 503")
+
+        agent._generate = generate
+        assert await agent._call_llm("test") == agent._fallback_response("test")
+        assert agent.llm_cache.responses == {}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+📦 Tests unitaires pour le protocole audio binaire du Brain API
+Trames binaires, compatibilité base64/JSON et accusés regroupés
+"""
+
+import pytest
+import base64
+import time
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.audio_protocol import AudioFrameError, FRAME_HEADER_SIZE, decode_frame, encode_frame
+from core.audio_streamer import AudioStreamer
+
+
+class RecordingManager:
+    """WebSocketManager simulé: enregistre les messages JSON et les trames binaires"""
+
+    def __init__(self):
+        self.messages = []
+        self.frames = []
+
+    async def _send_message(self, connection_id, message):
+        self.messages.append(message)
+
+    async def _send_binary(self, connection_id, data):
+        self.frames.append(data)
+
+    def acks(self):
+        return [m for m in self.messages if m["type"] == "audio_chunk_ack"]
+
+
+class TestAudioFrame:
+    """Tests de l'encodage des trames"""
+
+    def test_roundtrip(self):
+        payload = bytes(range(256)) * 2
+        data = encode_frame(7, 42, 1700000000.123456, "pcm_s16le", payload)
+
+        frame = decode_frame(data)
+
+        assert len(data) == FRAME_HEADER_SIZE + len(payload)
+        assert (frame.stream_id, frame.sequence, frame.format) == (7, 42, "pcm_s16le")
+        assert frame.timestamp == pytest.approx(1700000000.123456, abs=1e-6)
+        assert bytes(frame.payload) == payload
+
+    @pytest.mark.parametrize("data", [b"JA\x01", b"XX" + bytes(18), b"JA\x09" + bytes(17), b"JA\x01\x7f" + bytes(16)])
+    def test_invalid_frames_rejected(self, data):
+        with pytest.raises(AudioFrameError):
+            decode_frame(data)
+
+
+class TestAudioStreamerTransports:
+    """Tests des chemins binaire et JSON historique"""
+
+    @pytest.fixture
+    def streamer(self):
+        return AudioStreamer(RecordingManager(), config={"ack_interval_frames": 4, "ack_max_delay_ms": 60000})
+
+    async def test_binary_frames_coalesce_acks(self, streamer):
+        session_id = await streamer.start_session("conn", "user", {"transport": "binary", "format": "pcm_s16le"})
+        session = streamer.active_sessions[session_id]
+
+        for sequence in range(10):
+            data = encode_frame(session.stream_id, sequence, time.time(), "pcm_s16le", b"\x00\x01" * 320)
+            await streamer.process_audio_frame("conn", decode_frame(data))
+
+        acks = streamer.websocket_manager.acks()
+        assert [ack["frames"] for ack in acks] == [4, 4]
+        assert acks[-1]["last_sequence"] == 7
+        assert session.stats["chunks_received"] == 10
+        assert session.stats["bytes_transferred"] == 10 * 640
+
+        await streamer.end_session(session_id)
+        acks = streamer.websocket_manager.acks()
+        assert acks[-1]["frames"] == 2
+        assert acks[-1]["last_sequence"] == 9
+        assert session.stream_id not in streamer.stream_ids
+
+    async def test_frame_from_other_connection_rejected(self, streamer):
+        session_id = await streamer.start_session("conn", "user", {"transport": "binary", "format": "pcm_s16le"})
+        stream_id = streamer.active_sessions[session_id].stream_id
+        frame = decode_frame(encode_frame(stream_id, 0, time.time(), "pcm_s16le", b"\x00\x00"))
+
+        with pytest.raises(AudioFrameError):
+            await streamer.process_audio_frame("intrus", frame)
+
+    async def test_legacy_json_chunks_ack_each_chunk(self, streamer):
+        session_id = await streamer.start_session("conn", "user")
+
+        for sequence in range(3):
+            await streamer.process_audio_chunk(session_id, {
+                "type": "audio_chunk",
+                "chunk_id": f"c{sequence}",
+                "sequence": sequence,
+                "data": base64.b64encode(b"\x00\x01" * 160).decode(),
+                "timestamp": time.time()
+            })
+
+        acks = streamer.websocket_manager.acks()
+        assert [ack["chunk_id"] for ack in acks] == ["c0", "c1", "c2"]
+        assert all(ack["frames"] == 1 for ack in acks)
+
+    async def test_binary_session_sends_binary_frames(self, streamer):
+        session_id = await streamer.start_session("conn", "user", {"transport": "binary", "format": "pcm_s16le"})
+
+        await streamer.send_audio_chunk(session_id, b"\x10\x00" * 100)
+
+        frame = decode_frame(streamer.websocket_manager.frames[0])
+        assert frame.stream_id == streamer.active_sessions[session_id].stream_id
+        assert bytes(frame.payload) == b"\x10\x00" * 100
+        assert not [m for m in streamer.websocket_manager.messages if m["type"] == "audio_chunk"]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+🧬 Tests unitaires pour le moteur d'embeddings partagé du Brain API
+Micro-batching, cache par hash de contenu et embeddings de secours
+"""
+
+import asyncio
+import logging
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+import utils.embedding_engine as embedding_engine
+from utils.embedding_engine import EmbeddingEngine
+
+
+class FakeModel:
+    """Modèle simulé: un vecteur constant par texte"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        import numpy as np
+        self.calls += 1
+        return np.array([[float(len(text))] * 4 for text in texts])
+
+
+class TestEmbeddingEngine:
+    """Tests du moteur d'embeddings"""
+
+    async def test_concurrent_requests_share_one_batch(self):
+        engine = EmbeddingEngine(dimension=4)
+        engine.model = FakeModel()
+
+        vectors = await engine.embed_many(["a", "bb", "a"])
+
+        assert vectors == [[1.0] * 4, [2.0] * 4, [1.0] * 4]
+        assert engine.model.calls == 1
+        assert await engine.embed("bb") == [2.0] * 4
+        assert engine.stats["memory_hits"] == 1
+        assert not engine._flush_tasks
+        await engine.shutdown()
+
+    async def test_fallback_vectors_are_never_cached(self):
+        engine = EmbeddingEngine(dimension=4)
+        stored = []
+
+        async def db_store(encoded):
+            stored.append(encoded)
+
+        engine._db_store = db_store
+
+        fallback = await engine.embed("bonjour jarvis")
+        assert fallback == engine.hash_embedding("bonjour jarvis")
+        assert engine.encode_sync(["bonjour jarvis"]) == [fallback]
+        assert not engine._cache and not stored
+
+        # Une fois le modèle chargé, le même texte obtient son vrai embedding
+        engine.model = FakeModel()
+        assert await engine.embed("bonjour jarvis") == [14.0] * 4
+        assert len(stored) == 1
+        await engine.shutdown()
+
+    async def test_conflicting_settings_are_reported(self, monkeypatch, caplog):
+        monkeypatch.setattr(embedding_engine, "SENTENCE_TRANSFORMERS_AVAILABLE", False)
+        monkeypatch.setattr(embedding_engine, "_global_embedding_engine", None)
+
+        first = await embedding_engine.get_embedding_engine(dimension=8)
+        with caplog.at_level(logging.WARNING):
+            second = await embedding_engine.get_embedding_engine(dimension=16, hash_fallback=True)
+
+        assert first is second and first.dimension == 8
+        assert "dimension" in caplog.text and "hash_fallback" not in caplog.text
+
+    async def test_callers_wait_for_model_loading(self, monkeypatch):
+        monkeypatch.setattr(embedding_engine, "_global_embedding_engine", None)
+
+        async def slow_initialize(engine):
+            await asyncio.sleep(0.05)
+            engine.model = FakeModel()
+
+        monkeypatch.setattr(EmbeddingEngine, "initialize", slow_initialize)
+
+        async def get_engine():
+            engine = await embedding_engine.get_embedding_engine(dimension=4)
+            return engine, engine.model is not None
+
+        (first, first_loaded), (second, second_loaded) = await asyncio.gather(get_engine(), get_engine())
+
+        # Le second appelant n'obtient pas un moteur encore sans modèle (vecteurs de secours)
+        assert first is second
+        assert first_loaded and second_loaded
+        await first.shutdown()
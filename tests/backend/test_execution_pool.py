@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+🎟️ Tests unitaires pour le pool d'exécutions concurrentes de l'agent
+Slots bornés, équité entre utilisateurs, files bornées et annulation
+"""
+
+import pytest
+import asyncio
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.agent import ReactAgent
+from core.execution_pool import AgentExecutionPool, ExecutionRejected
+
+
+class TestAgentExecutionPool:
+    """Tests de l'admission des exécutions"""
+
+    async def test_immediate_admission_under_capacity(self):
+        pool = AgentExecutionPool(max_concurrent=2)
+
+        first = await pool.acquire("alice")
+        second = await pool.acquire("bob")
+
+        assert pool.active == 2
+        assert first.waited == 0.0 and second.waited == 0.0
+        pool.release(first)
+        pool.release(first)  # idempotent
+        assert pool.active == 1
+
+    async def test_round_robin_between_users(self):
+        pool = AgentExecutionPool(max_concurrent=1, max_active_per_user=1)
+        held = await pool.acquire("alice")
+        order = []
+
+        async def run(user_id):
+            slot = await pool.acquire(user_id)
+            order.append(user_id)
+            pool.release(slot)
+
+        # alice envoie trois tâches avant que bob n'en envoie une
+        tasks = [asyncio.create_task(run(u)) for u in ["alice", "alice", "alice", "bob"]]
+        await asyncio.sleep(0)
+        pool.release(held)
+        await asyncio.gather(*tasks)
+
+        assert order.index("bob") <= 1
+
+    async def test_per_user_active_cap(self):
+        pool = AgentExecutionPool(max_concurrent=4, max_active_per_user=1)
+        alice = await pool.acquire("alice")
+
+        waiting = asyncio.create_task(pool.acquire("alice"))
+        bob = await pool.acquire("bob")
+        await asyncio.sleep(0)
+
+        assert not waiting.done()
+        assert pool.active == 2
+
+        pool.release(alice)
+        second = await asyncio.wait_for(waiting, 1)
+        assert second.user_id == "alice"
+        pool.release(second)
+        pool.release(bob)
+        assert pool.active == 0
+
+    async def test_global_queue_full_rejects(self):
+        pool = AgentExecutionPool(max_concurrent=1, max_queue=2)
+        held = await pool.acquire("alice")
+
+        queued = [asyncio.create_task(pool.acquire(u)) for u in ["alice", "bob"]]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutionRejected) as excinfo:
+            await pool.acquire("carol")
+        assert excinfo.value.reason == "queue_full"
+
+        pool.release(held)
+        for task in queued:
+            pool.release(await task)
+
+    async def test_user_queue_full_rejects(self):
+        pool = AgentExecutionPool(max_concurrent=1, max_queued_per_user=1)
+        held = await pool.acquire("alice")
+
+        queued = asyncio.create_task(pool.acquire("alice"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutionRejected) as excinfo:
+            await pool.acquire("alice")
+        assert excinfo.value.reason == "user_queue_full"
+
+        pool.release(held)
+        pool.release(await queued)
+
+    async def test_cancelled_waiter_frees_its_place(self):
+        pool = AgentExecutionPool(max_concurrent=1)
+        held = await pool.acquire("alice")
+
+        waiter = asyncio.create_task(pool.acquire("bob"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert pool.queued() == 0
+        assert pool.stats["cancelled_in_queue"] == 1
+        pool.release(held)
+        assert pool.active == 0
+
+    async def test_slot_context_manager_releases(self):
+        pool = AgentExecutionPool(max_concurrent=1)
+
+        with pytest.raises(ValueError):
+            async with pool.slot("alice"):
+                assert pool.active == 1
+                raise ValueError("échec tâche")
+
+        assert pool.active == 0
+
+
+class TestConcurrentAgentExecutions:
+    """Tests des exécutions ReactAgent simultanées"""
+
+    async def test_executions_run_concurrently_with_own_state(self):
+        agent = ReactAgent(llm_url="http://localhost:11434", max_concurrent_executions=2)
+        release = asyncio.Event()
+
+        async def call_llm(prompt):
+            await release.wait()
+            return "Réponse finale: " + prompt.split("TÂCHE: ")[1].split("\n")[0]
+
+        agent._call_llm = call_llm
+        tasks = [
+            asyncio.create_task(agent.execute_task("un", user_id="alice")),
+            asyncio.create_task(agent.execute_task("deux", user_id="bob"))
+        ]
+        await asyncio.sleep(0.01)
+
+        assert len(agent.active_executions) == 2
+        release.set()
+        first, second = await asyncio.gather(*tasks)
+
+        assert (first.final_answer, second.final_answer) == ("un", "deux")
+        assert first.execution_id != second.execution_id
+        assert not agent.is_active
+        assert agent.stats["successful_executions"] == 2
+        assert agent.get_stats()["execution_pool"]["active"] == 0
+
+    async def test_rejected_execution_releases_nothing(self):
+        agent = ReactAgent(llm_url="http://localhost:11434", max_concurrent_executions=1)
+        agent.execution_pool.max_queue = 0
+        release = asyncio.Event()
+
+        async def call_llm(prompt):
+            await release.wait()
+            return "Réponse finale: ok"
+
+        agent._call_llm = call_llm
+        running = asyncio.create_task(agent.execute_task("un", user_id="alice"))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(ExecutionRejected):
+            await agent.execute_task("deux", user_id="bob")
+
+        # Le slot de l'exécution en cours n'est pas rendu par l'exécution refusée
+        assert agent.execution_pool.active == 1
+        assert list(agent.active_executions.values())[0].task == "un"
+        release.set()
+        assert (await running).final_answer == "ok"
+        assert agent.execution_pool.active == 0
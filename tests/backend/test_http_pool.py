@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+🔌 Tests unitaires pour le pool HTTP partagé du Brain API
+Réutilisation des connexions keep-alive et plafond par hôte
+"""
+
+import pytest
+import asyncio
+from aiohttp import web
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from utils.http_pool import HTTPClientPool
+
+
+@pytest.fixture
+async def upstream():
+    """Serveur HTTP local simulant un upstream Ollama"""
+    state = {"active": 0, "max_active": 0}
+
+    async def tags(request):
+        state["active"] += 1
+        state["max_active"] = max(state["max_active"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return web.json_response({"models": [{"name": "llama3.2:3b"}]})
+
+    app = web.Application()
+    app.router.add_get("/api/tags", tags)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", state
+
+    await runner.cleanup()
+
+
+class TestHTTPClientPool:
+    """Tests du registre de clients upstream"""
+
+    async def test_sequential_requests_reuse_connection(self, upstream):
+        url, _ = upstream
+        pool = HTTPClientPool()
+        client = pool.register("ollama", url)
+
+        for _ in range(5):
+            async with client.get("/api/tags") as response:
+                assert response.status == 200
+                await response.json()
+
+        stats = client.get_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 4
+        await pool.close()
+
+    async def test_limit_per_host_caps_concurrency(self, upstream):
+        url, state = upstream
+        pool = HTTPClientPool(limit_per_host=2)
+        client = pool.register("ollama", url)
+
+        async def call():
+            async with client.get("/api/tags") as response:
+                return response.status
+
+        statuses = await asyncio.gather(*(call() for _ in range(8)))
+
+        assert statuses == [200] * 8
+        assert state["max_active"] <= 2
+        assert client.get_stats()["queued"] > 0
+        await pool.close()
+
+    async def test_same_base_url_shares_client(self, upstream):
+        url, _ = upstream
+        pool = HTTPClientPool()
+
+        assert pool.register("ollama", url) is pool.register("ollama_fallback", url + "/")
+        assert list(pool.get_stats()) == ["ollama"]
+        await pool.close()
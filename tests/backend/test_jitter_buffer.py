@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+⏱️ Tests unitaires pour le jitter buffer du Brain API
+Réordonnancement, masquage des pertes, profondeur adaptative et percentiles
+"""
+
+import pytest
+import numpy as np
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.audio_streamer import AudioChunk, AudioStreamer
+from core.jitter_buffer import JitterBuffer
+
+
+def make_chunk(sequence, value=1000):
+    data = np.full(160, value, dtype=np.int16).tobytes()
+    return AudioChunk(f"c{sequence}", data, "pcm_s16le", 16000, 1, 0.0, "user", sequence)
+
+
+class TestJitterBuffer:
+    """Tests du réordonnancement et des pertes"""
+
+    def test_reorders_by_sequence(self):
+        buffer = JitterBuffer(min_depth=2, adaptive=False)
+        released = []
+        for t, sequence in enumerate([0, 2, 1, 3]):
+            buffer.push(make_chunk(sequence), t * 0.02, t * 0.02)
+            released += buffer.pop_ready(t * 0.02)
+
+        assert [chunk.sequence for chunk in released] == [0, 1, 2, 3]
+        assert buffer.stats["reordered"] == 1
+        assert buffer.stats["lost"] == 0
+
+    def test_gap_is_concealed_once_depth_reached(self):
+        buffer = JitterBuffer(min_depth=2, adaptive=False)
+        released = []
+        for t, sequence in enumerate([0, 2, 3, 4]):
+            buffer.push(make_chunk(sequence), t * 0.02, t * 0.02)
+            released += buffer.pop_ready(t * 0.02)
+
+        assert [chunk.sequence for chunk in released] == [0, 1, 2, 3, 4]
+        concealed = released[1]
+        assert concealed.concealed
+        assert np.frombuffer(concealed.data, dtype=np.int16)[0] == 500
+
+        buffer.push(make_chunk(1), 0.1, 0.02)
+        assert buffer.stats["late"] == 1
+        assert buffer.get_stats()["loss_rate"] == pytest.approx(0.2)
+
+    def test_gap_is_concealed_after_waiting(self):
+        buffer = JitterBuffer(min_depth=3, adaptive=False)
+        buffer.push(make_chunk(0), 0.0, 0.0)
+        buffer.push(make_chunk(2), 0.02, 0.02)
+
+        assert [chunk.sequence for chunk in buffer.pop_ready(0.02)] == [0]
+        assert buffer.pop_ready(0.05) == []
+        assert [chunk.sequence for chunk in buffer.pop_ready(0.09)] == [1, 2]
+
+    def test_target_depth_follows_jitter(self):
+        steady = JitterBuffer(max_depth=25)
+        jittery = JitterBuffer(max_depth=25)
+        rng = np.random.default_rng(0)
+        for sequence in range(200):
+            sent = sequence * 0.02
+            steady.push(make_chunk(sequence), sent + 0.01, sent)
+            jittery.push(make_chunk(sequence), sent + 0.01 + rng.uniform(0, 0.08), sent)
+
+        assert steady.target_depth == 1
+        assert jittery.target_depth > 3
+        assert jittery.get_stats()["jitter_ms"] > 10
+
+    def test_latency_percentiles(self):
+        buffer = JitterBuffer()
+        for sequence in range(100):
+            buffer.push(make_chunk(sequence), sequence + (sequence + 1) / 1000, sequence)
+
+        stats = buffer.get_stats()
+        assert stats["latency_p50_ms"] == pytest.approx(50.5)
+        assert stats["latency_p95_ms"] == pytest.approx(95.05)
+        assert stats["latency_p99_ms"] == pytest.approx(99.01)
+
+
+class TestAudioStreamerJitter:
+    """Intégration du jitter buffer dans les sessions"""
+
+    async def test_session_stats_expose_jitter(self):
+        streamer = AudioStreamer()
+        processed = []
+
+        async def stt(data, meta):
+            processed.append(data)
+
+        streamer.register_audio_processor("stt", stt)
+        session_id = await streamer.start_session("conn", "user")
+
+        for sequence in [0, 2, 1]:
+            await streamer.process_audio_chunk(session_id, {"type": "input", "sequence": sequence, "data": ""})
+
+        stats = streamer.get_session_stats(session_id)
+        assert [chunk.sequence for chunk in streamer.audio_buffers[session_id]] == [0, 1, 2]
+        assert len(processed) == 3
+        assert stats["jitter"]["reordered"] == 1
+        assert {"latency_p50_ms", "latency_p95_ms", "latency_p99_ms", "loss_rate"} <= set(stats["jitter"])
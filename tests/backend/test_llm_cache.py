@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🧠 Tests unitaires pour le cache LLM du Brain API
+Cache local LRU (bornes, TTL, compression, admission) et index sémantique
+"""
+
+import pytest
+import time
+import numpy as np
+from unittest.mock import Mock, AsyncMock
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from utils.llm_cache import (
+    LLMCacheManager, CacheConfig, CacheEntry,
+    LocalLRUCache, SemanticCacheIndex
+)
+
+
+def make_entry(prompt="Quelle heure est-il ?", response="Il est midi.", **kwargs):
+    return CacheEntry(
+        key="k", prompt_hash="h", prompt=prompt, response=response,
+        model="llama3.2:3b", temperature=0.7, max_tokens=256, **kwargs
+    )
+
+
+class TestLocalLRUCache:
+    """Tests du cache local LRU"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LocalLRUCache(max_entries=2, max_bytes=10**6)
+        expires = time.time() + 60
+        cache.put("a", make_entry(), expires)
+        cache.put("b", make_entry(), expires)
+        assert cache.get("a") is not None  # "a" devient la plus récente
+        cache.put("c", make_entry(), expires)
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.evictions == 1
+
+    def test_byte_budget_is_enforced(self):
+        cache = LocalLRUCache(max_entries=100, max_bytes=300, enable_compression=False)
+        expires = time.time() + 60
+        for i in range(5):
+            cache.put(f"k{i}", make_entry(response="x" * 100), expires)
+
+        assert cache.total_bytes <= 300
+        assert len(cache) < 5
+
+    def test_expired_entries_are_dropped(self):
+        cache = LocalLRUCache(max_entries=10, max_bytes=10**6)
+        cache.put("a", make_entry(), time.time() - 1)
+
+        assert cache.get("a") is None
+        assert cache.total_bytes == 0
+
+    def test_access_count_survives_compression(self):
+        cache = LocalLRUCache(max_entries=10, max_bytes=10**6, compression_min_bytes=64)
+        cache.put("k", make_entry(response="Il est midi. " * 100, access_count=4), time.time() + 60)
+
+        cache.get("k")
+        assert cache.get("k").access_count == 6
+        assert cache._items["k"].compressed_response is not None
+
+    def test_large_responses_are_compressed_transparently(self):
+        cache = LocalLRUCache(max_entries=10, max_bytes=10**6, compression_min_bytes=100)
+        response = "JARVIS à votre service. " * 200
+        cache.put("a", make_entry(response=response), time.time() + 60)
+
+        assert cache.compressed_entries == 1
+        assert cache.total_bytes < len(response)
+        assert cache.get("a").response == response
+
+
+class TestSemanticCacheIndex:
+    """Tests de l'index sémantique par modèle"""
+
+    def test_search_respects_threshold_and_model(self):
+        index = SemanticCacheIndex(dimension=4)
+        index.add("m1", "a", [1, 0, 0, 0])
+        index.add("m1", "b", [0.9, 0.1, 0, 0])
+        index.add("m2", "c", [1, 0, 0, 0])
+
+        results = index.search("m1", [1, 0, 0, 0], threshold=0.95, limit=5)
+
+        assert [key for _, key in results] == ["a", "b"]
+        assert index.search("m1", [0, 0, 1, 0], threshold=0.5, limit=5) == []
+
+    def test_remove_keeps_remaining_keys_searchable(self):
+        index = SemanticCacheIndex(dimension=4)
+        for i in range(20):
+            index.add("m1", f"k{i}", np.eye(4)[i % 4].tolist())
+        index.remove("k0")
+        index.remove("k4")
+
+        results = index.search("m1", [1, 0, 0, 0], threshold=0.99, limit=10)
+
+        assert sorted(key for _, key in results) == ["k12", "k16", "k8"]
+        assert len(index) == 18
+
+
+class TestLLMCacheManagerLocalTier:
+    """Tests de l'admission en L1 et des TTL par stratégie"""
+
+    def setup_method(self):
+        self.redis = Mock()
+        self.redis.setex = AsyncMock(return_value=True)
+        self.redis.get = AsyncMock(return_value=None)
+        self.manager = LLMCacheManager(self.redis, CacheConfig(local_admission_threshold=2))
+
+    async def test_admission_requires_repeated_pattern(self):
+        prompt = "Quelle est la météo à Paris ?"
+        await self.manager.get_cached_response(prompt)
+        await self.manager.cache_response(prompt, "Ensoleillé, 22 degrés.")
+        assert len(self.manager.local_cache) == 0
+
+        await self.manager.get_cached_response(prompt)
+        await self.manager.cache_response(prompt, "Ensoleillé, 22 degrés.")
+        assert len(self.manager.local_cache) == 1
+
+        assert await self.manager.get_cached_response(prompt) == "Ensoleillé, 22 degrés."
+        self.redis.get.assert_awaited()
+
+    def test_local_ttl_follows_strategy(self):
+        self.manager.frequent_patterns["quelle heure est-il ?"] = 5
+        entry = make_entry()
+        self.manager._update_local_cache("llm_cache:context_aware:h", entry)
+
+        item = self.manager.local_cache._items["llm_cache:context_aware:h"]
+        expected = entry.created_at.timestamp() + self.manager.config.context_aware_ttl
+        assert item.expires_at == pytest.approx(expected)
+
+    def test_tracked_patterns_are_bounded(self):
+        manager = LLMCacheManager(self.redis, CacheConfig(max_tracked_patterns=3))
+        for prompt in ["a", "b", "c", "a", "d"]:
+            manager._record_pattern(prompt)
+
+        assert list(manager.frequent_patterns.items()) == [("c", 1), ("a", 2), ("d", 1)]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🧭 Tests unitaires pour le moteur de routage du LLM Gateway
+Analyse incrémentale par préfixe de conversation et indicateurs compilés
+"""
+
+import pytest
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'llm-gateway'))
+
+import routing
+from routing import RoutingEngine, IndicatorMatcher
+
+REASONING = ["explain", "analyze", "compare", "logic", "step by step", "complex", "comprehensive"]
+CODE = ["code", "function", "class", "debug", "implement"]
+
+
+def conversation(turns):
+    messages = [{"role": "system", "content": "Tu es JARVIS."}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Question {i}: explain the class hierarchy step by step"})
+        messages.append({"role": "assistant", "content": f"Réponse {i}: voici le code de la function demandée."})
+    return messages
+
+
+class TestIndicatorMatcher:
+    """Tests du motif d'indicateurs compilé"""
+
+    @pytest.mark.parametrize("text", [
+        "Please explain this complex decoder logic",
+        "comprehensive comparison, compare step by step",
+        "nothing relevant here",
+        "classes and subclasses encode functions",
+    ])
+    def test_matches_substring_semantics(self, text):
+        matcher = IndicatorMatcher(REASONING + CODE)
+        expected = sum(1 for indicator in REASONING + CODE if indicator in text.lower())
+
+        assert IndicatorMatcher.count(matcher.scan(text.lower())) == expected
+
+
+class TestRoutingEngine:
+    """Tests de l'analyse incrémentale"""
+
+    def test_incremental_analysis_matches_full_analysis(self):
+        engine = RoutingEngine(REASONING, CODE)
+        for turns in range(1, 6):
+            engine.analyze(conversation(turns))
+
+        key, incremental = engine.analyze(conversation(6))
+        fresh_key, full = RoutingEngine(REASONING, CODE).analyze(conversation(6))
+
+        assert key == fresh_key
+        assert incremental == full
+        assert engine.reasoning_score(full) == 2
+        assert engine.code_score(full) == 3
+
+    def test_only_new_messages_are_analyzed(self):
+        engine = RoutingEngine(REASONING, CODE)
+        engine.analyze(conversation(10))
+        analyzed = engine.stats["messages_analyzed"]
+
+        engine.analyze(conversation(11))
+
+        assert engine.stats["messages_analyzed"] - analyzed == 2
+        assert engine.stats["messages_reused"] == 21
+
+    def test_edited_history_changes_conversation_key(self):
+        engine = RoutingEngine(REASONING, CODE)
+        messages = conversation(3)
+        key, _ = engine.analyze(messages)
+
+        messages[1] = {"role": "user", "content": "Autre question"}
+        edited_key, state = engine.analyze(messages)
+
+        assert edited_key != key
+        assert state.messages == len(messages)
+
+    def test_decision_cache_is_keyed_by_features(self):
+        engine = RoutingEngine(REASONING, CODE)
+        engine.store_decision(("optimal", True, True), "heavy")
+
+        # Toute conversation complexe sur GPU optimal partage la décision
+        assert engine.cached_decision(("optimal", True, True)) == "heavy"
+        assert engine.cached_decision(("critical", False, True)) is None
+        assert engine.stats["decision_hits"] == 1
+
+    async def test_tokenizer_load_failure_keeps_estimate(self, monkeypatch):
+        engine = RoutingEngine(REASONING, CODE)
+        monkeypatch.setattr(routing, "TIKTOKEN_AVAILABLE", True)
+
+        def offline():
+            raise OSError("network unreachable")
+
+        monkeypatch.setattr(routing.LocalTokenizer, "load_bpe", staticmethod(offline))
+
+        assert not await engine.load_tokenizer(timeout=1.0)
+        assert engine.tokenizer.backend == "regex"
+        assert engine.analyze(conversation(1))[1].token_count > 0
+
+    async def test_tokenizer_loaded_at_startup_resets_prefixes(self, monkeypatch):
+        engine = RoutingEngine(REASONING, CODE)
+        engine.analyze(conversation(2))
+        monkeypatch.setattr(routing, "TIKTOKEN_AVAILABLE", True)
+        monkeypatch.setattr(routing.LocalTokenizer, "load_bpe", staticmethod(lambda: FakeEncoder()))
+
+        assert await engine.load_tokenizer()
+        _, state = engine.analyze(conversation(2))
+
+        assert engine.tokenizer.backend == "tiktoken"
+        assert state.token_count == 5 * (1 + routing.MESSAGE_OVERHEAD_TOKENS)
+
+
+class FakeEncoder:
+    """Encodage simulé: un token par message"""
+
+    def encode_ordinary(self, text):
+        return [0]
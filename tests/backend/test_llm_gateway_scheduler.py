@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+🚦 Tests unitaires pour le contrôle d'admission du LLM Gateway
+Slots par modèle, priorités, files bornées et délestage par échéance
+"""
+
+import pytest
+import asyncio
+from types import SimpleNamespace
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'llm-gateway'))
+
+from scheduler import AdmissionScheduler, AdmissionRejected, Priority
+
+
+def gpu(used_mb, total_mb=16384, status="optimal"):
+    return SimpleNamespace(memory_used_mb=used_mb, memory_total_mb=total_mb, status=SimpleNamespace(value=status))
+
+
+class TestSlotComputation:
+    """Tests du calcul des slots depuis la VRAM"""
+
+    def test_slots_follow_free_vram(self):
+        scheduler = AdmissionScheduler(max_slots=8)
+
+        assert scheduler.compute_slots(3072, None) == scheduler.default_slots
+        assert scheduler.compute_slots(3072, gpu(used_mb=16384 - 768)) == 3
+        assert scheduler.compute_slots(3072, gpu(used_mb=0)) == 8
+        assert scheduler.compute_slots(3072, gpu(used_mb=0, status="critical")) == 1
+
+    def test_loaded_gpu_halves_slots(self):
+        scheduler = AdmissionScheduler(max_slots=8)
+
+        assert scheduler.compute_slots(12288, gpu(used_mb=16384 - 6144, status="loaded")) == 2
+
+    def test_free_vram_split_between_gpu_models(self):
+        scheduler = AdmissionScheduler(max_slots=8)
+        free_6gb = gpu(used_mb=16384 - 6144)
+
+        assert scheduler.compute_slots(12288, free_6gb) == 5
+        scheduler.update_gpu_capacities({"light": 3072, "heavy": 12288}, free_6gb)
+
+        # 3 GB chacun: 1 + 3072 // 384 (plafonné) et 1 + 3072 // 1536
+        assert scheduler.queues["light"].capacity == 8
+        assert scheduler.queues["heavy"].capacity == 3
+
+
+class TestAdmissionScheduler:
+    """Tests de l'ordonnancement et du délestage"""
+
+    async def test_priority_order_when_slot_frees(self):
+        scheduler = AdmissionScheduler()
+        scheduler.register_model("light", capacity=1)
+        holder = await scheduler.acquire("light", Priority.CHAT)
+        order = []
+
+        async def request(priority):
+            ticket = await scheduler.acquire("light", priority)
+            order.append(priority)
+            scheduler.release(ticket)
+
+        tasks = [asyncio.create_task(request(p)) for p in (Priority.BACKGROUND, Priority.CHAT, Priority.VOICE)]
+        await asyncio.sleep(0.01)
+        scheduler.release(holder)
+        await asyncio.gather(*tasks)
+
+        assert order == [Priority.VOICE, Priority.CHAT, Priority.BACKGROUND]
+
+    async def test_full_queue_preempts_lower_priority(self):
+        scheduler = AdmissionScheduler(max_queue_per_model=1)
+        scheduler.register_model("light", capacity=1)
+        holder = await scheduler.acquire("light", Priority.CHAT)
+
+        background = asyncio.create_task(scheduler.acquire("light", Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        voice = asyncio.create_task(scheduler.acquire("light", Priority.VOICE))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await background
+        assert exc.value.reason == "preempted"
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire("light", Priority.CHAT)
+        assert exc.value.reason == "queue_full"
+
+        scheduler.release(holder)
+        ticket = await voice
+        assert ticket.priority == Priority.VOICE
+
+    async def test_unreachable_deadline_is_rejected_immediately(self):
+        scheduler = AdmissionScheduler(initial_service_time=2.0)
+        scheduler.register_model("light", capacity=1)
+        await scheduler.acquire("light", Priority.CHAT)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire("light", Priority.VOICE, deadline_s=0.5)
+
+        assert exc.value.reason == "deadline_unreachable"
+        assert scheduler.get_stats()["light"]["queue_depth"] == 0
+
+    async def test_queued_request_expires_at_deadline(self):
+        scheduler = AdmissionScheduler(initial_service_time=0.01)
+        scheduler.register_model("light", capacity=1)
+        holder = await scheduler.acquire("light", Priority.CHAT)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await scheduler.acquire("light", Priority.CHAT, deadline_s=0.05)
+
+        assert exc.value.status_code == 504
+        scheduler.release(holder)
+        assert scheduler.get_stats()["light"]["active"] == 0
+
+    async def test_capacity_increase_admits_waiters(self):
+        scheduler = AdmissionScheduler(max_slots=4)
+        scheduler.register_model("light", capacity=1)
+        await scheduler.acquire("light", Priority.CHAT)
+        waiter = asyncio.create_task(scheduler.acquire("light", Priority.CHAT))
+        await asyncio.sleep(0)
+
+        scheduler.update_capacity("light", 3072, gpu(used_mb=16384 - 384))
+        ticket = await asyncio.wait_for(waiter, 1)
+
+        assert ticket.waited >= 0
+        assert scheduler.get_stats()["light"]["active"] == 2
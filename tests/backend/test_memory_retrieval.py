@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+🔍 Tests unitaires pour la récupération de mémoires du Brain API
+Re-rank hybride des candidats L1/PostgreSQL et chemins des modes memory, database et hybrid
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.memory import HybridMemoryManager, MemoryEntry
+
+
+QUERY = [1.0, 0.0, 0.0, 0.0]
+
+
+def make_memory(memory_id, embedding, access_count=0, hours_ago=1000.0, memory_type="static"):
+    when = datetime.now() - timedelta(hours=hours_ago)
+    return MemoryEntry(
+        id=memory_id,
+        type=memory_type,
+        content=f"mémoire {memory_id}",
+        embedding=embedding,
+        meta_data={"user_id": "user1"},
+        created_at=when,
+        updated_at=when,
+        access_count=access_count,
+        last_accessed=when
+    )
+
+
+def make_manager(mode, db_candidates=()):
+    manager = HybridMemoryManager("postgresql://test", "redis://test", retrieval_mode=mode)
+    manager.vector_dimension = len(QUERY)
+    manager.vector_index.dimension = len(QUERY)
+    manager._generate_embedding = AsyncMock(return_value=QUERY)
+    manager._get_candidates_from_db = AsyncMock(return_value=list(db_candidates))
+    manager._update_access_stats_batch = AsyncMock()
+    return manager
+
+
+class TestRerankCandidates:
+    """Tests de la fusion et du re-classement des candidats"""
+
+    def test_candidates_ordered_by_hybrid_score(self):
+        manager = make_manager("hybrid")
+        near = make_memory("near", [0.9, 0.1, 0.0, 0.0])
+        far = make_memory("far", [0.0, 1.0, 0.0, 0.0])
+        # Similarité moyenne mais très consultée: le bonus de fréquence la fait passer devant
+        popular = make_memory("popular", [0.8, 0.6, 0.0, 0.0], access_count=100)
+        local = [(0.5, make_memory("local", [0.5, 0.5, 0.5, 0.5]))]
+
+        ranked = manager._rerank_candidates(local, [far, near, popular], QUERY)
+
+        assert [memory.id for _, memory in ranked] == ["popular", "near", "local", "far"]
+        scores = [score for score, _ in ranked]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_l1_entries_win_over_database_copies(self):
+        manager = make_manager("hybrid")
+        stale = make_memory("m1", [1.0, 0.0, 0.0, 0.0], access_count=0)
+        fresh = make_memory("m1", [1.0, 0.0, 0.0, 0.0], access_count=50)
+        manager.static_memory["m1"] = fresh
+        indexed = make_memory("m2", [0.0, 1.0, 0.0, 0.0])
+
+        ranked = manager._rerank_candidates([(0.1, indexed)], [stale, indexed], QUERY)
+
+        assert [memory for _, memory in ranked] == [fresh, indexed]
+        assert ranked[1][0] == 0.1  # score L1 conservé, pas recalculé
+
+
+class TestRetrievalModes:
+    """Tests des chemins de recherche par mode"""
+
+    async def test_memory_mode_searches_only_the_index(self):
+        manager = make_manager("memory")
+        manager.vector_index.add(make_memory("m1", [1.0, 0.0, 0.0, 0.0]))
+        manager.vector_index.add(make_memory("m2", [0.0, 1.0, 0.0, 0.0]))
+
+        results = await manager.retrieve_memories("requête", "user1", limit=1)
+
+        assert [memory.id for memory in results] == ["m1"]
+        manager._get_candidates_from_db.assert_not_awaited()
+        manager._update_access_stats_batch.assert_not_awaited()
+
+    async def test_database_mode_ranks_nearest_neighbours(self):
+        candidates = [make_memory("db1", [0.0, 1.0, 0.0, 0.0]), make_memory("db2", [1.0, 0.0, 0.0, 0.0])]
+        manager = make_manager("database", candidates)
+        manager.vector_index.add(make_memory("l1", [1.0, 0.0, 0.0, 0.0]))
+
+        results = await manager.retrieve_memories("requête", "user1", memory_types=["static"], limit=2)
+
+        # L'index L1 n'est pas consulté; les voisins ANN sont re-classés par score exact
+        assert [memory.id for memory in results] == ["db2", "db1"]
+        manager._get_candidates_from_db.assert_awaited_once_with(
+            "user1", ["static"], QUERY, 2 * manager.ann_oversample
+        )
+        manager._update_access_stats_batch.assert_awaited_once_with(["db2", "db1"])
+
+    async def test_hybrid_mode_merges_index_and_database(self):
+        candidates = [make_memory("db", [0.9, 0.1, 0.0, 0.0])]
+        manager = make_manager("hybrid", candidates)
+        manager.vector_index.add(make_memory("l1", [1.0, 0.0, 0.0, 0.0]))
+        manager.vector_index.add(make_memory("l2", [0.0, 0.0, 1.0, 0.0]))
+
+        results = await manager.retrieve_memories("requête", "user1", limit=2)
+
+        assert [memory.id for memory in results] == ["l1", "db"]
+        # Seules les mémoires venues de PostgreSQL y voient leurs compteurs mis à jour
+        manager._update_access_stats_batch.assert_awaited_once_with(["db"])
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            HybridMemoryManager("postgresql://test", "redis://test", retrieval_mode="exact")
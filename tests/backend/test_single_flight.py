@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+🛫 Tests unitaires pour la coalescence des requêtes LLM (single-flight)
+"""
+
+import asyncio
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests du groupe single-flight"""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        calls = 0
+
+        async def generate():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "réponse"
+
+        results = await asyncio.gather(*(flight.do("k", generate) for _ in range(5)))
+
+        assert results == ["réponse"] * 5
+        assert calls == 1
+        assert flight.stats["coalesced"] == 4
+        assert flight.in_flight() == 0
+
+    async def test_errors_propagate_to_all_waiters(self):
+        flight = SingleFlight("test")
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("gateway indisponible")
+
+        results = await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert flight.in_flight() == 0
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight("test")
+
+        async def generate():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        leader = asyncio.create_task(flight.do("k", generate))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", generate))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "ok"
+
+    async def test_stream_fans_out_chunks_to_late_joiner(self):
+        flight = SingleFlight("test")
+        produced = 0
+
+        async def chunks():
+            nonlocal produced
+            for i in range(4):
+                produced += 1
+                await asyncio.sleep(0.005)
+                yield i
+
+        async def consume(delay):
+            await asyncio.sleep(delay)
+            return [c async for c in flight.stream("k", chunks)]
+
+        first, second = await asyncio.gather(consume(0), consume(0.008))
+
+        assert first == second == [0, 1, 2, 3]
+        assert produced == 4
+        assert flight.stats["stream_coalesced"] == 1
+
+    async def test_stream_is_cancelled_without_subscribers(self):
+        flight = SingleFlight("test")
+        produced = 0
+
+        async def chunks():
+            nonlocal produced
+            for i in range(100):
+                produced += 1
+                await asyncio.sleep(0.001)
+                yield i
+
+        async for chunk in flight.stream("k", chunks):
+            if chunk == 2:
+                break
+        await asyncio.sleep(0.01)
+
+        assert produced < 100
+        assert flight.in_flight() == 0
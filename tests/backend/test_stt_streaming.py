@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+🎙️ Tests unitaires pour le pipeline de streaming du STT Service
+Ring buffer, segmentation VAD avec recouvrement, inférence hors boucle
+"""
+
+import pytest
+import asyncio
+import time
+import numpy as np
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'stt-service'))
+
+from streaming import (
+    AudioRingBuffer, EnergyVAD, StreamSegmenter, StreamConfig,
+    StreamingSession, InferenceWorkerPool, merge_overlap
+)
+
+SR = 16000
+
+
+def pcm(seconds, amplitude=0.0, freq=220.0, rng=None):
+    """PCM int16: tonalité (parole simulée) ou bruit faible"""
+    rng = rng or np.random.default_rng(0)
+    t = np.arange(int(seconds * SR)) / SR
+    signal = amplitude * np.sin(2 * np.pi * freq * t) + 0.001 * rng.normal(size=len(t))
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes()
+
+
+def segment(config, audio):
+    ring = AudioRingBuffer(len(audio) // 2 + SR)
+    ring.write_pcm16(audio)
+    vad, segmenter = EnergyVAD(config), StreamSegmenter(config)
+    frame = segmenter.frame
+    n = ring.total_written // frame
+    speech, rms = vad.process(ring.read(0, n * frame).reshape(n, frame))
+    return segmenter.update(speech, rms, 0)
+
+
+class TestAudioRingBuffer:
+    """Tests du ring buffer préalloué"""
+
+    def test_wraparound_read_is_contiguous(self):
+        ring = AudioRingBuffer(1000)
+        samples = np.arange(2500, dtype=np.int16)
+        for chunk in np.array_split(samples, 7):
+            ring.write_pcm16(chunk.tobytes())
+
+        out = ring.read(1600, 2500)
+        assert np.allclose(out * 32768, samples[1600:2500])
+        assert len(ring.read(0, 1000)) == 0  # écrasé
+
+    def test_odd_byte_is_carried(self):
+        ring = AudioRingBuffer(100)
+        data = np.array([1000, -2000, 3000], dtype=np.int16).tobytes()
+        ring.write_pcm16(data[:3])
+        ring.write_pcm16(data[3:])
+
+        assert ring.total_written == 3
+        assert np.allclose(ring.read(0, 3) * 32768, [1000, -2000, 3000])
+
+
+class TestStreamSegmenter:
+    """Tests de la segmentation VAD"""
+
+    def test_speech_between_silences_gives_one_final(self):
+        config = StreamConfig()
+        events = segment(config, pcm(1.0) + pcm(2.0, amplitude=0.3) + pcm(1.0))
+
+        finals = [e for e in events if e.kind == "final"]
+        assert len(finals) == 1
+        assert finals[0].start == pytest.approx(1.0 * SR - config.samples(config.preroll_ms), abs=config.samples(60))
+        assert finals[0].end == pytest.approx(3.0 * SR + config.samples(config.tail_ms), abs=config.samples(60))
+        assert any(e.kind == "partial" for e in events)
+
+    def test_long_speech_is_split_with_overlap(self):
+        config = StreamConfig(max_segment_s=3.0)
+        events = segment(config, pcm(0.5) + pcm(10.0, amplitude=0.3) + pcm(1.0))
+
+        finals = [e for e in events if e.kind == "final"]
+        assert len(finals) >= 3
+        assert all(f.forced for f in finals[:-1])
+        for previous, current in zip(finals, finals[1:]):
+            assert current.start == previous.end - config.samples(config.overlap_ms)
+
+
+def test_merge_overlap_removes_repeated_words():
+    assert merge_overlap("allume la lumière du salon", "du salon s'il te plaît") == "s'il te plaît"
+    assert merge_overlap("bonjour", "quelle heure est-il") == "quelle heure est-il"
+
+
+class TestStreamingSession:
+    """Tests de la session de streaming"""
+
+    async def test_inference_runs_off_event_loop(self):
+        calls = []
+
+        def slow_transcribe(audio, language, prompt):
+            time.sleep(0.2)
+            calls.append(len(audio))
+            return {"text": f"segment {len(calls)}", "language": "fr"}
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        pool = InferenceWorkerPool(max_workers=1)
+        session = StreamingSession(pool, slow_transcribe, send, StreamConfig(partial_interval_s=10))
+        session.start()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        audio = pcm(0.5) + pcm(1.0, amplitude=0.3) + pcm(1.0)
+        for i in range(0, len(audio), 3200):
+            await session.feed(audio[i:i + 3200])
+        await session.finish()
+        ticker_task.cancel()
+        await session.close()
+        pool.shutdown()
+
+        finals = [m for m in sent if m.get("is_final")]
+        assert [m["text"] for m in finals] == ["segment 1"]
+        assert session.language == "fr"
+        assert ticks >= 10  # la boucle a continué de tourner pendant l'inférence
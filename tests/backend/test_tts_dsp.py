@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+🎛️ Tests unitaires pour la chaîne d'effets DSP du TTS Service
+Suiveur d'enveloppe vectorisé et chaîne compilée du preset Jarvis
+"""
+
+import pytest
+import numpy as np
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'tts-service'))
+
+from core.dsp import PresetEffectChain, envelope_follower
+from presets.jarvis_voice import JarvisVoicePreset
+
+
+def sequential_envelope(magnitude, attack_samples, release_samples):
+    """Référence: boucle par échantillon de l'ancien compresseur"""
+    envelope = magnitude.copy()
+    for i in range(1, len(envelope)):
+        step = attack_samples if envelope[i] > envelope[i-1] else release_samples
+        envelope[i] = envelope[i-1] + (envelope[i] - envelope[i-1]) / step
+    return envelope
+
+
+class TestEnvelopeFollower:
+    """Tests du suiveur d'enveloppe par blocs"""
+
+    @pytest.mark.parametrize("length,attack,release", [(1, 110, 1102), (3000, 3, 7), (50000, 22, 2205)])
+    def test_matches_sequential_follower(self, length, attack, release):
+        rng = np.random.default_rng(length)
+        magnitude = np.abs(rng.standard_normal(length) * rng.random(length))
+
+        envelope = envelope_follower(magnitude, 1 / attack, 1 / release)
+
+        np.testing.assert_allclose(envelope, sequential_envelope(magnitude, attack, release), atol=1e-12)
+
+    def test_instant_attack_matches_sequential_follower(self):
+        # Attaque d'un échantillon (coefficient 1.0) sur dents de scie: point fixe non atteint en 64 itérations
+        magnitude = (np.arange(100000) / 441) % 1.0
+
+        envelope = envelope_follower(magnitude, 1.0, 1 / 2205)
+
+        np.testing.assert_allclose(envelope, sequential_envelope(magnitude, 1, 2205), atol=1e-12)
+
+
+class TestPresetEffectChain:
+    """Tests de la chaîne compilée"""
+
+    def test_jarvis_chain_keeps_length_and_input(self):
+        rng = np.random.default_rng(0)
+        audio = 0.3 * np.sin(2 * np.pi * 150 * np.arange(22050) / 22050) + 0.01 * rng.standard_normal(22050)
+        original = audio.copy()
+        chain = PresetEffectChain(JarvisVoicePreset().get_audio_effects(), 22050)
+
+        processed = chain.process(audio)
+
+        assert processed.shape == audio.shape
+        assert np.all(np.abs(processed) <= 1.0)
+        np.testing.assert_array_equal(audio, original)
+
+    def test_reverb_is_sparse_echo_sum(self):
+        chain = PresetEffectChain({"reverb": {"room_size": 0.5, "damping": 0.0, "wet_level": 0.5, "dry_level": 0.5}})
+        impulse = np.zeros(4000)
+        impulse[0] = 1.0
+
+        response = chain.process(impulse)
+
+        echoes = np.flatnonzero(response)
+        assert echoes.tolist() == [0, 661, 1102, 1543, 1984]
+        np.testing.assert_allclose(response[echoes], [0.5, 0.25, 0.25, 0.25, 0.25])
+
+    def test_chorus_lfo_is_shared_across_lengths(self):
+        effects = {"fx": {"subtle_chorus": {"enabled": True, "rate": 0.5, "depth": 0.1, "delay": 10}}}
+        chain = PresetEffectChain(effects, 22050)
+        rng = np.random.default_rng(3)
+        long_audio = 0.3 * rng.standard_normal(44100)
+        short_audio = 0.3 * rng.standard_normal(22050)
+
+        chain.process(long_audio)
+        short = chain.process(short_audio)
+
+        # Le LFO d'un signal court est le début du tampon déjà calculé
+        np.testing.assert_array_equal(short, PresetEffectChain(effects, 22050).process(short_audio))
+        assert len(chain._chorus_lfo) == 44100
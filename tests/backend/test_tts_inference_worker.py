@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+⚙️ Tests unitaires pour le worker d'inférence du TTS Service
+Regroupement par voix/langue, concurrence bornée et file saturée
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'tts-service'))
+
+from core.inference_worker import InferenceWorker, InferenceQueueFull
+
+
+class RecordingModel:
+    """Modèle simulé: enregistre l'ordre des synthèses et la concurrence"""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text, voice_id, language, speed):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append((voice_id, language, text))
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if text == "erreur":
+            raise RuntimeError("échec modèle")
+        return f"audio:{text}"
+
+
+class TestInferenceWorker:
+    """Tests de l'ordonnancement des jobs de synthèse"""
+
+    async def test_compatible_jobs_are_grouped(self):
+        model = RecordingModel()
+        worker = InferenceWorker(model, max_batch_size=8, batch_window_ms=20)
+        await worker.start()
+
+        jobs = [("a", "fr_male", "fr"), ("b", "en_female", "en"), ("c", "fr_male", "fr"), ("d", "fr_male", "fr")]
+        results = await asyncio.gather(*(worker.submit(text, voice, lang, 1.0) for text, voice, lang in jobs))
+
+        assert results == ["audio:a", "audio:b", "audio:c", "audio:d"]
+        assert [text for _, _, text in model.calls] == ["a", "c", "d", "b"]
+        stats = worker.get_stats()
+        assert stats["batches"] == 2
+        assert stats["avg_batch_size"] == 2
+        assert all(name.startswith("tts-inference") for name in model.threads)
+        await worker.shutdown()
+
+    async def test_batch_size_and_concurrency_are_bounded(self):
+        model = RecordingModel()
+        worker = InferenceWorker(model, max_batch_size=2, max_concurrency=2, batch_window_ms=0)
+        await worker.start()
+
+        await asyncio.gather(*(worker.submit(str(i), "default", "fr", 1.0) for i in range(8)))
+
+        assert model.max_active <= 2
+        assert worker.get_stats()["batches"] >= 4
+        await worker.shutdown()
+
+    async def test_full_queue_rejects(self):
+        model = RecordingModel()
+        worker = InferenceWorker(model, max_batch_size=1, batch_window_ms=0, max_queue=2)
+        await worker.start()
+
+        tasks = [asyncio.create_task(worker.submit(str(i), "default", "fr", 1.0)) for i in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(InferenceQueueFull):
+            await worker.submit("x", "default", "fr", 1.0)
+
+        await asyncio.gather(*tasks)
+        assert worker.get_stats()["rejected"] == 1
+        await worker.shutdown()
+
+    async def test_job_error_only_fails_that_job(self):
+        model = RecordingModel()
+        worker = InferenceWorker(model, batch_window_ms=10)
+        await worker.start()
+
+        results = await asyncio.gather(
+            worker.submit("ok", "default", "fr", 1.0),
+            worker.submit("erreur", "default", "fr", 1.0),
+            return_exceptions=True
+        )
+
+        assert results[0] == "audio:ok"
+        assert isinstance(results[1], RuntimeError)
+        assert worker.get_stats()["failed"] == 1
+        await worker.shutdown()
+
+    async def test_cancelled_job_is_skipped_by_running_batch(self):
+        model = RecordingModel(delay=0.05)
+        worker = InferenceWorker(model, batch_window_ms=10)
+        await worker.start()
+
+        first = asyncio.create_task(worker.submit("a", "default", "fr", 1.0))
+        second = asyncio.create_task(worker.submit("b", "default", "fr", 1.0))
+        while not model.calls:
+            await asyncio.sleep(0.005)
+        second.cancel()
+
+        assert await first == "audio:a"
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        assert [text for _, _, text in model.calls] == ["a"]
+        await worker.shutdown()
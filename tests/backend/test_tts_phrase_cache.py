@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+🗃️ Tests unitaires pour le cache de phrases du TTS Service
+Clés par paramètres vocaux, niveaux mémoire/disque et fusion des synthèses concurrentes
+"""
+
+import pytest
+import asyncio
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'tts-service'))
+
+from core.phrase_cache import PhraseCache
+
+
+@pytest.fixture
+async def cache(tmp_path):
+    phrase_cache = PhraseCache(cache_dir=str(tmp_path / "phrases"), max_memory_mb=1, max_disk_mb=4)
+    await phrase_cache.initialize()
+    return phrase_cache
+
+
+class TestPhraseCacheKeys:
+    """Tests des clés de cache"""
+
+    def test_key_normalizes_whitespace_only(self, cache):
+        base = cache.make_key("Bien reçu, Monsieur.", "french_male", "fr", 0.95, -2.0, preset_name="jarvis")
+
+        assert cache.make_key("  Bien reçu,\n Monsieur. ", "french_male", "fr", 0.95, -2.0, preset_name="jarvis") == base
+        assert cache.make_key("Bien reçu, monsieur.", "french_male", "fr", 0.95, -2.0, preset_name="jarvis") != base
+
+    def test_key_depends_on_voice_parameters(self, cache):
+        base = cache.make_key("Bonjour.", "default", "fr", 1.0, 1.0)
+
+        assert cache.make_key("Bonjour.", "french_male", "fr", 1.0, 1.0) != base
+        assert cache.make_key("Bonjour.", "default", "fr", 1.1, 1.0) != base
+        assert cache.make_key("Bonjour.", "default", "fr", 1.0, 1.0, preset_effects={"eq": {"low_gain": 3.0}}) != base
+        assert cache.make_key("Bonjour.", "default", "fr", 1.0, 1.0, variant="stream") != base
+
+
+class TestPhraseCacheTiers:
+    """Tests des niveaux mémoire et disque"""
+
+    async def test_synthesizes_once_then_hits_memory(self, cache):
+        calls = []
+
+        async def synthesize():
+            calls.append(1)
+            return b"\x01\x00" * 100
+
+        key = cache.make_key("Bonjour, Monsieur.")
+        first = await cache.get_or_synthesize(key, synthesize)
+        second = await cache.get_or_synthesize(key, synthesize)
+
+        assert first == second
+        assert len(calls) == 1
+        assert cache.get_stats()["memory_hits"] == 1
+
+    async def test_disk_tier_survives_restart(self, cache, tmp_path):
+        key = cache.make_key("À votre service, Monsieur.")
+        await cache.put(key, b"\x02\x00" * 50)
+
+        restarted = PhraseCache(cache_dir=str(tmp_path / "phrases"))
+        await restarted.initialize()
+
+        assert await restarted.get(key) == b"\x02\x00" * 50
+        assert restarted.get_stats()["disk_hits"] == 1
+        assert restarted.get_stats()["disk_bytes"] == 100
+
+    async def test_concurrent_requests_share_one_synthesis(self, cache):
+        calls = []
+
+        async def synthesize():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return b"\x03\x00" * 10
+
+        key = cache.make_key("Immédiatement, Monsieur.")
+        results = await asyncio.gather(*(cache.get_or_synthesize(key, synthesize) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert len(set(results)) == 1
+        assert cache.get_stats()["coalesced"] == 4
+
+    async def test_cancelled_caller_does_not_cancel_others(self, cache):
+        started = asyncio.Event()
+
+        async def synthesize():
+            started.set()
+            await asyncio.sleep(0.05)
+            return b"\x05\x00" * 10
+
+        key = cache.make_key("Bonjour monsieur.")
+        first = asyncio.create_task(cache.get_or_synthesize(key, synthesize))
+        await started.wait()
+        second = asyncio.create_task(cache.get_or_synthesize(key, synthesize))
+        while cache.get_stats()["coalesced"] == 0:
+            await asyncio.sleep(0.001)
+        first.cancel()
+
+        assert await asyncio.wait_for(second, 2) == b"\x05\x00" * 10
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await cache.get(key) == b"\x05\x00" * 10
+
+    async def test_failed_synthesis_is_not_cached(self, cache):
+        async def fail():
+            raise RuntimeError("modèle indisponible")
+
+        key = cache.make_key("Mission accomplie.")
+        with pytest.raises(RuntimeError):
+            await cache.get_or_synthesize(key, fail)
+
+        assert await cache.get(key) is None
+
+    async def test_warm_skips_cached_phrases(self, cache):
+        synthesized = []
+
+        async def synthesize(**params):
+            synthesized.append(params["text"])
+            return b"\x04\x00" * 10
+
+        entries = [{"text": "Bonjour, Monsieur."}, {"text": "Mission accomplie."}]
+
+        assert await cache.warm(entries, synthesize) == 2
+        assert await cache.warm(entries, synthesize) == 0
+        assert synthesized == ["Bonjour, Monsieur.", "Mission accomplie."]
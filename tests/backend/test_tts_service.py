@@ -17,7 +17,11 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'tts-service'))
 
-from main import app, app_state, TTSRequest, JarvisRequest, VoiceCloneRequest
+from main import (
+    app, app_state, TTSRequest, JarvisRequest, VoiceCloneRequest,
+    jarvis_tts, preset_warmup_entries, render_speech_pcm, speech_params, synthesize_speech
+)
+from core.phrase_cache import PhraseCache
 from core.tts_engine import TTSEngine
 from core.audio_processor import AudioProcessor
 from core.stream_manager import StreamManager
@@ -446,7 +450,8 @@ class TestTTSServiceEndpoints:
         mock_processed_audio = b"fake_processed_audio"
         
         app_state["tts_engine"].synthesize = AsyncMock(return_value=mock_audio_data)
-        app_state["audio_processor"].process = AsyncMock(return_value=mock_processed_audio)
+        app_state["audio_processor"].process_to_pcm = AsyncMock(return_value=b"\x01\x00" * 100)
+        app_state["audio_processor"].pcm16_to_wav = Mock(return_value=mock_processed_audio)
         
         request_data = {
             "text": "Hello, this is a test",
@@ -475,7 +480,8 @@ class TestTTSServiceEndpoints:
         mock_processed_audio = b"jarvis_processed_audio"
         
         app_state["tts_engine"].synthesize = AsyncMock(return_value=(mock_audio_data, mock_effects))
-        app_state["audio_processor"].process = AsyncMock(return_value=mock_processed_audio)
+        app_state["audio_processor"].process_to_pcm = AsyncMock(return_value=b"\x01\x00" * 100)
+        app_state["audio_processor"].pcm16_to_wav = Mock(return_value=mock_processed_audio)
         
         request_data = {
             "text": "System status nominal",
@@ -639,6 +645,53 @@ def event_loop():
     loop.close()
 
 
+class TestPhraseCacheWarmup:
+    """Les entrées préchauffées doivent être servies aux vraies requêtes"""
+    
+    @pytest.fixture
+    async def warmed(self, tmp_path):
+        phrase_cache = PhraseCache(cache_dir=str(tmp_path / "phrases"))
+        await phrase_cache.initialize()
+        app_state["phrase_cache"] = phrase_cache
+        app_state["tts_engine"] = Mock(synthesize=AsyncMock(return_value=b"audio"))
+        app_state["audio_processor"] = Mock(
+            process_to_pcm=AsyncMock(return_value=b"\x01\x00" * 100),
+            pcm16_to_wav=Mock(return_value=b"wav")
+        )
+        await phrase_cache.warm(preset_warmup_entries(), render_speech_pcm)
+        yield phrase_cache, app_state["tts_engine"].synthesize
+        app_state["phrase_cache"] = None
+    
+    def test_key_ignores_overridden_and_unused_parameters(self):
+        base = speech_params("Bien reçu, Monsieur.", preset_name="jarvis")
+        
+        assert speech_params("Bien reçu, Monsieur.", speed=1.3, pitch=0.8, preset_name="jarvis") == base
+        assert speech_params("Bien reçu, Monsieur.", preset_name="jarvis", context="inconnu") == base
+        assert speech_params("Bien reçu, Monsieur.", preset_name="jarvis", context="weather") != base
+    
+    async def test_warmed_intro_served_to_jarvis_endpoint(self, warmed):
+        phrase_cache, synthesize = warmed
+        warmed_calls = synthesize.await_count
+        
+        for intro in ["Bonjour, Monsieur.", "À votre service, Monsieur."]:
+            with patch("random.choice", return_value=intro):
+                result = await jarvis_tts(JarvisRequest(text="Les systèmes sont prêts.", phrase_category="greetings"))
+            assert result["enhanced_text"] == f"{intro} Les systèmes sont prêts."
+        
+        # Seul le texte demandé est synthétisé, une fois; les introductions viennent du préchauffage
+        assert synthesize.await_count == warmed_calls + 1
+        assert phrase_cache.get_stats()["memory_hits"] == 3
+    
+    async def test_warmed_phrase_served_to_synthesize_endpoint(self, warmed):
+        phrase_cache, synthesize = warmed
+        warmed_calls = synthesize.await_count
+        
+        await synthesize_speech(TTSRequest(text="Bien reçu, Monsieur.", voice_id="french_male", preset_name="jarvis"))
+        
+        assert synthesize.await_count == warmed_calls
+        assert phrase_cache.get_stats()["memory_hits"] == 1
+
+
 # Helpers pour les tests TTS
 class TestTTSHelpers:
     """Helpers utilitaires pour les tests TTS"""
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+🧭 Tests unitaires pour l'index vectoriel en mémoire du Brain API
+Vérifie l'équivalence avec le classement Python d'origine et la maintenance incrémentale
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.vector_index import VectorIndexManager, UserVectorIndex, MEMORY_TYPE_CODES
+
+
+DIM = 16
+
+
+def make_entry(memory_id, user_id="user1", memory_type="static", access_count=0, hours_ago=1.0, rng=None):
+    rng = rng or np.random.default_rng(abs(hash(memory_id)) % (2**32))
+    return SimpleNamespace(
+        id=memory_id,
+        type=memory_type,
+        embedding=rng.normal(size=DIM).tolist(),
+        meta_data={"user_id": user_id},
+        access_count=access_count,
+        last_accessed=datetime.now() - timedelta(hours=hours_ago),
+    )
+
+
+def brute_force(entries, query, limit):
+    """Classement de référence (implémentation Python d'origine)"""
+    scored = []
+    q = np.array(query)
+    for e in entries:
+        v = np.array(e.embedding)
+        sim = np.dot(q, v) / (np.linalg.norm(q) * np.linalg.norm(v))
+        hours = (datetime.now() - e.last_accessed).total_seconds() / 3600
+        recency = 0.1 * np.exp(-hours / 24)
+        frequency = min(0.05 * np.log(1 + e.access_count), 0.2)
+        scored.append((sim + recency + frequency, e))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [e.id for _, e in scored[:limit]]
+
+
+class TestVectorIndexManager:
+    """Tests du gestionnaire d'index par utilisateur"""
+
+    def setup_method(self):
+        self.rng = np.random.default_rng(0)
+        self.index = VectorIndexManager(DIM)
+
+    def test_topk_matches_bruteforce(self):
+        entries = [
+            make_entry(f"m{i}", memory_type=["static", "dynamic", "episodic"][i % 3],
+                       access_count=i % 7, hours_ago=i % 48, rng=self.rng)
+            for i in range(300)
+        ]
+        for entry in entries:
+            self.index.add(entry)
+
+        query = self.rng.normal(size=DIM).tolist()
+        results = self.index.search("user1", query, None, 10)
+
+        assert [e.id for _, e in results] == brute_force(entries, query, 10)
+
+    def test_type_filter_and_user_isolation(self):
+        self.index.add(make_entry("a", memory_type="static", rng=self.rng))
+        self.index.add(make_entry("b", memory_type="episodic", rng=self.rng))
+        self.index.add(make_entry("c", user_id="user2", rng=self.rng))
+
+        query = self.rng.normal(size=DIM).tolist()
+        results = self.index.search("user1", query, ["episodic"], 5)
+
+        assert [e.id for _, e in results] == ["b"]
+        assert self.index.search("unknown", query, None, 5) == []
+
+    def test_remove_keeps_rows_consistent(self):
+        entries = [make_entry(f"m{i}", rng=self.rng) for i in range(20)]
+        for entry in entries:
+            self.index.add(entry)
+
+        for memory_id in ("m0", "m7", "m19"):
+            assert self.index.remove(memory_id)
+        assert not self.index.remove("m0")
+
+        remaining = [e for e in entries if e.id not in ("m0", "m7", "m19")]
+        query = self.rng.normal(size=DIM).tolist()
+        results = self.index.search("user1", query, None, 50)
+
+        assert sorted(e.id for _, e in results) == sorted(e.id for e in remaining)
+        assert [e.id for _, e in results] == brute_force(remaining, query, 50)
+
+    def test_touch_updates_frequency_bonus(self):
+        entry = make_entry("a", rng=self.rng)
+        self.index.add(entry)
+        query = self.rng.normal(size=DIM).tolist()
+
+        before = self.index.search("user1", query, None, 1)[0][0]
+        entry.access_count = 50
+        self.index.touch(entry)
+        after = self.index.search("user1", query, None, 1)[0][0]
+
+        assert after == pytest.approx(before + 0.05 * np.log(51), abs=1e-5)
+
+    def test_entries_without_embedding_are_skipped(self):
+        entry = make_entry("a", rng=self.rng)
+        entry.embedding = None
+        assert not self.index.add(entry)
+        assert self.index.get_stats()["indexed_vectors"] == 0
+
+
+class TestUserVectorIndexIVF:
+    """Tests du mode IVF pour les gros utilisateurs"""
+
+    def test_ivf_recall_on_clustered_data(self):
+        rng = np.random.default_rng(1)
+        index = UserVectorIndex(DIM, ivf_threshold=500, ivf_nprobe=4)
+        centers = rng.normal(size=(8, DIM))
+        for i in range(2000):
+            entry = make_entry(f"m{i}", rng=rng)
+            entry.embedding = (centers[i % 8] + 0.05 * rng.normal(size=DIM)).tolist()
+            entry.last_accessed = None
+            index.add(entry)
+
+        assert index._centroids is not None
+
+        query = centers[3] / np.linalg.norm(centers[3])
+        results = index.search(query.astype(np.float32), [MEMORY_TYPE_CODES["static"]], 10)
+
+        assert len(results) == 10
+        assert all(int(e.id[1:]) % 8 == 3 for _, e in results)
+
+    def test_exact_below_threshold_ivf_above(self):
+        rng = np.random.default_rng(2)
+        index = UserVectorIndex(DIM, ivf_threshold=200, ivf_nprobe=1)
+        entries = [make_entry(f"m{i}", access_count=i % 5, rng=rng) for i in range(200)]
+        for entry in entries[:199]:
+            index.add(entry)
+        query = rng.normal(size=DIM)
+        query = (query / np.linalg.norm(query)).astype(np.float32)
+
+        # Sous le seuil: recherche exacte sur toutes les lignes
+        assert index._centroids is None
+        exact = [e.id for _, e in index.search(query, None, 10)]
+        assert exact == brute_force(entries[:199], query.tolist(), 10)
+
+        # Seuil atteint: seules les listes sondées sont parcourues
+        index.add(entries[199])
+        assert index._centroids is not None
+        probed = int(np.argmax(index._centroids @ query))
+        in_probed = {index._ids[row] for row in np.flatnonzero(index._assignments[:index.size] == probed)}
+        results = index.search(query, None, 500)
+        assert {e.id for _, e in results} == in_probed
+        assert len(results) < 200
+
+        # Retour sous le seuil après suppressions: de nouveau exacte
+        index.remove("m0")
+        assert len(index.search(query, None, 500)) == 199
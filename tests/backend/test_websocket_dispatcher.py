@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+🔌 Tests unitaires pour le dispatcher de messages du WebSocketManager
+Chats en tâches suivies, chemin rapide du contrôle, annulation et latences
+"""
+
+import pytest
+import asyncio
+import json
+
+# Import du module à tester
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'brain-api'))
+
+from core.websocket_manager import WebSocketManager
+from core.audio_streamer import AudioStreamer
+
+
+class QueueWebSocket:
+    """WebSocket simulé: messages entrants via une file, messages sortants enregistrés"""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return json.dumps(message)
+
+    def of_type(self, message_type):
+        return [m for m in self.sent if m["type"] == message_type]
+
+
+class SlowAgent:
+    """Agent simulé: chaque tâche attend d'être libérée"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+
+    async def execute_task(self, message, context, on_event=None, user_id=None):
+        self.started += 1
+        await self.release.wait()
+        return type("Execution", (), {"final_answer": f"ok: {message}", "total_duration": 0.0, "steps": []})()
+
+
+async def wait_for(predicate, timeout=1.0):
+    for _ in range(int(timeout / 0.005)):
+        if predicate():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition non atteinte")
+
+
+@pytest.fixture
+async def connected():
+    agent = SlowAgent()
+    manager = WebSocketManager(agent=agent, max_concurrent_chats=2, max_chats_per_connection=3)
+    websocket = QueueWebSocket()
+    task = asyncio.create_task(manager.handle_connection(websocket, "/ws"))
+    await websocket.incoming.put({"type": "auth", "user_id": "user"})
+    await wait_for(lambda: websocket.of_type("auth_success"))
+    yield manager, websocket, agent
+    await websocket.incoming.put(None)
+    await task
+
+
+class TestChatDispatcher:
+    """Tests du dispatcher par connexion"""
+
+    async def test_ping_answered_while_chat_runs(self, connected):
+        manager, websocket, agent = connected
+
+        await websocket.incoming.put({"type": "chat", "message": "bonjour", "message_id": "m1"})
+        await wait_for(lambda: agent.started == 1)
+        await websocket.incoming.put({"type": "ping"})
+        await wait_for(lambda: websocket.of_type("pong"))
+
+        assert not websocket.of_type("chat_response")
+        agent.release.set()
+        await wait_for(lambda: websocket.of_type("chat_response"))
+        assert websocket.of_type("chat_response")[0]["response"] == "ok: bonjour"
+
+    async def test_concurrency_bounded_and_overflow_rejected(self, connected):
+        manager, websocket, agent = connected
+
+        for i in range(4):
+            await websocket.incoming.put({"type": "chat", "message": str(i), "message_id": f"m{i}"})
+        await wait_for(lambda: websocket.of_type("chat_rejected"))
+        await asyncio.sleep(0.02)
+
+        assert agent.started == 2
+        assert websocket.of_type("chat_rejected")[0]["message_id"] == "m3"
+        assert manager.get_stats()["chats_in_flight"] == 3
+
+        agent.release.set()
+        await wait_for(lambda: len(websocket.of_type("chat_response")) == 3)
+
+    async def test_cancel_by_message_id(self, connected):
+        manager, websocket, agent = connected
+
+        await websocket.incoming.put({"type": "chat", "message": "long", "message_id": "m1"})
+        await wait_for(lambda: agent.started == 1)
+        await websocket.incoming.put({"type": "chat_cancel", "message_id": "m1"})
+        await wait_for(lambda: websocket.of_type("chat_cancelled"))
+
+        stats = manager.get_stats()
+        assert stats["chats_cancelled"] == 1
+        assert stats["chats_in_flight"] == 0
+        assert {"auth", "chat", "chat_cancel", "chat_execution"} <= set(stats["handling_latency"])
+        assert stats["handling_latency"]["chat"]["count"] == 1
+
+    async def test_unknown_types_share_one_latency_key(self, connected):
+        manager, websocket, agent = connected
+
+        for message_type in ["foo", "bar", [1], {"nested": True}]:
+            await websocket.incoming.put({"type": message_type})
+        await websocket.incoming.put({"type": "ping"})
+        await wait_for(lambda: websocket.of_type("pong"))
+
+        latency = manager.get_stats()["handling_latency"]
+        assert latency["unknown"]["count"] == 4
+        assert set(latency) <= {"auth", "ping", "unknown"}
+        assert len(websocket.of_type("error")) == 4
+
+    async def test_audio_session_events_sent_once(self, connected):
+        manager, websocket, agent = connected
+        manager.audio_streamer = AudioStreamer(websocket_manager=manager)
+
+        await websocket.incoming.put({"type": "audio_session_start", "config": {}})
+        await wait_for(lambda: websocket.of_type("audio_session_started"))
+        session_id = websocket.of_type("audio_session_started")[0]["session_id"]
+        await websocket.incoming.put({"type": "audio_session_end", "session_id": session_id})
+        await wait_for(lambda: websocket.of_type("audio_session_ended"))
+        await websocket.incoming.put({"type": "ping"})
+        await wait_for(lambda: websocket.of_type("pong"))
+
+        assert len(websocket.of_type("audio_session_started")) == 1
+        assert len(websocket.of_type("audio_session_ended")) == 1
+        assert "stats" in websocket.of_type("audio_session_ended")[0]
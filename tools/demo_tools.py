@@ -52,7 +52,7 @@ async def demo_search_tools():
     
     # Rechercher des outils pour lire des fichiers
     logger.info("Recherche: 'lire fichier'")
-    matches = tool_manager.search_tools("lire fichier", max_results=3)
+    matches = await tool_manager.search_tools("lire fichier", max_results=3)
     
     for i, match in enumerate(matches, 1):
         tool_info = match["tool"]
@@ -62,7 +62,7 @@ async def demo_search_tools():
     
     # Rechercher des outils d'IA
     logger.info("Recherche: 'intelligence artificielle'")
-    matches = tool_manager.search_tools("intelligence artificielle", max_results=3)
+    matches = await tool_manager.search_tools("intelligence artificielle", max_results=3)
     
     for i, match in enumerate(matches, 1):
         tool_info = match["tool"]
@@ -427,7 +427,7 @@ class MCPServer:
                 )
             
             # Rechercher les outils
-            matches = tool_manager.search_tools(query, max_results)
+            matches = await tool_manager.search_tools(query, max_results)
             
             # Convertir en format MCP
             mcp_matches = []
@@ -14,7 +14,7 @@ import json
 from loguru import logger
 
 from .base_tool import BaseTool, ToolResult, ToolCategory, ToolExecution, ToolStatus
-from sentence_transformers import SentenceTransformer
+from core.ai.embedding_engine import get_embedding_engine
 import numpy as np
 
 @dataclass
@@ -39,7 +39,7 @@ class ToolManager:
             executions={}
         )
         
-        # Modèle de similarité sémantique pour la sélection d'outils
+        # Modèle de similarité sémantique pour la sélection d'outils (moteur d'embeddings partagé)
         self.similarity_model = None
         self.tool_embeddings = {}
         
@@ -89,8 +89,12 @@ class ToolManager:
         """Initialise le modèle de similarité sémantique"""
         try:
             logger.info("🧠 Chargement du modèle de similarité...")
-            self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.success("✅ Modèle de similarité chargé")
+            engine = await get_embedding_engine(model_name='all-MiniLM-L6-v2', hash_fallback=False)
+            self.similarity_model = engine if engine.model is not None else None
+            if self.similarity_model:
+                logger.success("✅ Modèle de similarité chargé")
+            else:
+                logger.warning("⚠️ Modèle de similarité indisponible, recherche par mots-clés")
         except Exception as e:
             logger.warning(f"⚠️ Impossible de charger le modèle de similarité: {e}")
             self.similarity_model = None
@@ -183,8 +187,8 @@ class ToolManager:
             # Générer l'embedding pour la recherche sémantique
             if self.similarity_model:
                 text_for_embedding = f"{tool.display_name} {tool.description} {' '.join(tool.keywords)}"
-                embedding = self.similarity_model.encode(text_for_embedding)
-                self.tool_embeddings[tool_name] = embedding
+                embedding = await self.similarity_model.embed(text_for_embedding)
+                self.tool_embeddings[tool_name] = np.asarray(embedding)
             
             self.stats["tools_loaded"] += 1
             
@@ -232,7 +236,7 @@ class ToolManager:
         
         return tools_info
     
-    def search_tools(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    async def search_tools(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Recherche d'outils par similarité sémantique
         
@@ -248,8 +252,8 @@ class ToolManager:
             return self._keyword_search(query, max_results)
         
         try:
-            # Générer l'embedding de la requête
-            query_embedding = self.similarity_model.encode(query)
+            # Générer l'embedding de la requête (lot partagé, sans bloquer la boucle)
+            query_embedding = np.asarray(await self.similarity_model.embed(query))
             
             # Calculer les similarités
             similarities = []
@@ -403,7 +407,7 @@ class ToolManager:
             ToolResult: Résultat de l'exécution
         """
         # Rechercher les outils correspondants
-        matches = self.search_tools(query, max_results=1)
+        matches = await self.search_tools(query, max_results=1)
         
         if not matches:
             return ToolResult(